@@ -306,6 +306,23 @@ class Configuration(object):
                                    Set to one to use scientific notation.
                                    Default value is *1000000.0*.
     :cvar float RTK_MTIME: The default mission time for new RTK Programs.
+    :cvar bool RTK_PARALLEL_CALCS: Indicates whether to calculate the
+                                   hazard rates of the parts in the hardware
+                                   BoM in one worker process per CPU.  When
+                                   *False* the parts are calculated in the
+                                   RTK process.  Default value is *False*.
+    :cvar bool RTK_SPARSE_MATRICES: Indicates whether to store only the
+                                    non-zero cells of the traceability
+                                    matrices.  Default value is *False*.
+    :cvar bool RTK_GLOBALS_SNAPSHOT: Indicates whether to save the global
+                                     dictionaries loaded from the RTK Common
+                                     database to a snapshot file and load
+                                     them from it while the RTK Common
+                                     database is unchanged.  The snapshot is
+                                     unpickled when it is read so it is saved
+                                     as globals.snapshot in RTK_CONF_DIR,
+                                     which must only be writable by the
+                                     user.  Default value is *False*.
     :cvar int RTK_DEC_PLACES: Number of decimal places to show in numerical
                               results.  Default value is *6*.
     :cvar int RTK_MODE_SOURCE: Indicator variable used to determine which
@@ -448,6 +465,9 @@ class Configuration(object):
     RTK_HR_MULTIPLIER = 1000000.0
     RTK_DEC_PLACES = 6
     RTK_MTIME = 10.0
+    RTK_PARALLEL_CALCS = False
+    RTK_SPARSE_MATRICES = False
+    RTK_GLOBALS_SNAPSHOT = False
     RTK_GUI_LAYOUT = 'advanced'
     RTK_METHOD = 'STANDARD'  # STANDARD or LRM
     RTK_LOCALE = 'en_US'
@@ -655,6 +675,8 @@ class Configuration(object):
         _config.set('General', 'decimal', 6)
         _config.set('General', 'modesource', 1)
         _config.set('General', 'parallelcalcs', 'False')
+        _config.set('General', 'sparsematrices', 'False')
+        _config.set('General', 'globalssnapshot', 'False')
         _config.set('General', 'treetabpos', 'top')
         _config.set('General', 'listtabpos', 'bottom')
         _config.set('General', 'booktabpos', 'bottom')
@@ -742,13 +764,17 @@ class Configuration(object):
             _config.add_section('General')
             _config.set('General', 'reportsize', 'letter')
             _config.set('General', 'repairtimeunit', 'hours')
-            _config.set('General', 'parallelcalcs', 'False')
+            _config.set('General', 'parallelcalcs', self.RTK_PARALLEL_CALCS)
             _config.set('General', 'frmultiplier', self.RTK_HR_MULTIPLIER)
             _config.set('General', 'failtimeunit', 'hours')
             _config.set('General', 'calcreltime', self.RTK_MTIME)
             _config.set('General', 'autoaddlistitems', 'False')
             _config.set('General', 'decimal', self.RTK_DEC_PLACES)
             _config.set('General', 'modesource', self.RTK_MODE_SOURCE)
+            _config.set('General', 'sparsematrices',
+                        self.RTK_SPARSE_MATRICES)
+            _config.set('General', 'globalssnapshot',
+                        self.RTK_GLOBALS_SNAPSHOT)
             _config.set('General', 'treetabpos', self.RTK_TABPOS['modulebook'])
             _config.set('General', 'listtabpos', self.RTK_TABPOS['listbook'])
             _config.set('General', 'booktabpos', self.RTK_TABPOS['workbook'])
@@ -843,6 +869,15 @@ class Configuration(object):
             self.RTK_DEC_PLACES = _config.get('General', 'decimal')
             self.RTK_MTIME = _config.get('General', 'calcreltime')
             self.RTK_MODE_SOURCE = _config.get('General', 'modesource')
+            if _config.has_option('General', 'parallelcalcs'):
+                self.RTK_PARALLEL_CALCS = _config.getboolean(
+                    'General', 'parallelcalcs')
+            if _config.has_option('General', 'sparsematrices'):
+                self.RTK_SPARSE_MATRICES = _config.getboolean(
+                    'General', 'sparsematrices')
+            if _config.has_option('General', 'globalssnapshot'):
+                self.RTK_GLOBALS_SNAPSHOT = _config.getboolean(
+                    'General', 'globalssnapshot')
             self.RTK_TABPOS['listbook'] = _config.get('General', 'listtabpos')
             self.RTK_TABPOS['modulebook'] = _config.get(
                 'General', 'treetabpos')
@@ -27,23 +27,11 @@ except ImportError:
 from Configuration import Configuration
 import Utilities
 from rtk.dao.DAO import DAO
-from rtk.dao.commondb.RTKCategory import RTKCategory
+from rtk.dao.RTKGlobals import RTKGlobals
 from rtk.dao.commondb.RTKCondition import RTKCondition
-from rtk.dao.commondb.RTKFailureMode import RTKFailureMode
-from rtk.dao.commondb.RTKGroup import RTKGroup
-from rtk.dao.commondb.RTKHazards import RTKHazards
-from rtk.dao.commondb.RTKManufacturer import RTKManufacturer
-from rtk.dao.commondb.RTKMeasurement import RTKMeasurement
-from rtk.dao.commondb.RTKMethod import RTKMethod
 from rtk.dao.commondb.RTKModel import RTKModel
 from rtk.dao.commondb.RTKSiteInfo import RTKSiteInfo
-from rtk.dao.commondb.RTKStakeholders import RTKStakeholders
-from rtk.dao.commondb.RTKStatus import RTKStatus
-from rtk.dao.commondb.RTKSubCategory import RTKSubCategory
-from rtk.dao.commondb.RTKType import RTKType
-from rtk.dao.commondb.RTKUser import RTKUser
 from rtk.dao.programdb.RTKProgramInfo import RTKProgramInfo
-from rtk.dao.programdb.RTKRPN import RTKRPN
 # from datamodels.matrix.Matrix import Matrix
 from rtk.modules.revision import dtcRevision
 from rtk.modules.usage import dtcUsageProfile
@@ -156,6 +144,9 @@ class Model(object):
     :ivar program_dao: the data access object used to communicate with the RTK
                        Program database
     :type program_dao: :class:`rtk.dao.DAO.DAO()`
+    :ivar site_globals: the global dictionaries loaded from the RTK Common
+                        database.
+    :type site_globals: :class:`rtk.dao.RTKGlobals.RTKGlobals()`
     """
 
     def __init__(self, sitedao, programdao):
@@ -187,6 +178,7 @@ class Model(object):
         site_session.configure(
             bind=self.site_dao.engine, autoflush=False, expire_on_commit=False)
         self.site_session = scoped_session(site_session)
+        self.site_globals = None
         self.program_session = None
 
     def create_program(self, database):
@@ -272,11 +264,15 @@ class Model(object):
         """
         pass
 
-    # pylint: disable=too-many-branches
     def load_globals(self, configuration):
         """
         Load the RTK Program global constants.
 
+        The global dictionaries are replaced with dictionaries that are loaded
+        from the RTK Common database the first time they are used.  When the
+        snapshot option is set, the dictionaries are saved to and loaded from
+        a snapshot file in the RTK configuration directory.
+
         :param configuration: the currently active RTK Program Configuration()
                               object.
         :type configuration: :class:`rtk.Configuration.Configuration()`
@@ -285,180 +281,12 @@ class Model(object):
         """
         _return = False
 
-        # ------------------------------------------------------------------- #
-        # Build the component category, component subcategory, failure modes  #
-        # tree.                                                               #
-        # ------------------------------------------------------------------- #
-        for _record in self.site_session.query(RTKCategory).\
-                filter(RTKCategory.cat_type == 'hardware').all():
-
-            _subcats = {}
-            configuration.RTK_FAILURE_MODES[_record.category_id] = {}
-
-            for _subcat in self.site_session.query(RTKSubCategory).\
-                    filter(RTKSubCategory.category_id == _record.category_id).\
-                    all():
-                _subcats[_subcat.subcategory_id] = _subcat.description
-
-                _modes = {}
-                configuration.RTK_FAILURE_MODES[_record.category_id][
-                    _subcat.subcategory_id] = {}
-
-                for _mode in self.site_session.query(RTKFailureMode).\
-                        filter(RTKFailureMode.category_id == _record.category_id).\
-                        filter(RTKFailureMode.subcategory_id == _subcat.subcategory_id).\
-                        all():
-                    _modes[_mode.mode_id] = [
-                        _mode.description, _mode.mode_ratio, _mode.source
-                    ]
-
-                configuration.RTK_FAILURE_MODES[_record.category_id][
-                    _subcat.subcategory_id] = _modes
-
-            configuration.RTK_CATEGORIES[
-                _record.category_id] = _record.description
-            configuration.RTK_SUBCATEGORIES[_record.category_id] = _subcats
-
-        for _record in self.site_session.query(RTKStakeholders).all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_STAKEHOLDERS[_record.stakeholders_id] = (
-                _attributes['stakeholder'], )
-
-        # ------------------------------------------------------------------- #
-        # Load dictionaries from RTKCategory.                                 #
-        # ------------------------------------------------------------------- #
-        for _record in self.site_session.query(RTKCategory).\
-                filter(RTKCategory.category_id == 'action').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_ACTION_CATEGORY[_record.category_id] = (
-                _attributes['name'], _attributes['description'],
-                _attributes['category_type'], _attributes['value'])
-
-        for _record in self.site_session.query(RTKCategory).\
-                filter(RTKCategory.cat_type == 'incident').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_INCIDENT_CATEGORY[_record.category_id] = (
-                _attributes['name'], _attributes['description'],
-                _attributes['category_type'], _attributes['value'])
-
-        for _record in self.site_session.query(RTKCategory).\
-                filter(RTKCategory.cat_type == 'risk').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_SEVERITY[_record.category_id] = (
-                _attributes['name'], _attributes['description'],
-                _attributes['category_type'], _attributes['value'])
-
-        # ------------------------------------------------------------------- #
-        # Load dictionaries from RTKGroup.                                    #
-        # ------------------------------------------------------------------- #
-        for _record in self.site_session.query(RTKGroup).\
-                filter(RTKGroup.group_type == 'affinity').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_AFFINITY_GROUPS[_record.group_id] = (
-                _attributes['description'], _attributes['group_type'])
-
-        for _record in self.site_session.query(RTKGroup).\
-                filter(RTKGroup.group_type == 'workgroup').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_WORKGROUPS[_record.group_id] = (
-                _attributes['description'], _attributes['group_type'])
-
-        # ------------------------------------------------------------------- #
-        # Load the dictionaries from RTKMethod.                               #
-        # ------------------------------------------------------------------- #
-        for _record in self.site_session.query(RTKMethod).\
-                filter(RTKMethod.method_type == 'detection').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_DETECTION_METHODS[_record.method_id] = (
-                _attributes['name'], _attributes['description'],
-                _attributes['method_type'])
-
-        # ------------------------------------------------------------------- #
-        # Load dictionaries from RTKRPN.                                      #
-        # ------------------------------------------------------------------- #
-        for _record in self.site_session.query(RTKRPN).\
-                filter(RTKRPN.rpn_type == 'detection').all():
-            configuration.RTK_RPN_DETECTION[_record.value] = \
-                _record.get_attributes()
-
-        for _record in self.site_session.query(RTKRPN).\
-                filter(RTKRPN.rpn_type == 'occurrence').all():
-            configuration.RTK_RPN_OCCURRENCE[_record.value] = \
-                _record.get_attributes()
-
-        for _record in self.site_session.query(RTKRPN). \
-                filter(RTKRPN.rpn_type == 'severity').all():
-            configuration.RTK_RPN_SEVERITY[_record.value] = \
-                _record.get_attributes()
-
-        # ------------------------------------------------------------------- #
-        # Load dictionaries from RTKStatus.                                   #
-        # ------------------------------------------------------------------- #
-        for _record in self.site_session.query(RTKStatus).\
-                filter(RTKStatus.status_type == 'action').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_ACTION_STATUS[_record.status_id] = (
-                _attributes['name'], _attributes['description'],
-                _attributes['status_type'])
-
-        for _record in self.site_session.query(RTKStatus).\
-                filter(RTKStatus.status_type == 'incident').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_INCIDENT_STATUS[_record.status_id] = (
-                _attributes['name'], _attributes['description'],
-                _attributes['status_type'])
-
-        # ------------------------------------------------------------------- #
-        # Load dictionaries from RTKType.                                     #
-        # ------------------------------------------------------------------- #
-        for _record in self.site_session.query(RTKType).\
-                filter(RTKType.type_type == 'incident').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_INCIDENT_TYPE[_record.type_id] = (
-                _attributes['code'], _attributes['description'],
-                _attributes['type_type'])
-
-        for _record in self.site_session.query(RTKType).\
-                filter(RTKType.type_type == 'requirement').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_REQUIREMENT_TYPE[_record.type_id] = (
-                _attributes['code'], _attributes['description'],
-                _attributes['type_type'])
-
-        for _record in self.site_session.query(RTKType).\
-                filter(RTKType.type_type == 'validation').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_VALIDATION_TYPE[_record.type_id] = (
-                _attributes['code'], _attributes['description'],
-                _attributes['type_type'])
-
-        # ------------------------------------------------------------------- #
-        # Load dictionaries from tables not requiring a filter.               #
-        # ------------------------------------------------------------------- #
-        for _record in self.site_session.query(RTKHazards).all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_HAZARDS[_record.hazard_id] = (
-                _attributes['category'], _attributes['subcategory'])
-
-        for _record in self.site_session.query(RTKManufacturer).all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_MANUFACTURERS[_record.manufacturer_id] = (
-                _attributes['description'], _attributes['location'],
-                _attributes['cage_code'])
-
-        for _record in self.site_session.query(RTKMeasurement).\
-                filter(RTKMeasurement.measurement_type == 'unit').all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_MEASUREMENT_UNITS[_record.measurement_id] = (
-                _attributes['code'], _attributes['description'],
-                _attributes['measurement_type'])
-
-        for _record in self.site_session.query(RTKUser).all():
-            _attributes = _record.get_attributes()
-            configuration.RTK_USERS[_record.user_id] = (
-                _attributes['user_lname'], _attributes['user_fname'],
-                _attributes['user_email'], _attributes['user_phone'],
-                _attributes['user_group_id'])
+        _snapshot = None
+        if configuration.RTK_GLOBALS_SNAPSHOT:
+            _snapshot = configuration.RTK_CONF_DIR + '/globals.snapshot'
+
+        self.site_globals = RTKGlobals(self.site_dao, snapshot=_snapshot)
+        self.site_globals.do_attach(configuration)
 
         return _return
 
@@ -9,9 +9,12 @@ Contains utility functions for interacting with the RTK application.  Import
 this module in other modules that need to interact with the RTK application.
 """
 
+import multiprocessing
 import os
 import os.path
 
+import numpy as np
+
 # Add localization support.
 import gettext
 
@@ -126,6 +129,63 @@ def dir_exists(directory):
     return os.path.isdir(directory)
 
 
+def do_make_seeded_chunks(n_items, chunk_size, seed=None):
+    """
+    Split a number of items into chunks, each with its own random seed.
+
+    The seeds are drawn from a random number generator seeded with seed so
+    the chunks, and any results calculated from them, don't depend on which
+    process each chunk is calculated in.
+
+    :param int n_items: the number of items to split.
+    :param int chunk_size: the largest number of items in a chunk.
+    :param int seed: the seed of the random number generator that draws the
+                     chunk seeds.
+    :return: _lst_chunks; the list of (seed, number of items) of each chunk.
+    :rtype: list
+    """
+    _seeds = np.random.RandomState(seed).randint(
+        0, 2**31 - 1, size=-(-n_items // chunk_size)).tolist()
+
+    return [(_seed, min(chunk_size, n_items - _idx * chunk_size))
+            for _idx, _seed in enumerate(_seeds)]
+
+
+def do_map_chunks(function, chunks, n_workers=1):
+    """
+    Call function with each chunk, in a pool of worker processes if possible.
+
+    The chunks are mapped in a pool of worker processes when there is more
+    than one worker and more than one chunk.  They are mapped in this process
+    otherwise or when a pool of worker processes can't be started.
+
+    :param function: the module-level function, or partial() of one, to call
+                     with each chunk.
+    :param list chunks: the chunks to pass to function.
+    :param int n_workers: the largest number of worker processes to use.
+    :return: _lst_results; the list of function results in the same order as
+             chunks.
+    :rtype: list
+    """
+    _lst_results = None
+    if n_workers > 1 and len(chunks) > 1:
+        try:
+            _pool = multiprocessing.Pool(min(n_workers, len(chunks)))
+        except (ImportError, NotImplementedError, OSError):
+            _pool = None
+        if _pool is not None:
+            try:
+                _lst_results = _pool.map(function, chunks)
+            finally:
+                _pool.terminate()
+                _pool.join()
+
+    if _lst_results is None:
+        _lst_results = [function(_chunk) for _chunk in chunks]
+
+    return _lst_results
+
+
 def error_handler(message):
     """
     Function to convert string errors to integer error codes.
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+#       rtk.analyses.Equation.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+User-Defined Equation Module.
+
+User-defined equations are parsed and validated once and compiled into a code
+object.  The compiled equations are cached by the equation string so changing
+an equation automatically uses a new cache entry.  Only arithmetic,
+comparison, boolean, and conditional expressions of numbers and named
+variables are allowed.  Function calls, attribute access, subscripts, and
+literals other than numbers are rejected so an equation can't reach anything
+other than the values passed to it.
+"""
+
+import ast
+
+import numpy as np
+
+# The maximum number of compiled equations to keep.  The cache is emptied
+# when it is full.
+CACHE_SIZE = 4096
+
+_ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp,
+                  ast.Compare, ast.IfExp, ast.Num, ast.Name, ast.Load,
+                  ast.operator, ast.unaryop, ast.boolop, ast.cmpop)
+
+_CACHE = {}
+
+
+def _do_compile(equation):
+    """
+    Parse, validate, and compile a user-defined equation.
+
+    :param str equation: the user-defined equation to compile.
+    :return: (_code, _names, _error); the compiled equation, the set of
+             variable names used in the equation, and the reason the equation
+             is not valid (None if the equation is valid).
+    :rtype: tuple
+    """
+    try:
+        _tree = ast.parse(equation.strip(), mode='eval')
+    except (AttributeError, SyntaxError, TypeError, ValueError) as _error:
+        return None, frozenset(), str(_error)
+
+    _names = set()
+    for _node in ast.walk(_tree):
+        if not isinstance(_node, _ALLOWED_NODES):
+            return None, frozenset(), '{0:s} is not allowed in an ' \
+                'equation.'.format(_node.__class__.__name__)
+        if isinstance(_node, ast.Name):
+            _names.add(_node.id)
+
+    return compile(_tree, '<equation>', 'eval'), frozenset(_names), None
+
+
+def do_compile(equation):
+    """
+    Retrieve the compiled user-defined equation from the cache.
+
+    The equation is compiled and added to the cache the first time it is
+    requested.
+
+    :param str equation: the user-defined equation to compile.
+    :return: (_code, _names, _error); the compiled equation, the set of
+             variable names used in the equation, and the reason the equation
+             is not valid (None if the equation is valid).
+    :rtype: tuple
+    """
+    try:
+        return _CACHE[equation]
+    except KeyError:
+        if len(_CACHE) >= CACHE_SIZE:
+            _CACHE.clear()
+        _CACHE[equation] = _do_compile(equation)
+
+        return _CACHE[equation]
+
+
+def _do_check(equation, namespace):
+    """
+    Retrieve the compiled equation and check it can be evaluated.
+
+    :param str equation: the user-defined equation to evaluate.
+    :param dict namespace: the {name:value} variables available to the
+                           equation.
+    :return: (_code, _names); the compiled equation and the set of variable
+             names used in the equation.
+    :rtype: tuple
+    :raise: SyntaxError if the equation is empty, is not a valid equation, or
+            uses a variable that is not in the namespace.
+    """
+    _code, _names, _error = do_compile(equation)
+
+    if _error is not None:
+        raise SyntaxError(_error)
+    _unknown = _names.difference(namespace)
+    if _unknown:
+        raise SyntaxError('Unknown variable(s) {0:s} in equation.'.format(
+            ', '.join(sorted(_unknown))))
+
+    return _code, _names
+
+
+def do_evaluate(equation, namespace):
+    """
+    Evaluate a user-defined equation.
+
+    :param str equation: the user-defined equation to evaluate.
+    :param dict namespace: the {name:value} variables available to the
+                           equation.
+    :return: the value of the equation.
+    :raise: SyntaxError if the equation is empty, is not a valid equation, or
+            uses a variable that is not in the namespace.
+    """
+    return eval(  # pylint: disable=eval-used
+        _do_check(equation, namespace)[0], {'__builtins__': None}, namespace)
+
+
+def do_evaluate_array(equation, namespace, n_records):
+    """
+    Evaluate a user-defined equation for a batch of records in one call.
+
+    Each value in the namespace is either a scalar shared by all the records
+    or an array holding one value per record.  The equation is evaluated once
+    on the arrays.  If the equation can't be evaluated element-wise (e.g., it
+    uses a conditional expression or a floating point error is encountered)
+    it is evaluated one record at a time so the results, including any
+    exception raised, are the same as calling do_evaluate() for each record.
+
+    :param str equation: the user-defined equation to evaluate.
+    :param dict namespace: the {name:value} variables available to the
+                           equation.
+    :param int n_records: the number of records in the batch.
+    :return: _results; the list of the value of the equation for each record.
+    :rtype: list
+    :raise: SyntaxError if the equation is empty, is not a valid equation, or
+            uses a variable that is not in the namespace.
+    """
+    _code, _names = _do_check(equation, namespace)
+
+    _arrays = dict((_key, np.asarray(namespace[_key])) for _key in _names)
+    try:
+        with np.errstate(all='raise'):
+            _results = eval(  # pylint: disable=eval-used
+                _code, {'__builtins__': None}, _arrays)
+        _results = np.broadcast_to(_results, (n_records, ))
+        if _results.dtype.kind in 'biuf':
+            return _results.tolist()
+    except (ArithmeticError, TypeError, ValueError):
+        pass
+
+    _results = []
+    for _idx in range(n_records):
+        _record = {}
+        for _key, _value in _arrays.items():
+            if _value.ndim == 0:
+                _record[_key] = namespace[_key]
+            elif isinstance(_value[_idx], np.generic):
+                _record[_key] = _value[_idx].item()
+            else:
+                _record[_key] = _value[_idx]
+        _results.append(
+            eval(  # pylint: disable=eval-used
+                _code, {'__builtins__': None}, _record))
+
+    return _results
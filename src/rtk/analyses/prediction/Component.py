@@ -9,12 +9,61 @@
 
 import gettext
 
+import numpy as np
+
 from . import (Capacitor, Connection, Crystal, Filter, Fuse, Inductor,
                IntegratedCircuit, Lamp, Meter, Relay, Resistor, Semiconductor,
                Switch)
 
 _ = gettext.gettext
 
+# MIL-HDBK-217F parts count functions.  The key is the category ID.  The
+# miscellaneous parts (category 10) are further keyed by the subcategory ID.
+PART_COUNT_FUNCTIONS = {
+    1: IntegratedCircuit.calculate_217f_part_count,
+    2: Semiconductor.calculate_217f_part_count,
+    3: Resistor.calculate_217f_part_count,
+    4: Capacitor.calculate_217f_part_count,
+    5: Inductor.calculate_217f_part_count,
+    6: Relay.calculate_217f_part_count,
+    7: Switch.calculate_217f_part_count,
+    8: Connection.calculate_217f_part_count,
+    9: Meter.calculate_217f_part_count,
+    10: {
+        1: Crystal.calculate_217f_part_count,
+        2: Filter.calculate_217f_part_count,
+        3: Fuse.calculate_217f_part_count,
+        4: Lamp.calculate_217f_part_count
+    }
+}
+
+# The attributes, other than the category ID, subcategory ID, active
+# environment ID, and quality ID, that select the parts count base hazard rate
+# or piQ.  The key is the category ID.
+PART_COUNT_KEYS = {
+    1: ['technology_id', 'n_elements'],
+    2: ['type_id'],
+    3: ['specification_id'],
+    4: ['specification_id'],
+    5: ['family_id'],
+    6: ['type_id'],
+    7: ['construction_id'],
+    8: ['type_id'],
+    9: ['type_id'],
+    10: ['type_id', 'application_id']
+}
+
+# The attributes that identify a hardware item but don't change its hazard
+# rate.  They are left out of the key used to share mission hazard rate
+# calculations between identical parts.
+MISSION_IGNORE_KEYS = frozenset([
+    'alt_part_number', 'attachments', 'cage_code', 'comp_ref_des',
+    'description', 'environment_active_id', 'figure_number', 'hardware_id',
+    'lcn', 'name', 'nsn', 'page_number', 'parent_id', 'part_number',
+    'ref_des', 'remarks', 'revision_id', 'specification_number',
+    'tagged_part', 'temperature_active'
+])
+
 
 def calculate(**attributes):
     """
@@ -59,6 +108,134 @@ def calculate(**attributes):
     return attributes, _msg
 
 
+def do_calculate_mission_hazard_rate(parts, phases, cache=None):
+    """
+    Calculate the mission weighted active hazard rates for a set of parts.
+
+    Each mission phase is a (duration, environment_active_id,
+    temperature_active) tuple.  An environment or temperature of None means
+    the part's own value is used during the phase.  The phases are reduced to
+    the distinct conditions and the time spent in each, so a mission with
+    many phases that share a few conditions is no more expensive than one
+    with a phase per condition.  The parts count model does not use the
+    temperature so parts count parts are calculated once per environment.
+
+    calculate() is called once for each part and distinct condition.  The
+    result is stored in the cache keyed by the part's attributes (less those
+    in MISSION_IGNORE_KEYS) and the condition so parts that differ only in
+    name, reference designator, etc. share the calculation.  The attribute
+    dictionaries of the parts are not changed.
+
+    :param list parts: the list of attribute dictionaries of the parts.
+    :param list phases: the list of (duration, environment_active_id,
+                        temperature_active) for each mission phase.
+    :param dict cache: the {key:hazard rate} calculations to reuse and add
+                       to.  Defaults to an empty cache.
+    :return: _hazard_rates; the list of the time weighted average active
+             hazard rate of each part over the mission.
+    :rtype: list
+    :raise: ValueError if the total duration of the phases is not greater
+            than zero.
+    """
+    if cache is None:
+        cache = {}
+
+    _conditions = _do_reduce_phases(phases)
+    _total = float(sum(_duration for __, _duration in _conditions))
+    if _total <= 0.0:
+        raise ValueError('The total duration of the mission phases must be '
+                         'greater than zero.')
+
+    _hazard_rates = []
+    for _part in parts:
+        _signature = _do_get_mission_signature(_part)
+        _hazard_rate = 0.0
+        for _condition, _duration in _conditions:
+            _hazard_rate += _duration * _do_calculate_condition(
+                _part, _signature, _condition, cache)
+
+        _hazard_rates.append(_hazard_rate / _total)
+
+    return _hazard_rates
+
+
+def _do_reduce_phases(phases):
+    """
+    Reduce the mission phases to the distinct conditions.
+
+    :param list phases: the list of (duration, environment_active_id,
+                        temperature_active) for each mission phase.
+    :return: _conditions; the list of ((environment_active_id,
+             temperature_active), total duration) of each distinct condition
+             in the order they are first used.
+    :rtype: list
+    """
+    _conditions = []
+    _durations = {}
+    for _duration, _environment_id, _temperature in phases:
+        _condition = (_environment_id, _temperature)
+        if _condition not in _durations:
+            _conditions.append(_condition)
+            _durations[_condition] = 0.0
+        _durations[_condition] += _duration
+
+    return [(_key, _durations[_key]) for _key in _conditions]
+
+
+def _do_get_mission_signature(part):
+    """
+    Return the key that identical parts share in the mission cache.
+
+    :param dict part: the attribute dictionary of the part.
+    :return: the frozenset of the part's (attribute, value) pairs less those
+             in MISSION_IGNORE_KEYS or None if a value can't be hashed.
+    :rtype: frozenset
+    """
+    try:
+        _signature = frozenset((_key, _value) for _key, _value in part.items()
+                               if _key not in MISSION_IGNORE_KEYS)
+        hash(_signature)
+    except TypeError:
+        _signature = None
+
+    return _signature
+
+
+def _do_calculate_condition(part, signature, condition, cache):
+    """
+    Calculate the active hazard rate of a part in one mission condition.
+
+    :param dict part: the attribute dictionary of the part.
+    :param frozenset signature: the part's mission cache key or None to not
+                                use the cache.
+    :param tuple condition: the (environment_active_id, temperature_active)
+                            of the condition.  None uses the part's value.
+    :param dict cache: the {key:hazard rate} calculations to reuse and add
+                       to.
+    :return: the active hazard rate of the part in the condition.
+    :rtype: float
+    """
+    _environment_id, _temperature = condition
+    if _environment_id is None:
+        _environment_id = part['environment_active_id']
+    # The parts count model does not use the temperature.
+    if _temperature is None or part['hazard_rate_method_id'] == 1:
+        _temperature = part['temperature_active']
+
+    _key = (signature, _environment_id, _temperature)
+    if signature is not None and cache.get(_key, None) is not None:
+        return cache[_key]
+
+    _value = calculate(**dict(
+        part,
+        environment_active_id=_environment_id,
+        temperature_active=_temperature))[0]['hazard_rate_active']
+    if signature is not None:
+        cache[_key] = _value
+
+    return _value
+
+
 def do_calculate_217f_part_count(**attributes):
     """
     Calculate the part count hazard rate for a hardware item.
@@ -72,39 +249,111 @@ def do_calculate_217f_part_count(**attributes):
     """
     _msg = ''
 
-    #attributes, __ = {1: IntegratedCircuit.calculate_217f_part_count(**attributes)}
-    if attributes['category_id'] == 1:
-        attributes, __ = IntegratedCircuit.calculate_217f_part_count(
-            **attributes)
-    elif attributes['category_id'] == 2:
-        attributes, __ = Semiconductor.calculate_217f_part_count(**attributes)
-    elif attributes['category_id'] == 3:
-        attributes, __ = Resistor.calculate_217f_part_count(**attributes)
-    elif attributes['category_id'] == 4:
-        attributes, __ = Capacitor.calculate_217f_part_count(**attributes)
-    elif attributes['category_id'] == 5:
-        attributes, __ = Inductor.calculate_217f_part_count(**attributes)
-    elif attributes['category_id'] == 6:
-        attributes, __ = Relay.calculate_217f_part_count(**attributes)
-    elif attributes['category_id'] == 7:
-        attributes, __ = Switch.calculate_217f_part_count(**attributes)
-    elif attributes['category_id'] == 8:
-        attributes, __ = Connection.calculate_217f_part_count(**attributes)
-    elif attributes['category_id'] == 9:
-        attributes, __ = Meter.calculate_217f_part_count(**attributes)
-    elif attributes['category_id'] == 10:
-        if attributes['subcategory_id'] == 1:
-            attributes, __ = Crystal.calculate_217f_part_count(**attributes)
-        elif attributes['subcategory_id'] == 4:
-            attributes, __ = Lamp.calculate_217f_part_count(**attributes)
-        elif attributes['subcategory_id'] == 3:
-            attributes, __ = Fuse.calculate_217f_part_count(**attributes)
-        elif attributes['subcategory_id'] == 2:
-            attributes, __ = Filter.calculate_217f_part_count(**attributes)
+    _function = _get_part_count_function(attributes['category_id'],
+                                         attributes['subcategory_id'])
+    if _function is not None:
+        attributes, __ = _function(**attributes)
 
     return attributes, _msg
 
 
+def do_calculate_217f_part_count_batch(parts):
+    """
+    Calculate the part count hazard rates for a set of hardware items.
+
+    The parts are passed as columns, one array per attribute, rather than as
+    one attribute dictionary per part.  The category_id, subcategory_id,
+    environment_active_id, quality_id, and quantity columns are required.
+    The columns listed in PART_COUNT_KEYS are used when present and the
+    add_adj_factor, duty_cycle, and mult_adj_factor columns default to 0.0,
+    100.0, and 1.0.
+
+    The parts are grouped by the attributes that select the base hazard rate
+    and piQ.  Each distinct group is calculated once with the same function
+    the single part calculation uses and the results are gathered back to the
+    parts with fancy indexing.  Parts with a category or subcategory that has
+    no parts count model have a hazard rate of 0.0.
+
+    :param dict parts: the {attribute name:array of values} of the parts.
+    :return: _results; the {attribute name:array of values} of lambda_b, piQ,
+             and hazard_rate_active for the parts.
+    :rtype: dict
+    """
+    _n_parts = len(parts['category_id'])
+
+    _lst_keys = ['category_id', 'subcategory_id', 'environment_active_id',
+                 'quality_id']
+    for _category_keys in PART_COUNT_KEYS.values():
+        _lst_keys.extend(
+            [_key for _key in _category_keys if _key not in _lst_keys])
+    _lst_keys = [_key for _key in _lst_keys if _key in parts]
+
+    _keys = np.column_stack(
+        [np.asarray(parts[_key], dtype=float) for _key in _lst_keys])
+    _unique, _inverse = np.unique(_keys, axis=0, return_inverse=True)
+
+    _lambda_b = np.zeros(len(_unique))
+    _piQ = np.ones(len(_unique))
+    _hr_part = np.zeros(len(_unique))
+    for _idx, _row in enumerate(_unique):
+        _attributes = dict(zip(_lst_keys, _row.tolist()))
+        for _key in _lst_keys:
+            if _key != 'n_elements':
+                _attributes[_key] = int(_attributes[_key])
+
+        _function = _get_part_count_function(_attributes['category_id'],
+                                             _attributes['subcategory_id'])
+        if _function is None:
+            continue
+
+        for _key in PART_COUNT_KEYS[_attributes['category_id']]:
+            _attributes.setdefault(_key, 0)
+        _attributes['hardware_id'] = -1
+        _attributes['hazard_rate_active'] = 0.0
+
+        _attributes, __ = _function(**_attributes)
+        _lambda_b[_idx] = _attributes['lambda_b']
+        _piQ[_idx] = _attributes.get('piQ', 1.0)
+        _hr_part[_idx] = _attributes['hazard_rate_active']
+
+    _add_adj_factor = np.asarray(
+        parts.get('add_adj_factor', np.zeros(_n_parts)), dtype=float)
+    _duty_cycle = np.asarray(
+        parts.get('duty_cycle', np.full(_n_parts, 100.0)), dtype=float)
+    _mult_adj_factor = np.asarray(
+        parts.get('mult_adj_factor', np.ones(_n_parts)), dtype=float)
+    _quantity = np.asarray(parts['quantity'], dtype=float)
+
+    _results = {
+        'lambda_b':
+        _lambda_b[_inverse],
+        'piQ':
+        _piQ[_inverse],
+        'hazard_rate_active':
+        (_hr_part[_inverse] + _add_adj_factor) * (_duty_cycle / 100.0) *
+        _mult_adj_factor * _quantity
+    }
+
+    return _results
+
+
+def _get_part_count_function(category_id, subcategory_id):
+    """
+    Find the parts count function for a category and subcategory.
+
+    :param int category_id: the category ID of the hardware item.
+    :param int subcategory_id: the subcategory ID of the hardware item.
+    :return: the parts count function or None if there is no parts count
+             model for the category and subcategory.
+    :rtype: function
+    """
+    _function = PART_COUNT_FUNCTIONS.get(category_id, None)
+    if isinstance(_function, dict):
+        _function = _function.get(subcategory_id, None)
+
+    return _function
+
+
 def do_calculate_217f_part_stress(**attributes):
     """
     Calculate the part stress hazard rate for a hardware item.
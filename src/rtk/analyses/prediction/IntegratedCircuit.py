@@ -11,8 +11,130 @@ import gettext
 
 from math import exp, log
 
+import numpy as np
+
 _ = gettext.gettext
 
+# The MIL-HDBK-217F part stress tables.  calculate_217f_part_stress() looks
+# values up in these and calculate_217f_part_stress_array() uses the arrays
+# built from them below.
+#
+# Key is subcategory ID.  Value is a list of lists where the first index is
+# the technology ID to select the inner list and the second index is
+# determined by the number of elements.
+C1 = {
+    1: [[0.01, 0.02, 0.04, 0.06], [0.01, 0.02, 0.04, 0.06]],
+    2: [[0.0025, 0.005, 0.01, 0.02, 0.04, 0.08],
+        [0.01, 0.02, 0.04, 0.08, 0.16, 0.29]],
+    3: [[0.01, 0.021, 0.042], [0.00085, 0.0017, 0.0034, 0.0068]],
+    4: [[0.06, 0.12, 0.24, 0.48], [0.14, 0.28, 0.56, 1.12]],
+    5: [[0.00065, 0.0013, 0.0026, 0.0052], [0.0094, 0.019, 0.038, 0.075]],
+    6: [[0.00085, 0.0017, 0.0034, 0.0068], [0.0, 0.0, 0.0, 0.0]],
+    7: [[0.0013, 0.0025, 0.005, 0.01], [0.0, 0.0, 0.0, 0.0]],
+    8: [[0.0078, 0.016, 0.031, 0.062], [0.0052, 0.011, 0.021, 0.042]],
+    9: [[4.5, 7.2], [25.0, 51.0]]
+}
+# Key is the package type.  Value is the coefficient and exponent of C2.
+C2 = {
+    1: [2.8E-4, 1.08],
+    2: [9.0E-5, 1.51],
+    3: [3.0E-5, 1.82],
+    4: [3.0E-5, 2.01],
+    5: [3.6E-4, 1.08]
+}
+# Key is the GaAs type ID.  Value is the list of piA by application ID.
+PI_A = {1: [1.0, 3.0, 3.0], 2: [1.0]}
+# Key is the package ID.  Package IDs that aren't keys have a piPT of 1.0.
+PI_PT = {1: 1.0, 7: 1.3, 2: 2.2, 8: 2.9, 3: 4.7, 9: 6.1}
+# The number of element breakpoints for determining the C1 to use.
+BREAKPOINTS = {
+    1: [100, 300, 1000],
+    2: [100, 1000, 3000, 10000, 30000],
+    3: {
+        1: [200, 1000],
+        2: [500, 1000, 5000]
+    },
+    4: [8, 16, 32],
+    5: [16000, 64000, 256000],
+    6: [16000, 64000, 256000],
+    7: [16000, 64000, 256000],
+    8: [16000, 64000, 256000],
+    9: {
+        1: [
+            10,
+        ],
+        2: [
+            1000,
+        ]
+    }
+}
+# Key is the subcategory ID, value is Ea or list containing Ea values.
+EA = {
+    1: 0.65,
+    2: [
+        0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.45, 0.45, 0.5, 0.5, 0.6, 0.6,
+        0.6
+    ],
+    3: 0.65,
+    4: 0.65,
+    5: 0.6,
+    6: 0.6,
+    7: 0.6,
+    8: 0.6,
+    9: [1.5, 1.4]
+}
+PI_Q = [0.25, 1.0, 2.0]
+PI_E = [
+    0.5, 2.0, 4.0, 4.0, 6.0, 4.0, 5.0, 5.0, 8.0, 8.0, 0.5, 5.0, 12.0, 220.0
+]
+
+
+def _do_make_arrays():
+    """
+    Build the arrays used by calculate_217f_part_stress_array().
+
+    The arrays are indexed by subcategory ID, technology, package ID, or
+    package type.  Index 0 and the padding are 0.0 except for the
+    breakpoints, which are padded with infinity, and piPT, which is 1.0 for
+    package IDs without a piPT.  calculate_217f_part_stress() searches the
+    keys of the subcategory 3 breakpoints, the technology IDs, and always
+    uses the first C1 for subcategory 9, so their breakpoints are built the
+    same way.
+
+    :return: (_c1, _c2, _pi_pt, _breakpoints, _n_breaks, _ea)
+    :rtype: tuple
+    """
+    _c1 = np.zeros((10, 2, 6))
+    for _subcategory, _lst_c1 in C1.items():
+        for _idx, _values in enumerate(_lst_c1):
+            _c1[_subcategory, _idx, :len(_values)] = _values
+
+    _c2 = np.array([[0.0, 0.0]] + [C2[_key] for _key in sorted(C2)])
+    _pi_pt = np.array([PI_PT.get(_key, 1.0) for _key in range(10)])
+
+    _breakpoints = np.full((10, 5), np.inf)
+    _n_breaks = np.ones(10, dtype=int)
+    for _subcategory in range(1, 10):
+        _breaks = BREAKPOINTS[_subcategory]
+        if _subcategory == 3:
+            _breaks = sorted(_breaks)
+        elif _subcategory == 9:
+            _breaks = [np.inf]
+        _breakpoints[_subcategory, :len(_breaks)] = _breaks
+        _n_breaks[_subcategory] = len(_breaks)
+
+    # The Ea of subcategories with a single Ea; 0.0 for the others.
+    _ea = np.array([
+        0.0 if isinstance(EA.get(_key, []), list) else EA[_key]
+        for _key in range(10)
+    ])
+
+    return _c1, _c2, _pi_pt, _breakpoints, _n_breaks, _ea
+
+
+(_C1_ARRAY, _C2_ARRAY, _PI_PT_ARRAY, _BREAKPOINTS_ARRAY, _N_BREAKS_ARRAY,
+ _EA_ARRAY) = _do_make_arrays()
+
 
 def calculate_217f_part_count(**attributes):
     """
@@ -442,57 +564,6 @@ def calculate_217f_part_stress(**attributes):
              dictionary with updated values and the error message, if any.
     :rtype: (dict, str)
     """
-    # Key is subcategory ID.  Value is a list of lists where the first index
-    # is the technology ID to select the inner list and the second index is
-    # determined by the number of elements.
-    _dic_c1 = {
-        1: [[0.01, 0.02, 0.04, 0.06], [0.01, 0.02, 0.04, 0.06]],
-        2: [[0.0025, 0.005, 0.01, 0.02, 0.04, 0.08],
-            [0.01, 0.02, 0.04, 0.08, 0.16, 0.29]],
-        3: [[0.01, 0.021, 0.042], [0.00085, 0.0017, 0.0034, 0.0068]],
-        4: [[0.06, 0.12, 0.24, 0.48], [0.14, 0.28, 0.56, 1.12]],
-        5: [[0.00065, 0.0013, 0.0026, 0.0052], [0.0094, 0.019, 0.038, 0.075]],
-        6: [[0.00085, 0.0017, 0.0034, 0.0068], [0.0, 0.0, 0.0, 0.0]],
-        7: [[0.0013, 0.0025, 0.005, 0.01], [0.0, 0.0, 0.0, 0.0]],
-        8: [[0.0078, 0.016, 0.031, 0.062], [0.0052, 0.011, 0.021, 0.042]],
-        9: [[4.5, 7.2], [25.0, 51.0]]
-    }
-    _dic_c2 = {
-        1: [2.8E-4, 1.08],
-        2: [9.0E-5, 1.51],
-        3: [3.0E-5, 1.82],
-        4: [3.0E-5, 2.01],
-        5: [3.6E-4, 1.08]
-    }
-    _dic_piA = {1: [1.0, 3.0, 3.0], 2: [1.0]}
-    _dic_piPT = {1: 1.0, 7: 1.3, 2: 2.2, 8: 2.9, 3: 4.7, 9: 6.1}
-    # Dictionary containing the number of element breakpoints for determining
-    # the base hazard rate list to use.
-    _dic_breakpoints = {
-        1: [100, 300, 1000],
-        2: [100, 1000, 3000, 10000, 30000],
-        3: {
-            1: [200, 1000],
-            2: [500, 1000, 5000]
-        },
-        4: [8, 16, 32],
-        5: [16000, 64000, 256000],
-        6: [16000, 64000, 256000],
-        7: [16000, 64000, 256000],
-        8: [16000, 64000, 256000],
-        9: {
-            1: [
-                10,
-            ],
-            2: [
-                1000,
-            ]
-        }
-    }
-    _lst_piQ = [0.25, 1.0, 2.0]
-    _lst_piE = [
-        0.5, 2.0, 4.0, 4.0, 6.0, 4.0, 5.0, 5.0, 8.0, 8.0, 0.5, 5.0, 12.0, 220.0
-    ]
     _msg = ''
 
     # Categorize the technology.
@@ -507,13 +578,13 @@ def calculate_217f_part_stress(**attributes):
     # Retrieve the value of C1.
     try:
         if attributes['subcategory_id'] == 3:
-            _breaks = _dic_breakpoints[attributes['subcategory_id']][
+            _breaks = BREAKPOINTS[attributes['subcategory_id']][
                 _technology]
         if attributes['subcategory_id'] == 9:
-            _breaks = _dic_breakpoints[attributes['subcategory_id']][
+            _breaks = BREAKPOINTS[attributes['subcategory_id']][
                 attributes['application_id']]
         else:
-            _breaks = _dic_breakpoints[attributes['subcategory_id']]
+            _breaks = BREAKPOINTS[attributes['subcategory_id']]
 
         _index = -1
         for _index, _value in enumerate(_breaks):
@@ -523,8 +594,8 @@ def calculate_217f_part_stress(**attributes):
             elif _diff >= 0:
                 break
 
-        attributes['C1'] = _dic_c1[attributes['subcategory_id']][_technology -
-                                                                 1][_index + 1]
+        attributes['C1'] = C1[attributes['subcategory_id']][_technology -
+                                                            1][_index + 1]
 
     except KeyError:
         attributes['C1'] = 0.0
@@ -543,8 +614,8 @@ def calculate_217f_part_stress(**attributes):
 
     # Calculate the value of C2.
     try:
-        _f0 = _dic_c2[_package][0]
-        _f1 = _dic_c2[_package][1]
+        _f0 = C2[_package][0]
+        _f1 = C2[_package][1]
         attributes['C2'] = _f0 * (attributes['n_active_pins']**_f1)
     except KeyError:
         attributes['C2'] = 0.0
@@ -557,7 +628,7 @@ def calculate_217f_part_stress(**attributes):
         'piL'] = 0.01 * exp(5.35 - 0.35 * attributes['years_in_production'])
 
     # Determine the quality factor (piQ).
-    attributes['piQ'] = _lst_piQ[attributes['quality_id'] - 1]
+    attributes['piQ'] = PI_Q[attributes['quality_id'] - 1]
 
     if attributes['piQ'] <= 0.0:
         _msg = _msg + 'RTK WARNING: piQ is 0.0 when calculating ' \
@@ -565,7 +636,7 @@ def calculate_217f_part_stress(**attributes):
             '{0:d}'.format(attributes['hardware_id'])
 
     # Determine the environmental factor (piE).
-    attributes['piE'] = _lst_piE[attributes['environment_active_id'] - 1]
+    attributes['piE'] = PI_E[attributes['environment_active_id'] - 1]
 
     if attributes['piE'] <= 0.0:
         _msg = _msg + 'RTK WARNING: piE is 0.0 when calculating ' \
@@ -585,7 +656,7 @@ def calculate_217f_part_stress(**attributes):
              attributes['C2'] * attributes['piE'] + attributes['lambda_cyc']) *
             attributes['piQ'] * attributes['piL'])
     elif attributes['subcategory_id'] == 9:
-        attributes['piA'] = _dic_piA[attributes['type_id']][
+        attributes['piA'] = PI_A[attributes['type_id']][
             attributes['application_id'] - 1]
         attributes['hazard_rate_active'] = (
             (attributes['C1'] * attributes['piT'] * attributes['piA'] +
@@ -611,7 +682,7 @@ def calculate_217f_part_stress(**attributes):
 
         # Determine the package type correction factor (piPT).
         try:
-            attributes['piPT'] = _dic_piPT[attributes['package_id']]
+            attributes['piPT'] = PI_PT[attributes['package_id']]
         except KeyError:
             attributes['piPT'] = 1.0
 
@@ -632,6 +703,175 @@ def calculate_217f_part_stress(**attributes):
     return attributes, _msg
 
 
+def calculate_217f_part_stress_array(parts):
+    """
+    Calculate the part stress hazard rates for a set of integrated circuits.
+
+    This function calculates the MIL-HDBK-217F hazard rate using the part
+    stress method for every integrated circuit in parts at once.  The results
+    are the same as calling calculate_217f_part_stress() for each part.  The
+    parts are passed as columns, one array per attribute.  Attributes only
+    used by some subcategories default to 0 when the column is missing.
+
+    Factors that do not apply to a part's subcategory are 0.0, as is the
+    hazard rate of a part whose subcategory has no part stress model.
+
+    :param dict parts: the {attribute name:array of values} of the integrated
+                       circuits.
+    :return: _results; the {attribute name:array of values} of the hazard
+             rate, junction temperature, and factors for the parts.
+    :rtype: dict
+    """
+    _n_parts = len(parts['subcategory_id'])
+
+    def _column(key):
+        """Return the column of an attribute or zeros if it is missing."""
+        return np.asarray(parts.get(key, np.zeros(_n_parts)))
+
+    _subcategory = _column('subcategory_id').astype(int)
+    _technology_id = _column('technology_id').astype(int)
+    _application = _column('application_id').astype(int)
+    _type = _column('type_id').astype(int)
+    _package_id = _column('package_id').astype(int)
+    _n_elements = _column('n_elements').astype(float)
+    _n_active_pins = _column('n_active_pins').astype(float)
+
+    _results = dict((_key, np.zeros(_n_parts)) for _key in [
+        'C1', 'C2', 'piA', 'lambda_cyc', 'lambdaBD', 'piMFG', 'piCD', 'piPT',
+        'lambdaBP', 'lambdaEOS', 'hazard_rate_active'
+    ])
+
+    # Categorize the technology.
+    _technology = np.where(_subcategory == 2,
+                           np.where(_technology_id == 11, 2, 1),
+                           _technology_id)
+
+    # Retrieve the value of C1.  Subcategory 3 and 9 parts with a technology
+    # or application with no breakpoints have a C1 of 0.0.
+    _valid = ((_subcategory >= 1) & (_subcategory <= 9)
+              & ((_subcategory != 3) | np.in1d(_technology, [1, 2]))
+              & ((_subcategory != 9) | np.in1d(_application, [1, 2])))
+    _sub = _subcategory[_valid]
+    _index = np.minimum(
+        np.sum(_BREAKPOINTS_ARRAY[_sub] < _n_elements[_valid, None], axis=1),
+        _N_BREAKS_ARRAY[_sub] - 1)
+    _results['C1'][_valid] = _C1_ARRAY[_sub, _technology[_valid] - 1,
+                                       _index + 1]
+
+    # Categorize the package type and calculate the value of C2.
+    _package = np.full(_n_parts, 5)
+    _package[np.in1d(_package_id, [1, 2, 3])] = 1
+    _package[_package_id == 4] = 2
+    _package[_package_id == 5] = 3
+    _package[_package_id == 6] = 4
+    _results['C2'] = (_C2_ARRAY[_package, 0] *
+                      _n_active_pins**_C2_ARRAY[_package, 1])
+
+    # Calculate the temperature factor.
+    _ref_temp = np.where(_subcategory == 9, 423.0, 296.0)
+    _ea_part = np.where((_subcategory >= 0) & (_subcategory <= 9),
+                        _EA_ARRAY[np.clip(_subcategory, 0, 9)], 0.0)
+    _is_sub = _subcategory == 2
+    _ea_part[_is_sub] = _do_index(
+        EA[2], _column('family_id')[_is_sub].astype(int) - 1)
+    _is_sub = _subcategory == 9
+    _ea_part[_is_sub] = _do_index(EA[9], _type[_is_sub] - 1)
+    _temperature_junction = (
+        _column('temperature_case') +
+        _column('power_operating') * _column('theta_jc'))
+    _results['temperature_junction'] = _temperature_junction
+    _results['piT'] = 0.1 * np.exp((-_ea_part / 8.617E-5) * (
+        (1.0 / (_temperature_junction + 273)) - (1.0 / _ref_temp)))
+
+    # Calculate the learning, quality, and environmental factors.
+    _results['piL'] = 0.01 * np.exp(
+        5.35 - 0.35 * _column('years_in_production'))
+    _results['piQ'] = _do_index(PI_Q,
+                                _column('quality_id').astype(int) - 1)
+    _results['piE'] = _do_index(PI_E,
+                                _column('environment_active_id').astype(int) -
+                                1)
+
+    _C1 = _results['C1']
+    _C2 = _results['C2']
+    _piT = _results['piT']
+    _piL = _results['piL']
+    _piQ = _results['piQ']
+    _piE = _results['piE']
+    _hazard_rate = _results['hazard_rate_active']
+
+    # Determine the active hazard rate.
+    _is_sub = np.in1d(_subcategory, [1, 2, 3, 4, 5, 6, 7, 8])
+    _hazard_rate[_is_sub] = (_C1[_is_sub] * _piT[_is_sub] +
+                             _C2[_is_sub] * _piE[_is_sub])
+
+    # Calculate the write cycle hazard rate for EEPROMs.
+    _is_sub = _subcategory == 6
+    if np.any(_is_sub):
+        _n_cycles = _column('n_cycles')[_is_sub].astype(float)
+        _construction = _column('construction_id')[_is_sub].astype(int)
+        _n_elem = _n_elements[_is_sub]
+        _inv_tj = 1.0 / (_temperature_junction[_is_sub] + 273.0)
+        _A1 = 6.817E-6 * _n_cycles
+        _A2 = np.where(_construction == 2,
+                       np.where((_n_cycles > 300000) & (_n_cycles <= 400000),
+                                1.1, 2.3), 0.0)
+        _B1 = np.where(
+            _construction == 1, (_n_elem / 16000.0)**0.5 * np.exp(
+                (-0.15 / 8.63E-5) * (_inv_tj - (1.0 / 333.0))),
+            np.where(_construction == 2, (_n_elem / 64000.0)**0.25 * np.exp(
+                (0.1 / 8.63E-5) * (_inv_tj - (1.0 / 303.0))), 0.0))
+        _B2 = np.where(_construction == 2,
+                       (_n_elem / 64000.0)**0.25 * np.exp(
+                           (-0.12 / 8.63E-5) * (_inv_tj - (1.0 / 303.0))),
+                       0.0)
+        _piECC = np.select(
+            [_type[_is_sub] == 1, _type[_is_sub] == 2, _type[_is_sub] == 3],
+            [1.0, 0.72, 0.68], 0.0)
+        _results['lambda_cyc'][_is_sub] = (
+            (_A1 * _B1 + (_A2 * _B2 / _piQ[_is_sub])) * _piECC)
+        _hazard_rate[_is_sub] += _results['lambda_cyc'][_is_sub]
+
+    _is_sub = np.in1d(_subcategory, [1, 2, 3, 4, 5, 6, 7, 8])
+    _hazard_rate[_is_sub] *= _piQ[_is_sub] * _piL[_is_sub]
+
+    _is_sub = _subcategory == 9
+    for _type_id, _lst_piA in PI_A.items():
+        _is_type = _is_sub & (_type == _type_id)
+        _results['piA'][_is_type] = _do_index(_lst_piA,
+                                              _application[_is_type] - 1)
+    if np.any(_is_sub & ~np.in1d(_type, PI_A.keys())):
+        raise KeyError(_(u"No piA for integrated circuit type ID."))
+    _hazard_rate[_is_sub] = (
+        (_C1[_is_sub] * _piT[_is_sub] * _results['piA'][_is_sub] +
+         _C2[_is_sub] * _piE[_is_sub]) * _piQ[_is_sub] * _piL[_is_sub])
+
+    _is_sub = _subcategory == 10
+    if np.any(_is_sub):
+        _results['lambdaBD'][_is_sub] = np.where(_type[_is_sub] == 1, 0.16,
+                                                 0.24)
+        _results['piMFG'][_is_sub] = np.where(
+            _column('manufacturing_id')[_is_sub] == 1, 0.55, 2.0)
+        _results['piCD'][_is_sub] = (
+            (_column('area')[_is_sub] / 0.21) *
+            (2.0 / _column('feature_size')[_is_sub])**2.0 * 0.64) + 0.36
+        _results['piPT'][_is_sub] = _do_index(
+            _PI_PT_ARRAY,
+            np.where(_package_id[_is_sub] < 0, len(_PI_PT_ARRAY),
+                     _package_id[_is_sub]), 1.0)
+        _results['lambdaBP'][_is_sub] = 0.0022 + (
+            1.72E-5 * _n_active_pins[_is_sub])
+        _results['lambdaEOS'][_is_sub] = (-np.log(1.0 - 0.00057 * np.exp(
+            -0.0002 * _column('voltage_esd')[_is_sub]))) / 0.00876
+        _hazard_rate[_is_sub] = (
+            _results['lambdaBD'][_is_sub] * _results['piMFG'][_is_sub] *
+            _piT[_is_sub] * _results['piCD'][_is_sub] +
+            _results['lambdaBP'][_is_sub] * _piE[_is_sub] * _piQ[_is_sub] *
+            _results['piPT'][_is_sub] + _results['lambdaEOS'][_is_sub])
+
+    return _results
+
+
 def overstressed(**attributes):
     """
     Determine whether the integrated circuit is overstressed.
@@ -748,39 +988,16 @@ def _calculate_lambda_cyclic(**attributes):
 
 def _calculate_temperature_factor(**attributes):
     """Calculate the temperature factor."""
-    # Key is the subcategory ID, value is Ea or list containing Ea values.
-    _dic_ea = {
-        1:
-        0.65,
-        2: [
-            0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.4, 0.45, 0.45, 0.5, 0.5, 0.6,
-            0.6, 0.6
-        ],
-        3:
-        0.65,
-        4:
-        0.65,
-        5:
-        0.6,
-        6:
-        0.6,
-        7:
-        0.6,
-        8:
-        0.6,
-        9: [1.5, 1.4]
-    }
     if attributes['subcategory_id'] == 2:
         _ref_temp = 296.0
-        _ea = _dic_ea[attributes['subcategory_id']][attributes['family_id'] -
-                                                    1]
+        _ea = EA[attributes['subcategory_id']][attributes['family_id'] - 1]
     elif attributes['subcategory_id'] == 9:
         _ref_temp = 423.0
-        _ea = _dic_ea[attributes['subcategory_id']][attributes['type_id'] - 1]
+        _ea = EA[attributes['subcategory_id']][attributes['type_id'] - 1]
     else:
         _ref_temp = 296.0
         try:
-            _ea = _dic_ea[attributes['subcategory_id']]
+            _ea = EA[attributes['subcategory_id']]
         except KeyError:
             _ea = 0.0
     attributes['temperature_junction'] = (
@@ -791,3 +1008,22 @@ def _calculate_temperature_factor(**attributes):
         (1.0 / _ref_temp)))
 
     return attributes
+
+
+def _do_index(values, index, default=None):
+    """
+    Look up the values at an array of list indices.
+
+    Negative indices count from the end of the list as they do for a list.
+    Indices outside the list raise an IndexError unless a default is given.
+    """
+    _values = np.asarray(values, dtype=float)
+    index = np.asarray(index, dtype=int)
+    if default is None:
+        return _values[index]
+
+    _result = np.full(len(index), default, dtype=float)
+    _valid = (index >= -len(_values)) & (index < len(_values))
+    _result[_valid] = _values[index[_valid]]
+
+    return _result
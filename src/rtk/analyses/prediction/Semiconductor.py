@@ -11,8 +11,172 @@ import gettext
 
 from math import exp, log, sqrt
 
+import numpy as np
+
 _ = gettext.gettext
 
+# The MIL-HDBK-217F part stress tables used by calculate_217f_part_stress()
+# and calculate_217f_part_stress_array().
+#
+# Key is the subcategory ID.  Value is the base hazard rate or the list of
+# base hazard rates by type ID.
+LAMBDA_B = {
+    1: [0.0038, 0.0010, 0.069, 0.003, 0.005, 0.0013, 0.0034, 0.002],
+    2: [0.22, 0.18, 0.0023, 0.0081, 0.027, 0.0025, 0.0025],
+    3: 0.00074,
+    4: [0.012, 0.0045],
+    5: 0.0083,
+    6: 0.18,
+    9: [0.06, 0.023],
+    10: 0.0022,
+    11: [
+        0.0055, 0.004, 0.0025, 0.013, 0.013, 0.0064, 0.0033, 0.017, 0.017,
+        0.0086, 0.0013, 0.00023
+    ],
+    13: [3.23, 5.65]
+}
+# Key is the subcategory ID.  Value is the temperature factor Ea/k, the list
+# of them by type ID, or for subcategory 7 the (Ea/k, low voltage
+# multiplier, high voltage multiplier) keyed by type ID.
+TEMPERATURE_FACTORS = {
+    1: [3091.0, 3091.0, 3091.0, 3091.0, 3091.0, 3091.0, 1925.0, 1925.0],
+    2: [5260.0, 2100.0, 2100.0, 2100.0, 2100.0, 2100.0],
+    3: 2114.0,
+    4: 1925.0,
+    5: 2483.0,
+    6: 2114.0,
+    7: {
+        1: [2903.0, 0.1, 2.0],
+        2: [5794.0, 0.38, 7.55]
+    },
+    8: 4485.0,
+    9: 1925.0,
+    10: 3082.0,
+    11: 2790.0,
+    12: 2790.0,
+    13: 4635.0
+}
+# Key is the subcategory ID.  Value is the list of piQ by quality ID or for
+# subcategory 2 the lists keyed by type ID.
+PI_Q = {
+    1: [0.7, 1.0, 2.4, 5.5, 8.0],
+    2: {
+        1: [0.5, 1.0, 5.0, 25.0, 50.0],
+        2: [0.5, 1.0, 5.0, 25.0, 50.0],
+        3: [0.5, 1.0, 5.0, 25.0, 50.0],
+        4: [0.5, 1.0, 5.0, 25.0, 50.0],
+        5: [0.5, 1.0, 1.8, 2.5],
+        6: [0.5, 1.0, 5.0, 25.0, 50.0]
+    },
+    3: [0.7, 1.0, 2.4, 5.5, 8.0],
+    4: [0.7, 1.0, 2.4, 5.5, 8.0],
+    5: [0.7, 1.0, 2.4, 5.5, 8.0],
+    6: [0.5, 1.0, 2.0, 5.0],
+    7: [0.5, 1.0, 2.0, 5.0],
+    8: [0.5, 1.0, 2.0, 5.0],
+    9: [0.5, 1.0, 2.0, 5.0],
+    10: [0.7, 1.0, 2.4, 5.5, 8.0],
+    11: [0.7, 1.0, 2.4, 5.5, 8.0],
+    12: [0.7, 1.0, 2.4, 5.5, 8.0],
+    13: [1.0, 1.0, 3.3]
+}
+# Key is the subcategory ID.  Value is the list of piE by active environment
+# ID.
+PI_E = {
+    1: [
+        1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
+        32.0, 320.0
+    ],
+    2: [
+        1.0, 2.0, 5.0, 4.0, 11.0, 4.0, 5.0, 7.0, 12.0, 16.0, 0.5, 9.0, 24.0,
+        250.0
+    ],
+    3: [
+        1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
+        32.0, 320.0
+    ],
+    4: [
+        1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
+        32.0, 320.0
+    ],
+    5: [
+        1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
+        32.0, 320.0
+    ],
+    6: [
+        1.0, 2.0, 5.0, 4.0, 11.0, 4.0, 5.0, 7.0, 12.0, 16.0, 0.5, 9.0, 24.0,
+        250.0
+    ],
+    7: [
+        1.0, 2.0, 5.0, 4.0, 11.0, 4.0, 5.0, 7.0, 12.0, 16.0, 0.5, 9.0, 24.0,
+        250.0
+    ],
+    8: [
+        1.0, 2.0, 5.0, 4.0, 11.0, 4.0, 5.0, 7.0, 12.0, 16.0, 0.5, 7.5, 24.0,
+        250.0
+    ],
+    9: [
+        1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
+        32.0, 320.0
+    ],
+    10: [
+        1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
+        32.0, 320.0
+    ],
+    11: [
+        1.0, 2.0, 8.0, 5.0, 12.0, 4.0, 6.0, 6.0, 8.0, 17.0, 0.5, 9.0, 24.0,
+        450.0
+    ],
+    12: [
+        1.0, 2.0, 8.0, 5.0, 12.0, 4.0, 6.0, 6.0, 8.0, 17.0, 0.5, 9.0, 24.0,
+        450.0
+    ],
+    13: [
+        1.0, 2.0, 8.0, 5.0, 12.0, 4.0, 6.0, 6.0, 8.0, 17.0, 0.5, 9.0, 24.0,
+        450.0
+    ]
+}
+# Key is the subcategory ID.  Value is the list of piA by application ID.
+PI_A = {
+    2: [0.5, 2.5, 1.0],
+    3: [1.5, 0.7],
+    4: [1.5, 0.7, 2.0, 4.0, 8.0, 10.0],
+    8: [1.0, 4.0]
+}
+PI_C = [1.0, 2.0]
+PI_M = [1.0, 2.0, 4.0]
+# The default case temperature by active environment ID.
+TEMPERATURE_CASE = [
+    35.0, 45.0, 50.0, 45.0, 50.0, 60.0, 60.0, 75.0, 75.0, 60.0, 35.0, 50.0,
+    60.0, 45.0
+]
+# The default junction to case thermal resistance by package ID.
+THETA_JC = [
+    70.0, 10.0, 70.0, 70.0, 70.0, 70.0, 70.0, 5.0, 70.0, 70.0, 10.0, 70.0,
+    70.0, 70.0, 5.0, 5.0, 5.0, 5.0, 5.0, 5.0, 10.0, 70.0, 70.0, 5.0, 22.0,
+    70.0, 5.0, 70.0, 5.0, 5.0, 1.0, 10.0, 70.0, 70.0, 5.0, 5.0, 5.0, 10.0,
+    5.0, 5.0, 10.0, 5.0, 10.0, 10.0, 10.0, 5.0, 70.0, 5.0, 70.0, 70.0, 70.0,
+    70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0,
+    70.0, 70.0
+]
+# Key is the subcategory ID.  Value is the list of factors that, with
+# lambda_b, piQ, and piE, make up the active hazard rate.
+HAZARD_RATE_FACTORS = {
+    1: ['piT', 'piS', 'piC'],
+    2: ['piT', 'piA', 'piR'],
+    3: ['piT', 'piA', 'piR', 'piS'],
+    4: ['piT', 'piA'],
+    5: ['piT'],
+    6: ['piT', 'piR', 'piS'],
+    7: ['piT', 'piA', 'piM'],
+    8: ['piT', 'piA', 'piM'],
+    9: ['piT'],
+    10: ['piT', 'piR', 'piS'],
+    11: ['piT'],
+    12: ['piT'],
+    13: ['piT', 'piI', 'piA', 'piP']
+}
+
 
 def calculate_217f_part_count(**attributes):
     """
@@ -258,146 +422,12 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
              dictionary with updated values and the error message, if any.
     :rtype: (dict, str)
     """
-    _dic_lambdab = {
-        1: [0.0038, 0.0010, 0.069, 0.003, 0.005, 0.0013, 0.0034, 0.002],
-        2: [0.22, 0.18, 0.0023, 0.0081, 0.027, 0.0025, 0.0025],
-        3:
-        0.00074,
-        4: [0.012, 0.0045],
-        5:
-        0.0083,
-        6:
-        0.18,
-        9: [0.06, 0.023],
-        10:
-        0.0022,
-        11: [
-            0.0055, 0.004, 0.0025, 0.013, 0.013, 0.0064, 0.0033, 0.017, 0.017,
-            0.0086, 0.0013, 0.00023
-        ],
-        13: [3.23, 5.65]
-    }
-    _dic_factors = {
-        1: [3091.0, 3091.0, 3091.0, 3091.0, 3091.0, 3091.0, 1925.0, 1925.0],
-        2: [5260.0, 2100.0, 2100.0, 2100.0, 2100.0, 2100.0],
-        3: 2114.0,
-        4: 1925.0,
-        5: 2483.0,
-        6: 2114.0,
-        7: {
-            1: [2903.0, 0.1, 2.0],
-            2: [5794.0, 0.38, 7.55]
-        },
-        8: 4485.0,
-        9: 1925.0,
-        10: 3082.0,
-        11: 2790.0,
-        12: 2790.0,
-        13: 4635.0
-    }
-    _dic_piQ = {
-        1: [0.7, 1.0, 2.4, 5.5, 8.0],
-        2: {
-            1: [0.5, 1.0, 5.0, 25.0, 50.0],
-            2: [0.5, 1.0, 5.0, 25.0, 50.0],
-            3: [0.5, 1.0, 5.0, 25.0, 50.0],
-            4: [0.5, 1.0, 5.0, 25.0, 50.0],
-            5: [0.5, 1.0, 1.8, 2.5],
-            6: [0.5, 1.0, 5.0, 25.0, 50.0]
-        },
-        3: [0.7, 1.0, 2.4, 5.5, 8.0],
-        4: [0.7, 1.0, 2.4, 5.5, 8.0],
-        5: [0.7, 1.0, 2.4, 5.5, 8.0],
-        6: [0.5, 1.0, 2.0, 5.0],
-        7: [0.5, 1.0, 2.0, 5.0],
-        8: [0.5, 1.0, 2.0, 5.0],
-        9: [0.5, 1.0, 2.0, 5.0],
-        10: [0.7, 1.0, 2.4, 5.5, 8.0],
-        11: [0.7, 1.0, 2.4, 5.5, 8.0],
-        12: [0.7, 1.0, 2.4, 5.5, 8.0],
-        13: [1.0, 1.0, 3.3]
-    }
-    _dic_piE = {
-        1: [
-            1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
-            32.0, 320.0
-        ],
-        2: [
-            1.0, 2.0, 5.0, 4.0, 11.0, 4.0, 5.0, 7.0, 12.0, 16.0, 0.5, 9.0,
-            24.0, 250.0
-        ],
-        3: [
-            1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
-            32.0, 320.0
-        ],
-        4: [
-            1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
-            32.0, 320.0
-        ],
-        5: [
-            1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
-            32.0, 320.0
-        ],
-        6: [
-            1.0, 2.0, 5.0, 4.0, 11.0, 4.0, 5.0, 7.0, 12.0, 16.0, 0.5, 9.0,
-            24.0, 250.0
-        ],
-        7: [
-            1.0, 2.0, 5.0, 4.0, 11.0, 4.0, 5.0, 7.0, 12.0, 16.0, 0.5, 9.0,
-            24.0, 250.0
-        ],
-        8: [
-            1.0, 2.0, 5.0, 4.0, 11.0, 4.0, 5.0, 7.0, 12.0, 16.0, 0.5, 7.5,
-            24.0, 250.0
-        ],
-        9: [
-            1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
-            32.0, 320.0
-        ],
-        10: [
-            1.0, 6.0, 9.0, 9.0, 19.0, 13.0, 29.0, 20.0, 43.0, 24.0, 0.5, 14.0,
-            32.0, 320.0
-        ],
-        11: [
-            1.0, 2.0, 8.0, 5.0, 12.0, 4.0, 6.0, 6.0, 8.0, 17.0, 0.5, 9.0, 24.0,
-            450.0
-        ],
-        12: [
-            1.0, 2.0, 8.0, 5.0, 12.0, 4.0, 6.0, 6.0, 8.0, 17.0, 0.5, 9.0, 24.0,
-            450.0
-        ],
-        13: [
-            1.0, 2.0, 8.0, 5.0, 12.0, 4.0, 6.0, 6.0, 8.0, 17.0, 0.5, 9.0, 24.0,
-            450.0
-        ]
-    }
-    _dic_piA = {
-        2: [0.5, 2.5, 1.0],
-        3: [1.5, 0.7],
-        4: [1.5, 0.7, 2.0, 4.0, 8.0, 10.0],
-        8: [1.0, 4.0]
-    }
-    _lst_piC = [1.0, 2.0]
-    _lst_piM = [1.0, 2.0, 4.0]
-    _lst_temp_case = [
-        35.0, 45.0, 50.0, 45.0, 50.0, 60.0, 60.0, 75.0, 75.0, 60.0, 35.0, 50.0,
-        60.0, 45.0
-    ]
-    _lst_theta_jc = [
-        70.0, 10.0, 70.0, 70.0, 70.0, 70.0, 70.0, 5.0, 70.0, 70.0, 10.0, 70.0,
-        70.0, 70.0, 5.0, 5.0, 5.0, 5.0, 5.0, 5.0, 10.0, 70.0, 70.0, 5.0, 22.0,
-        70.0, 5.0, 70.0, 5.0, 5.0, 1.0, 10.0, 70.0, 70.0, 5.0, 5.0, 5.0, 10.0,
-        5.0, 5.0, 10.0, 5.0, 10.0, 10.0, 10.0, 5.0, 70.0, 5.0, 70.0, 70.0,
-        70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0, 70.0,
-        70.0, 70.0, 70.0
-    ]
-
     _msg = ''
 
     # Retrieve the base hazard rate.
     try:
         if attributes['subcategory_id'] in [3, 5, 6, 10]:
-            attributes['lambda_b'] = _dic_lambdab[attributes['subcategory_id']]
+            attributes['lambda_b'] = LAMBDA_B[attributes['subcategory_id']]
         elif attributes['subcategory_id'] == 7:
             attributes['lambda_b'] = 0.032 * exp(
                 0.354 * attributes['frequency_operating'] +
@@ -418,7 +448,7 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
             else:
                 attributes['lambda_b'] = 0.00043 * attributes['n_elements']
         else:
-            attributes['lambda_b'] = _dic_lambdab[attributes[
+            attributes['lambda_b'] = LAMBDA_B[attributes[
                 'subcategory_id']][attributes['type_id'] - 1]
     except KeyError:
         attributes['lambda_b'] = 0.0
@@ -430,10 +460,10 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
 
     # Calculate junction temperature.
     if attributes['temperature_case'] <= 0.0:
-        attributes['temperature_case'] = _lst_temp_case[
+        attributes['temperature_case'] = TEMPERATURE_CASE[
             attributes['environment_active_id'] - 1]
     if attributes['theta_jc'] <= 0.0:
-        attributes['theta_jc'] = _lst_theta_jc[attributes['package_id'] - 1]
+        attributes['theta_jc'] = THETA_JC[attributes['package_id'] - 1]
     attributes['temperature_junction'] = (
         attributes['temperature_case'] +
         attributes['theta_jc'] * attributes['power_operating'])
@@ -441,13 +471,13 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
     # Calculate the temperature factor (piT).
     try:
         if attributes['subcategory_id'] in [1, 2]:
-            _factors = _dic_factors[attributes['subcategory_id']][
+            _factors = TEMPERATURE_FACTORS[attributes['subcategory_id']][
                 attributes['type_id'] - 1]
         elif attributes['subcategory_id'] == 7:
-            _factors = _dic_factors[attributes['subcategory_id']][attributes[
-                'type_id']]
+            _factors = TEMPERATURE_FACTORS[attributes['subcategory_id']][
+                attributes['type_id']]
         else:
-            _factors = _dic_factors[attributes['subcategory_id']]
+            _factors = TEMPERATURE_FACTORS[attributes['subcategory_id']]
 
         if attributes['subcategory_id'] == 7:
             _f0 = _factors[0]
@@ -473,7 +503,7 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
     # Retrieve the application factor (piA).
     if attributes['subcategory_id'] in [2, 3, 4, 8]:
         try:
-            attributes['piA'] = _dic_piA[attributes['subcategory_id']][
+            attributes['piA'] = PI_A[attributes['subcategory_id']][
                 attributes['application_id'] - 1]
         except KeyError:
             attributes['piA'] = 0.0
@@ -490,7 +520,7 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
 
     # Retrieve the matching network factor (piM).
     if attributes['subcategory_id'] in [7, 8]:
-        attributes['piM'] = _lst_piM[attributes['matching_id'] - 1]
+        attributes['piM'] = PI_M[attributes['matching_id'] - 1]
 
     # Calculate the power rating factor (piR).
     if attributes['subcategory_id'] == 2:
@@ -535,7 +565,7 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
 
     # Retrieve the construction factor (piC).
     if attributes['subcategory_id'] == 1:
-        attributes['piC'] = _lst_piC[attributes['construction_id'] - 1]
+        attributes['piC'] = PI_C[attributes['construction_id'] - 1]
 
     # Calculate forward current factor (piI).
     if attributes['subcategory_id'] == 13:
@@ -548,10 +578,10 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
     # Retrieve the quality factor (piQ).
     try:
         if attributes['subcategory_id'] == 2:
-            attributes['piQ'] = _dic_piQ[attributes['subcategory_id']][
+            attributes['piQ'] = PI_Q[attributes['subcategory_id']][
                 attributes['type_id']][attributes['quality_id'] - 1]
         else:
-            attributes['piQ'] = _dic_piQ[attributes['subcategory_id']][
+            attributes['piQ'] = PI_Q[attributes['subcategory_id']][
                 attributes['quality_id'] - 1]
     except (KeyError, IndexError):
         attributes['piQ'] = 0.0
@@ -564,7 +594,7 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
 
     # Retrieve the environmental factor (piE).
     try:
-        attributes['piE'] = _dic_piE[attributes['subcategory_id']][
+        attributes['piE'] = PI_E[attributes['subcategory_id']][
             attributes['environment_active_id'] - 1]
     except (KeyError, IndexError):
         attributes['piE'] = 0.0
@@ -576,34 +606,60 @@ def calculate_217f_part_stress(**attributes):  # pylint: disable=R0912
                            attributes['environment_active_id'])
 
     # Calculate the active hazard rate.
-    if attributes['subcategory_id'] == 1:
-        attributes[
-            'hazard_rate_active'] = attributes['lambda_b'] * attributes['piT'] * attributes['piS'] * attributes['piC'] * attributes['piQ'] * attributes['piE']
-    elif attributes['subcategory_id'] == 2:
-        attributes[
-            'hazard_rate_active'] = attributes['lambda_b'] * attributes['piT'] * attributes['piA'] * attributes['piR'] * attributes['piQ'] * attributes['piE']
-    elif attributes['subcategory_id'] == 3:
-        attributes[
-            'hazard_rate_active'] = attributes['lambda_b'] * attributes['piT'] * attributes['piA'] * attributes['piR'] * attributes['piS'] * attributes['piQ'] * attributes['piE']
-    elif attributes['subcategory_id'] == 4:
-        attributes[
-            'hazard_rate_active'] = attributes['lambda_b'] * attributes['piT'] * attributes['piA'] * attributes['piQ'] * attributes['piE']
-    elif attributes['subcategory_id'] in [5, 9, 11, 12]:
-        attributes[
-            'hazard_rate_active'] = attributes['lambda_b'] * attributes['piT'] * attributes['piQ'] * attributes['piE']
-    elif attributes['subcategory_id'] in [6, 10]:
-        attributes[
-            'hazard_rate_active'] = attributes['lambda_b'] * attributes['piT'] * attributes['piR'] * attributes['piS'] * attributes['piQ'] * attributes['piE']
-    elif attributes['subcategory_id'] in [7, 8]:
-        attributes[
-            'hazard_rate_active'] = attributes['lambda_b'] * attributes['piT'] * attributes['piA'] * attributes['piM'] * attributes['piQ'] * attributes['piE']
-    elif attributes['subcategory_id'] == 13:
-        attributes[
-            'hazard_rate_active'] = attributes['lambda_b'] * attributes['piT'] * attributes['piI'] * attributes['piA'] * attributes['piP'] * attributes['piQ'] * attributes['piE']
+    if attributes['subcategory_id'] in HAZARD_RATE_FACTORS:
+        _hazard_rate = attributes['lambda_b']
+        _lst_factors = HAZARD_RATE_FACTORS[attributes['subcategory_id']]
+        for _factor in _lst_factors + ['piQ', 'piE']:
+            _hazard_rate = _hazard_rate * attributes[_factor]
+        attributes['hazard_rate_active'] = _hazard_rate
 
     return attributes, _msg
 
 
+def calculate_217f_part_stress_array(parts):
+    """
+    Calculate the part stress hazard rates for a set of semiconductors.
+
+    This function calculates the MIL-HDBK-217F hazard rate using the part
+    stress method for every semiconductor in parts at once.  The results are
+    the same as calling calculate_217f_part_stress() for each part.  The parts
+    are passed as columns, one array per attribute.  Attributes only used by
+    some subcategories default to 0 when the column is missing.
+
+    Factors that do not apply to a part's subcategory are 0.0, as is the
+    hazard rate of a part whose subcategory has no part stress model.
+
+    :param dict parts: the {attribute name:array of values} of the
+                       semiconductors.
+    :return: _results; the {attribute name:array of values} of the hazard
+             rate, junction temperature, and factors for the parts.
+    :rtype: dict
+    """
+    _n_parts = len(parts['subcategory_id'])
+
+    _results = dict((_key, np.zeros(_n_parts)) for _key in [
+        'lambda_b', 'piT', 'piA', 'piM', 'piR', 'piS', 'piC', 'piI', 'piP',
+        'piQ', 'piE', 'hazard_rate_active'
+    ])
+
+    _calculate_base_hazard_rate_array(parts, _results)
+    _calculate_temperature_factor_array(parts, _results)
+    _calculate_application_factor_array(parts, _results)
+    _calculate_stress_factors_array(parts, _results)
+    _calculate_quality_environment_factors_array(parts, _results)
+
+    # Calculate the active hazard rate.
+    _subcategory = _do_column(parts, 'subcategory_id').astype(int)
+    for _sub, _lst_factors in HAZARD_RATE_FACTORS.items():
+        _is_sub = _subcategory == _sub
+        _hazard_rate = _results['lambda_b'][_is_sub]
+        for _factor in _lst_factors + ['piQ', 'piE']:
+            _hazard_rate = _hazard_rate * _results[_factor][_is_sub]
+        _results['hazard_rate_active'][_is_sub] = _hazard_rate
+
+    return _results
+
+
 def overstressed(**attributes):
     """
     Determine whether the semiconductor is overstressed.
@@ -649,3 +705,194 @@ def overstressed(**attributes):
     attributes['reason'] = _reason
 
     return attributes
+
+
+def _do_column(parts, key):
+    """Return the column of an attribute or zeros if it is missing."""
+    return np.asarray(parts.get(key, np.zeros(len(parts['subcategory_id']))))
+
+
+def _calculate_base_hazard_rate_array(parts, results):
+    """Calculate the base hazard rate (lambda_b) of each semiconductor."""
+    _subcategory = _do_column(parts, 'subcategory_id').astype(int)
+    _type = _do_column(parts, 'type_id').astype(int)
+    _application = _do_column(parts, 'application_id').astype(int)
+    _frequency = _do_column(parts, 'frequency_operating').astype(float)
+    _power = _do_column(parts, 'power_operating').astype(float)
+
+    for _sub, _lambda_b in LAMBDA_B.items():
+        _is_sub = _subcategory == _sub
+        if isinstance(_lambda_b, list):
+            results['lambda_b'][_is_sub] = _do_index(_lambda_b,
+                                                     _type[_is_sub] - 1)
+        else:
+            results['lambda_b'][_is_sub] = _lambda_b
+    _is_sub = _subcategory == 7
+    results['lambda_b'][_is_sub] = 0.032 * np.exp(
+        0.354 * _frequency[_is_sub] + 0.00558 * _power[_is_sub])
+    _is_sub = _subcategory == 8
+    results['lambda_b'][_is_sub] = np.where(
+        (_frequency[_is_sub] >= 1.0) & (_frequency[_is_sub] <= 10.0) &
+        (_power[_is_sub] < 0.1), 0.052, 0.0093 * np.exp(
+            0.429 * _frequency[_is_sub] + 0.486 * _power[_is_sub]))
+    _is_sub = _subcategory == 12
+    results['lambda_b'][_is_sub] = (
+        0.00043 * _do_column(parts, 'n_elements')[_is_sub] +
+        np.where(np.in1d(_application[_is_sub], [1, 3]), 0.000043, 0.0))
+
+
+def _calculate_temperature_factor_array(parts, results):
+    """Calculate the junction temperature and temperature factor (piT)."""
+    _subcategory = _do_column(parts, 'subcategory_id').astype(int)
+    _type = _do_column(parts, 'type_id').astype(int)
+    _environment = _do_column(parts, 'environment_active_id').astype(int)
+    _power = _do_column(parts, 'power_operating').astype(float)
+    _voltage_ratio = _do_column(parts, 'voltage_ratio').astype(float)
+
+    _temperature_case = _do_column(parts, 'temperature_case').astype(float)
+    _is_default = _temperature_case <= 0.0
+    _temperature_case[_is_default] = _do_index(
+        TEMPERATURE_CASE, _environment[_is_default] - 1)
+    _theta_jc = _do_column(parts, 'theta_jc').astype(float)
+    _is_default = _theta_jc <= 0.0
+    _theta_jc[_is_default] = _do_index(
+        THETA_JC,
+        _do_column(parts, 'package_id')[_is_default].astype(int) - 1)
+    _temperature_junction = _temperature_case + _theta_jc * _power
+    results['temperature_case'] = _temperature_case
+    results['theta_jc'] = _theta_jc
+    results['temperature_junction'] = _temperature_junction
+
+    _inv_tj = 1.0 / (_temperature_junction + 273.0) - 1.0 / 298.0
+    for _sub, _factors in TEMPERATURE_FACTORS.items():
+        _is_sub = _subcategory == _sub
+        if _sub == 7:
+            _f0 = np.zeros(np.sum(_is_sub))
+            _f1 = np.zeros(np.sum(_is_sub))
+            _f2 = np.zeros(np.sum(_is_sub))
+            for _type_id, (_e0, _e1, _e2) in _factors.items():
+                _is_type = _type[_is_sub] == _type_id
+                _f0[_is_type] = _e0
+                _f1[_is_type] = _e1
+                _f2[_is_type] = _e2
+            results['piT'][_is_sub] = np.where(
+                _voltage_ratio[_is_sub] <= 0.4,
+                _f1 * np.exp(-_f0 * _inv_tj[_is_sub]),
+                _f2 * (_voltage_ratio[_is_sub] - 0.35) *
+                np.exp(-_f0 * _inv_tj[_is_sub]))
+        else:
+            if isinstance(_factors, list):
+                _factors = _do_index(_factors, _type[_is_sub] - 1, 0.0)
+            results['piT'][_is_sub] = np.where(
+                _factors == 0.0, 0.0, np.exp(-_factors * _inv_tj[_is_sub]))
+
+
+def _calculate_application_factor_array(parts, results):
+    """Calculate the application (piA) and matching network (piM) factors."""
+    _subcategory = _do_column(parts, 'subcategory_id').astype(int)
+    _application = _do_column(parts, 'application_id').astype(int)
+    _duty_cycle = _do_column(parts, 'duty_cycle').astype(float)
+
+    for _sub, _lst_piA in PI_A.items():
+        _is_sub = _subcategory == _sub
+        results['piA'][_is_sub] = _do_index(_lst_piA,
+                                            _application[_is_sub] - 1)
+    _is_sub = _subcategory == 7
+    results['piA'][_is_sub] = np.where(
+        _application[_is_sub] == 1, 7.6,
+        0.06 * (_duty_cycle[_is_sub] / 100.0) + 0.4)
+    _is_sub = _subcategory == 13
+    results['piA'][_is_sub] = np.where(_application[_is_sub] == 1, 4.4,
+                                       np.sqrt(_duty_cycle[_is_sub] / 100.0))
+
+    _is_sub = np.in1d(_subcategory, [7, 8])
+    results['piM'][_is_sub] = _do_index(
+        PI_M, _do_column(parts, 'matching_id')[_is_sub].astype(int) - 1)
+
+
+def _calculate_stress_factors_array(parts, results):
+    """
+    Calculate the electrical stress and construction related factors.
+
+    These are the power rating (piR), electrical stress (piS), construction
+    (piC), forward current (piI), and power degradation (piP) factors.
+    """
+    _subcategory = _do_column(parts, 'subcategory_id').astype(int)
+    _type = _do_column(parts, 'type_id').astype(int)
+    _power_rated = _do_column(parts, 'power_rated').astype(float)
+    _voltage_ratio = _do_column(parts, 'voltage_ratio').astype(float)
+
+    _is_sub = _subcategory == 2
+    _is_type = _is_sub & (_type == 4)
+    results['piR'][_is_sub] = 1.0
+    results['piR'][_is_type & (_power_rated <= 0.0)] = 0.0
+    _is_type = _is_type & (_power_rated > 0.0)
+    results['piR'][_is_type] = 0.326 * np.log(_power_rated[_is_type]) - 0.25
+    _is_sub = np.in1d(_subcategory, [3, 6])
+    results['piR'][_is_sub] = np.where(_power_rated[_is_sub] < 0.1, 0.43,
+                                       np.abs(_power_rated[_is_sub])**0.37)
+    _is_sub = _subcategory == 10
+    results['piR'][_is_sub] = _do_column(parts, 'current_rated')[_is_sub]**0.4
+
+    _is_sub = _subcategory == 1
+    results['piS'][_is_sub] = np.where(
+        _type[_is_sub] > 5, 1.0,
+        np.where(_voltage_ratio[_is_sub] <= 0.3, 0.054,
+                 np.abs(_voltage_ratio[_is_sub])**2.43))
+    _is_sub = np.in1d(_subcategory, [3, 6])
+    results['piS'][_is_sub] = 0.045 * np.exp(3.1 * _voltage_ratio[_is_sub])
+    _is_sub = _subcategory == 10
+    results['piS'][_is_sub] = np.where(_voltage_ratio[_is_sub] <= 0.3, 0.1,
+                                       np.abs(_voltage_ratio[_is_sub])**1.9)
+
+    _is_sub = _subcategory == 1
+    results['piC'][_is_sub] = _do_index(
+        PI_C, _do_column(parts, 'construction_id')[_is_sub].astype(int) - 1)
+
+    _is_sub = _subcategory == 13
+    results['piI'][_is_sub] = _do_column(parts,
+                                         'current_operating')[_is_sub]**0.68
+    results['piP'][_is_sub] = 1.0 / (
+        2.0 * (1.0 - _do_column(parts, 'power_ratio')[_is_sub]))
+
+
+def _calculate_quality_environment_factors_array(parts, results):
+    """Retrieve the quality (piQ) and environmental (piE) factors."""
+    _subcategory = _do_column(parts, 'subcategory_id').astype(int)
+    _type = _do_column(parts, 'type_id').astype(int)
+    _quality = _do_column(parts, 'quality_id').astype(int)
+    _environment = _do_column(parts, 'environment_active_id').astype(int)
+
+    for _sub, _lst_piQ in PI_Q.items():
+        _is_sub = _subcategory == _sub
+        if _sub == 2:
+            for _type_id, _lst_type_piQ in _lst_piQ.items():
+                _is_type = _is_sub & (_type == _type_id)
+                results['piQ'][_is_type] = _do_index(
+                    _lst_type_piQ, _quality[_is_type] - 1, 0.0)
+        else:
+            results['piQ'][_is_sub] = _do_index(_lst_piQ,
+                                                _quality[_is_sub] - 1, 0.0)
+    for _sub, _lst_piE in PI_E.items():
+        _is_sub = _subcategory == _sub
+        results['piE'][_is_sub] = _do_index(_lst_piE,
+                                            _environment[_is_sub] - 1, 0.0)
+
+
+def _do_index(values, index, default=None):
+    """
+    Look up the values at an array of list indices.
+
+    Negative indices count from the end of the list as they do for a list.
+    Indices outside the list raise an IndexError unless a default is given.
+    """
+    _values = np.asarray(values, dtype=float)
+    index = np.asarray(index, dtype=int)
+    if default is None:
+        return _values[index]
+
+    _result = np.full(len(index), default, dtype=float)
+    _valid = (index >= -len(_values)) & (index < len(_values))
+    _result[_valid] = _values[index[_valid]]
+
+    return _result
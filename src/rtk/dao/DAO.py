@@ -8,9 +8,10 @@
 
 import gettext
 
-from sqlalchemy import create_engine, exc, MetaData
+from sqlalchemy import create_engine, exc, inspect, MetaData
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import make_transient_to_detached, sessionmaker
+from sqlalchemy.sql.util import sort_tables
 
 # Import tables objects for the RTK Common database.
 from .RTKCommonDB import create_common_db
@@ -134,7 +135,7 @@ class DAO(object):
             return True
 
     @staticmethod
-    def db_add(item, session):
+    def db_add(item, session, bulk=False):
         """
         Add a new item to the RTK Program database.
 
@@ -142,14 +143,19 @@ class DAO(object):
         :param session: the SQLAlchemy scoped_session instance used to
                         communicate with the RTK Program database.
         :type session: :py:class:`sqlalchemy.orm.scoped_session`
+        :keyword bool bulk: indicates whether to add all the items in a single
+                            transaction rather than one transaction per item.
         :return: (_error_code, _Msg); the error code and associated error
                                       message.
         :rtype: (int, str)
         """
+        if bulk:
+            return DAO._db_add_bulk(item, session)
+
         _error_code = 0
         _msg = "RTK SUCCESS: Adding one or more items to the RTK Program " \
                "database."
-        # TODO: Determine if the add_many option can work with Foreign Keys.
+
         for _item in item:
             try:
                 session.add(_item)
@@ -163,6 +169,96 @@ class DAO(object):
 
         return _error_code, _msg
 
+    @staticmethod
+    def _db_add_bulk(items, session):
+        """
+        Add a list of new items to the RTK Program database in one transaction.
+
+        The items are inserted table by table with the parent tables before
+        the child tables that reference them.  Items with all their primary and
+        foreign key values set are inserted with one executemany statement per
+        table.  The remaining items are flushed through the session so their
+        autoincrement keys are fetched.  If the transaction fails, it is rolled
+        back and the items are added one at a time to find the ones that fail.
+
+        :param list items: the objects to add to the RTK Program database.
+        :param session: the SQLAlchemy scoped_session instance used to
+                        communicate with the RTK Program database.
+        :type session: :py:class:`sqlalchemy.orm.scoped_session`
+        :return: (_error_code, _Msg); the error code and associated error
+                                      message.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = "RTK SUCCESS: Adding one or more items to the RTK Program " \
+               "database."
+
+        _keyed = []
+        try:
+            _tables = {}
+            for _item in items:
+                _tables.setdefault(
+                    inspect(_item).mapper.local_table, []).append(_item)
+
+            for _table in sort_tables(_tables.keys()):
+                _items = [
+                    _item for _item in _tables[_table]
+                    if DAO._has_keys(_item)
+                ]
+                session.bulk_save_objects(_items)
+                session.add_all([
+                    _item for _item in _tables[_table]
+                    if not DAO._has_keys(_item)
+                ])
+                session.flush()
+                _keyed.extend(_items)
+
+            session.commit()
+        except (exc.SQLAlchemyError, exc.DBAPIError) as error:
+            print error
+            session.rollback()
+            _keyed = []
+
+            _failed = []
+            for _index, _item in enumerate(items):
+                _code, _message = DAO.db_add([
+                    _item,
+                ], session)
+                if _code != 0:
+                    _failed.append(str(_index))
+
+            if _failed:
+                _error_code = 1
+                _msg = "RTK ERROR: Adding one or more items to the RTK " \
+                       "Program database.  Failed items: {0:s}.".format(
+                           ', '.join(_failed))
+
+        # Items inserted with executemany are not attached to the session so
+        # they are marked as detached to be saved with UPDATE hereafter.
+        for _item in _keyed:
+            make_transient_to_detached(_item)
+
+        return _error_code, _msg
+
+    @staticmethod
+    def _has_keys(item):
+        """
+        Determine whether all the primary and foreign keys of an item are set.
+
+        :param item: the object to check.
+        :return: True if all the key values are set, otherwise False.
+        :rtype: bool
+        """
+        _mapper = inspect(item).mapper
+        _columns = list(_mapper.primary_key) + [
+            _key.parent for _key in _mapper.local_table.foreign_keys
+        ]
+
+        return all(
+            getattr(item,
+                    _mapper.get_property_by_column(_column).key) is not None
+            for _column in _columns)
+
     @staticmethod
     def db_update(session):
         """
@@ -188,6 +284,38 @@ class DAO(object):
 
         return _error_code, _msg
 
+    @staticmethod
+    def db_update_many(items, session):
+        """
+        Update a list of items in the RTK Program database in one transaction.
+
+        Only the items with modified attributes are added to the session so
+        the flush issues one (executemany) UPDATE per table for the changed
+        columns rather than one commit per item.
+
+        :param list items: the objects to update in the RTK Program database.
+        :param session: the SQLAlchemy scoped_session instance used to
+                        communicate with the RTK Program database.
+        :type session: :py:class:`sqlalchemy.orm.scoped_session`
+        :return: (_error_code, _Msg); the error code and associated error
+                                      message.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = "RTK SUCCESS: Updating the RTK Program database."
+
+        try:
+            session.add_all([_item for _item in items
+                             if inspect(_item).modified])
+            session.commit()
+        except (exc.SQLAlchemyError, exc.DBAPIError) as error:
+            print error
+            session.rollback()
+            _error_code = 1
+            _msg = "RTK ERROR: Updating the RTK Program database."
+
+        return _error_code, _msg
+
     @staticmethod
     def db_delete(item, session):
         """
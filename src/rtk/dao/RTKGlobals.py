@@ -0,0 +1,409 @@
+# -*- coding: utf-8 -*-
+#
+#       rtk.dao.RTKGlobals.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+RTK Common Database Globals Module.
+
+The global dictionaries of the RTK Configuration (failure modes, RPN tables,
+manufacturers, users, etc.) are loaded from the RTK Common database the first
+time they are used.  Each table is retrieved with one query the first time
+any dictionary built from it is needed and the rows are grouped in memory.
+
+An optional snapshot of every dictionary can be saved to a file.  The
+snapshot is keyed by the modification time and size of the RTK Common
+database file so a snapshot is only used while the database is unchanged.
+When a valid snapshot exists the database isn't queried at all.  The
+snapshot is read with pickle so it must be kept in a directory only the user
+can write to.
+"""
+
+import os
+import pickle
+from collections import MutableMapping
+
+from .commondb.RTKCategory import RTKCategory
+from .commondb.RTKFailureMode import RTKFailureMode
+from .commondb.RTKGroup import RTKGroup
+from .commondb.RTKHazards import RTKHazards
+from .commondb.RTKManufacturer import RTKManufacturer
+from .commondb.RTKMeasurement import RTKMeasurement
+from .commondb.RTKMethod import RTKMethod
+from .commondb.RTKStakeholders import RTKStakeholders
+from .commondb.RTKStatus import RTKStatus
+from .commondb.RTKSubCategory import RTKSubCategory
+from .commondb.RTKType import RTKType
+from .commondb.RTKUser import RTKUser
+from .programdb.RTKRPN import RTKRPN
+
+# The global dictionaries that map one table row to one entry.  The value is
+# (table, filter attribute, filter value, key attribute, value attributes).
+# Rows are selected when the filter attribute equals the filter value (all
+# rows when the filter attribute is None).  The entry is the tuple of the
+# value attributes from the row's get_attributes() or the entire attribute
+# dictionary when the value attributes are None.
+SIMPLE_GLOBALS = {
+    'RTK_ACTION_CATEGORY': (RTKCategory, 'cat_type', 'action', 'category_id',
+                            ('name', 'description', 'category_type',
+                             'value')),
+    'RTK_ACTION_STATUS': (RTKStatus, 'status_type', 'action', 'status_id',
+                          ('name', 'description', 'status_type')),
+    'RTK_AFFINITY_GROUPS': (RTKGroup, 'group_type', 'affinity', 'group_id',
+                            ('description', 'group_type')),
+    'RTK_DETECTION_METHODS': (RTKMethod, 'method_type', 'detection',
+                              'method_id', ('name', 'description',
+                                            'method_type')),
+    'RTK_HAZARDS': (RTKHazards, None, None, 'hazard_id', ('category',
+                                                          'subcategory')),
+    'RTK_INCIDENT_CATEGORY': (RTKCategory, 'cat_type', 'incident',
+                              'category_id', ('name', 'description',
+                                              'category_type', 'value')),
+    'RTK_INCIDENT_STATUS': (RTKStatus, 'status_type', 'incident', 'status_id',
+                            ('name', 'description', 'status_type')),
+    'RTK_INCIDENT_TYPE': (RTKType, 'type_type', 'incident', 'type_id',
+                          ('code', 'description', 'type_type')),
+    'RTK_MANUFACTURERS': (RTKManufacturer, None, None, 'manufacturer_id',
+                          ('description', 'location', 'cage_code')),
+    'RTK_MEASUREMENT_UNITS': (RTKMeasurement, 'measurement_type', 'unit',
+                              'measurement_id', ('code', 'description',
+                                                 'measurement_type')),
+    'RTK_REQUIREMENT_TYPE': (RTKType, 'type_type', 'requirement', 'type_id',
+                             ('code', 'description', 'type_type')),
+    'RTK_RPN_DETECTION': (RTKRPN, 'rpn_type', 'detection', 'value', None),
+    'RTK_RPN_OCCURRENCE': (RTKRPN, 'rpn_type', 'occurrence', 'value', None),
+    'RTK_RPN_SEVERITY': (RTKRPN, 'rpn_type', 'severity', 'value', None),
+    'RTK_SEVERITY': (RTKCategory, 'cat_type', 'risk', 'category_id',
+                     ('name', 'description', 'category_type', 'value')),
+    'RTK_STAKEHOLDERS': (RTKStakeholders, None, None, 'stakeholders_id',
+                         ('stakeholder', )),
+    'RTK_USERS': (RTKUser, None, None, 'user_id',
+                  ('user_lname', 'user_fname', 'user_email', 'user_phone',
+                   'user_group_id')),
+    'RTK_VALIDATION_TYPE': (RTKType, 'type_type', 'validation', 'type_id',
+                            ('code', 'description', 'type_type')),
+    'RTK_WORKGROUPS': (RTKGroup, 'group_type', 'workgroup', 'group_id',
+                       ('description', 'group_type'))
+}
+
+# The global dictionaries built from the hardware category, subcategory, and
+# failure mode tables.
+HARDWARE_GLOBALS = ('RTK_CATEGORIES', 'RTK_FAILURE_MODES', 'RTK_SUBCATEGORIES')
+
+GLOBALS = tuple(sorted(list(SIMPLE_GLOBALS) + list(HARDWARE_GLOBALS)))
+
+
+class LazyDict(MutableMapping):
+    """
+    A dictionary whose contents are loaded the first time it is used.
+
+    The loader is called with no arguments and returns the dictionary of
+    contents.  It is called once, the first time the contents are read or
+    changed.  LazyDict wraps a plain dictionary rather than subclassing dict
+    so dict(), dict.update(), and ** unpacking see the loaded contents.
+    """
+
+    def __init__(self, loader):
+        """
+        Initialize a LazyDict instance.
+
+        :param loader: the function that returns the contents of the
+                       dictionary.
+        """
+        self._loader = loader
+        self._dic_contents = {}
+
+    def do_load(self):
+        """
+        Load the contents of the dictionary if they haven't been loaded.
+
+        :return: _dic_contents; the loaded contents.
+        :rtype: dict
+        """
+        if self._loader is not None:
+            _loader = self._loader
+            self._loader = None
+            self._dic_contents.update(_loader())
+
+        return self._dic_contents
+
+    @property
+    def loaded(self):
+        """Indicate whether the contents of the dictionary have been loaded."""
+        return self._loader is None
+
+    def __getitem__(self, key):
+        """Return the value of key."""
+        return self.do_load()[key]
+
+    def __setitem__(self, key, value):
+        """Set the value of key."""
+        self.do_load()[key] = value
+
+    def __delitem__(self, key):
+        """Delete key."""
+        del self.do_load()[key]
+
+    def __iter__(self):
+        """Iterate over the keys."""
+        return iter(self.do_load())
+
+    def __len__(self):
+        """Return the number of keys."""
+        return len(self.do_load())
+
+    def __contains__(self, key):
+        """Indicate whether key is in the dictionary."""
+        return key in self.do_load()
+
+    def __repr__(self):
+        """Return the representation of the loaded contents."""
+        return repr(self.do_load())
+
+    def __reduce__(self):
+        """Pickle the loaded contents as a plain dictionary."""
+        return (dict, (dict(self.do_load()), ))
+
+    def copy(self):
+        """Return a plain dictionary copy of the loaded contents."""
+        return self.do_load().copy()
+
+    def has_key(self, key):
+        """Indicate whether key is in the dictionary."""
+        return key in self
+
+
+class RTKGlobals(object):
+    """
+    Load the global dictionaries from the RTK Common database on demand.
+
+    :ivar dao: the data access object connected to the RTK Common database.
+    :type dao: :class:`rtk.dao.DAO.DAO`
+    :ivar str snapshot: the path to the snapshot file or None to not use a
+                        snapshot.
+    """
+
+    def __init__(self, dao, snapshot=None):
+        """
+        Initialize an instance of the RTK Common database globals.
+
+        :param dao: the data access object connected to the RTK Common
+                    database.
+        :type dao: :class:`rtk.dao.DAO.DAO`
+        :param str snapshot: the path to the snapshot file.  Defaults to not
+                             using a snapshot.  The file is unpickled so it
+                             must be in a user-private directory.
+        """
+        # Initialize private dictionary attributes.
+        self._dic_globals = {}
+        self._dic_tables = {}
+
+        # Initialize private list attributes.
+
+        # Initialize private scalar attributes.
+        self._snapshot_read = False
+
+        # Initialize public dictionary attributes.
+
+        # Initialize public list attributes.
+
+        # Initialize public scalar attributes.
+        self.dao = dao
+        self.snapshot = snapshot
+
+    def do_attach(self, configuration):
+        """
+        Replace the global dictionaries of a Configuration with LazyDicts.
+
+        :param configuration: the RTK Configuration to attach to.
+        :type configuration: :class:`rtk.Configuration.Configuration`
+        :return: None
+        :rtype: None
+        """
+        for _name in GLOBALS:
+            setattr(configuration, _name,
+                    LazyDict(self._do_make_loader(_name)))
+
+    def _do_make_loader(self, name):
+        """Return the function that loads the global dictionary name."""
+        return lambda: self.do_get(name)
+
+    def do_get(self, name):
+        """
+        Retrieve one of the global dictionaries.
+
+        The first time any dictionary is requested a valid snapshot, if there
+        is one, supplies every dictionary.  Otherwise the dictionary is built
+        from the RTK Common database.  When a snapshot is used but isn't
+        valid, every dictionary is built and the snapshot is saved.
+
+        :param str name: the name of the global dictionary; one of GLOBALS.
+        :return: the global dictionary.
+        :rtype: dict
+        :raise: KeyError if name isn't one of GLOBALS.
+        """
+        if name not in GLOBALS:
+            raise KeyError(name)
+
+        if not self._snapshot_read and self.snapshot is not None:
+            self._snapshot_read = True
+            if not self._do_read_snapshot():
+                self.do_save_snapshot()
+
+        if name not in self._dic_globals:
+            if name in SIMPLE_GLOBALS:
+                self._dic_globals[name] = self._do_build_simple(
+                    *SIMPLE_GLOBALS[name])
+            else:
+                self._do_build_hardware()
+
+        return self._dic_globals[name]
+
+    def do_get_stamp(self):
+        """
+        Retrieve the modification stamp of the RTK Common database.
+
+        :return: the (modification time, size) of the RTK Common database
+                 file or None if the database is not a file.
+        :rtype: tuple
+        """
+        _database = self.dao.engine.url.database
+        if self.dao.engine.url.drivername != 'sqlite' or not _database:
+            return None
+
+        try:
+            _stat = os.stat(_database)
+        except OSError:
+            return None
+
+        return (_stat.st_mtime, _stat.st_size)
+
+    def do_save_snapshot(self):
+        """
+        Build every global dictionary and save them to the snapshot file.
+
+        :return: False if successful or True if an error is encountered.
+        :rtype: bool
+        """
+        _stamp = self.do_get_stamp()
+        if self.snapshot is None or _stamp is None:
+            return True
+
+        _globals = dict((_name, self.do_get(_name)) for _name in GLOBALS)
+        try:
+            with open(self.snapshot, 'wb') as _file:
+                pickle.dump({
+                    'stamp': _stamp,
+                    'globals': _globals
+                }, _file, pickle.HIGHEST_PROTOCOL)
+        except (IOError, OSError, pickle.PicklingError):
+            return True
+
+        return False
+
+    def _do_read_snapshot(self):
+        """
+        Read the global dictionaries from the snapshot file.
+
+        :return: True if the snapshot was valid and read or False otherwise.
+        :rtype: bool
+        """
+        _stamp = self.do_get_stamp()
+        if _stamp is None:
+            return False
+
+        try:
+            with open(self.snapshot, 'rb') as _file:
+                _snapshot = pickle.load(_file)
+        except (IOError, OSError, EOFError, AttributeError, ImportError,
+                IndexError, KeyError, TypeError, ValueError,
+                pickle.UnpicklingError):
+            return False
+
+        try:
+            if (_snapshot['stamp'] != _stamp
+                    or set(_snapshot['globals']) != set(GLOBALS)):
+                return False
+        except (KeyError, TypeError):
+            return False
+
+        self._dic_globals.update(_snapshot['globals'])
+
+        return True
+
+    def _do_get_rows(self, table, attribute):
+        """
+        Retrieve the rows of a table grouped by the value of an attribute.
+
+        The table is queried the first time any of its rows are needed.
+
+        :param table: the RTK<MODULE> class of the table.
+        :param str attribute: the name of the attribute to group the rows by
+                              or None to put every row in one group.
+        :return: dictionary of rows; key is the attribute value and values
+                 are the list of rows with that value.
+        :rtype: dict
+        """
+        if table not in self._dic_tables:
+            _session = self.dao.RTK_SESSION(
+                bind=self.dao.engine, autoflush=False, expire_on_commit=False)
+            self._dic_tables[table] = {None: _session.query(table).all()}
+            _session.close()
+
+        _groups = self._dic_tables[table]
+        if attribute not in _groups:
+            _groups[attribute] = {}
+            for _row in _groups[None]:
+                _groups[attribute].setdefault(getattr(_row, attribute),
+                                              []).append(_row)
+
+        if attribute is None:
+            return {None: _groups[None]}
+
+        return _groups[attribute]
+
+    def _do_build_simple(self, table, attribute, value, key, values):
+        """Build one of the SIMPLE_GLOBALS dictionaries."""
+        _global = {}
+        for _row in self._do_get_rows(table, attribute).get(value, []):
+            _attributes = _row.get_attributes()
+            if values is None:
+                _global[getattr(_row, key)] = _attributes
+            else:
+                _global[getattr(_row, key)] = tuple(
+                    _attributes[_value] for _value in values)
+
+        return _global
+
+    def _do_build_hardware(self):
+        """Build the hardware category, subcategory, and failure mode dicts."""
+        _subcategories = self._do_get_rows(RTKSubCategory, 'category_id')
+        _modes = self._do_get_rows(RTKFailureMode, 'category_id')
+
+        _categories = {}
+        _dic_subcategories = {}
+        _failure_modes = {}
+        for _category in self._do_get_rows(RTKCategory, 'cat_type').get(
+                'hardware', []):
+            _category_id = _category.category_id
+            _categories[_category_id] = _category.description
+            _dic_subcategories[_category_id] = {}
+            _failure_modes[_category_id] = {}
+
+            _category_modes = {}
+            for _mode in _modes.get(_category_id, []):
+                _category_modes.setdefault(_mode.subcategory_id, {})[
+                    _mode.mode_id] = [
+                        _mode.description, _mode.mode_ratio, _mode.source]
+
+            for _subcategory in _subcategories.get(_category_id, []):
+                _dic_subcategories[_category_id][
+                    _subcategory.subcategory_id] = _subcategory.description
+                _failure_modes[_category_id][
+                    _subcategory.subcategory_id] = _category_modes.get(
+                        _subcategory.subcategory_id, {})
+
+        self._dic_globals['RTK_CATEGORIES'] = _categories
+        self._dic_globals['RTK_FAILURE_MODES'] = _failure_modes
+        self._dic_globals['RTK_SUBCATEGORIES'] = _dic_subcategories
@@ -13,8 +13,20 @@ from sqlalchemy.orm import relationship
 
 # Import other RTK modules.
 from rtk.Utilities import none_to_default
+from rtk.analyses.Equation import do_evaluate
 from rtk.dao.RTKCommonDB import RTK_BASE
 
+# The (name, attribute) of the variables available to the user-defined
+# equations.
+EQUATION_VARIABLES = [('uf1', 'user_float_1'), ('uf2', 'user_float_2'),
+                      ('uf3', 'user_float_3'), ('ui1', 'user_int_1'),
+                      ('ui2', 'user_int_2'), ('ui3', 'user_int_3'),
+                      ('equation1', 'function_1'), ('equation2', 'function_2'),
+                      ('equation3', 'function_3'), ('equation4', 'function_4'),
+                      ('equation5', 'function_5'), ('res1', 'result_1'),
+                      ('res2', 'result_2'), ('res3', 'result_3'),
+                      ('res4', 'result_4'), ('res5', 'result_5')]
+
 
 class RTKHazardAnalysis(RTK_BASE):
     """
@@ -249,9 +261,9 @@ class RTKHazardAnalysis(RTK_BASE):
 
         return _error_code, _msg
 
-    def calculate(self):
+    def calculate_hri(self):
         """
-        Calculate the hazard analysis.
+        Calculate the MIL-STD-882 hazard risk indices.
 
         This method calculate the initial assembly hazard risk index (HRI), the
         final assembly HRI, the initial system HRI, and the final system HRI.
@@ -277,17 +289,6 @@ class RTKHazardAnalysis(RTK_BASE):
             'Level A - Frequent': 5
         }
 
-        # Create list of safe functions.
-        _safe_list = [
-            'uf1', 'uf2', 'uf3', 'ui1', 'ui2', 'ui3', 'equation1', 'equation2',
-            'equation3', 'equation4', 'equation5', 'res1', 'res2', 'res3',
-            'res4', 'res5'
-        ]
-
-        # Use the list to filter the local namespace
-        _calculations = dict([(k, locals().get(k, None)) for k in _safe_list])
-
-        # Calculate the MIL-STD-882 hazard risk indices.
         try:
             self.assembly_hri = (_probability[self.assembly_probability] *
                                  _severity[self.assembly_severity])
@@ -316,74 +317,37 @@ class RTKHazardAnalysis(RTK_BASE):
             self.system_hri_f = 30
             _return = True
 
-        # Get the user-defined float and integer values.
-        _calculations['uf1'] = self.user_float_1
-        _calculations['uf2'] = self.user_float_2
-        _calculations['uf3'] = self.user_float_3
-        _calculations['ui1'] = self.user_int_1
-        _calculations['ui2'] = self.user_int_2
-        _calculations['ui3'] = self.user_int_3
-
-        # Get the user-defined functions.
-        _calculations['equation1'] = self.function_1
-        _calculations['equation2'] = self.function_2
-        _calculations['equation3'] = self.function_3
-        _calculations['equation4'] = self.function_4
-        _calculations['equation5'] = self.function_5
-
-        # Get the existing results.  This allows the use of the results
-        # fields to be manually set to a float values by the user.
-        # Essentially creating five more user-defined float values.
-        _calculations['res1'] = self.result_1
-        _calculations['res2'] = self.result_2
-        _calculations['res3'] = self.result_3
-        _calculations['res4'] = self.result_4
-        _calculations['res5'] = self.result_5
-
-        _keys = _calculations.keys()
-        _values = _calculations.values()
-
-        for _index, _key in enumerate(_keys):
-            vars()[_key] = _values[_index]
-
-        try:
-            self.result_1 = eval(_calculations['equation1'],
-                                 {"__builtins__": None}, _calculations)
-        except SyntaxError:
-            self.result_1 = _calculations['res1']
-            if _calculations['equation1'] != '':
-                _return = True
+        return _return
 
-        try:
-            self.result_2 = eval(_calculations['equation2'],
-                                 {"__builtins__": None}, _calculations)
-        except SyntaxError:
-            self.result_2 = _calculations['res2']
-            if _calculations['equation2'] != '':
-                _return = True
+    def calculate(self):
+        """
+        Calculate the hazard analysis.
 
-        try:
-            self.result_3 = eval(_calculations['equation3'],
-                                 {"__builtins__": None}, _calculations)
-        except SyntaxError:
-            self.result_3 = _calculations['res3']
-            if _calculations['equation3'] != '':
-                _return = True
+        This method calculate the initial assembly hazard risk index (HRI), the
+        final assembly HRI, the initial system HRI, the final system HRI, and
+        the five user-defined equations.  An equation that is empty or not
+        valid leaves its result unchanged.
 
-        try:
-            self.result_4 = eval(_calculations['equation4'],
-                                 {"__builtins__": None}, _calculations)
-        except SyntaxError:
-            self.result_4 = _calculations['res4']
-            if _calculations['equation4'] != '':
-                _return = True
+        :return: False if successful or True if an error is encountered.
+        :rtype: bool
+        """
+        _return = self.calculate_hri()
 
-        try:
-            self.result_5 = eval(_calculations['equation5'],
-                                 {"__builtins__": None}, _calculations)
-        except SyntaxError:
-            self.result_5 = _calculations['res5']
-            if _calculations['equation5'] != '':
-                _return = True
+        # Get the user-defined float and integer values, the user-defined
+        # functions, and the existing results.  This allows the use of the
+        # results fields to be manually set to a float values by the user.
+        # Essentially creating five more user-defined float values.
+        _calculations = dict((_name, getattr(self, _attribute))
+                             for _name, _attribute in EQUATION_VARIABLES)
+
+        for _index in range(1, 6):
+            _equation = _calculations['equation{0:d}'.format(_index)]
+            try:
+                _result = do_evaluate(_equation, _calculations)
+            except SyntaxError:
+                _result = _calculations['res{0:d}'.format(_index)]
+                if _equation != '':
+                    _return = True
+            setattr(self, 'result_{0:d}'.format(_index), _result)
 
         return _return
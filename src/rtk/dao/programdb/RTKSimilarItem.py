@@ -6,13 +6,154 @@
 # Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
 """RTKSimilarItem Table."""
 
+import numpy as np
 from sqlalchemy import BLOB, Column, Float, ForeignKey, Integer, String
 from sqlalchemy.orm import relationship
 
 # Import other RTK modules.
 from rtk.Utilities import none_to_default
+from rtk.analyses.Equation import do_evaluate
 from rtk.dao.RTKCommonDB import RTK_BASE
 
+# The (name, attribute) of the variables available to the user-defined
+# equations.  The hazard rate of the hardware item, hr, is also available.
+EQUATION_VARIABLES = [
+    ('pi1', 'change_factor_1'), ('pi2', 'change_factor_2'),
+    ('pi3', 'change_factor_3'), ('pi4', 'change_factor_4'),
+    ('pi5', 'change_factor_5'), ('pi6', 'change_factor_6'),
+    ('pi7', 'change_factor_7'), ('pi8', 'change_factor_8'),
+    ('pi9', 'change_factor_9'), ('pi10', 'change_factor_10'),
+    ('uf1', 'user_float_1'), ('uf2', 'user_float_2'), ('uf3', 'user_float_3'),
+    ('uf4', 'user_float_4'), ('uf5', 'user_float_5'), ('ui1', 'user_int_1'),
+    ('ui2', 'user_int_2'), ('ui3', 'user_int_3'), ('ui4', 'user_int_4'),
+    ('ui5', 'user_int_5'), ('equation1', 'function_1'),
+    ('equation2', 'function_2'), ('equation3', 'function_3'),
+    ('equation4', 'function_4'), ('equation5', 'function_5'),
+    ('res1', 'result_1'), ('res2', 'result_2'), ('res3', 'result_3'),
+    ('res4', 'result_4'), ('res5', 'result_5')
+]
+
+# The Topic 6.3.3 conversion factors.  The rows are the from quality level,
+# environment, or temperature and the columns are the to quality level,
+# environment, or temperature.  Row and column zero are for quality level and
+# environment ID 1 and temperature 10C.
+QUALITY_CONVERT = np.array([[1.0, 0.8, 0.5, 0.2], [1.3, 1.0, 0.6, 0.3],
+                            [2.0, 1.7, 1.0, 0.4], [5.0, 3.3, 2.5, 1.0]])
+ENVIRONMENT_CONVERT = np.array([[1.0, 0.2, 0.3, 0.3, 0.1, 1.1],
+                                [5.0, 1.0, 1.4, 1.4, 0.5, 5.0],
+                                [3.3, 0.7, 1.0, 1.0, 0.3, 3.3],
+                                [3.3, 0.7, 1.0, 1.0, 0.3, 3.3],
+                                [10.0, 2.0, 3.3, 3.3, 1.0, 10.0],
+                                [0.9, 0.2, 0.3, 0.3, 0.1, 1.0]])
+TEMPERATURE_CONVERT = np.array([[1.0, 0.9, 0.8, 0.8, 0.7, 0.5, 0.4],
+                                [1.1, 1.0, 0.9, 0.8, 0.7, 0.6, 0.5],
+                                [1.2, 1.1, 1.0, 0.9, 0.8, 0.6, 0.5],
+                                [1.3, 1.2, 1.1, 1.0, 0.9, 0.7, 0.6],
+                                [1.5, 1.4, 1.2, 1.1, 1.0, 0.8, 0.7],
+                                [1.9, 1.7, 1.6, 1.5, 1.2, 1.0, 0.8],
+                                [2.4, 2.2, 1.9, 1.8, 1.5, 1.2, 1.0]])
+
+
+def _do_lookup(table, row, column):
+    """
+    Look up Topic 6.3.3 conversion factors.
+
+    :param table: the conversion table to look the factors up in.
+    :type table: :class:`numpy.ndarray`
+    :param row: the one-based row(s) of the factors to look up.
+    :param column: the one-based column(s) of the factors to look up.
+    :return: (_factors, _bad); the conversion factors and whether each row,
+             column pair is not in the table.  The conversion factor is 1.0
+             for pairs not in the table.
+    :rtype: tuple
+    """
+    _row, _column = np.broadcast_arrays(
+        np.asarray(row, dtype=float) - 1.0,
+        np.asarray(column, dtype=float) - 1.0)
+
+    with np.errstate(invalid='ignore'):
+        _valid = ((_row >= 0) & (_row < table.shape[0]) &
+                  (_row == np.floor(_row)) & (_column >= 0) &
+                  (_column < table.shape[1]) &
+                  (_column == np.floor(_column)))
+
+    _factors = np.ones(_row.shape)
+    _factors[_valid] = table[_row[_valid].astype(int),
+                             _column[_valid].astype(int)]
+
+    return _factors, ~_valid
+
+
+def _do_get_factor(table, row, column):
+    """
+    Look up one Topic 6.3.3 conversion factor.
+
+    :param table: the conversion table to look the factor up in.
+    :type table: :class:`numpy.ndarray`
+    :param row: the one-based row of the factor to look up.
+    :param column: the one-based column of the factor to look up.
+    :return: (_factor, _bad); the conversion factor and whether the row,
+             column pair is not in the table.  The conversion factor is 1.0
+             if the pair is not in the table.
+    :rtype: tuple
+    """
+    try:
+        _row = row - 1
+        _column = column - 1
+        if (0 <= _row < table.shape[0] and _row == int(_row)
+                and 0 <= _column < table.shape[1]
+                and _column == int(_column)):
+            return table.item(int(_row), int(_column)), False
+    except (TypeError, ValueError):
+        pass
+
+    return 1.0, True
+
+
+def do_calculate_topic_633(hazard_rate, quality_from, quality_to,
+                           environment_from, environment_to, temperature_from,
+                           temperature_to):
+    """
+    Calculate the Topic 6.3.3 change factors and new hazard rates.
+
+    Each argument is either a scalar or an array holding one value per
+    hardware item.  The temperatures are rounded to the nearest 10C before
+    they are converted.
+
+    :param hazard_rate: the current hazard rate of the hardware item(s).
+    :param quality_from: the ID of the quality level converted from.
+    :param quality_to: the ID of the quality level converted to.
+    :param environment_from: the ID of the environment converted from.
+    :param environment_to: the ID of the environment converted to.
+    :param temperature_from: the temperature converted from.
+    :param temperature_to: the temperature converted to.
+    :return: (_factors, _result, _temperatures, _bad); the array of quality,
+             environment, and temperature change factors, the new hazard
+             rates, the array of rounded from and to temperatures, and
+             whether any of the conversions for each hardware item is not in
+             the conversion tables.
+    :rtype: tuple
+    """
+    # Round half away from zero the same as round() does.
+    _temperatures = np.asarray([temperature_from, temperature_to],
+                               dtype=float)
+    _temperatures = np.copysign(
+        np.floor(np.abs(_temperatures) / 10.0 + 0.5), _temperatures) * 10.0
+
+    _factor_1, _bad_1 = _do_lookup(QUALITY_CONVERT, quality_from, quality_to)
+    _factor_2, _bad_2 = _do_lookup(ENVIRONMENT_CONVERT, environment_from,
+                                   environment_to)
+    _factor_3, _bad_3 = _do_lookup(TEMPERATURE_CONVERT,
+                                   _temperatures[0] / 10.0,
+                                   _temperatures[1] / 10.0)
+
+    _result = np.asarray(hazard_rate, dtype=float) / (
+        _factor_1 * _factor_2 * _factor_3)
+
+    return (np.array(np.broadcast_arrays(_factor_1, _factor_2, _factor_3)),
+            _result,
+            _temperatures, _bad_1 | _bad_2 | _bad_3)
+
 
 # pylint: disable=R0902
 class RTKSimilarItem(RTK_BASE):
@@ -307,145 +448,23 @@ class RTKSimilarItem(RTK_BASE):
         :return: False on success or True if an error is encountered.
         :rtype: bool
         """
-        _return = False
-
-        _environment_convert = {
-            (1, 1): 1.0,
-            (1, 2): 0.2,
-            (1, 3): 0.3,
-            (1, 4): 0.3,
-            (1, 5): 0.1,
-            (1, 6): 1.1,
-            (2, 1): 5.0,
-            (2, 2): 1.0,
-            (2, 3): 1.4,
-            (2, 4): 1.4,
-            (2, 5): 0.5,
-            (2, 6): 5.0,
-            (3, 1): 3.3,
-            (3, 2): 0.7,
-            (3, 3): 1.0,
-            (3, 4): 1.0,
-            (3, 5): 0.3,
-            (3, 6): 3.3,
-            (4, 1): 3.3,
-            (4, 2): 0.7,
-            (4, 3): 1.0,
-            (4, 4): 1.0,
-            (4, 5): 0.3,
-            (4, 6): 3.3,
-            (5, 1): 10.0,
-            (5, 2): 2.0,
-            (5, 3): 3.3,
-            (5, 4): 3.3,
-            (5, 5): 1.0,
-            (5, 6): 10.0,
-            (6, 1): 0.9,
-            (6, 2): 0.2,
-            (6, 3): 0.3,
-            (6, 4): 0.3,
-            (6, 5): 0.1,
-            (6, 6): 1.0
-        }
-        _quality_convert = {
-            (1, 1): 1.0,
-            (1, 2): 0.8,
-            (1, 3): 0.5,
-            (1, 4): 0.2,
-            (2, 1): 1.3,
-            (2, 2): 1.0,
-            (2, 3): 0.6,
-            (2, 4): 0.3,
-            (3, 1): 2.0,
-            (3, 2): 1.7,
-            (3, 3): 1.0,
-            (3, 4): 0.4,
-            (4, 1): 5.0,
-            (4, 2): 3.3,
-            (4, 3): 2.5,
-            (4, 4): 1.0
-        }
-        _temperature_convert = {
-            (10.0, 10.0): 1.0,
-            (10.0, 20.0): 0.9,
-            (10.0, 30.0): 0.8,
-            (10.0, 40.0): 0.8,
-            (10.0, 50.0): 0.7,
-            (10.0, 60.0): 0.5,
-            (10.0, 70.0): 0.4,
-            (20.0, 10.0): 1.1,
-            (20.0, 20.0): 1.0,
-            (20.0, 30.0): 0.9,
-            (20.0, 40.0): 0.8,
-            (20.0, 50.0): 0.7,
-            (20.0, 60.0): 0.6,
-            (20.0, 70.0): 0.5,
-            (30.0, 10.0): 1.2,
-            (30.0, 20.0): 1.1,
-            (30.0, 30.0): 1.0,
-            (30.0, 40.0): 0.9,
-            (30.0, 50.0): 0.8,
-            (30.0, 60.0): 0.6,
-            (30.0, 70.0): 0.5,
-            (40.0, 10.0): 1.3,
-            (40.0, 20.0): 1.2,
-            (40.0, 30.0): 1.1,
-            (40.0, 40.0): 1.0,
-            (40.0, 50.0): 0.9,
-            (40.0, 60.0): 0.7,
-            (40.0, 70.0): 0.6,
-            (50.0, 10.0): 1.5,
-            (50.0, 20.0): 1.4,
-            (50.0, 30.0): 1.2,
-            (50.0, 40.0): 1.1,
-            (50.0, 50.0): 1.0,
-            (50.0, 60.0): 0.8,
-            (50.0, 70.0): 0.7,
-            (60.0, 10.0): 1.9,
-            (60.0, 20.0): 1.7,
-            (60.0, 30.0): 1.6,
-            (60.0, 40.0): 1.5,
-            (60.0, 50.0): 1.2,
-            (60.0, 60.0): 1.0,
-            (60.0, 70.0): 0.8,
-            (70.0, 10.0): 2.4,
-            (70.0, 20.0): 2.2,
-            (70.0, 30.0): 1.9,
-            (70.0, 40.0): 1.8,
-            (70.0, 50.0): 1.5,
-            (70.0, 60.0): 1.2,
-            (70.0, 70.0): 1.0
-        }
-
         # Convert user-supplied temperatures to whole values used in Topic 633.
         self.temperature_from = round(self.temperature_from / 10.0) * 10.0
         self.temperature_to = round(self.temperature_to / 10.0) * 10.0
 
-        try:
-            self.change_factor_1 = _quality_convert[(self.quality_from_id,
-                                                     self.quality_to_id)]
-        except KeyError:
-            self.change_factor_1 = 1.0
-            _return = True
-
-        try:
-            self.change_factor_2 = _environment_convert[(
-                self.environment_from_id, self.environment_to_id)]
-        except KeyError:
-            self.change_factor_2 = 1.0
-            _return = True
-
-        try:
-            self.change_factor_3 = _temperature_convert[(self.temperature_from,
-                                                         self.temperature_to)]
-        except KeyError:
-            self.change_factor_3 = 1.0
-            _return = True
+        self.change_factor_1, _bad_1 = _do_get_factor(
+            QUALITY_CONVERT, self.quality_from_id, self.quality_to_id)
+        self.change_factor_2, _bad_2 = _do_get_factor(
+            ENVIRONMENT_CONVERT, self.environment_from_id,
+            self.environment_to_id)
+        self.change_factor_3, _bad_3 = _do_get_factor(
+            TEMPERATURE_CONVERT, self.temperature_from / 10.0,
+            self.temperature_to / 10.0)
 
         self.result_1 = hazard_rate / (
             self.change_factor_1 * self.change_factor_2 * self.change_factor_3)
 
-        return _return
+        return _bad_1 or _bad_2 or _bad_3
 
     def user_defined(self, hazard_rate):
         """
@@ -458,100 +477,23 @@ class RTKSimilarItem(RTK_BASE):
         """
         _return = False
 
-        # Create list of safe functions.
-        _safe_list = [
-            'hr', 'pi1', 'pi3', 'pi3', 'pi4', 'pi5', 'pi6', 'pi7', 'pi8',
-            'pi9', 'pi10', 'uf1', 'uf2', 'uf3', 'uf4', 'uf5', 'ui1', 'ui2',
-            'ui3', 'ui4', 'ui5', 'equation1', 'equation2', 'equation3',
-            'equation4', 'equation5', 'res1', 'res2', 'res3', 'res4', 'res5'
-        ]
-
-        # Use the list to filter the local namespace
-        _sia = dict([(k, locals().get(k, None)) for k in _safe_list])
-
-        # Get the assembly failure intensity.
-        _sia['hr'] = hazard_rate
-
-        # Get the change factor values.
-        _sia['pi1'] = self.change_factor_1
-        _sia['pi2'] = self.change_factor_2
-        _sia['pi3'] = self.change_factor_3
-        _sia['pi4'] = self.change_factor_4
-        _sia['pi5'] = self.change_factor_5
-        _sia['pi6'] = self.change_factor_6
-        _sia['pi7'] = self.change_factor_7
-        _sia['pi8'] = self.change_factor_8
-        _sia['pi9'] = self.change_factor_9
-        _sia['pi10'] = self.change_factor_10
-
-        # Get the user-defined float and integer values.
-        _sia['uf1'] = self.user_float_1
-        _sia['uf2'] = self.user_float_2
-        _sia['uf3'] = self.user_float_3
-        _sia['uf4'] = self.user_float_4
-        _sia['uf5'] = self.user_float_5
-        _sia['ui1'] = self.user_int_1
-        _sia['ui2'] = self.user_int_2
-        _sia['ui3'] = self.user_int_3
-        _sia['ui4'] = self.user_int_4
-        _sia['ui5'] = self.user_int_5
-
-        # Get the user-defined functions.
-        _sia['equation1'] = self.function_1
-        _sia['equation2'] = self.function_2
-        _sia['equation3'] = self.function_3
-        _sia['equation4'] = self.function_4
-        _sia['equation5'] = self.function_5
-
-        # Get the existing results.  This allows the use of the results
+        # Get the assembly failure intensity, the change factor values, the
+        # user-defined float and integer values, the user-defined functions,
+        # and the existing results.  This allows the use of the results
         # fields to be manually set to float values by the user essentially
         # creating five more user-defined float values.
-        _sia['res1'] = self.result_1
-        _sia['res2'] = self.result_2
-        _sia['res3'] = self.result_3
-        _sia['res4'] = self.result_4
-        _sia['res5'] = self.result_5
-
-        _keys = _sia.keys()
-        _values = _sia.values()
-
-        for _index, _key in enumerate(_keys):
-            vars()[_key] = _values[_index]
-
-        try:
-            self.result_1 = eval(_sia['equation1'], {"__builtins__": None},
-                                 _sia)
-        except SyntaxError:
-            self.result_1 = 0.0
-            _return = True
-
-        try:
-            self.result_2 = eval(_sia['equation2'], {"__builtins__": None},
-                                 _sia)
-        except SyntaxError:
-            self.result_2 = 0.0
-            _return = True
-
-        try:
-            self.result_3 = eval(_sia['equation3'], {"__builtins__": None},
-                                 _sia)
-        except SyntaxError:
-            self.result_3 = 0.0
-            _return = True
-
-        try:
-            self.result_4 = eval(_sia['equation4'], {"__builtins__": None},
-                                 _sia)
-        except SyntaxError:
-            self.result_4 = 0.0
-            _return = True
+        _sia = dict((_name, getattr(self, _attribute))
+                    for _name, _attribute in EQUATION_VARIABLES)
+        _sia['hr'] = hazard_rate
 
-        try:
-            self.result_5 = eval(_sia['equation5'], {"__builtins__": None},
-                                 _sia)
-        except SyntaxError:
-            self.result_5 = 0.0
-            _return = True
+        for _index in range(1, 6):
+            try:
+                _result = do_evaluate(_sia['equation{0:d}'.format(_index)],
+                                      _sia)
+            except SyntaxError:
+                _result = 0.0
+                _return = True
+            setattr(self, 'result_{0:d}'.format(_index), _result)
 
         # If all the equations are set and _return is True, then there is a
         # real issue.  Otherwise, _return was set just because one or more
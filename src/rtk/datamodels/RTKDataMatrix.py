@@ -1,320 +1,690 @@
-# -*- coding: utf-8 -*-
-#
-#       rtk.datamodels.matrix.Matrix.py is part of The RTK Project
-#
-# All rights reserved.
-# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
-"""Datamodels Package RTKDataMatrix."""
-
-import pandas as pd
-from sqlalchemy import and_
-
-# Import other RTK modules.
-from rtk.dao import RTKMatrix
-
-
-class RTKDataMatrix(object):
-    """
-    The RTK Data Matrix model.
-
-    The Matrix data model is an aggregate model of N x M cell data models.  The
-    attributes of a Matrix are:
-
-    :ivar dict dic_row_hdrs: dictionary of the row heading text to use in
-                             views.  Key is the <MODULE> ID; values are the
-                             noun name to use in the row heading.
-    :ivar dict dic_column_hdrs: dictionary of the column heading text to use
-                                in views.  Key is the <MODULE> ID; values are
-                                the noun name to use in the column heading.
-    :ivar object _column_table: the RTK Progam database table to use for the
-                                matrix columns.  This is an SQLAlchemy object.
-    :ivar object _row_table: the RTK Progam database table to use for the
-                             matrix rows.  This is an SQLAlchemy object.
-    :ivar dtf_matrix: the :class:`pd.DataFrame` storing the Matrix.
-    :ivar dao: the :class:`rtk.dao.DAO` object used to communicate with the
-               RTK Program database.
-    :ivar int n_row: the number of rows in the Matrix.
-    :ivar int n_col: the number of columns in the Matrix.
-
-    There are currently 10 matrices as defined by their matrix type.  These
-    are:
-
-        +-------------+--------------+--------------+
-        |  Row Table  | Column Table |  Matrix Type |
-        +-------------+--------------+--------------+
-        | Function    | Hardware     | fnctn_hrdwr  |
-        +-------------+--------------+--------------+
-        | Function    | Software     | fnctn_sftwr  |
-        +-------------+--------------+--------------+
-        | Function    | Validation   | fnctn_vldtn  |
-        +-------------+--------------+--------------+
-        | Requirement | Hardware     | rqrmnt_hrdwr |
-        +-------------+--------------+--------------+
-        | Requirement | Software     | rqrmnt_sftwr |
-        +-------------+--------------+--------------+
-        | Requirement | Validation   | rqrmnt_vldtn |
-        +-------------+--------------+--------------+
-        | Hardware    | Testing      | hrdwr_tstng  |
-        +-------------+--------------+--------------+
-        | Hardware    | Validation   | hrdwr_vldtn  |
-        +-------------+--------------+--------------+
-        | Software    | Risk         |  sftwr_rsk   |
-        +-------------+--------------+--------------+
-        | Software    | Validation   | sftwr_vldtn  |
-        +-------------+--------------+--------------+
-    """
-
-    _tag = 'matrix'
-
-    def __init__(self, dao, row_table, column_table):
-        """Initialize a Matrix data model instance."""
-        # Initialize private dictionary attributes.
-
-        # Initialize private list attributes.
-
-        # Initialize private scalar attributes.
-        self._column_table = column_table
-        self._row_table = row_table
-
-        # Initialize public dictionary attributes.
-        self.dtf_matrix = None
-        self.dic_row_hdrs = {}
-        self.dic_column_hdrs = {}
-
-        # Initialize public list attributes.
-
-        # Initialize public scalar attributes.
-        self.dao = dao
-        self.n_row = 1
-        self.n_col = 1
-
-    def select(self, col, row):
-        """
-        Select the value from the cell identified by col and row.
-
-        :param str col: the column of the cell.  This is the first index of the
-                        Pandas DataFrame.
-        :param str row: the row of the cell.  This is the second index of the
-                        Pandas DataFrame.
-        :return: the value in the cell at (col, row).
-        :rtype: float
-        """
-        return self.dtf_matrix[col][row]
-
-    # pylint: disable=R0913
-    def select_all(self,
-                   revision_id,
-                   matrix_type,
-                   rkey='rkey',
-                   ckey='ckey',
-                   rheader=0,
-                   cheader=0):
-        """
-        Select everything needed to build the matrix.
-
-        This method selects the row headngs, the column headings, and the cell
-        values for the matrix then build the matrix as a Pandas DataFrame.
-
-        :param int revision_id: the ID of the Revision the desired Matrix is
-                                associated with.
-        :param str matrix_type: the type of the Matrix to select all rows and
-                                all columns for.
-        :keyword int rkey: the key in the row table attributes containing the
-                           module ID.
-        :keyword int ckey: the key in the column table attributes containing
-                           the module ID.
-        :keyword int rheader: the index in the row table attributes containing
-                              the text to use for the Matrix row headings.
-        :keyword int cheader: the index in the column table attributes
-                              containing the text to use for the Matrix column
-                              headings.
-        :return: False if successful or True if an error occurs.
-        :rtype: bool
-        """
-        _return = False
-
-        _session = self.dao.RTK_SESSION(
-            bind=self.dao.engine, autoflush=False, expire_on_commit=False)
-
-        _column_id = 0
-        _lst_row_id = []
-        _lst_value = []
-        _dic_column = {}
-
-        self.n_col = 0
-        self.n_row = 0
-
-        # Retrieve the dictionary of row headings.  The key is the row table's
-        # module ID.  The value is the row table field with string data
-        # (typically the code, description, or name field).
-        for _row in _session.query(self._row_table).filter(
-                self._row_table.revision_id == revision_id).all():
-            _attributes = _row.get_attributes()
-            self.dic_row_hdrs[_attributes[rkey]] = _attributes[rheader]
-
-            self.n_row += 1
-
-        # Retrieve the dictionary of column headings.  The key is the column
-        # table's module ID.  The value is the column table field with string
-        # data (typically the code, description, or name field).
-        for _column in _session.query(self._column_table).filter(
-                self._column_table.revision_id == revision_id).all():
-            _attributes = _column.get_attributes()
-            try:
-                self.dic_column_hdrs[_attributes[ckey]] = _attributes[cheader]
-            except TypeError:
-                print 'FIXME: Handle TypeError in ' \
-                      'RTKDataMatrix.select_all().  Tuple indices must be ' \
-                      'integers, not str.  This will be fixed when all the ' \
-                      'RTK database tables are converted to return dicts ' \
-                      'from the get_attributes() method.  Matrix {0:s} is ' \
-                      'not working.'.format(matrix_type)
-
-            self.n_col += 1
-
-        # Retrieve the matrix values for the desired Matrix ID.
-        for _matrix in _session.query(RTKMatrix).filter(
-                and_(RTKMatrix.revision_id == revision_id,
-                     RTKMatrix.matrix_type == matrix_type)).all():
-            if _matrix.column_item_id == _column_id:
-                _lst_row_id.append(_matrix.row_item_id)
-                _lst_value.append(_matrix.value)
-            else:
-                _lst_row_id = [_matrix.row_item_id]
-                _lst_value = [_matrix.value]
-                _column_id = _matrix.column_item_id
-
-            _dic_column[_column_id] = pd.Series(_lst_value, index=_lst_row_id)
-
-        self.dtf_matrix = pd.DataFrame(_dic_column)
-
-        _session.close()
-
-        return _return
-
-    def insert(self, item_id, heading, row=True):
-        """
-        Insert a row or a column into the matrix.
-
-        :param int item_id: the ID of the row or column item to insert into the
-                            Matrix (this is the module ID associated with the
-                            row or column to be inserted).
-        :param str heading: the heading for the new row or column.
-        :keyword bool row: indicates whether to insert a row (default) or a
-                           column.
-        :return: (_error_code, _msg); the error code and associated message.
-        :rtype: (int, str)
-        """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Inserting a row or column into the matrix.'
-
-        if row:
-            if (self.dtf_matrix.index == item_id).any():
-                _error_code = 6
-                _msg = 'RTK ERROR: Attempting to insert row {0:d} into a ' \
-                       'matrix already containing a row {0:d}.'.format(item_id)
-            else:
-                self.dic_row_hdrs[item_id] = heading
-                _values = [0] * len(self.dtf_matrix.columns)
-                try:
-                    self.dtf_matrix.loc[item_id] = _values
-                    self.n_row = len(self.dtf_matrix.index)
-                except ValueError:
-                    _error_code = 6
-                    _msg = 'RTK ERROR: Inserting row into matrix.  Row ' \
-                           '{0:d} already exists or adjacent row {1:d} does ' \
-                           'NOT exist.'.format(item_id, self.n_row - 1)
-        else:
-            self.dic_column_hdrs[item_id] = heading
-            _values = [0] * len(self.dtf_matrix.index)
-
-            try:
-                self.dtf_matrix.insert(self.n_col, item_id, _values)
-                self.n_col = len(self.dtf_matrix.columns)
-            except ValueError:
-                _error_code = 6
-                _msg = 'RTK ERROR: Inserting column into matrix.  Column ' \
-                       '{0:d} already exists or adjacent column {1:d} does ' \
-                       'NOT exist.'.format(item_id, self.n_col)
-
-        return _error_code, _msg
-
-    def delete(self, item_id, row=True):
-        """
-        Delete a column or row from the Matrix.
-
-        :param int item_id: the ID of the row or column item to delete from the
-                            Matrix.
-        :param bool row: indicates whether to delete a row (default) or a
-                         column identified by identifier.
-        :return: (_error_code, _msg); the error code and associated message.
-        :rtype: (int, str)
-        """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Removing a row or column from the matrix.'
-
-        if row:
-            try:
-                self.dtf_matrix = self.dtf_matrix.drop(item_id)
-                self.dic_row_hdrs.pop(item_id)
-                self.n_row = len(self.dtf_matrix.index)
-            except (KeyError, ValueError):
-                _error_code = 6
-                _msg = 'RTK ERROR: Attempted to drop non-existent row {0:d} ' \
-                       'from the matrix.'.format(item_id)
-
-        else:
-            try:
-                self.dtf_matrix.pop(item_id)
-                self.dic_column_hdrs.pop(item_id)
-                self.n_col = len(self.dtf_matrix.columns)
-            except KeyError:
-                _error_code = 6
-                _msg = 'RTK ERROR: Attempted to drop non-existent column ' \
-                       '{0:d} from the matrix.'.format(item_id)
-
-        return _error_code, _msg
-
-    def update(self, revision_id, matrix_type):
-        """
-        Update the Matrix associated with Matrix type.
-
-        :param int revision_id: the Revision ID the matrix is associated with.
-        :param str matrix_type: the type of the Matrix to update.
-        :return: (_error_code, _msg); the error code and associated message.
-        :rtype: (int, str)
-        """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Updating Matrix {0:s}.'.format(matrix_type)
-
-        _session = self.dao.RTK_SESSION(
-            bind=self.dao.engine,
-            autoflush=True,
-            autocommit=False,
-            expire_on_commit=False)
-
-        for _column_item_id in list(self.dtf_matrix.columns):
-            for _row_item_id in list(self.dtf_matrix.index):
-                _entity = _session.query(RTKMatrix).filter(
-                    and_(RTKMatrix.revision_id == revision_id,
-                         RTKMatrix.matrix_type == matrix_type,
-                         RTKMatrix.column_item_id == int(_column_item_id),
-                         RTKMatrix.row_item_id == int(_row_item_id))).first()
-
-                try:
-                    if _entity is not None:
-                        _entity.value = int(
-                            self.dtf_matrix[_column_item_id][_row_item_id])
-                        _session.add(_entity)
-                        _error_code, _msg = self.dao.db_update(_session)
-                except AttributeError:
-                    _error_code = 6
-                    _msg = 'RTK ERROR: Attempted to save non-existent ' \
-                           'entity with Column ID {0:s} and Row ID {1:s} to ' \
-                           'Matrix {2:s}.'.format(
-                               str(_column_item_id), str(_row_item_id),
-                               matrix_type)
-
-        _session.close()
-
-        return _error_code, _msg
+# -*- coding: utf-8 -*-
+#
+#       rtk.datamodels.matrix.Matrix.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Datamodels Package RTKDataMatrix."""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, bindparam, exc, func
+
+# Import other RTK modules.
+from rtk.dao import RTKMatrix
+
+
+class RTKDataMatrix(object):
+    """
+    The RTK Data Matrix model.
+
+    The Matrix data model is an aggregate model of N x M cell data models.  The
+    attributes of a Matrix are:
+
+    :ivar dict dic_row_hdrs: dictionary of the row heading text to use in
+                             views.  Key is the <MODULE> ID; values are the
+                             noun name to use in the row heading.
+    :ivar dict dic_column_hdrs: dictionary of the column heading text to use
+                                in views.  Key is the <MODULE> ID; values are
+                                the noun name to use in the column heading.
+    :ivar object _column_table: the RTK Progam database table to use for the
+                                matrix columns.  This is an SQLAlchemy object.
+    :ivar object _row_table: the RTK Progam database table to use for the
+                             matrix rows.  This is an SQLAlchemy object.
+    :ivar dtf_matrix: the :class:`pd.DataFrame` storing the Matrix.
+    :ivar _dtf_saved: the :class:`pd.DataFrame` storing the Matrix as it was
+                      last loaded from or saved to the RTK Program database.
+                      Used to find the cells that need to be saved.
+    :ivar int _matrix_id: the matrix ID to use when saving new cells.
+    :ivar dict dic_cells: the non-zero cells of a sparse Matrix.  Key is the
+                          (column ID, row ID) tuple; value is the cell value.
+    :ivar list lst_row_ids: the row IDs of a sparse Matrix.
+    :ivar list lst_column_ids: the column IDs of a sparse Matrix.
+    :ivar bool sparse: indicates whether the Matrix is stored as a dictionary
+                       of the non-zero cells rather than a DataFrame.  The
+                       DataFrame of a sparse Matrix is only built when
+                       dtf_matrix is used and only the non-zero cells are
+                       kept in the RTK Program database.
+    :ivar dao: the :class:`rtk.dao.DAO` object used to communicate with the
+               RTK Program database.
+    :ivar int n_row: the number of rows in the Matrix.
+    :ivar int n_col: the number of columns in the Matrix.
+
+    There are currently 10 matrices as defined by their matrix type.  These
+    are:
+
+        +-------------+--------------+--------------+
+        |  Row Table  | Column Table |  Matrix Type |
+        +-------------+--------------+--------------+
+        | Function    | Hardware     | fnctn_hrdwr  |
+        +-------------+--------------+--------------+
+        | Function    | Software     | fnctn_sftwr  |
+        +-------------+--------------+--------------+
+        | Function    | Validation   | fnctn_vldtn  |
+        +-------------+--------------+--------------+
+        | Requirement | Hardware     | rqrmnt_hrdwr |
+        +-------------+--------------+--------------+
+        | Requirement | Software     | rqrmnt_sftwr |
+        +-------------+--------------+--------------+
+        | Requirement | Validation   | rqrmnt_vldtn |
+        +-------------+--------------+--------------+
+        | Hardware    | Testing      | hrdwr_tstng  |
+        +-------------+--------------+--------------+
+        | Hardware    | Validation   | hrdwr_vldtn  |
+        +-------------+--------------+--------------+
+        | Software    | Risk         |  sftwr_rsk   |
+        +-------------+--------------+--------------+
+        | Software    | Validation   | sftwr_vldtn  |
+        +-------------+--------------+--------------+
+    """
+
+    _tag = 'matrix'
+
+    def __init__(self, dao, row_table, column_table, sparse=False):
+        """
+        Initialize a Matrix data model instance.
+
+        :param dao: the data access object for communicating with the RTK
+                    Program database.
+        :type dao: :class:`rtk.dao.DAO.DAO`
+        :param row_table: the RTK Program database table to use for the
+                          Matrix rows.
+        :param column_table: the RTK Program database table to use for the
+                             Matrix columns.
+        :keyword bool sparse: indicates whether to store only the non-zero
+                              cells of the Matrix.
+        """
+        # Initialize private dictionary attributes.
+        self._dic_saved = None
+
+        # Initialize private list attributes.
+
+        # Initialize private scalar attributes.
+        self._dtf_matrix = None
+        self._dtf_saved = None
+        self._matrix_id = 0
+        self._column_table = column_table
+        self._row_table = row_table
+
+        # Initialize public dictionary attributes.
+        self.dic_cells = {}
+        self.dic_row_hdrs = {}
+        self.dic_column_hdrs = {}
+
+        # Initialize public list attributes.
+        self.lst_row_ids = []
+        self.lst_column_ids = []
+
+        # Initialize public scalar attributes.
+        self.dao = dao
+        self.n_row = 1
+        self.n_col = 1
+        self.sparse = sparse
+
+    @property
+    def dtf_matrix(self):
+        """
+        Get the Matrix as a Pandas DataFrame.
+
+        The DataFrame of a sparse Matrix is built from the non-zero cells the
+        first time it is requested.  Changes made to it are saved by update().
+
+        :return: the Matrix; None if no Matrix has been selected.
+        :rtype: :class:`pd.DataFrame`
+        """
+        if self.sparse and self._dtf_matrix is None and \
+                self._dic_saved is not None:
+            _values = np.zeros((len(self.lst_row_ids),
+                                len(self.lst_column_ids)),
+                               dtype=int)
+            _rows = dict((_id, _idx) for _idx, _id in enumerate(
+                self.lst_row_ids))
+            _columns = dict((_id, _idx) for _idx, _id in enumerate(
+                self.lst_column_ids))
+            for (_column_id, _row_id), _value in self.dic_cells.items():
+                _values[_rows[_row_id], _columns[_column_id]] = _value
+
+            self._dtf_matrix = pd.DataFrame(
+                _values, index=self.lst_row_ids, columns=self.lst_column_ids)
+
+        return self._dtf_matrix
+
+    @dtf_matrix.setter
+    def dtf_matrix(self, value):
+        """
+        Set the Matrix Pandas DataFrame.
+
+        :param value: the DataFrame to use for the Matrix.
+        :type value: :class:`pd.DataFrame`
+        """
+        self._dtf_matrix = value
+
+    def _do_fold_dense(self):
+        """
+        Move the changes made to the DataFrame of a sparse Matrix to its cells.
+
+        The DataFrame is discarded and built again when it is next requested.
+
+        :return: None
+        :rtype: None
+        """
+        if self._dtf_matrix is None:
+            return
+
+        _values = self._dtf_matrix.fillna(0).values
+        _rows, _columns = np.nonzero(_values)
+        self.lst_row_ids = list(self._dtf_matrix.index)
+        self.lst_column_ids = list(self._dtf_matrix.columns)
+        self.dic_cells = dict(
+            ((self.lst_column_ids[_column], self.lst_row_ids[_row]),
+             int(_values[_row, _column]))
+            for _row, _column in zip(_rows, _columns))
+        self._dtf_matrix = None
+
+    def select(self, col, row):
+        """
+        Select the value from the cell identified by col and row.
+
+        :param str col: the column of the cell.  This is the first index of the
+                        Pandas DataFrame.
+        :param str row: the row of the cell.  This is the second index of the
+                        Pandas DataFrame.
+        :return: the value in the cell at (col, row).
+        :rtype: float
+        """
+        if self.sparse and self._dtf_matrix is None:
+            if col not in self.lst_column_ids or row not in self.lst_row_ids:
+                raise KeyError((col, row))
+            return self.dic_cells.get((col, row), 0)
+
+        return self.dtf_matrix[col][row]
+
+    # pylint: disable=R0913
+    def select_all(self,
+                   revision_id,
+                   matrix_type,
+                   rkey='rkey',
+                   ckey='ckey',
+                   rheader=0,
+                   cheader=0):
+        """
+        Select everything needed to build the matrix.
+
+        This method selects the row headngs, the column headings, and the cell
+        values for the matrix then build the matrix as a Pandas DataFrame.  A
+        sparse matrix has one row and column for each row and column heading
+        and only the non-zero cell values are selected.
+
+        :param int revision_id: the ID of the Revision the desired Matrix is
+                                associated with.
+        :param str matrix_type: the type of the Matrix to select all rows and
+                                all columns for.
+        :keyword int rkey: the key in the row table attributes containing the
+                           module ID.
+        :keyword int ckey: the key in the column table attributes containing
+                           the module ID.
+        :keyword int rheader: the index in the row table attributes containing
+                              the text to use for the Matrix row headings.
+        :keyword int cheader: the index in the column table attributes
+                              containing the text to use for the Matrix column
+                              headings.
+        :return: False if successful or True if an error occurs.
+        :rtype: bool
+        """
+        _return = False
+
+        _session = self.dao.RTK_SESSION(
+            bind=self.dao.engine, autoflush=False, expire_on_commit=False)
+
+        self.n_col = 0
+        self.n_row = 0
+        self.lst_row_ids = []
+        self.lst_column_ids = []
+
+        # Retrieve the dictionary of row headings.  The key is the row table's
+        # module ID.  The value is the row table field with string data
+        # (typically the code, description, or name field).
+        for _row in _session.query(self._row_table).filter(
+                self._row_table.revision_id == revision_id).all():
+            _attributes = _row.get_attributes()
+            self.dic_row_hdrs[_attributes[rkey]] = _attributes[rheader]
+            self.lst_row_ids.append(_attributes[rkey])
+
+            self.n_row += 1
+
+        # Retrieve the dictionary of column headings.  The key is the column
+        # table's module ID.  The value is the column table field with string
+        # data (typically the code, description, or name field).
+        for _column in _session.query(self._column_table).filter(
+                self._column_table.revision_id == revision_id).all():
+            _attributes = _column.get_attributes()
+            try:
+                self.dic_column_hdrs[_attributes[ckey]] = _attributes[cheader]
+                self.lst_column_ids.append(_attributes[ckey])
+            except TypeError:
+                print 'FIXME: Handle TypeError in ' \
+                      'RTKDataMatrix.select_all().  Tuple indices must be ' \
+                      'integers, not str.  This will be fixed when all the ' \
+                      'RTK database tables are converted to return dicts ' \
+                      'from the get_attributes() method.  Matrix {0:s} is ' \
+                      'not working.'.format(matrix_type)
+
+            self.n_col += 1
+
+        self._matrix_id = self._do_select_matrix_id(_session, revision_id,
+                                                    matrix_type)
+
+        # Retrieve the matrix values for the desired Matrix ID with a single
+        # query and pivot them into a DataFrame with one column per column
+        # item and one row per row item.
+        _query = _session.query(RTKMatrix.column_item_id,
+                                RTKMatrix.row_item_id, RTKMatrix.value).filter(
+                                    and_(RTKMatrix.revision_id == revision_id,
+                                         RTKMatrix.matrix_type == matrix_type))
+
+        if self.sparse:
+            self.lst_row_ids.sort()
+            self.lst_column_ids.sort()
+            _rows = set(self.lst_row_ids)
+            _columns = set(self.lst_column_ids)
+            self.dic_cells = dict(
+                ((_column_id, _row_id), _value)
+                for _column_id, _row_id, _value in _query.filter(
+                    RTKMatrix.value != 0).all()
+                if _column_id in _columns and _row_id in _rows)
+            self._dic_saved = dict(self.dic_cells)
+            self._dtf_matrix = None
+        else:
+            _cells = _query.all()
+            if _cells:
+                self.dtf_matrix = pd.DataFrame.from_records(
+                    _cells, columns=['column', 'row', 'value']).\
+                    drop_duplicates(['column', 'row'], keep='last').\
+                    pivot(index='row', columns='column', values='value')
+                self.dtf_matrix.index.name = None
+                self.dtf_matrix.columns.name = None
+            else:
+                self.dtf_matrix = pd.DataFrame()
+
+            self._dtf_saved = self.dtf_matrix.copy()
+
+        _session.close()
+
+        return _return
+
+    @staticmethod
+    def _do_select_matrix_id(session, revision_id, matrix_type):
+        """
+        Select the matrix ID to use when saving new cells of the Matrix.
+
+        :param session: the SQLAlchemy session to use for the query.
+        :param int revision_id: the Revision ID the matrix is associated with.
+        :param str matrix_type: the type of the Matrix.
+        :return: the matrix ID of the existing cells of the Matrix or the next
+                 unused matrix ID if the Matrix has no cells.
+        :rtype: int
+        """
+        _matrix_id = session.query(RTKMatrix.matrix_id).filter(
+            and_(RTKMatrix.revision_id == revision_id,
+                 RTKMatrix.matrix_type == matrix_type)).first()
+        if _matrix_id is not None:
+            return _matrix_id[0]
+
+        _matrix_id = session.query(func.max(RTKMatrix.matrix_id)).filter(
+            RTKMatrix.revision_id == revision_id).scalar()
+
+        return (_matrix_id or 0) + 1
+
+    def insert(self, item_id, heading, row=True):
+        """
+        Insert a row or a column into the matrix.
+
+        :param int item_id: the ID of the row or column item to insert into the
+                            Matrix (this is the module ID associated with the
+                            row or column to be inserted).
+        :param str heading: the heading for the new row or column.
+        :keyword bool row: indicates whether to insert a row (default) or a
+                           column.
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
+        """
+        if self.sparse:
+            return self._do_insert_sparse(item_id, heading, row)
+
+        return self._do_insert_dense(item_id, heading, row)
+
+    def _do_insert_sparse(self, item_id, heading, row):
+        """
+        Insert a row or a column into a sparse matrix.
+
+        :param int item_id: the ID of the row or column item to insert.
+        :param str heading: the heading for the new row or column.
+        :param bool row: indicates whether to insert a row or a column.
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = 'RTK SUCCESS: Inserting a row or column into the matrix.'
+
+        self._do_fold_dense()
+        if row and item_id in self.lst_row_ids:
+            _error_code = 6
+            _msg = 'RTK ERROR: Attempting to insert row {0:d} into a ' \
+                   'matrix already containing a row {0:d}.'.format(item_id)
+        elif row:
+            self.dic_row_hdrs[item_id] = heading
+            self.lst_row_ids.append(item_id)
+            self.n_row = len(self.lst_row_ids)
+        elif item_id in self.lst_column_ids:
+            _error_code = 6
+            _msg = 'RTK ERROR: Inserting column into matrix.  Column ' \
+                   '{0:d} already exists or adjacent column {1:d} does ' \
+                   'NOT exist.'.format(item_id, self.n_col)
+        else:
+            self.dic_column_hdrs[item_id] = heading
+            self.lst_column_ids.append(item_id)
+            self.n_col = len(self.lst_column_ids)
+
+        return _error_code, _msg
+
+    def _do_insert_dense(self, item_id, heading, row):
+        """
+        Insert a row or a column into a dense matrix.
+
+        :param int item_id: the ID of the row or column item to insert.
+        :param str heading: the heading for the new row or column.
+        :param bool row: indicates whether to insert a row or a column.
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = 'RTK SUCCESS: Inserting a row or column into the matrix.'
+
+        if row:
+            if (self.dtf_matrix.index == item_id).any():
+                _error_code = 6
+                _msg = 'RTK ERROR: Attempting to insert row {0:d} into a ' \
+                       'matrix already containing a row {0:d}.'.format(item_id)
+            else:
+                self.dic_row_hdrs[item_id] = heading
+                _values = [0] * len(self.dtf_matrix.columns)
+                try:
+                    self.dtf_matrix.loc[item_id] = _values
+                    self.n_row = len(self.dtf_matrix.index)
+                except ValueError:
+                    _error_code = 6
+                    _msg = 'RTK ERROR: Inserting row into matrix.  Row ' \
+                           '{0:d} already exists or adjacent row {1:d} does ' \
+                           'NOT exist.'.format(item_id, self.n_row - 1)
+        else:
+            self.dic_column_hdrs[item_id] = heading
+            _values = [0] * len(self.dtf_matrix.index)
+
+            try:
+                self.dtf_matrix.insert(self.n_col, item_id, _values)
+                self.n_col = len(self.dtf_matrix.columns)
+            except ValueError:
+                _error_code = 6
+                _msg = 'RTK ERROR: Inserting column into matrix.  Column ' \
+                       '{0:d} already exists or adjacent column {1:d} does ' \
+                       'NOT exist.'.format(item_id, self.n_col)
+
+        return _error_code, _msg
+
+    def delete(self, item_id, row=True):
+        """
+        Delete a column or row from the Matrix.
+
+        :param int item_id: the ID of the row or column item to delete from the
+                            Matrix.
+        :param bool row: indicates whether to delete a row (default) or a
+                         column identified by identifier.
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = 'RTK SUCCESS: Removing a row or column from the matrix.'
+
+        if self.sparse:
+            self._do_fold_dense()
+            if row and item_id in self.lst_row_ids:
+                self.lst_row_ids.remove(item_id)
+                self.dic_row_hdrs.pop(item_id, None)
+                self.dic_cells = dict(
+                    (_key, _value) for _key, _value in self.dic_cells.items()
+                    if _key[1] != item_id)
+                self.n_row = len(self.lst_row_ids)
+            elif row:
+                _error_code = 6
+                _msg = 'RTK ERROR: Attempted to drop non-existent row {0:d} ' \
+                       'from the matrix.'.format(item_id)
+            elif item_id in self.lst_column_ids:
+                self.lst_column_ids.remove(item_id)
+                self.dic_column_hdrs.pop(item_id, None)
+                self.dic_cells = dict(
+                    (_key, _value) for _key, _value in self.dic_cells.items()
+                    if _key[0] != item_id)
+                self.n_col = len(self.lst_column_ids)
+            else:
+                _error_code = 6
+                _msg = 'RTK ERROR: Attempted to drop non-existent column ' \
+                       '{0:d} from the matrix.'.format(item_id)
+        elif row:
+            try:
+                self.dtf_matrix = self.dtf_matrix.drop(item_id)
+                self.dic_row_hdrs.pop(item_id)
+                self.n_row = len(self.dtf_matrix.index)
+            except (KeyError, ValueError):
+                _error_code = 6
+                _msg = 'RTK ERROR: Attempted to drop non-existent row {0:d} ' \
+                       'from the matrix.'.format(item_id)
+
+        else:
+            try:
+                self.dtf_matrix.pop(item_id)
+                self.dic_column_hdrs.pop(item_id)
+                self.n_col = len(self.dtf_matrix.columns)
+            except KeyError:
+                _error_code = 6
+                _msg = 'RTK ERROR: Attempted to drop non-existent column ' \
+                       '{0:d} from the matrix.'.format(item_id)
+
+        return _error_code, _msg
+
+    def _do_get_changes(self, revision_id, matrix_type):
+        """
+        Find the cells that changed since the Matrix was loaded or saved.
+
+        :param int revision_id: the Revision ID the matrix is associated with.
+        :param str matrix_type: the type of the Matrix.
+        :return: (_updates, _inserts); the list of parameters for the cells
+                 that exist in the RTK Program database and the list of rows
+                 for the cells that do not.
+        :rtype: (list, list)
+        """
+        _updates = []
+        _inserts = []
+
+        if self._dtf_saved is None:
+            self._dtf_saved = pd.DataFrame()
+
+        _saved = self._dtf_saved.reindex(
+            index=self.dtf_matrix.index,
+            columns=self.dtf_matrix.columns).values
+        _values = self.dtf_matrix.values
+        _rows, _columns = np.nonzero(
+            pd.notnull(_values) & (_values != _saved))
+
+        for _row, _column in zip(_rows, _columns):
+            _column_item_id = int(self.dtf_matrix.columns[_column])
+            _row_item_id = int(self.dtf_matrix.index[_row])
+            _value = int(_values[_row, _column])
+            if pd.isnull(_saved[_row, _column]):
+                _inserts.append({
+                    'fld_revision_id': revision_id,
+                    'fld_matrix_id': self._matrix_id,
+                    'fld_matrix_type': matrix_type,
+                    'fld_column_id': int(_column),
+                    'fld_column_item_id': _column_item_id,
+                    'fld_row_id': int(_row),
+                    'fld_row_item_id': _row_item_id,
+                    'fld_value': _value
+                })
+            else:
+                _updates.append({
+                    'revision_id': revision_id,
+                    'matrix_type': matrix_type,
+                    'column_item_id': _column_item_id,
+                    'row_item_id': _row_item_id,
+                    'value': _value
+                })
+
+        return _updates, _inserts
+
+    def _do_get_sparse_changes(self, revision_id, matrix_type):
+        """
+        Find the cells of a sparse Matrix that changed since it was saved.
+
+        :param int revision_id: the Revision ID the matrix is associated with.
+        :param str matrix_type: the type of the Matrix.
+        :return: (_updates, _inserts, _deletes); the list of parameters for
+                 the cells with a new non-zero value, the list of rows for the
+                 cells that became non-zero, and the list of parameters for
+                 the cells that became zero.
+        :rtype: (list, list, list)
+        """
+        _updates = []
+        _inserts = []
+        _deletes = []
+
+        self._do_fold_dense()
+        _dic_column_pos = dict((_item_id, _pos) for _pos, _item_id in
+                               enumerate(self.lst_column_ids))
+        _dic_row_pos = dict((_item_id, _pos) for _pos, _item_id in
+                            enumerate(self.lst_row_ids))
+
+        for (_column_item_id, _row_item_id), _value in self.dic_cells.items():
+            _saved = self._dic_saved.get((_column_item_id, _row_item_id))
+            if _saved is None:
+                _inserts.append({
+                    'fld_revision_id': revision_id,
+                    'fld_matrix_id': self._matrix_id,
+                    'fld_matrix_type': matrix_type,
+                    'fld_column_id': _dic_column_pos[_column_item_id],
+                    'fld_column_item_id': int(_column_item_id),
+                    'fld_row_id': _dic_row_pos[_row_item_id],
+                    'fld_row_item_id': int(_row_item_id),
+                    'fld_value': int(_value)
+                })
+            elif _saved != _value:
+                _updates.append({
+                    'revision_id': revision_id,
+                    'matrix_type': matrix_type,
+                    'column_item_id': int(_column_item_id),
+                    'row_item_id': int(_row_item_id),
+                    'value': int(_value)
+                })
+
+        for _column_item_id, _row_item_id in self._dic_saved:
+            if (_column_item_id, _row_item_id) not in self.dic_cells:
+                _deletes.append({
+                    'revision_id': revision_id,
+                    'matrix_type': matrix_type,
+                    'column_item_id': int(_column_item_id),
+                    'row_item_id': int(_row_item_id)
+                })
+
+        return _updates, _inserts, _deletes
+
+    def _do_execute_changes(self, session, revision_id, matrix_type,
+                            updates, inserts, deletes):
+        """
+        Execute the changed cells of the Matrix in the session.
+
+        Each list of cells is written with a single executemany statement.
+        The session is neither committed nor rolled back.
+
+        :param session: the SQLAlchemy scoped_session to execute in.
+        :param int revision_id: the Revision ID the matrix is associated with.
+        :param str matrix_type: the type of the Matrix to update.
+        :param list updates: the parameters for the cells to update.
+        :param list inserts: the rows for the cells to insert.
+        :param list deletes: the parameters for the cells to delete.
+        :return: None
+        :rtype: None
+        """
+        _table = RTKMatrix.__table__
+        _where = and_(
+            _table.c.fld_revision_id == bindparam('revision_id'),
+            _table.c.fld_matrix_type == bindparam('matrix_type'),
+            _table.c.fld_column_item_id == bindparam('column_item_id'),
+            _table.c.fld_row_item_id == bindparam('row_item_id'))
+
+        if updates:
+            session.execute(
+                _table.update().where(_where).values(
+                    fld_value=bindparam('value')), updates)
+        if deletes:
+            session.execute(_table.delete().where(_where), deletes)
+        if self.sparse:
+            session.execute(_table.delete().where(
+                and_(_table.c.fld_revision_id == revision_id,
+                     _table.c.fld_matrix_type == matrix_type,
+                     _table.c.fld_value == 0)))
+        if inserts:
+            session.execute(_table.insert(), inserts)
+
+    def update(self, revision_id, matrix_type):
+        """
+        Update the Matrix associated with Matrix type.
+
+        Only the cells that changed since the Matrix was loaded or last saved
+        are written to the RTK Program database.  Existing cells are updated
+        and new cells are inserted in a single transaction.  The cells of a
+        sparse Matrix that became zero are deleted along with any zero cells
+        saved before the Matrix was sparse.
+
+        :param int revision_id: the Revision ID the matrix is associated with.
+        :param str matrix_type: the type of the Matrix to update.
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = 'RTK SUCCESS: Updating Matrix {0:s}.'.format(matrix_type)
+
+        if self.sparse and self._dic_saved is not None:
+            _updates, _inserts, _deletes = self._do_get_sparse_changes(
+                revision_id, matrix_type)
+        elif not self.sparse and self.dtf_matrix is not None:
+            _updates, _inserts = self._do_get_changes(revision_id, matrix_type)
+            _deletes = []
+        else:
+            return _error_code, _msg
+
+        if not _updates and not _inserts and not _deletes:
+            return _error_code, _msg
+
+        _session = self.dao.RTK_SESSION(
+            bind=self.dao.engine,
+            autoflush=True,
+            autocommit=False,
+            expire_on_commit=False)
+
+        try:
+            self._do_execute_changes(_session, revision_id, matrix_type,
+                                     _updates, _inserts, _deletes)
+            _session.commit()
+
+            if self.sparse:
+                self._dic_saved = dict(self.dic_cells)
+            else:
+                self._dtf_saved = self.dtf_matrix.copy()
+        except (exc.SQLAlchemyError, exc.DBAPIError) as error:
+            print error
+            _session.rollback()
+            _error_code = 6
+            _msg = 'RTK ERROR: Updating Matrix {0:s}.'.format(matrix_type)
+
+        _session.close()
+
+        return _error_code, _msg
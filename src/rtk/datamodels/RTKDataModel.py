@@ -96,14 +96,17 @@ class RTKDataModel(object):  # pragma: no cover
 
         :param list entities: the list of RTK<MODULE> entities to add to the
                               RTK Program database.
+        :keyword bool bulk: indicates whether to add all the entities in a
+                            single transaction.
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
         _entities = kwargs['entities']
+        _bulk = kwargs.get('bulk', False)
         _session = self.dao.RTK_SESSION(
             bind=self.dao.engine, autoflush=False, expire_on_commit=False)
 
-        _error_code, _msg = self.dao.db_add(_entities, _session)
+        _error_code, _msg = self.dao.db_add(_entities, _session, bulk=_bulk)
 
         _session.close()
 
@@ -169,3 +172,37 @@ class RTKDataModel(object):  # pragma: no cover
         _session.close()
 
         return _error_code, _msg
+
+    def update_all(self, entities=None):
+        """
+        Update all the RTK<MODULE> instances in the RTK Program database.
+
+        All the entities are saved in a single session and transaction.
+
+        :keyword list entities: the RTK<MODULE> instances to update.  Defaults
+                                to all the instances in the RTK<MODULE> tree.
+        :return: (_error_code, _msg); the error code and associated message.
+                 The message is empty if there was nothing to update.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = ''
+
+        if entities is None:
+            entities = [
+                _node.data for _node in self.tree.all_nodes()
+                if _node.data is not None
+            ]
+
+        if entities:
+            _session = self.dao.RTK_SESSION(
+                bind=self.dao.engine,
+                autoflush=True,
+                autocommit=False,
+                expire_on_commit=False)
+
+            _error_code, _msg = self.dao.db_update_many(entities, _session)
+
+            _session.close()
+
+        return _error_code, _msg
@@ -311,7 +311,8 @@ class ListView(RTKListView):
             self._on_select_revision(self._revision_id)
         else:
             _prompt = _(u"A problem occurred while attempting to delete {0:s} "
-                        u"with ID {1:d}.").format(_level.title(), _node_id)
+                        u"with ID {1:s}.").format(_level.title(),
+                                                  str(_node_id))
             rtk.RTKMessageDialog(_prompt, self._dic_icons['error'], 'error')
 
             _return = True
@@ -338,10 +339,12 @@ class ListView(RTKListView):
         _level = _model.get_value(_row, 11)
         _prow = _model.iter_parent(_row)
 
+        # The Node IDs in column 9 are strings; missions are added to the root
+        # of the Usage Profile tree, Node ID '0'.
         if sibling:
             if _level == 'mission':
                 _entity_id = self._revision_id
-                _parent_id = 0
+                _parent_id = '0'
             else:
                 _entity_id = _model.get_value(_prow, 1)
                 _parent_id = _model.get_value(_prow, 9)
@@ -456,7 +459,7 @@ class ListView(RTKListView):
             gtk.gdk.Pixbuf, gobject.TYPE_INT, gobject.TYPE_STRING,
             gobject.TYPE_STRING, gobject.TYPE_STRING, gobject.TYPE_FLOAT,
             gobject.TYPE_FLOAT, gobject.TYPE_FLOAT, gobject.TYPE_FLOAT,
-            gobject.TYPE_INT, gobject.TYPE_INT, gobject.TYPE_STRING)
+            gobject.TYPE_STRING, gobject.TYPE_INT, gobject.TYPE_STRING)
         self.treeview.set_model(_model)
 
         for i in range(10):
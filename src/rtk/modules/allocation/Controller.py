@@ -58,6 +58,17 @@ class AllocationDataController(RTKDataController):
         # Initialize public scalar attributes.
         self.system_hazard_rate = 0.0
 
+    def _do_get_hazard_rates(self):
+        """
+        Retrieve the current hazard rate of each item in the Hardware BoM.
+
+        :return: the current hazard rates keyed by the Hardware ID.
+        :rtype: dict
+        """
+        return dict((_node.identifier, _node.data['hazard_rate_logistics'])
+                    for _node in self._dtm_hardware_bom.tree.all_nodes()
+                    if _node.data is not None)
+
     def request_select(self, node_id):
         """
         Request the RTK Program database record associated with Node ID.
@@ -204,3 +215,51 @@ class AllocationDataController(RTKDataController):
                 self, 0, '', 'calculatedAllocation')
 
         return _return
+
+    def request_calculate_all(self):
+        """
+        Request the allocation calculations for the entire allocation tree.
+
+        The current hazard rate of each hardware item is taken from the
+        Hardware BoM selected with the allocation.
+
+        :return: False if successful or True is an error is encountered.
+        :rtype: bool
+        """
+        _return = self._dtm_data_model.calculate_all(
+            self._do_get_hazard_rates())
+
+        if not _return:
+            _return = RTKDataController.do_handle_results(
+                self, 0, '', 'calculatedAllocation')
+
+        return _return
+
+    def request_calculate_feasibility(self, node_id, distributions=None,
+                                      **kwargs):
+        """
+        Request the probability the allocated goals will be met.
+
+        :param int node_id: the Node (Hardware) ID of the hardware item whose
+                            goal is to be allocated.
+        :param dict distributions: the distributions of the uncertain
+                                   attributes of each child keyed by the
+                                   Hardware ID.
+        :return: False if successful or True is an error is encountered.
+        :rtype: bool
+        """
+        _error_code, _msg = self._dtm_data_model.calculate_feasibility(
+            node_id, self._do_get_hazard_rates(), distributions, **kwargs)
+
+        return RTKDataController.do_handle_results(self, _error_code, _msg,
+                                                   None)
+
+    def request_goal_feasibility(self):
+        """
+        Request the probability each allocated goal will be met.
+
+        :return: the probability each goal will be met keyed by the Hardware
+                 ID.
+        :rtype: dict
+        """
+        return self._dtm_data_model.goal_feasibility
@@ -6,11 +6,279 @@
 # Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
 """FMEA Package Data Models."""
 
+from functools import partial
+from itertools import chain
+
+import numpy as np
+
 # Import other RTK modules.
+import rtk.Utilities as Utilities
 from rtk.datamodels import RTKDataModel
 from rtk.dao import RTKAllocation
 
 
+def do_allocate(method_id, n_sub_systems, reliability_goal, hazard_rate_goal,
+                cum_weight, system_hr, hazard_rate, mission_time, duty_cycle,
+                n_sub_elements, weight_factor, foo_weight):
+    """
+    Allocate the parent goals to a batch of child hardware items.
+
+    Each argument is an array with one value per child hardware item.  The
+    parent values are repeated for each of the parent's children.  The
+    arguments are broadcast together so a scalar or an array with an extra
+    dimension (e.g., one row per Monte Carlo trial) can be passed as well.
+    The results are the same as calling the RTKAllocation apportionment
+    method selected by the method ID for each child.
+
+    :param method_id: the allocation method ID of the parent (1=equal,
+                      2=AGREE, 3=ARINC, 4=feasibility of objectives).
+    :param n_sub_systems: the number of included children of the parent.
+    :param reliability_goal: the reliability goal of the parent.
+    :param hazard_rate_goal: the hazard rate goal of the parent.
+    :param cum_weight: the cumulative feasibility of objectives weight factor
+                       of the parent's children.
+    :param system_hr: the current hazard rate of the parent.
+    :param hazard_rate: the current hazard rate of the child.
+    :param mission_time: the mission time of the child.
+    :param duty_cycle: the duty cycle of the child.
+    :param n_sub_elements: the number of sub-elements of the child.
+    :param weight_factor: the AGREE weight factor of the child.
+    :param foo_weight: the feasibility of objectives weight factor of the
+                       child.
+    :return: (_reliability, _hazard_rate, _mtbf, _weight_factor, _percent,
+             _bad); the allocated reliability, hazard rate, and MTBF, the
+             ARINC weight factor, the feasibility of objectives percent
+             weight factor, and whether the allocation failed for each child.
+             The allocated values are zero when the allocation fails.
+    :rtype: tuple
+    """
+    _equal = method_id == 1
+    _agree = method_id == 2
+    _arinc = method_id == 3
+    _foo = method_id == 4
+
+    with np.errstate(all='ignore'):
+        _weight_i = 1.0 / n_sub_systems
+        _mtbf_agree = (
+            (n_sub_systems * weight_factor * mission_time * duty_cycle / 100.0)
+            / (-1.0 * n_sub_elements * np.log(reliability_goal)))
+        _weight_factor = hazard_rate / system_hr
+        _percent = np.asarray(foo_weight, dtype=float) / cum_weight
+
+        _reliability = np.where(_equal, reliability_goal**_weight_i, 0.0)
+        _hazard_rate = np.select(
+            [_equal, _agree, _arinc, _foo], [
+                -1.0 * np.log(_reliability) / mission_time,
+                1.0 / _mtbf_agree, _weight_factor * hazard_rate_goal,
+                _percent * hazard_rate_goal
+            ],
+            default=0.0)
+        _mtbf = np.where(_agree, _mtbf_agree, 1.0 / _hazard_rate)
+        _reliability = np.where(_equal, _reliability,
+                                np.exp(-1.0 * _hazard_rate * mission_time))
+
+    # The apportionment methods fail on the same inputs that leave one of the
+    # allocated values infinite or NaN here.
+    _bad = (_equal | _agree | _arinc | _foo) & ~(
+        np.isfinite(_reliability) & np.isfinite(_hazard_rate)
+        & np.isfinite(_mtbf))
+    _reliability = np.where(_bad, 0.0, _reliability)
+    _hazard_rate = np.where(_bad, 0.0, _hazard_rate)
+    _mtbf = np.where(_bad, 0.0, _mtbf)
+    _weight_factor = np.where(_bad, 0.0, _weight_factor)
+    _percent = np.where(_bad, 0.0, _percent)
+
+    return _reliability, _hazard_rate, _mtbf, _weight_factor, _percent, _bad
+
+
+# The attributes of the child hardware items that can be sampled by the
+# allocation feasibility analysis and the numpy.random.RandomState()
+# distributions they can be sampled from.
+FEASIBILITY_ATTRIBUTES = [
+    'hazard_rate', 'int_factor', 'soa_factor', 'op_time_factor', 'env_factor'
+]
+FEASIBILITY_DISTRIBUTIONS = ['lognormal', 'normal', 'triangular', 'uniform']
+
+
+def _do_sample(random_state, n_trials, values, samplers):
+    """
+    Sample one attribute of each child hardware item.
+
+    :param random_state: the random number generator to sample with.
+    :type random_state: :class:`numpy.random.RandomState`
+    :param int n_trials: the number of trials to sample.
+    :param values: the array of current values of the attribute.  These are
+                   used in every trial for the children that aren't sampled.
+    :type values: :class:`numpy.ndarray`
+    :param list samplers: the list of (distribution, columns, parameters) of
+                          the children that are sampled.
+    :return: _samples; the (n_trials, n_children) array of samples.  Negative
+             samples are set to zero.
+    :rtype: :class:`numpy.ndarray`
+    """
+    _samples = None
+    for _distribution, _columns, _parameters in samplers:
+        _sample = getattr(random_state, _distribution)(
+            *_parameters, size=(n_trials, len(_columns)))
+        if len(_columns) == len(values):
+            _samples = _sample
+        else:
+            if _samples is None:
+                _samples = np.tile(values, (n_trials, 1))
+            _samples[:, _columns] = _sample
+
+    if _samples is None:
+        return np.broadcast_to(values, (n_trials, len(values)))
+
+    return np.maximum(_samples, 0.0, out=_samples)
+
+
+def do_simulate_feasibility(chunk, allocation, samplers):
+    """
+    Simulate a chunk of allocation feasibility trials.
+
+    This is a module function so it can be sent to the worker processes used
+    by AllocationDataModel.calculate_feasibility().
+
+    :param tuple chunk: the (seed, number of trials) of the chunk.
+    :param dict allocation: the current values of the parent and child
+                            attributes keyed by the do_allocate() argument or
+                            RTKAllocation attribute name.
+    :param dict samplers: the list of (distribution, columns, parameters) of
+                          the sampled children keyed by attribute name.
+    :return: (_n_met, _n_goal_met); the array of the number of trials each
+             child's sampled hazard rate met its allocation and the number of
+             trials the sum of the sampled hazard rates met the parent goal.
+    :rtype: tuple
+    """
+    _seed, _n_trials = chunk
+    _random_state = np.random.RandomState(_seed)
+
+    _samples = {}
+    for _attribute in FEASIBILITY_ATTRIBUTES:
+        _samples[_attribute] = _do_sample(_random_state, _n_trials,
+                                          allocation[_attribute],
+                                          samplers.get(_attribute, []))
+
+    _foo_weights = (_samples['int_factor'] * _samples['soa_factor'] *
+                    _samples['op_time_factor'] * _samples['env_factor'])
+    __, _hazard_rate, __, __, __, _bad = do_allocate(
+        allocation['method_id'], allocation['n_sub_systems'],
+        allocation['reliability_goal'], allocation['hazard_rate_goal'],
+        _foo_weights.sum(axis=1)[:, np.newaxis], allocation['system_hr'],
+        allocation['hazard_rate'], allocation['mission_time'],
+        allocation['duty_cycle'], allocation['n_sub_elements'],
+        allocation['weight_factor'], _foo_weights)
+
+    _n_met = ((_samples['hazard_rate'] <= _hazard_rate) & ~_bad).sum(axis=0)
+    _n_goal_met = int(((_samples['hazard_rate'] * allocation['included']).sum(
+        axis=1) <= allocation['hazard_rate_goal']).sum())
+
+    return _n_met, _n_goal_met
+
+
+def _do_check_sampler(sampler):
+    """
+    Check a sampler of an attribute of a child hardware item.
+
+    :param tuple sampler: the (distribution, parameters) to check.
+    :return: (_distribution, _parameters)
+    :rtype: tuple
+    :raise: TypeError or ValueError if the distribution isn't one of
+            FEASIBILITY_DISTRIBUTIONS or can't be sampled with the parameters.
+    """
+    _distribution, _parameters = sampler
+    if _distribution not in FEASIBILITY_DISTRIBUTIONS:
+        raise ValueError
+    getattr(np.random.RandomState(0), _distribution)(*_parameters)
+
+    return _distribution, _parameters
+
+
+def _do_get_samplers(children, distributions):
+    """
+    Group the children sampled from the same distribution.
+
+    Each group is sampled with one call in do_simulate_feasibility().
+
+    :param list children: the RTKAllocation records of the child hardware
+                          items.
+    :param dict distributions: the distributions of the uncertain attributes
+                               of each child keyed by the Hardware ID.
+    :return: (_samplers, _lst_errors); the list of (distribution, columns,
+             parameters) of the sampled children keyed by attribute name and
+             the list of the samplers that aren't valid.
+    :rtype: tuple
+    """
+    _samplers = {}
+    _lst_errors = []
+    for _attribute in FEASIBILITY_ATTRIBUTES:
+        _groups = {}
+        for _column, _child in enumerate(children):
+            try:
+                _sampler = distributions[_child.hardware_id][_attribute]
+            except KeyError:
+                continue
+            try:
+                _distribution, _parameters = _do_check_sampler(_sampler)
+            except (TypeError, ValueError):
+                _lst_errors.append(
+                    '{0} for the {1:s} of Hardware ID {2:d}.'.format(
+                        _sampler, _attribute, _child.hardware_id))
+                continue
+            _group = _groups.setdefault((_distribution, len(_parameters)),
+                                        ([], []))
+            _group[0].append(_column)
+            _group[1].append(_parameters)
+        _samplers[_attribute] = [
+            (_key[0], _lst_columns,
+             tuple(np.array(_lst_parameters, dtype=float).T))
+            for _key, (_lst_columns,
+                       _lst_parameters) in sorted(_groups.items())
+        ]
+
+    return _samplers, _lst_errors
+
+
+def _do_get_allocation(parent, children, hazard_rates):
+    """
+    Collect the values do_simulate_feasibility() allocates with.
+
+    :param parent: the RTKAllocation record of the parent hardware item.
+    :param list children: the RTKAllocation records of the child hardware
+                          items.
+    :param dict hazard_rates: the current hazard rate of the parent and each
+                              child keyed by the Hardware ID.
+    :return: _allocation; the current values of the parent and child
+             attributes keyed by the do_allocate() argument or RTKAllocation
+             attribute name.
+    :rtype: dict
+    """
+    _allocation = {
+        'method_id': parent.method_id,
+        'reliability_goal': parent.reliability_goal,
+        'hazard_rate_goal': parent.hazard_rate_goal,
+        'system_hr': hazard_rates.get(parent.hardware_id, 0.0),
+        'hazard_rate': np.array(
+            [
+                hazard_rates.get(_child.hardware_id, 0.0)
+                for _child in children
+            ],
+            dtype=float)
+    }
+    for _attribute in [
+            'included', 'mission_time', 'duty_cycle', 'n_sub_elements',
+            'weight_factor', 'int_factor', 'soa_factor', 'op_time_factor',
+            'env_factor'
+    ]:
+        _allocation[_attribute] = np.array(
+            [getattr(_child, _attribute) for _child in children], dtype=float)
+    _allocation['included'] = (_allocation['included'] != 0)
+    _allocation['n_sub_systems'] = int(_allocation['included'].sum())
+
+    return _allocation
+
+
 class AllocationDataModel(RTKDataModel):
     """
     Contain the attributes and methods of a reliability allocation.
@@ -38,6 +306,7 @@ class AllocationDataModel(RTKDataModel):
         # Initialize private scalar attributes.
 
         # Initialize public dictionary attributes.
+        self.goal_feasibility = {}
 
         # Initialize public list attributes.
 
@@ -159,26 +428,10 @@ class AllocationDataModel(RTKDataModel):
         """
         Update all RTKAllocation records.
 
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.hardware_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.allocation.Model.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.allocation.Model.update_all().'
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
     def calculate(self, node_id, hazard_rates=None):
         """
@@ -230,3 +483,275 @@ class AllocationDataModel(RTKDataModel):
             _return = True
 
         return _return
+
+    def calculate_all(self, hazard_rates=None):
+        """
+        Calculate and allocate the goals for the entire allocation tree.
+
+        The tree is allocated one level at a time from the top down.  The
+        goals of each top-level hardware item are calculated from its goal
+        measure.  The goal of every other hardware item is the allocation it
+        receives from its parent.  The children of a hardware item whose goals
+        or allocation couldn't be calculated are not allocated.
+
+        :param dict hazard_rates: the current hazard rate of each hardware item
+                                  keyed by the Hardware ID (only needed for
+                                  ARINC apportionment).
+        :return: False if successful or True if an error is encountered.
+        :rtype: bool
+        """
+        _return = False
+
+        if hazard_rates is None:
+            hazard_rates = {}
+
+        _level = []
+        for _node in self.tree.children(self.tree.root):
+            if _node.data.calculate_goals():
+                _return = True
+            elif _node.fpointer:
+                _level.append(_node)
+
+        while _level:
+            _parents, _children, _index, _values, _foo_weights, _goals = \
+                self._do_gather_level(_level, hazard_rates)
+
+            _n_sub_systems = np.bincount(
+                _index, weights=_values[:, 0], minlength=len(_parents))
+            _cum_weights = np.zeros(len(_parents), dtype=_foo_weights.dtype)
+            np.add.at(_cum_weights, _index, _foo_weights)
+
+            for _parent, _n_children, _cum_weight in zip(
+                    _parents,
+                    _n_sub_systems.astype(int).tolist(),
+                    _cum_weights.tolist()):
+                _parent.n_sub_systems = _n_children
+                _parent.weight_factor = _cum_weight
+
+            _allocations = do_allocate(
+                _goals[_index, 0], _n_sub_systems[_index], _goals[_index, 1],
+                _goals[_index, 2], _cum_weights[_index], _goals[_index, 3],
+                _values[:, 1], _values[:, 2], _values[:, 3], _values[:, 4],
+                _values[:, 5], _foo_weights)
+
+            _level, _bad = self._do_set_level(_children, _goals[_index, 0],
+                                              _allocations, _foo_weights)
+            _return = _return or _bad
+
+        return _return
+
+    def _do_gather_level(self, level, hazard_rates):
+        """
+        Gather the values of one level of the allocation tree into arrays.
+
+        :param list level: the treelib Node()s of the parents being
+                           allocated.
+        :param dict hazard_rates: the current hazard rate of each hardware item
+                                  keyed by the Hardware ID.
+        :return: (_parents, _children, _index, _values, _foo_weights, _goals);
+                 the parent RTKAllocation records, the child treelib
+                 Node()s, the index of each child's parent, the array of the
+                 (included, hazard rate, mission time, duty cycle, number of
+                 sub-elements, weight factor) of each child, the array of the
+                 feasibility of objectives weight of each child, and the array
+                 of the (method ID, reliability goal, hazard rate goal, hazard
+                 rate) of each parent.
+        :rtype: tuple
+        """
+        _parents = [_node.data for _node in level]
+        _children = [self.tree.children(_node.identifier) for _node in level]
+        _index = np.repeat(
+            np.arange(len(_parents)), [len(_nodes) for _nodes in _children])
+        _children = list(chain.from_iterable(_children))
+
+        _values = np.array(
+            [(_node.data.included != 0,
+              hazard_rates.get(_node.identifier, 0.0), _node.data.mission_time,
+              _node.data.duty_cycle, _node.data.n_sub_elements,
+              _node.data.weight_factor) for _node in _children],
+            dtype=float)
+        _foo_weights = np.array([
+            _node.data.int_factor * _node.data.soa_factor *
+            _node.data.op_time_factor * _node.data.env_factor
+            for _node in _children
+        ])
+        _goals = np.array(
+            [(_parent.method_id, _parent.reliability_goal,
+              _parent.hazard_rate_goal,
+              hazard_rates.get(_parent.hardware_id, 0.0))
+             for _parent in _parents],
+            dtype=float)
+
+        return _parents, _children, _index, _values, _foo_weights, _goals
+
+    @staticmethod
+    def _do_set_level(children, method_ids, allocations, foo_weights):
+        """
+        Write the allocations of one level back to the child records.
+
+        :param list children: the child treelib Node()s.
+        :param method_ids: the array of the allocation method ID of each
+                           child's parent.
+        :type method_ids: :class:`numpy.ndarray`
+        :param tuple allocations: the arrays returned by do_allocate().
+        :param foo_weights: the array of the feasibility of objectives weight
+                            of each child.
+        :type foo_weights: :class:`numpy.ndarray`
+        :return: (_level, _return); the list of child treelib Node()s to
+                 allocate next and True if an allocation couldn't be
+                 calculated or False otherwise.
+        :rtype: tuple
+        """
+        _return = False
+        _level = []
+        (_reliability, _hazard_rate, _mtbf, _weight_factor, _percent,
+         _bad) = allocations
+        for (_node, _method_id, _reliability_i, _hazard_rate_i, _mtbf_i,
+             _weight_factor_i, _percent_i, _foo_weight, _bad_i) in zip(
+                 children, method_ids.tolist(), _reliability.tolist(),
+                 _hazard_rate.tolist(), _mtbf.tolist(),
+                 _weight_factor.tolist(), _percent.tolist(),
+                 foo_weights.tolist(), _bad.tolist()):
+            _child = _node.data
+            if _method_id not in [1, 2, 3, 4]:
+                continue
+            elif _method_id == 3:
+                _child.weight_factor = _weight_factor_i
+            elif _method_id == 4:
+                _child.weight_factor = _foo_weight
+                _child.percent_weight_factor = _percent_i
+            _child.reliability_alloc = _reliability_i
+            _child.hazard_rate_alloc = _hazard_rate_i
+            _child.mtbf_alloc = _mtbf_i
+
+            if _bad_i:
+                _return = True
+            elif _node.fpointer:
+                _child.reliability_goal = _reliability_i
+                _child.hazard_rate_goal = _hazard_rate_i
+                _child.mtbf_goal = _mtbf_i
+                _level.append(_node)
+
+        return _level, _return
+
+    def calculate_feasibility(self,
+                              node_id,
+                              hazard_rates,
+                              distributions=None,
+                              n_trials=100000,
+                              seed=None,
+                              n_workers=1,
+                              chunk_size=None):
+        """
+        Estimate the probability the allocated goals will be met.
+
+        The uncertain hazard rates and feasibility of objectives weighting
+        factors of the child hardware items are sampled for each trial and the
+        parent's goal is allocated to the children the same way calculate()
+        allocates it.  A child meets its allocated goal in a trial when its
+        sampled hazard rate is no more than its allocated hazard rate.  The
+        parent meets its goal when the sum of the sampled hazard rates of the
+        included children is no more than its hazard rate goal.  The
+        probability each goal is met is stored in goal_feasibility keyed by
+        the Hardware ID.
+
+        The trials are simulated in chunks.  The chunks are simulated in a pool
+        of worker processes when there is more than one worker and more than
+        one chunk.  The results for a seed don't depend on the number of
+        workers.
+
+        :param int node_id: the Node (Hardware) ID of the hardware item whose
+                            goal is to be allocated.
+        :param dict hazard_rates: the current hazard rate of the parent and
+                                  each child hardware item keyed by the
+                                  Hardware ID.  These are used for ARINC
+                                  apportionment and as the hazard rate of the
+                                  children whose hazard rate isn't sampled.
+        :param dict distributions: the distributions of the uncertain
+                                   attributes of each child keyed by the
+                                   Hardware ID.  The distributions of a child
+                                   are (distribution, parameters) keyed by the
+                                   attribute name (hazard_rate, int_factor,
+                                   soa_factor, op_time_factor, or env_factor).
+                                   The distribution is the name of the
+                                   numpy.random.RandomState() method to sample
+                                   with (lognormal, normal, triangular, or
+                                   uniform) and the parameters are passed to
+                                   it.  Negative samples are set to zero.
+                                   Attributes without a distribution use their
+                                   current value in every trial.
+        :param int n_trials: the number of trials to simulate.
+        :param int seed: the seed of the random number generator.
+        :param int n_workers: the number of worker processes.
+        :param int chunk_size: the number of trials simulated at a time.
+                               Defaults to about one million samples of each
+                               attribute per chunk.
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = 'RTK SUCCESS: Calculating allocation feasibility.'
+
+        self.goal_feasibility = {}
+
+        if distributions is None:
+            distributions = {}
+
+        _parent = self.select(node_id)
+        _children = [_node.data for _node in self.select_children(node_id)]
+
+        if (not _children or _parent.method_id not in [1, 2, 3, 4]
+                or n_trials < 1):
+            return 2010, 'RTK ERROR: Calculating allocation feasibility.  ' \
+                         'Hardware ID {0:d} has no children or no ' \
+                         'allocation method or no trials were ' \
+                         'requested.'.format(node_id)
+        if _parent.calculate_goals():
+            return 2010, 'RTK ERROR: Calculating allocation feasibility.  ' \
+                         'The goals of Hardware ID {0:d} could not be ' \
+                         'calculated.'.format(node_id)
+
+        _samplers, _lst_errors = _do_get_samplers(_children, distributions)
+        if _lst_errors:
+            return 2010, 'RTK ERROR: Calculating allocation feasibility.  ' \
+                         'The following {0:d} distribution(s) are not ' \
+                         'valid:\n'.format(len(_lst_errors)) + \
+                         '\n'.join(_lst_errors)
+
+        if chunk_size is None:
+            chunk_size = max(1, 1000000 // len(_children))
+
+        _lst_results = Utilities.do_map_chunks(
+            partial(
+                do_simulate_feasibility,
+                allocation=_do_get_allocation(_parent, _children,
+                                              hazard_rates),
+                samplers=_samplers),
+            Utilities.do_make_seeded_chunks(n_trials, chunk_size, seed),
+            n_workers)
+
+        self._do_set_feasibility(_parent, _children, _lst_results, n_trials)
+
+        return _error_code, _msg
+
+    def _do_set_feasibility(self, parent, children, results, n_trials):
+        """
+        Store the probability each goal is met in goal_feasibility.
+
+        :param parent: the RTKAllocation record of the parent hardware item.
+        :param list children: the RTKAllocation records of the child hardware
+                              items.
+        :param list results: the do_simulate_feasibility() results of each
+                             chunk of trials.
+        :param int n_trials: the number of trials simulated.
+        :return: None
+        :rtype: None
+        """
+        _n_met = sum(_results[0] for _results in results)
+        _n_goal_met = sum(_results[1] for _results in results)
+
+        self.goal_feasibility[parent.hardware_id] = (
+            float(_n_goal_met) / n_trials)
+        for _child, _n_child_met in zip(children, _n_met.tolist()):
+            self.goal_feasibility[_child.hardware_id] = (
+                float(_n_child_met) / n_trials)
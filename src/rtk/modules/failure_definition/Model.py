@@ -146,23 +146,7 @@ class FailureDefinitionDataModel(RTKDataModel):
         """
         Upsate all RTKFailureDefinition records.
 
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.definition_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.failure_definition.Model.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.failure_definition.Model.update_all().'
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
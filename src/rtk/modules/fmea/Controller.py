@@ -7,9 +7,8 @@
 """FMEA Package Data Controller."""
 
 # Import other RTK modules.
-from rtk.Utilities import OutOfRangeError
 from rtk.datamodels import RTKDataController
-from . import dtmFMEA
+from . import dtmCriticalityMatrix, dtmFMEA
 
 
 class FMEADataController(RTKDataController):
@@ -43,6 +42,8 @@ class FMEADataController(RTKDataController):
         # Initialize private list attributes.
 
         # Initialize private scalar attributes.
+        self._dtm_criticality = dtmCriticalityMatrix(dao)
+        self._hardware_id = None
 
         # Initialize public dictionary attributes.
 
@@ -62,6 +63,11 @@ class FMEADataController(RTKDataController):
         """
         _functional = kwargs['functional']
 
+        if _functional:
+            self._hardware_id = None
+        else:
+            self._hardware_id = parent_id
+
         return self._dtm_data_model.do_select_all(
             parent_id=parent_id, functional=_functional)
 
@@ -100,6 +106,9 @@ class FMEADataController(RTKDataController):
         """
         _error_code, _msg = self._dtm_data_model.delete(node_id)
 
+        if _error_code == 0:
+            self._do_refresh_criticality()
+
         return RTKDataController.do_handle_results(self, _error_code, _msg,
                                                    None)
 
@@ -114,6 +123,9 @@ class FMEADataController(RTKDataController):
 
         _error_code, _msg = self._dtm_data_model.update_all()
 
+        if _error_code == 0:
+            self._do_refresh_criticality()
+
         return RTKDataController.do_handle_results(self, _error_code, _msg,
                                                    None)
 
@@ -121,22 +133,28 @@ class FMEADataController(RTKDataController):
         """
         Request the (D)FME(C)A be calculated.
 
+        Both the RPN and the criticality are calculated even if one of them
+        has out of range inputs so every out of range value is reported at
+        once.
+
         :return: False if successful or True if an error is encountered.
         :rtype: bool
         """
         _error_code = 0
         _msg = 'RTK SUCCESS: Calculating (D)FME(C)A.'
 
-        try:
-            if rpn:
-                _error_code, _msg = self._dtm_data_model.calculate_rpn()
-            if criticality:
-                _error_code, _msg = self._dtm_data_model.calculate_criticality(
-                    item_hr)
-        except OutOfRangeError:
-            _error_code = 50
-            _msg = ("RTK WARNING: OutOfRangeError raised when calculating "
-                    "(D)FME(C)A.")
+        _lst_results = []
+        if rpn:
+            _lst_results.append(self._dtm_data_model.calculate_rpn())
+        if criticality:
+            _lst_results.append(
+                self._dtm_data_model.calculate_criticality(item_hr))
+            self._do_refresh_criticality(item_hr)
+
+        _lst_errors = [_result for _result in _lst_results if _result[0] != 0]
+        if _lst_errors:
+            _error_code = _lst_errors[0][0]
+            _msg = '\n'.join([_error[1] for _error in _lst_errors])
 
         return RTKDataController.do_handle_results(self, _error_code, _msg,
                                                    None)
@@ -149,3 +167,54 @@ class FMEADataController(RTKDataController):
         :rtype: float
         """
         return self._dtm_data_model.item_criticality
+
+    def _do_refresh_criticality(self, item_hr=None):
+        """
+        Pass the failure Modes of the loaded hardware FMEA to the matrix.
+
+        Nothing is done if the loaded FMEA is a functional FMEA or the
+        criticality matrix has not been selected.
+
+        :keyword float item_hr: the hazard rate of the hardware item.
+        :return: None
+        :rtype: None
+        """
+        if (self._hardware_id is not None
+                and self._dtm_criticality.revision_id is not None):
+            if item_hr is not None:
+                self._dtm_criticality.do_set_hazard_rate(
+                    self._hardware_id, item_hr)
+            self._dtm_criticality.do_set_modes(self._hardware_id, [
+                _node.data
+                for _node in self._dtm_data_model.tree.children(0)
+            ])
+
+    def request_select_criticality_matrix(self, revision_id, hardware=None):
+        """
+        Request the criticality matrix of every hardware item in a Revision.
+
+        The failure Modes of the Revision are only retrieved the first time
+        the matrix is requested for the Revision.  After that only the
+        hardware items whose hazard rate or failure Modes have changed are
+        recalculated.
+
+        :param int revision_id: the Revision ID to select the criticality
+                                matrix for.
+        :keyword hardware: the Hardware BoM data model with the current hazard
+                           rates of the hardware items.
+        :type hardware:
+            :class:`rtk.modules.hardware.Model.HardwareBoMDataModel`
+        :return: the criticality matrix; the rows are the hardware items and
+                 the columns are the severity classes.
+        :rtype: :class:`pandas.DataFrame`
+        """
+        if self._dtm_criticality.revision_id != revision_id:
+            self._dtm_criticality.do_select_all(
+                revision_id=revision_id, hardware=hardware)
+        elif hardware is not None:
+            self._dtm_criticality.do_set_hazard_rates(hardware)
+
+        _error_code, _msg = self._dtm_criticality.calculate_dirty()
+        RTKDataController.do_handle_results(self, _error_code, _msg, None)
+
+        return self._dtm_criticality.get_matrix()
@@ -6,12 +6,80 @@
 # Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
 """FMEA Package Data Models."""
 
+from itertools import chain
+
 from treelib import tree
+import numpy as np
+import pandas as pd
 
 # Import other RTK modules.
-from rtk.Utilities import OutOfRangeError
+from rtk.Utilities import none_to_default
 from rtk.datamodels import RTKDataModel
-from rtk.dao import RTKAction, RTKCause, RTKControl, RTKMechanism, RTKMode
+from rtk.dao import (RTKAction, RTKCause, RTKControl, RTKHardware,
+                     RTKMechanism, RTKMode, RTKReliability)
+
+CRITICALITY_ERRORS = [
+    'Failure mode ratio is outside the range [0.0, 1.0]',
+    'Failure mode operating time has a negative value',
+    'Failure effect probability is outside the range [0.0, 1.0]'
+]
+
+
+def do_calculate_criticality(item_hr, values, keys):
+    """
+    Calculate the MIL-STD-1629A, Task 102 criticality of failure Modes.
+
+        Mode Hazard Rate = Item Hazard Rate * Mode Ratio
+        Mode Criticality = Mode Hazard Rate * Mode Operating Time *
+                           Effect Probability
+
+    The mode criticalities are summed by key with a segment sum over the
+    failure Modes whose inputs are all in range.  numpy.bincount() accumulates
+    the weights in array order so each sum is formed in the same order as
+    adding the failure Modes one at a time.
+
+    :param item_hr: the hazard rate of the item; either a float or an array
+                    with the hazard rate of the item each failure Mode
+                    belongs to.
+    :param values: the (n, 3) array of the mode ratio, mode operating time,
+                   and effect probability of each failure Mode.
+    :type values: :class:`numpy.ndarray`
+    :param list keys: the key of each failure Mode to sum the mode
+                      criticalities by.
+    :return: (_hazard_rate, _criticality, _valid, _bad, _sums); the arrays of
+             mode hazard rates, mode criticalities, and whether all the inputs
+             of each failure Mode are in range, the (n, 3) array flagging the
+             out of range inputs in the order of CRITICALITY_ERRORS, and the
+             {key: criticality} sums.
+    :rtype: tuple
+    """
+    _item_hr = np.broadcast_to(
+        np.asarray(item_hr, dtype=float), values.shape[:1])
+
+    # Negated comparisons so NaN values are also out of range.
+    _bad = np.column_stack((~((values[:, 0] >= 0.0) & (values[:, 0] <= 1.0)),
+                            ~(values[:, 1] >= 0.0),
+                            ~((values[:, 2] >= 0.0) & (values[:, 2] <= 1.0))))
+    _valid = ~_bad.any(axis=1) & (_item_hr >= 0.0)
+
+    _hazard_rate = _item_hr * values[:, 0]
+    _criticality = _hazard_rate * values[:, 1] * values[:, 2]
+
+    _index = {}
+    _inverse = np.array(
+        [_index.setdefault(_key, len(_index)) for _key in keys], dtype=int)
+    _sums = {}
+    if np.any(_valid):
+        _counts = np.bincount(_inverse[_valid], minlength=len(_index))
+        _totals = np.bincount(
+            _inverse[_valid],
+            weights=_criticality[_valid],
+            minlength=len(_index))
+        for _key, _position in _index.items():
+            if _counts[_position] > 0:
+                _sums[_key] = float(_totals[_position])
+
+    return _hazard_rate, _criticality, _valid, _bad, _sums
 
 
 class ModeDataModel(RTKDataModel):
@@ -154,21 +222,10 @@ class ModeDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all Modes in the FMEA.'
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.mode_id)
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.fmea.Model.ModeDataModel.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.fmea.Model.ModeDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all Modes in the FMEA.'
 
         return _error_code, _msg
 
@@ -310,21 +367,10 @@ class MechanismDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all Mechanisms in the FMEA.'
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.mechanism_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.fmea.Model.MechanismDataModel.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.fmea.Model.MechanismDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all Mechanisms in the FMEA.'
 
         return _error_code, _msg
 
@@ -469,21 +515,10 @@ class CauseDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all Causes in the FMEA.'
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.cause_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.fmea.Model.CauseDataModel.update_all().'
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.fmea.Model.CauseDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all Causes in the FMEA.'
 
         return _error_code, _msg
 
@@ -628,21 +663,10 @@ class ControlDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all Controls in the FMEA.'
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.control_id)
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.fmea.Model.ControlDataModel.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.fmea.Model.ControlDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all Controls in the FMEA.'
 
         return _error_code, _msg
 
@@ -788,21 +812,10 @@ class ActionDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all Actions in the FMEA.'
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.action_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.fmea.Model.ActionDataModel.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.fmea.Model.ActionDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all Actions in the FMEA.'
 
         return _error_code, _msg
 
@@ -871,7 +884,9 @@ class FMEADataModel(RTKDataModel):
         Retrieve and build the FMEA tree for Parent ID.
 
         The Parent ID is one of Function ID (functional FMEA) or Hardware ID
-        (hardware FMEA).
+        (hardware FMEA).  Each level of the FMEA (modes, mechanisms, causes,
+        controls, and actions) is retrieved with a single query and the tree
+        is built from the rows grouped by the ID of their parent.
 
         :return: tree; the FMEA treelib Tree().
         :rtype: :class:`treelib.Tree`
@@ -879,135 +894,123 @@ class FMEADataModel(RTKDataModel):
         _parent_id = kwargs['parent_id']
         self._functional = kwargs['functional']
 
-        RTKDataModel.select_all(self)
-
-        _modes = self.dtm_mode.do_select_all(
-            parent_id=_parent_id, functional=self._functional).nodes
-
-        for _key in _modes:
-            _mode = _modes[_key].data
-            if _mode is not None:
-                _node_id = '0.' + str(_mode.mode_id)
-                self.tree.create_node(
-                    tag=_mode.description,
-                    identifier=_node_id,
-                    parent=0,
-                    data=_mode)
-                if self._functional:
-                    self._do_add_causes(_mode.mode_id, _node_id, True)
-                else:
-                    self._do_add_mechanisms(_mode.mode_id, _node_id)
-
-        return self.tree
-
-    def _do_add_mechanisms(self, mode_id, parent_id):
-        """
-        Add the failure mechanisms to the FMEA tree for Mode ID.
-
-        :param int mode_id: the Mode ID to add the failure mechanisms to.
-        :param str parent_id: the Node ID to add the failure mechanisms to.
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
-        """
-        _return = False
-
-        _mechanisms = self.dtm_mechanism.do_select_all(parent_id=mode_id).nodes
-        for _key in _mechanisms:
-            _mechanism = _mechanisms[_key].data
-            if _mechanism is not None:
-                _node_id = parent_id + '.' + str(_mechanism.mechanism_id)
-                self.tree.create_node(
-                    tag=_mechanism.description,
-                    identifier=_node_id,
-                    parent=parent_id,
-                    data=_mechanism)
-
-                self._do_add_causes(_mechanism.mechanism_id, _node_id, False)
-
-        return _return
+        _session = RTKDataModel.select_all(self)
 
-    def _do_add_causes(self, parent_id, parent_node, functional):
-        """
-        Add the failure causes to the FMEA tree for Mechanism ID.
+        if self._functional:
+            _modes = _session.query(RTKMode).filter(
+                RTKMode.function_id == _parent_id)
+            _mechanisms = {}
+            _causes = _session.query(RTKCause).filter(
+                RTKCause.mode_id.in_(_modes.with_entities(RTKMode.mode_id)))
+            _causes_key = 'mode_id'
+        else:
+            _modes = _session.query(RTKMode).filter(
+                RTKMode.hardware_id == _parent_id)
+            _mechanisms = _session.query(RTKMechanism).filter(
+                RTKMechanism.mode_id.in_(_modes.with_entities(
+                    RTKMode.mode_id)))
+            _causes = _session.query(RTKCause).filter(
+                RTKCause.mechanism_id.in_(
+                    _mechanisms.with_entities(RTKMechanism.mechanism_id)))
+            _causes_key = 'mechanism_id'
+            _mechanisms = self._do_group(_mechanisms.all(), 'mode_id')
+
+        _cause_ids = _causes.with_entities(RTKCause.cause_id)
+        _controls = self._do_group(
+            _session.query(RTKControl).filter(
+                RTKControl.cause_id.in_(_cause_ids)).all(), 'cause_id')
+        _actions = self._do_group(
+            _session.query(RTKAction).filter(
+                RTKAction.cause_id.in_(_cause_ids)).all(), 'cause_id')
+        _causes = self._do_group(_causes.all(), _causes_key)
+        _modes = _modes.all()
 
-        :param int parent_id: the Mode ID (functional FMEA) or Mechanism ID
-                              (hardware FMEA) to add the failure causes to.
-        :param str parent_node: the Node ID to add the failure causes to.
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
-        """
-        _return = False
+        # pylint: disable=attribute-defined-outside-init
+        # It is defined in RTKDataModel.__init__
+        for _dtm, _entities, _key in [
+            (self.dtm_mode, [_modes], 'mode_id'),
+            (self.dtm_mechanism, _mechanisms.values(), 'mechanism_id'),
+            (self.dtm_cause, _causes.values(), 'cause_id'),
+            (self.dtm_control, _controls.values(), 'control_id'),
+            (self.dtm_action, _actions.values(), 'action_id')
+        ]:
+            for _group in _entities:
+                _dtm.last_id = max([_dtm.last_id] +
+                                   [getattr(_entity, _key)
+                                    for _entity in _group])
 
-        _causes = self.dtm_cause.do_select_all(
-            parent_id=parent_id, functional=functional).nodes
-        for _key in _causes:
-            _cause = _causes[_key].data
-            if _cause is not None:
-                _node_id = parent_node + '.' + str(_cause.cause_id)
-                self.tree.create_node(
-                    tag=_cause.description,
-                    identifier=_node_id,
-                    parent=parent_node,
-                    data=_cause)
+        for _mode in _modes:
+            _node_id = self._do_add_node(_mode, 0, _mode.mode_id,
+                                         _mode.description)
+            if self._functional:
+                _parents = [(_mode.mode_id, _node_id)]
+            else:
+                _parents = [(_mechanism.mechanism_id,
+                             self._do_add_node(_mechanism, _node_id,
+                                               _mechanism.mechanism_id,
+                                               _mechanism.description))
+                            for _mechanism in _mechanisms.get(
+                                _mode.mode_id, [])]
+
+            for _cause_parent_id, _cause_parent_node in _parents:
+                for _cause in _causes.get(_cause_parent_id, []):
+                    _cause_node = self._do_add_node(_cause, _cause_parent_node,
+                                                    _cause.cause_id,
+                                                    _cause.description)
+
+                    # Since Controls and Actions are at the same level in the
+                    # FMEA tree, we append a 'c' to the Control ID and an 'a'
+                    # to the Action ID to differentiate them.
+                    for _control in _controls.get(_cause.cause_id, []):
+                        self._do_add_node(_control, _cause_node,
+                                          str(_control.control_id) + 'c',
+                                          _control.description)
+                    for _action in _actions.get(_cause.cause_id, []):
+                        self._do_add_node(_action, _cause_node,
+                                          str(_action.action_id) + 'a',
+                                          _action.action_category)
 
-                self._do_add_controls(_cause.cause_id, _node_id)
-                self._do_add_actions(_cause.cause_id, _node_id)
+        _session.close()
 
-        return _return
+        return self.tree
 
-    def _do_add_controls(self, cause_id, parent_id):
+    @staticmethod
+    def _do_group(entities, key):
         """
-        Add the control methods to the FMEA tree for Mode ID or Cause ID.
+        Group a list of FMEA entities by the ID of their parent.
 
-        :param int cause_id: the Mode ID (functional FMEA) or Cause ID
-                             (hardware FMEA) to add the control methods to.
-        :param str parent_id: the Node ID to add the control methods to.
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
+        :param list entities: the list of RTK<MODULE> entities to group.
+        :param str key: the name of the attribute with the parent ID.
+        :return: dictionary of entities; key is the parent ID and values are
+                 the list of entities with that parent ID.
+        :rtype: dict
         """
-        _return = False
-
-        _controls = self.dtm_control.do_select_all(parent_id=cause_id).nodes
+        _groups = {}
+        for _entity in entities:
+            _groups.setdefault(getattr(_entity, key), []).append(_entity)
 
-        for _key in _controls:
-            _control = _controls[_key].data
-            if _control is not None:
-                # Since Controls and Actions are at the same level in the FMEA
-                # tree, we prepend a zero to the Control ID to differentiate it
-                # from an Action.
-                _node_id = parent_id + '.' + str(_control.control_id) + 'c'
-                self.tree.create_node(
-                    tag=_control.description,
-                    identifier=_node_id,
-                    parent=parent_id,
-                    data=_control)
+        return _groups
 
-        return _return
-
-    def _do_add_actions(self, cause_id, parent_id):
+    def _do_add_node(self, entity, parent_id, entity_id, tag):
         """
-        Add the action to the FMEA tree for Mode ID or Cause ID.
+        Add an FMEA entity to the FMEA tree.
 
-        :param int cause_id: the Mode ID (functional FMEA) or Cause ID
-                             (hardware FMEA) to add the action to.
-        :param str parent_id: the Node ID to add the action to.
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
+        :param entity: the RTK<MODULE> entity to add to the FMEA tree.
+        :param str parent_id: the Node ID to add the entity to.
+        :param entity_id: the ID of the entity used to build its Node ID.
+        :param str tag: the tag of the new node.
+        :return: the Node ID of the new node.
+        :rtype: str
         """
-        _return = False
+        # We get and then set the attributes to replace any None values (NULL
+        # fields in the database) with their default value.
+        entity.set_attributes(entity.get_attributes())
 
-        _actions = self.dtm_action.do_select_all(parent_id=cause_id).nodes
-        for _key in _actions:
-            _action = _actions[_key].data
-            if _action is not None:
-                _node_id = parent_id + '.' + str(_action.action_id) + 'a'
-                self.tree.create_node(
-                    tag=_action.action_category,
-                    identifier=_node_id,
-                    parent=parent_id,
-                    data=_action)
+        _node_id = str(parent_id) + '.' + str(entity_id)
+        self.tree.create_node(
+            tag=tag, identifier=_node_id, parent=parent_id, data=entity)
 
-        return _return
+        return _node_id
 
     def do_insert(self, **kwargs):
         """
@@ -1143,45 +1146,118 @@ class FMEADataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _err_code, _debug_msg = self.update(_node.identifier)
-
-                if _err_code != 0:
-                    _error_code = 1
-                    _msg = _msg + _debug_msg + '\n'
-
-            except AttributeError:
-                _error_code = 1
-                _msg = "RTK ERROR: One or more line items in the FMEA did " \
-                       "not update."
+        _error_code, _msg = RTKDataModel.update_all(self)
 
         if _error_code == 0:
             _msg = 'RTK SUCCESS: Updating all line items in the FMEA.'
 
         return _error_code, _msg
 
+    def _do_pack_modes(self):
+        """
+        Pack the criticality inputs of every failure Mode into an array.
+
+        :return: (_modes, _values); the list of RTKMode entities and the
+                 (n, 3) array of their mode ratio, mode operating time, and
+                 effect probability.
+        :rtype: (list, :class:`numpy.ndarray`)
+        """
+        _modes = [
+            _node.data for _node in self.tree.children(0)
+            if _node.data is not None and _node.data.is_mode
+        ]
+        _values = np.array(
+            [[_mode.mode_ratio, _mode.mode_op_time, _mode.effect_probability]
+             for _mode in _modes],
+            dtype=float).reshape(-1, 3)
+
+        return _modes, _values
+
+    def _do_pack_rpn(self):
+        """
+        Pack the RPN inputs of every Mechanism and Cause into an array.
+
+        The severities of each Mechanism and Cause are those of the failure
+        Mode it is associated with.
+
+        :return: (_entities, _values); the list of RTKMechanism and RTKCause
+                 entities and the (n, 6) array of their severity, occurrence,
+                 detection, new severity, new occurrence, and new detection.
+        :rtype: (list, :class:`numpy.ndarray`)
+        """
+        _entities = []
+        _values = []
+        for _mode_node in self.tree.children(0):
+            _mode = _mode_node.data
+            if _mode is None or not _mode.is_mode:
+                continue
+            _node_ids = list(_mode_node.fpointer)
+            while _node_ids:
+                _node = self.tree.get_node(_node_ids.pop(0))
+                if _node.data is None:
+                    continue
+                if _node.data.is_mechanism:
+                    _node_ids.extend(_node.fpointer)
+                elif not _node.data.is_cause:
+                    continue
+                _entities.append(_node.data)
+                _values.append([
+                    _mode.rpn_severity, _node.data.rpn_occurrence,
+                    _node.data.rpn_detection, _mode.rpn_severity_new,
+                    _node.data.rpn_occurrence_new,
+                    _node.data.rpn_detection_new
+                ])
+
+        return _entities, np.array(_values, dtype=float).reshape(-1, 6)
+
     def calculate_criticality(self, item_hr):
         """
-        Calculate the FMEA MIL-STD-1629b, Task 102 criticality.
+        Calculate the FMEA MIL-STD-1629A, Task 102 criticality.
+
+        The inputs of every failure Mode are packed into arrays and the mode
+        hazard rates and mode criticalities of the entire FMEA are calculated
+        at once with do_calculate_criticality().  Every input outside its
+        range is reported rather than stopping at the first one.  Results are
+        only written back to the failure Modes whose inputs are all in range
+        and only these Modes contribute to the item criticality.
 
         :param float item_hr: the hazard rate of the item the criticality is
                               being calculated for.
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        self.item_criticality = {}
-        for _node in self.tree.children(0):
-            _error_code, _msg = _node.data.calculate_criticality(item_hr)
-            try:
-                self.item_criticality[
-                    _node.data.severity_class] += _node.data.mode_criticality
-            except KeyError:
-                self.item_criticality[
-                    _node.data.severity_class] = _node.data.mode_criticality
+        _error_code = 0
+        _msg = 'RTK SUCCESS: Calculating (D)FME(C)A criticality.'
+
+        _modes, _values = self._do_pack_modes()
+
+        _hazard_rate, _criticality, _valid, _bad, self.item_criticality = \
+            do_calculate_criticality(
+                item_hr, _values,
+                [_mode.severity_class for _mode in _modes])
+
+        _lst_errors = []
+        if not item_hr >= 0.0:
+            _lst_errors.append('Item hazard rate has a negative value.')
+        for _idx, _column in np.argwhere(_bad):
+            _lst_errors.append(
+                CRITICALITY_ERRORS[_column] +
+                ' for Mode ID: {0:d}.'.format(_modes[_idx].mode_id))
+
+        # Only changed results are written back because every assignment
+        # marks the entity as modified for the next update_all().
+        for _idx in np.flatnonzero(_valid):
+            _mode = _modes[_idx]
+            if _mode.mode_hazard_rate != _hazard_rate[_idx]:
+                _mode.mode_hazard_rate = float(_hazard_rate[_idx])
+            if _mode.mode_criticality != _criticality[_idx]:
+                _mode.mode_criticality = float(_criticality[_idx])
+
+        if _lst_errors:
+            _error_code = 2010
+            _msg = ('RTK ERROR: Calculating (D)FME(C)A criticality.  The '
+                    'following {0:d} value(s) are out of range:\n'
+                    '{1:s}').format(len(_lst_errors), '\n'.join(_lst_errors))
 
         return _error_code, _msg
 
@@ -1189,32 +1265,368 @@ class FMEADataModel(RTKDataModel):
         """
         Calculate the Risk Priority Number (RPN).
 
-        :param int node_id: the ID of the treelib Node to calculate the RPN.
-        :param int severity: the severity of the failure Mode the Mechanism is
-                             associated with.
-        :param int severity_new: the severity of the failure Mode after
-                                 corrective action.
+        The inputs of every Mechanism and Cause are packed into arrays and the
+        RPN and new RPN of the entire FMEA are calculated at once:
+
+            RPN = S * O * D
+
+        Every input outside the range [1, 10] is reported rather than
+        stopping at the first one.  Results are only written back to the
+        Mechanisms and Causes whose inputs are all in range.
+
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
+        """
+        _error_code = 0
+        _msg = 'RTK SUCCESS: Calculating (D)FME(C)A RPN.'
+
+        _entities, _values = self._do_pack_rpn()
+
+        # Negated comparisons so NaN values are also out of range.
+        _bad = ~((_values > 0) & (_values < 11))
+        _valid = ~_bad.any(axis=1)
+        _lst_errors = []
+        for _idx, _column in np.argwhere(_bad):
+            _entity = _entities[_idx]
+            if _entity.is_mechanism:
+                _entity_id = 'Mechanism ID: {0:d}'.format(_entity.mechanism_id)
+            else:
+                _entity_id = 'Cause ID: {0:d}'.format(_entity.cause_id)
+            _lst_errors.append(
+                'RPN {0:s} is outside the range [1, 10] for {1:s}.'.format([
+                    'severity', 'occurrence', 'detection', 'new severity',
+                    'new occurrence', 'new detection'
+                ][_column], _entity_id))
+
+        _values = np.trunc(np.where(_bad, 1.0, _values))
+        _rpn = np.prod(_values[:, 0:3], axis=1)
+        _rpn_new = np.prod(_values[:, 3:6], axis=1)
+        # Only changed results are written back because every assignment
+        # marks the entity as modified for the next update_all().
+        for _idx in np.flatnonzero(_valid):
+            _entity = _entities[_idx]
+            if _entity.rpn != _rpn[_idx]:
+                _entity.rpn = int(_rpn[_idx])
+            if _entity.rpn_new != _rpn_new[_idx]:
+                _entity.rpn_new = int(_rpn_new[_idx])
+
+        if _lst_errors:
+            _error_code = 2020
+            _msg = ('RTK ERROR: Calculating (D)FME(C)A RPN.  The following '
+                    '{0:d} value(s) are out of range:\n{1:s}').format(
+                        len(_lst_errors), '\n'.join(_lst_errors))
+
+        return _error_code, _msg
+
+
+class CriticalityMatrixDataModel(RTKDataModel):
+    """
+    Contain the attributes and methods of a criticality matrix.
+
+    The criticality matrix sums the MIL-STD-1629A mode criticality of every
+    failure Mode of every hardware item in a Revision by severity class.  Each
+    hardware item is a node in the treelib Tree() whose data package holds the
+    item's logistics hazard rate and the IDs, severity classes, and
+    criticality inputs of its failure Modes:
+
+        {'hazard_rate_logistics': float,
+         'mode_ids': list,
+         'severity_classes': list,
+         'values': (n, 3) numpy.ndarray of mode ratio, mode operating time,
+                   and effect probability}
+
+    The item criticalities are cached in a pandas DataFrame() and only the
+    hardware items whose hazard rate or failure Modes have changed since the
+    last calculation are recalculated.
+    """
+
+    _tag = 'Criticality'
+
+    def __init__(self, dao):
+        """
+        Initialize a criticality matrix data model instance.
+
+        :param dao: the data access object for communicating with the RTK
+                    Program database.
+        :type dao: :py:class:`rtk.dao.DAO.DAO`
+        """
+        RTKDataModel.__init__(self, dao)
+
+        # Initialize private dictionary attributes.
+
+        # Initialize private list attributes.
+        self._lst_dirty = []
+
+        # Initialize private scalar attributes.
+        # Missing (hardware item, severity class) cells are NaN in the cache
+        # so a severity class no longer used by any item can be dropped.
+        self._dtf_matrix = pd.DataFrame()
+
+        # Initialize public dictionary attributes.
+
+        # Initialize public list attributes.
+
+        # Initialize public scalar attributes.
+        self.revision_id = None
+
+    def do_select_all(self, **kwargs):
+        """
+        Retrieve the failure Modes of every hardware item in a Revision.
+
+        The failure Modes of all the hardware items are retrieved with a
+        single query.  The logistics hazard rate of each hardware item is
+        taken from the Hardware BoM data model if one is passed, otherwise it
+        is retrieved from the RTK Program database.  Every hardware item is
+        marked as needing to be calculated.
+
+        :param int revision_id: the Revision ID to build the criticality matrix
+                                for.
+        :keyword hardware: the Hardware BoM data model with the current
+                           hazard rates of the hardware items.
+        :type hardware:
+            :class:`rtk.modules.hardware.Model.HardwareBoMDataModel`
+        :return: tree; the criticality matrix treelib Tree().
+        :rtype: :class:`treelib.Tree`
+        """
+        self.revision_id = kwargs['revision_id']
+        _hardware = kwargs.get('hardware', None)
+
+        _session = RTKDataModel.select_all(self)
+        self._lst_dirty = []
+        self._dtf_matrix = pd.DataFrame()
+
+        _hardware_ids = _session.query(RTKHardware.hardware_id).filter(
+            RTKHardware.revision_id == self.revision_id)
+        if _hardware is None:
+            _hazard_rates = _session.query(
+                RTKReliability.hardware_id,
+                RTKReliability.hazard_rate_logistics).filter(
+                    RTKReliability.hardware_id.in_(_hardware_ids)).all()
+        else:
+            _hazard_rates = [(_node.identifier,
+                              _node.data['hazard_rate_logistics'])
+                             for _node in _hardware.tree.all_nodes()
+                             if _node.data is not None]
+        _modes = _session.query(
+            RTKMode.hardware_id, RTKMode.mode_id, RTKMode.severity_class,
+            RTKMode.mode_ratio, RTKMode.mode_op_time,
+            RTKMode.effect_probability).filter(
+                RTKMode.hardware_id.in_(_hardware_ids)).order_by(
+                    RTKMode.mode_id).all()
+
+        _session.close()
+
+        for _hardware_id, _hazard_rate in _hazard_rates:
+            self.do_set_hazard_rate(_hardware_id, _hazard_rate)
+
+        _dic_modes = {}
+        for _mode in _modes:
+            _dic_modes.setdefault(_mode[0], []).append(_mode[1:])
+        for _hardware_id, _lst_modes in _dic_modes.items():
+            self._do_set_mode_values(_hardware_id, [
+                (_mode_id, none_to_default(_severity_class, ''),
+                 none_to_default(_ratio, 0.0),
+                 none_to_default(_op_time, 0.0),
+                 none_to_default(_probability, 0.0))
+                for _mode_id, _severity_class, _ratio, _op_time, _probability
+                in _lst_modes
+            ])
+
+        return self.tree
+
+    def _do_get_item(self, hardware_id):
+        """
+        Retrieve the data package of a hardware item, adding it if needed.
+
+        A hardware item that is added is marked as needing to be calculated.
+
+        :param int hardware_id: the ID of the hardware item.
+        :return: the data package of the hardware item.
+        :rtype: dict
+        """
+        if not self.tree.contains(hardware_id):
+            self.tree.create_node(
+                tag=hardware_id,
+                identifier=hardware_id,
+                parent=0,
+                data={
+                    'hazard_rate_logistics': 0.0,
+                    'mode_ids': [],
+                    'severity_classes': [],
+                    'values': np.zeros((0, 3))
+                })
+            self.do_mark_dirty(hardware_id)
+
+        return self.tree.get_node(hardware_id).data
+
+    def _do_set_mode_values(self, hardware_id, modes):
+        """
+        Set the failure Modes of a hardware item.
+
+        :param int hardware_id: the ID of the hardware item.
+        :param list modes: the list of (Mode ID, severity class, mode ratio,
+                           mode operating time, effect probability) of each
+                           failure Mode of the hardware item.
+        :return: None
+        :rtype: None
+        """
+        _data = self._do_get_item(hardware_id)
+        _data['mode_ids'] = [_mode[0] for _mode in modes]
+        _data['severity_classes'] = [_mode[1] for _mode in modes]
+        _data['values'] = np.array(
+            [_mode[2:] for _mode in modes], dtype=float).reshape(-1, 3)
+
+        self.do_mark_dirty(hardware_id)
+
+    def do_set_hazard_rate(self, hardware_id, hazard_rate):
+        """
+        Set the logistics hazard rate of a hardware item.
+
+        The hardware item is only marked as needing to be recalculated if its
+        hazard rate has changed.
+
+        :param int hardware_id: the ID of the hardware item.
+        :param float hazard_rate: the logistics hazard rate of the hardware
+                                  item.
+        :return: None
+        :rtype: None
+        """
+        _data = self._do_get_item(hardware_id)
+        _hazard_rate = float(none_to_default(hazard_rate, 0.0))
+        if _data['hazard_rate_logistics'] != _hazard_rate:
+            _data['hazard_rate_logistics'] = _hazard_rate
+            self.do_mark_dirty(hardware_id)
+
+    def do_set_hazard_rates(self, hardware):
+        """
+        Set the logistics hazard rate of every hardware item in the BoM.
+
+        :param hardware: the Hardware BoM data model with the current hazard
+                         rates of the hardware items.
+        :type hardware:
+            :class:`rtk.modules.hardware.Model.HardwareBoMDataModel`
+        :return: None
+        :rtype: None
+        """
+        for _node in hardware.tree.all_nodes():
+            if _node.data is not None:
+                self.do_set_hazard_rate(_node.identifier,
+                                        _node.data['hazard_rate_logistics'])
+
+    def do_set_modes(self, hardware_id, modes):
+        """
+        Set the failure Modes of a hardware item from its FMEA.
+
+        :param int hardware_id: the ID of the hardware item.
+        :param list modes: the list of RTKMode entities of the hardware item's
+                           FMEA.  Entries that are not failure Modes are
+                           ignored.
+        :return: None
+        :rtype: None
+        """
+        self._do_set_mode_values(hardware_id, [
+            (_mode.mode_id, _mode.severity_class, _mode.mode_ratio,
+             _mode.mode_op_time, _mode.effect_probability) for _mode in modes
+            if _mode is not None and _mode.is_mode
+        ])
+
+    def do_mark_dirty(self, hardware_id):
+        """
+        Mark a hardware item as needing to be recalculated.
+
+        :param int hardware_id: the ID of the hardware item whose hazard rate
+                                or failure Modes have changed.
+        :return: None
+        :rtype: None
+        """
+        if hardware_id not in self._lst_dirty:
+            self._lst_dirty.append(hardware_id)
+
+    def calculate_dirty(self):
+        """
+        Recalculate the item criticality of the dirty hardware items.
+
+        The failure Modes of all the dirty hardware items are calculated at
+        once with do_calculate_criticality() and the rows of the dirty hardware
+        items in the criticality matrix are replaced.  Every input outside its
+        range is reported and failure Modes with an out of range input do not
+        contribute to the matrix.
+
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
         _error_code = 0
-        _msg = 'RTK INFO: Success calculating (D)FME(C)A.'
-
-        for _node in self.tree.children(0):
-            if _node.data is None:
-                _msg = "Node ID: {0:s} has no data package.".format(
-                    str(_node.identifier))
-            elif _node.data.is_mode:
-                for _child in self.tree.subtree(_node.identifier).all_nodes():
-                    try:
-                        _error_code, _msg = _child.data.calculate_rpn(
-                            _node.data.rpn_severity,
-                            _node.data.rpn_severity_new)
-                    except OutOfRangeError as _error:
-                        _error_code = 1
-                        _msg = _error.message
-                    except AttributeError:
-                        _msg = ("Node ID: {0:s} is not a Mechanism or "
-                                "Cause.").format(str(_child.identifier))
+        _msg = 'RTK SUCCESS: Calculating the criticality matrix.'
+
+        _lst_dirty = [
+            _hardware_id for _hardware_id in self._lst_dirty
+            if self.tree.contains(_hardware_id)
+        ]
+        _lst_items = [self.tree.get_node(_id).data for _id in _lst_dirty]
+        _lst_counts = [len(_data['mode_ids']) for _data in _lst_items]
+        _item_hr = np.repeat(
+            [_data['hazard_rate_logistics'] for _data in _lst_items],
+            _lst_counts)
+        _hardware_ids = np.repeat(_lst_dirty, _lst_counts)
+        _mode_ids = list(
+            chain.from_iterable(_data['mode_ids'] for _data in _lst_items))
+        _values = np.concatenate(
+            [np.zeros((0, 3))] + [_data['values'] for _data in _lst_items])
+        _keys = list(
+            zip(_hardware_ids.tolist(),
+                chain.from_iterable(
+                    _data['severity_classes'] for _data in _lst_items)))
+
+        __, __, __, _bad, _sums = do_calculate_criticality(
+            _item_hr, _values, _keys)
+
+        _lst_errors = []
+        for _hardware_id, _data in zip(_lst_dirty, _lst_items):
+            if not _data['hazard_rate_logistics'] >= 0.0:
+                _lst_errors.append(
+                    'Item hazard rate has a negative value for Hardware ID: '
+                    '{0:d}.'.format(_hardware_id))
+        for _idx, _column in np.argwhere(_bad):
+            _lst_errors.append(
+                CRITICALITY_ERRORS[_column] +
+                ' for Mode ID: {0:d} of Hardware ID: {1:d}.'.format(
+                    _mode_ids[_idx], int(_hardware_ids[_idx])))
+
+        _dic_rows = {}
+        for (_hardware_id, _severity_class), _criticality in _sums.items():
+            _dic_rows.setdefault(_hardware_id,
+                                 {})[_severity_class] = _criticality
+
+        # The columns are aligned explicitly because pandas before 0.23 has no
+        # sort argument to concat().
+        _dtf_matrix = pd.concat([
+            self._dtf_matrix.drop(_lst_dirty, errors='ignore'),
+            pd.DataFrame.from_dict(_dic_rows, orient='index')
+        ])
+        self._dtf_matrix = _dtf_matrix.loc[:, _dtf_matrix.notnull().any()].\
+            sort_index().sort_index(axis=1)
+        self._lst_dirty = []
+
+        if _lst_errors:
+            _error_code = 2010
+            _msg = ('RTK ERROR: Calculating the criticality matrix.  The '
+                    'following {0:d} value(s) are out of range:\n'
+                    '{1:s}').format(len(_lst_errors), '\n'.join(_lst_errors))
 
         return _error_code, _msg
+
+    def get_matrix(self):
+        """
+        Retrieve the criticality matrix.
+
+        The rows are the hardware items with at least one failure Mode whose
+        inputs are all in range and the columns are the severity classes.
+        Each cell is the item criticality of the hardware item for the
+        severity class; the sum of a column is the system criticality for the
+        severity class.  Hardware items marked as needing to be recalculated
+        are not recalculated by this method.
+
+        :return: the criticality matrix.
+        :rtype: :class:`pandas.DataFrame`
+        """
+        return self._dtf_matrix.fillna(0.0)
@@ -1,6 +1,7 @@
 from .Model import ActionDataModel as dtmAction
 from .Model import CauseDataModel as dtmCause
 from .Model import ControlDataModel as dtmControl
+from .Model import CriticalityMatrixDataModel as dtmCriticalityMatrix
 from .Model import FMEADataModel as dtmFMEA
 from .Model import MechanismDataModel as dtmMechanism
 from .Model import ModeDataModel as dtmMode
@@ -46,8 +46,16 @@ class FunctionDataController(RTKDataController):
         # Initialize private list attributes.
 
         # Initialize private scalar attributes.
-        self._dmx_fctn_hw_matrix = RTKDataMatrix(dao, RTKFunction, RTKHardware)
-        self._dmx_fctn_sw_matrix = RTKDataMatrix(dao, RTKFunction, RTKSoftware)
+        self._dmx_fctn_hw_matrix = RTKDataMatrix(
+            dao,
+            RTKFunction,
+            RTKHardware,
+            sparse=configuration.RTK_SPARSE_MATRICES)
+        self._dmx_fctn_sw_matrix = RTKDataMatrix(
+            dao,
+            RTKFunction,
+            RTKSoftware,
+            sparse=configuration.RTK_SPARSE_MATRICES)
 
         # Initialize public dictionary attributes.
 
@@ -46,11 +46,21 @@ class HardwareBoMDataController(RTKDataController):
         # Initialize private list attributes.
 
         # Initialize private scalar attributes.
-        self._dmx_hw_rqrmnt_matrix = RTKDataMatrix(dao, RTKHardware,
-                                                   RTKRequirement)
-        self._dmx_hw_tstng_matrix = RTKDataMatrix(dao, RTKHardware, RTKTest)
-        self._dmx_hw_vldtn_matrix = RTKDataMatrix(dao, RTKHardware,
-                                                  RTKValidation)
+        self._dmx_hw_rqrmnt_matrix = RTKDataMatrix(
+            dao,
+            RTKHardware,
+            RTKRequirement,
+            sparse=configuration.RTK_SPARSE_MATRICES)
+        self._dmx_hw_tstng_matrix = RTKDataMatrix(
+            dao,
+            RTKHardware,
+            RTKTest,
+            sparse=configuration.RTK_SPARSE_MATRICES)
+        self._dmx_hw_vldtn_matrix = RTKDataMatrix(
+            dao,
+            RTKHardware,
+            RTKValidation,
+            sparse=configuration.RTK_SPARSE_MATRICES)
 
         # Initialize public dictionary attributes.
 
@@ -320,6 +330,24 @@ class HardwareBoMDataController(RTKDataController):
         """
         Set the attributes of the record associated with the Node ID.
 
+        :param int node_id: the ID of the record in the RTK Program database
+                            table whose attributes are to be set.
+        :param dict attributes: the dictionary of attributes and values.
+        :return: False if successful or True if an error is encountered.
+        :rtype: bool
+        """
+        _return = self._do_set_attributes(node_id, attributes)
+
+        # Changed attributes change the results of the hardware item and its
+        # parents, so flag them for the next incremental calculation.
+        self._dtm_data_model.do_mark_dirty(node_id)
+
+        return _return
+
+    def _do_set_attributes(self, node_id, attributes):
+        """
+        Set the attributes of the BoM and each table without flagging a change.
+
         :param int node_id: the ID of the record in the RTK Program database
                             table whose attributes are to be set.
         :param dict attributes: the dictionary of attributes and values.
@@ -434,13 +462,66 @@ class HardwareBoMDataController(RTKDataController):
         """
         _return = False
 
-        _results = self._dtm_data_model.calculate_all()
+        if self._configuration.RTK_PARALLEL_CALCS:
+            _results = self._dtm_data_model.calculate_parallel()
+        else:
+            _results = self._dtm_data_model.calculate_all()
 
         if not self._test:
             for _node_id in self._dtm_data_model.tree.nodes:
                 if _node_id != 0:
                     _attributes = self.request_get_attributes(_node_id)
-                    self.request_set_attributes(_node_id, _attributes)
+                    self._do_set_attributes(_node_id, _attributes)
+
+            pub.sendMessage('calculatedHardware')
+        else:
+            _return = True
+
+        return _return
+
+    def request_calculate_mission(self, phases):
+        """
+        Request to calculate the mission hazard rate of the system.
+
+        :param list phases: the list of (duration, environment_active_id,
+                            temperature_active) for each mission phase.
+        :return: False if successful or True if an error is encountered.
+        :rtype: bool
+        """
+        _return = False
+
+        try:
+            self._dtm_data_model.calculate_mission(phases)
+        except ValueError as _error:
+            self._configuration.RTK_DEBUG_LOG.error(str(_error))
+            _return = True
+
+        if not _return and not self._test:
+            for _node_id in self._dtm_data_model.tree.nodes:
+                if _node_id != 0:
+                    _attributes = self.request_get_attributes(_node_id)
+                    self._do_set_attributes(_node_id, _attributes)
+
+            pub.sendMessage('calculatedHardware')
+
+        return _return
+
+    def request_calculate_dirty(self):
+        """
+        Request to recalculate the changed hardware items and their parents.
+
+        :return: False if successful or True if an error is encountered.
+        :rtype: bool
+        """
+        _return = False
+
+        _lst_updated = self._dtm_data_model.calculate_dirty()
+
+        if not self._test:
+            for _node_id in _lst_updated:
+                if _node_id != 0:
+                    _attributes = self.request_get_attributes(_node_id)
+                    self._do_set_attributes(_node_id, _attributes)
 
             pub.sendMessage('calculatedHardware')
         else:
@@ -6,16 +6,40 @@
 # Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
 """Hardware Package Data Model."""
 
+import multiprocessing
+
+from functools import partial
 from math import exp
+
+import numpy as np
 from treelib.exceptions import DuplicatedNodeIdError
 
 # Import other RTK modules.
+import rtk.Utilities as Utilities
 from rtk.analyses.prediction import Component
 from rtk.datamodels import RTKDataModel
 from rtk.dao import RTKHardware, RTKDesignElectric, RTKDesignMechanic, \
     RTKMilHdbkF, RTKNSWC, RTKReliability
 
 
+def do_calculate_parts(parts, hr_multiplier=1E6):
+    """
+    Calculate a chunk of parts the way HardwareBoMDataModel.calculate() does.
+
+    This is a module function so it can be sent to the worker processes used
+    by HardwareBoMDataModel.calculate_parallel().
+
+    :param list parts: the list of (Node ID, attributes) of the parts.
+    :param float hr_multiplier: the hazard rate multiplier.
+    :return: the list of (Node ID, calculated attributes) of the parts.
+    :rtype: list
+    """
+    return [(_node_id,
+             HardwareBoMDataModel._do_calculate_metrics(
+                 Component.calculate(**_attributes)[0], hr_multiplier))
+            for _node_id, _attributes in parts]
+
+
 class HardwareBoMDataModel(RTKDataModel):
     """
     Contain the attributes and methods of a Hardware Bill of Materials (BoM).
@@ -46,8 +70,14 @@ class HardwareBoMDataModel(RTKDataModel):
         RTKDataModel.__init__(self, dao)
 
         # Initialize private dictionary attributes.
+        # These hold each node's own and cumulative results from the last
+        # system calculation.  They are the baseline for the incremental
+        # recalculation of dirty nodes.
+        self._dic_own_results = {}
+        self._dic_cum_results = {}
 
         # Initialize private list attributes.
+        self._lst_dirty = []
 
         # Initialize private scalar attributes.
 
@@ -100,53 +130,85 @@ class HardwareBoMDataModel(RTKDataModel):
         """
         Retrieve all the Hardware BoM data from the RTK Program database.
 
+        The RTKHardware records for the Revision and their RTKDesignElectric,
+        RTKDesignMechanic, RTKMilHdbkF, RTKNSWC, and RTKReliability records
+        are retrieved with a single outer joined query.  The Hardware BoM tree
+        and the trees of the six table data models are then built from the
+        result set in one pass.  This keeps the number of queries constant
+        regardless of the size of the BoM.
+
         :param int revision_id: the Revision ID to select the Hardware BoM for.
         :return: tree; the Tree() of data models.
         :rtype: :class:`treelib.Tree`
         """
-        for _node in self.dtm_hardware.select_all(revision_id).all_nodes()[1:]:
-            _data = {}
-            _hardware_id = _node.data.hardware_id
-            _data = _node.data.get_attributes()
-            try:
-                _electrical = self.dtm_design_electric.select_all(_hardware_id)
-                _data.update(
-                    _electrical.nodes[_hardware_id].data.get_attributes())
-            except KeyError:
-                pass
+        _session = RTKDataModel.select_all(self)
 
-            try:
-                _mechanical = self.dtm_design_mechanic.select_all(_hardware_id)
-                _data.update(
-                    _mechanical.nodes[_hardware_id].data.get_attributes())
-            except KeyError:
-                pass
+        self._dic_own_results = {}
+        self._dic_cum_results = {}
+        self._lst_dirty = []
+
+        _lst_models = [
+            self.dtm_design_electric, self.dtm_design_mechanic,
+            self.dtm_mil_hdbk_f, self.dtm_nswc, self.dtm_reliability
+        ]
+        for _model in [self.dtm_hardware] + _lst_models:
+            for _node in _model.tree.children(_model.tree.root):
+                _model.tree.remove_node(_node.identifier)
+
+        _query = _session.query(
+            RTKHardware, RTKDesignElectric, RTKDesignMechanic, RTKMilHdbkF,
+            RTKNSWC, RTKReliability).\
+            outerjoin(RTKDesignElectric,
+                      RTKDesignElectric.hardware_id ==
+                      RTKHardware.hardware_id).\
+            outerjoin(RTKDesignMechanic,
+                      RTKDesignMechanic.hardware_id ==
+                      RTKHardware.hardware_id).\
+            outerjoin(RTKMilHdbkF,
+                      RTKMilHdbkF.hardware_id == RTKHardware.hardware_id).\
+            outerjoin(RTKNSWC,
+                      RTKNSWC.hardware_id == RTKHardware.hardware_id).\
+            outerjoin(RTKReliability,
+                      RTKReliability.hardware_id == RTKHardware.hardware_id).\
+            filter(RTKHardware.revision_id == revision_id).\
+            order_by(RTKHardware.hardware_id)
+
+        for _row in _query.all():
+            _hardware = _row[0]
+            _hardware_id = _hardware.hardware_id
 
-            try:
-                _mil_hdbk_f = self.dtm_mil_hdbk_f.select_all(_hardware_id)
-                _data.update(
-                    _mil_hdbk_f.nodes[_hardware_id].data.get_attributes())
-            except KeyError:
-                pass
+            # We get and then set the attributes to replace any None values
+            # (NULL fields in the database) with their default value.
+            _data = _hardware.get_attributes()
+            _hardware.set_attributes(_data)
 
             try:
-                _nswc = self.dtm_nswc.select_all(_hardware_id)
-                _data.update(_nswc.nodes[_hardware_id].data.get_attributes())
-            except KeyError:
+                self.dtm_hardware.tree.create_node(
+                    _hardware.comp_ref_des,
+                    _hardware_id,
+                    parent=_hardware.parent_id,
+                    data=_hardware)
+                self.dtm_hardware.last_id = max(self.dtm_hardware.last_id,
+                                                _hardware_id)
+            except DuplicatedNodeIdError:
                 pass
 
-            try:
-                _reliability = self.dtm_reliability.select_all(_hardware_id)
-                _data.update(
-                    _reliability.nodes[_hardware_id].data.get_attributes())
-            except KeyError:
-                pass
+            for _model, _record in zip(_lst_models, _row[1:]):
+                if _record is None:
+                    continue
+                try:
+                    _model.tree.create_node(
+                        _hardware_id, _hardware_id, parent=0, data=_record)
+                    _model.last_id = max(_model.last_id, _hardware_id)
+                except DuplicatedNodeIdError:
+                    pass
+                _data.update(_record.get_attributes())
 
             try:
                 self.tree.create_node(
-                    _node.data.comp_ref_des,
+                    _hardware.comp_ref_des,
                     _hardware_id,
-                    parent=_node.data.parent_id,
+                    parent=_hardware.parent_id,
                     data=_data)
 
                 # pylint: disable=attribute-defined-outside-init
@@ -155,6 +217,8 @@ class HardwareBoMDataModel(RTKDataModel):
             except DuplicatedNodeIdError:
                 pass
 
+        _session.close()
+
         return self.tree
 
     def insert(self, **kwargs):
@@ -216,7 +280,9 @@ class HardwareBoMDataModel(RTKDataModel):
             _reliability = self.dtm_reliability.select(_hardware_id)
             _data.update(_reliability.get_attributes())
 
-            # FIXME: Add code to insert record to analyses tables (Allocation, Similar Item, etc.) in HardwareBoMDataModel.insert().
+            # FIXME: Add code to insert record to analyses tables
+            # (Allocation, Similar Item, etc.) in
+            # HardwareBoMDataModel.insert().
 
             self.tree.create_node(
                 _hardware.comp_ref_des,
@@ -262,6 +328,12 @@ class HardwareBoMDataModel(RTKDataModel):
         # pylint: disable=attribute-defined-outside-init
         # It is defined in RTKDataModel.__init__
         if _error_code == 0:
+            # Removing a sub-tree invalidates the cumulative results of its
+            # ancestors so the next calculation must be a full calculation.
+            self._dic_own_results = {}
+            self._dic_cum_results = {}
+            self._lst_dirty = []
+
             self.tree.remove_node(node_id)
             # CASCADE DELETE removes the records from the database.  Now they
             # need to be reomved from the data model trees.
@@ -323,28 +395,26 @@ class HardwareBoMDataModel(RTKDataModel):
 
     def update_all(self):
         """
-        Update all RTKHardware table records in the RTK Program database.
+        Update all the Hardware BoM records in the RTK Program database.
+
+        The records from each of the Hardware tables are saved in a single
+        session and transaction.
 
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.identifier)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print('FIXME: Handle non-zero error codes in '
-                          'rtk.hardware.Model.HardwareDataModel.update_all().')
-
-            except AttributeError:
-                print('FIXME: Handle AttributeError in '
-                      'rtk.hardware.Model.HardwareDataModel.update_all().')
+        _entities = []
+        for _dtm in [
+                self.dtm_hardware, self.dtm_reliability,
+                self.dtm_design_electric, self.dtm_design_mechanic,
+                self.dtm_mil_hdbk_f, self.dtm_nswc
+        ]:
+            _entities.extend([
+                _node.data for _node in _dtm.tree.all_nodes()
+                if _node.data is not None
+            ])
 
-        return _error_code, _msg
+        return RTKDataModel.update_all(self, _entities)
 
     def calculate(self, hardware_id, hr_multiplier=1E6):
         """
@@ -373,19 +443,36 @@ class HardwareBoMDataModel(RTKDataModel):
                 if _attributes['cost_type_id'] in [0, 2]:
                     _attributes['total_cost'] = 0.0
 
-            _attributes['hazard_rate_active'] = (
-                _attributes['hazard_rate_active'] / hr_multiplier)
-            _attributes['hazard_rate_dormant'] = (
-                _attributes['hazard_rate_dormant'] / hr_multiplier)
-            _attributes['hazard_rate_software'] = (
-                _attributes['hazard_rate_software'] / hr_multiplier)
-
-            _attributes = self._calculate_reliability_metrics(_attributes)
-            _attributes = self._calculate_cost_metrics(_attributes)
-            _attributes = self._calculate_metric_variances(_attributes)
+            _attributes = self._do_calculate_metrics(_attributes,
+                                                     hr_multiplier)
 
         return _attributes
 
+    @staticmethod
+    def _do_calculate_metrics(attributes, hr_multiplier):
+        """
+        Scale the hazard rates and calculate the metrics of a hardware item.
+
+        :param dict attributes: the attributes of the hardware item.
+        :param float hr_multiplier: the hazard rate multiplier.
+        :return: attributes; the attributes with updated values.
+        :rtype: dict
+        """
+        attributes['hazard_rate_active'] = (
+            attributes['hazard_rate_active'] / hr_multiplier)
+        attributes['hazard_rate_dormant'] = (
+            attributes['hazard_rate_dormant'] / hr_multiplier)
+        attributes['hazard_rate_software'] = (
+            attributes['hazard_rate_software'] / hr_multiplier)
+
+        attributes = HardwareBoMDataModel._calculate_reliability_metrics(
+            attributes)
+        attributes = HardwareBoMDataModel._calculate_cost_metrics(attributes)
+        attributes = HardwareBoMDataModel._calculate_metric_variances(
+            attributes)
+
+        return attributes
+
     @staticmethod
     def _calculate_cost_metrics(attributes):
         """
@@ -435,7 +522,8 @@ class HardwareBoMDataModel(RTKDataModel):
         except ZeroDivisionError:
             attributes['mtbf_logistics'] = 0.0
         try:
-            attributes['mtbf_mission'] = attributes['hazard_rate_mission']
+            attributes['mtbf_mission'] = (
+                1.0 / attributes['hazard_rate_mission'])
         except ZeroDivisionError:
             attributes['mtbf_mission'] = 0.0
 
@@ -475,10 +563,92 @@ class HardwareBoMDataModel(RTKDataModel):
 
         return attributes
 
-    def calculate_all(self, hr_multiplier=1E6, node_id=0):
+    def _do_pack_tree(self, node_id):
+        """
+        Pack the sub-tree starting at Node ID into parent-index arrays.
+
+        The nodes are numbered in breadth-first order so the nodes at each
+        level of the sub-tree occupy a contiguous block of the arrays and the
+        children of each node appear in the same order as the node's
+        fpointer.
+
+        :param int node_id: the ID of the treelib Tree() node at the top of the
+                            sub-tree to pack.
+        :return: (_lst_node_ids, _parents, _levels); the list of Node IDs in
+                 breadth-first order, the array holding the index of each
+                 node's parent (-1 for the top node), and the list of
+                 (start, end) index pairs for each level of the sub-tree.
+        :rtype: (list, :class:`numpy.ndarray`, list)
+        """
+        _lst_node_ids = [node_id]
+        _lst_parents = [-1]
+        _levels = []
+
+        _start = 0
+        while _start < len(_lst_node_ids):
+            _end = len(_lst_node_ids)
+            _levels.append((_start, _end))
+            for _idx in range(_start, _end):
+                for _child_id in self.tree.get_node(
+                        _lst_node_ids[_idx]).fpointer:
+                    _lst_node_ids.append(_child_id)
+                    _lst_parents.append(_idx)
+            _start = _end
+
+        return _lst_node_ids, np.array(_lst_parents, dtype=int), _levels
+
+    @staticmethod
+    def _do_roll_up(own, parents, levels):
+        """
+        Roll up the results of each node into the cumulative results.
+
+        The cumulative results of a node are the sum of the cumulative results
+        of its children plus the node's own results.  The levels are reduced
+        from the bottom up with one segment sum per level.  numpy.bincount()
+        accumulates the weights in array order so each sum is formed in the
+        same order as adding the children one at a time.
+
+        :param own: the (n, 6) array of each node's own results.
+        :type own: :class:`numpy.ndarray`
+        :param parents: the array holding the index of each node's parent.
+        :type parents: :class:`numpy.ndarray`
+        :param list levels: the list of (start, end) index pairs for each level
+                            of the tree.
+        :return: _cum; the (n, 6) array of cumulative results.
+        :rtype: :class:`numpy.ndarray`
+        """
+        _n_cols = own.shape[1]
+        _children = np.zeros(own.shape)
+        _cum = np.zeros(own.shape)
+
+        for _level in range(len(levels) - 1, -1, -1):
+            _start, _end = levels[_level]
+            _cum[_start:_end] = _children[_start:_end] + own[_start:_end]
+
+            if _level > 0:
+                # Reduce every column in one pass by giving each (parent,
+                # column) pair its own bin.
+                _pstart, _pend = levels[_level - 1]
+                _bins = ((parents[_start:_end, None] - _pstart) * _n_cols +
+                         np.arange(_n_cols)).ravel()
+                _children[_pstart:_pend] += np.bincount(
+                    _bins,
+                    weights=_cum[_start:_end].ravel(),
+                    minlength=(_pend - _pstart) * _n_cols).reshape(
+                        -1, _n_cols)
+
+        return _cum
+
+    def calculate_all(self, hr_multiplier=1E6, node_id=0, parts=None):
         """
         Calculate all items in the system.
 
+        The sub-tree starting at Node ID is packed into parent-index arrays,
+        each node is calculated, and the hazard rates, costs, part counts, and
+        power dissipations are rolled up from the bottom level to the top
+        level with segment sums.  No recursion is used so the depth of the
+        hardware tree is not limited by the Python recursion limit.
+
         :param float hr_multiplier: the hazard rate multiplier.  This is used
                                     to allow the hazard rates to be entered and
                                     displayed in more human readable numbers,
@@ -488,6 +658,9 @@ class HardwareBoMDataModel(RTKDataModel):
                                     failures/million hours.
         :param int node_id: the ID of the treelib Tree() node to start the
                             calculation at.
+        :param dict parts: the {Node ID:attributes} of parts that have already
+                           been calculated.  These parts are not calculated
+                           again.
         :return: _cum_results; the list of cumulative results.  The list order
                  is:
 
@@ -500,54 +673,271 @@ class HardwareBoMDataModel(RTKDataModel):
 
         :rtype: list
         """
-        _cum_results = [0.0, 0.0, 0.0, 0.0, 0, 0.0]
-
-        # Check if there are children nodes of the node passed.
-        if self.tree.get_node(node_id).fpointer:
-            _attributes = self.tree.get_node(node_id).data
-
-            # If there are children, calculate each of them first.
-            for _node_id in self.tree.get_node(node_id).fpointer:
-                _results = self.calculate_all(hr_multiplier, _node_id)
-                _cum_results[0] += _results[0]
-                _cum_results[1] += _results[1]
-                _cum_results[2] += _results[2]
-                _cum_results[3] += _results[3]
-                _cum_results[4] += int(_results[4])
-                _cum_results[5] += _results[5]
-            # Then calculate the parent node.
-            _attributes = self.calculate(node_id, hr_multiplier)
+        if parts is None:
+            parts = {}
+
+        _lst_node_ids, _parents, _levels = self._do_pack_tree(node_id)
+
+        _own = np.zeros((len(_lst_node_ids), 6))
+        for _idx, _node_id in enumerate(_lst_node_ids):
+            if _node_id in parts:
+                _attributes = parts[_node_id]
+            elif self.tree.get_node(_node_id).data is not None:
+                _attributes = self.calculate(_node_id, hr_multiplier)
+            else:
+                _attributes = None
             if _attributes is not None:
-                _cum_results[0] += _attributes['hazard_rate_active']
-                _cum_results[1] += _attributes['hazard_rate_dormant']
-                _cum_results[2] += _attributes['hazard_rate_software']
-                _cum_results[3] += _attributes['total_cost']
-                _cum_results[4] += int(_attributes['total_part_count'])
-                _cum_results[5] += _attributes['total_power_dissipation']
+                _own[_idx] = [
+                    _attributes['hazard_rate_active'],
+                    _attributes['hazard_rate_dormant'],
+                    _attributes['hazard_rate_software'],
+                    _attributes['total_cost'],
+                    int(_attributes['total_part_count']),
+                    _attributes['total_power_dissipation']
+                ]
+
+        _cum = self._do_roll_up(_own, _parents, _levels)
+
+        for _idx, _node_id in enumerate(_lst_node_ids):
+            self._do_set_cum_results(_node_id, _cum[_idx])
+
+        # Only a calculation of the entire system provides a consistent
+        # baseline for later incremental recalculations.
+        if node_id == 0:
+            self._dic_own_results = dict(zip(_lst_node_ids, _own))
+            self._dic_cum_results = dict(zip(_lst_node_ids, _cum))
+            self._lst_dirty = []
         else:
-            if self.tree.get_node(node_id).data is not None:
-                _attributes = self.calculate(node_id, hr_multiplier)
-                _cum_results[0] += _attributes['hazard_rate_active']
-                _cum_results[1] += _attributes['hazard_rate_dormant']
-                _cum_results[2] += _attributes['hazard_rate_software']
-                _cum_results[3] += _attributes['total_cost']
-                _cum_results[4] += int(_attributes['total_part_count'])
-                _cum_results[5] += _attributes['total_power_dissipation']
-
-        if self.tree.get_node(
-                node_id).data is not None and _attributes['part'] == 0:
-            _attributes['hazard_rate_active'] = _cum_results[0]
-            _attributes['hazard_rate_dormant'] = _cum_results[1]
-            _attributes['hazard_rate_software'] = _cum_results[2]
-            _attributes['total_cost'] = _cum_results[3]
-            _attributes['total_part_count'] = int(_cum_results[4])
-            _attributes['total_power_dissipation'] = _cum_results[5]
+            self._dic_own_results = {}
+            self._dic_cum_results = {}
+
+        _cum_results = _cum[0].tolist()
+        _cum_results[4] = int(_cum_results[4])
+
+        return _cum_results
+
+    def _do_merge_parts(self, results):
+        """
+        Merge the calculated attributes of the parts back into the BoM.
+
+        :param list results: the list of do_calculate_parts() results for each
+                             chunk of parts.
+        :return: _dic_parts; the attributes of each calculated part keyed by
+                 Node ID.
+        :rtype: dict
+        """
+        _dic_parts = {}
+        for _results in results:
+            for _node_id, _attributes in _results:
+                _data = self.tree.get_node(_node_id).data
+                _data.update(_attributes)
+                _dic_parts[_node_id] = _data
+
+        return _dic_parts
+
+    def calculate_parallel(self,
+                           hr_multiplier=1E6,
+                           node_id=0,
+                           n_workers=None,
+                           chunk_size=250):
+        """
+        Calculate all items in the system with the parts split across workers.
+
+        The hazard rate of a part does not depend on any other hardware item
+        so the parts in the sub-tree starting at Node ID are split into chunks
+        and calculated in a pool of worker processes.  The calculated
+        attributes are merged back into the BoM and then the assemblies are
+        rolled up with calculate_all().  The parts are calculated in this
+        process when there is only one worker, only one chunk of parts, or a
+        pool of worker processes can't be started.
+
+        :param float hr_multiplier: the hazard rate multiplier.
+        :param int node_id: the ID of the treelib Tree() node to start the
+                            calculation at.
+        :param int n_workers: the number of worker processes.  Defaults to the
+                              number of CPUs.
+        :param int chunk_size: the number of parts sent to a worker at a time.
+        :return: _cum_results; the list of cumulative results in the same
+                 order as calculate_all().
+        :rtype: list
+        """
+        if n_workers is None:
+            n_workers = multiprocessing.cpu_count()
+
+        _lst_parts = []
+        for _node_id in self.tree.expand_tree(node_id):
+            _attributes = self.tree.get_node(_node_id).data
+            if _attributes is not None and _attributes['category_id'] > 0:
+                _lst_parts.append((_node_id, _attributes))
+
+        _lst_chunks = [
+            _lst_parts[_idx:_idx + chunk_size]
+            for _idx in range(0, len(_lst_parts), chunk_size)
+        ]
+
+        _dic_parts = self._do_merge_parts(
+            Utilities.do_map_chunks(
+                partial(do_calculate_parts, hr_multiplier=hr_multiplier),
+                _lst_chunks, n_workers))
+
+        return self.calculate_all(hr_multiplier, node_id, parts=_dic_parts)
+
+    def calculate_mission(self, phases, hr_multiplier=1E6, node_id=0):
+        """
+        Calculate the mission hazard rate of all items in the system.
+
+        The mission hazard rate of each part in the sub-tree starting at Node
+        ID is the average of its active hazard rate in the conditions of each
+        mission phase weighted by the duration of the phase.  See
+        Component.do_calculate_mission_hazard_rate() for how the phases are
+        described.  The mission hazard rates are rolled up into the
+        assemblies and the mission MTBF and reliability of every item are
+        updated.
+
+        :param list phases: the list of (duration, environment_active_id,
+                            temperature_active) for each mission phase.
+        :param float hr_multiplier: the hazard rate multiplier.
+        :param int node_id: the ID of the treelib Tree() node to start the
+                            calculation at.
+        :return: the mission hazard rate of the item at Node ID.
+        :rtype: float
+        :raise: ValueError if the total duration of the phases is not greater
+                than zero.
+        """
+        _lst_node_ids, _parents, _levels = self._do_pack_tree(node_id)
+
+        _lst_parts = []
+        _lst_index = []
+        for _idx, _node_id in enumerate(_lst_node_ids):
+            _attributes = self.tree.get_node(_node_id).data
+            if _attributes is not None and _attributes['category_id'] > 0:
+                _lst_parts.append(_attributes)
+                _lst_index.append(_idx)
+
+        _own = np.zeros((len(_lst_node_ids), 1))
+        _own[_lst_index, 0] = Component.do_calculate_mission_hazard_rate(
+            _lst_parts, phases)
+        _cum = self._do_roll_up(_own / hr_multiplier, _parents, _levels)
+
+        for _idx, _node_id in enumerate(_lst_node_ids):
+            _attributes = self.tree.get_node(_node_id).data
+            if _attributes is not None:
+                _attributes['hazard_rate_mission'] = _cum[_idx, 0].item()
+                try:
+                    _attributes['mtbf_mission'] = (
+                        1.0 / _attributes['hazard_rate_mission'])
+                except ZeroDivisionError:
+                    _attributes['mtbf_mission'] = 0.0
+                _attributes['reliability_mission'] = exp(
+                    -1.0 * _attributes['hazard_rate_mission'] *
+                    _attributes['mission_time'])
+
+        return _cum[0, 0].item()
+
+    def _do_set_cum_results(self, node_id, results):
+        """
+        Set the cumulative results of an assembly and update its metrics.
+
+        :param int node_id: the ID of the treelib Tree() node to update.
+        :param results: the six cumulative results of the node.
+        :type results: :class:`numpy.ndarray`
+        :return: None
+        :rtype: None
+        """
+        _attributes = self.tree.get_node(node_id).data
+        if _attributes is not None and _attributes['part'] == 0:
+            _results = results.tolist()
+            _attributes['hazard_rate_active'] = _results[0]
+            _attributes['hazard_rate_dormant'] = _results[1]
+            _attributes['hazard_rate_software'] = _results[2]
+            _attributes['total_cost'] = _results[3]
+            _attributes['total_part_count'] = int(_results[4])
+            _attributes['total_power_dissipation'] = _results[5]
 
             _attributes = self._calculate_reliability_metrics(_attributes)
             _attributes = self._calculate_cost_metrics(_attributes)
             _attributes = self._calculate_metric_variances(_attributes)
 
-        return _cum_results
+    def do_mark_dirty(self, node_id):
+        """
+        Mark a hardware item as needing to be recalculated.
+
+        :param int node_id: the ID of the hardware item whose attributes have
+                            changed.
+        :return: None
+        :rtype: None
+        """
+        if node_id not in self._lst_dirty:
+            self._lst_dirty.append(node_id)
+
+    def calculate_dirty(self, hr_multiplier=1E6):
+        """
+        Recalculate the dirty hardware items and their ancestors.
+
+        Each dirty hardware item is calculated and the change in its own
+        results is added to the cumulative results of the item and every
+        ancestor up to the top of the tree.  The deltas from all the dirty
+        items are accumulated before any assembly is updated, so an ancestor
+        shared by several dirty items is only updated once.  If there are no
+        results from a previous calculation of the system, the entire system
+        is calculated.
+
+        :param float hr_multiplier: the hazard rate multiplier.
+        :return: _lst_updated; the list of Node IDs whose cumulative results
+                 were updated.
+        :rtype: list
+        """
+        _lst_dirty = [
+            _node_id for _node_id in self._lst_dirty
+            if self.tree.contains(_node_id)
+        ]
+
+        # A new hardware item can be added to the baseline as long as it has
+        # no children; anything else requires a full calculation.
+        _baseline = 0 in self._dic_cum_results
+        for _node_id in _lst_dirty:
+            if (_node_id not in self._dic_cum_results
+                    and self.tree.get_node(_node_id).fpointer):
+                _baseline = False
+
+        if not _baseline:
+            self.calculate_all(hr_multiplier)
+            return list(self.tree.nodes.keys())
+
+        _dic_deltas = {}
+        for _node_id in _lst_dirty:
+            _old = self._dic_own_results.get(_node_id, np.zeros(6))
+            _new = np.zeros(6)
+            if self.tree.get_node(_node_id).data is not None:
+                _attributes = self.calculate(_node_id, hr_multiplier)
+                _new[:] = [
+                    _attributes['hazard_rate_active'],
+                    _attributes['hazard_rate_dormant'],
+                    _attributes['hazard_rate_software'],
+                    _attributes['total_cost'],
+                    int(_attributes['total_part_count']),
+                    _attributes['total_power_dissipation']
+                ]
+            self._dic_own_results[_node_id] = _new
+            if _node_id not in self._dic_cum_results:
+                self._dic_cum_results[_node_id] = np.zeros(6)
+
+            _delta = _new - _old
+            _ancestor_id = _node_id
+            while _ancestor_id is not None:
+                if _ancestor_id in _dic_deltas:
+                    _dic_deltas[_ancestor_id] += _delta
+                else:
+                    _dic_deltas[_ancestor_id] = _delta.copy()
+                _ancestor_id = self.tree.get_node(_ancestor_id).bpointer
+
+        for _node_id, _delta in _dic_deltas.items():
+            self._dic_cum_results[_node_id] += _delta
+            self._do_set_cum_results(_node_id, self._dic_cum_results[_node_id])
+
+        self._lst_dirty = []
+
+        return list(_dic_deltas.keys())
 
 
 class HardwareDataModel(RTKDataModel):
@@ -694,23 +1084,7 @@ class HardwareDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.hardware_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print('FIXME: Handle non-zero error codes in '
-                          'rtk.hardware.Model.HardwareDataModel.update_all().')
-
-            except AttributeError:
-                print('FIXME: Handle AttributeError in '
-                      'rtk.hardware.Model.HardwareDataModel.update_all().')
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
     def make_composite_ref_des(self, node_id=1):
         """
@@ -882,26 +1256,7 @@ class DesignElectricDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.hardware_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print(
-                        'FIXME: Handle non-zero error codes in '
-                        'rtk.hardware.Model.DesignElectricDataModel.update_all().'
-                    )
-
-            except AttributeError:
-                print(
-                    'FIXME: Handle AttributeError in '
-                    'rtk.hardware.Model.DesignElectricDataModel.update_all().')
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
 
 class DesignMechanicDataModel(RTKDataModel):
@@ -1045,26 +1400,7 @@ class DesignMechanicDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.hardware_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print(
-                        'FIXME: Handle non-zero error codes in '
-                        'rtk.hardware.Model.DesignMechanicDataModel.update_all().'
-                    )
-
-            except AttributeError:
-                print(
-                    'FIXME: Handle AttributeError in '
-                    'rtk.hardware.Model.DesignMechanicDataModel.update_all().')
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
 
 class MilHdbkFDataModel(RTKDataModel):
@@ -1208,23 +1544,7 @@ class MilHdbkFDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.hardware_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print('FIXME: Handle non-zero error codes in '
-                          'rtk.hardware.Model.MilHdbkFDataModel.update_all().')
-
-            except AttributeError:
-                print('FIXME: Handle AttributeError in '
-                      'rtk.hardware.Model.MilHdbkFDataModel.update_all().')
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
 
 class NSWCDataModel(RTKDataModel):
@@ -1362,23 +1682,7 @@ class NSWCDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.hardware_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print('FIXME: Handle non-zero error codes in '
-                          'rtk.hardware.Model.NSWCDataModel.update_all().')
-
-            except AttributeError:
-                print('FIXME: Handle AttributeError in '
-                      'rtk.hardware.Model.NSWCDataModel.update_all().')
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
 
 class ReliabilityDataModel(RTKDataModel):
@@ -1522,22 +1826,4 @@ class ReliabilityDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.hardware_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print(
-                        'FIXME: Handle non-zero error codes in '
-                        'rtk.hardware.Model.ReliabilityDataModel.update_all().'
-                    )
-
-            except AttributeError:
-                print('FIXME: Handle AttributeError in '
-                      'rtk.hardware.Model.ReliabilityDataModel.update_all().')
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
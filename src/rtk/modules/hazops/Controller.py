@@ -144,3 +144,12 @@ class HazardAnalysisDataController(RTKDataController):
         :rtype: bool
         """
         return self._dtm_data_model.calculate(node_id)
+
+    def request_calculate_all(self):
+        """
+        Request the calculations be performed for all the hazards.
+
+        :return: False if successful or True is an error is encountered.
+        :rtype: bool
+        """
+        return self._dtm_data_model.calculate_all()
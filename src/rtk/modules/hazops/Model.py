@@ -9,8 +9,10 @@
 from treelib import tree
 
 # Import other RTK modules.
+from rtk.analyses.Equation import do_evaluate_array
 from rtk.datamodels import RTKDataModel
 from rtk.dao import RTKHazardAnalysis
+from rtk.dao.programdb.RTKHazardAnalysis import EQUATION_VARIABLES
 
 
 class HazardAnalysisDataModel(RTKDataModel):
@@ -167,32 +169,17 @@ class HazardAnalysisDataModel(RTKDataModel):
         Update all RTKHazardAnalysis records for the selected Hardware item.
 
         :param int module_id: the ID of the Hardware item to save the HazOps for.
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = "RTK SUCCESS: Updating the RTK Program database."
+        _error_code, _msg = RTKDataModel.update_all(
+            self, [
+                _node.data for _node in self.select_children(module_id)
+                if _node.data is not None
+            ])
 
-        for _node in self.select_children(module_id):
-            try:
-                _id = '{0:d}.{1:d}'.format(_node.data.hardware_id,
-                                           _node.data.hazard_id)
-                _error_code, _err_msg = self.update(_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.hazard_analysis.Model.update_all().'
-
-            except AttributeError:
-                if _node.data is None:
-                    _msg = _msg + ('RTK ERROR: No data package for Node ID: '
-                                   '{0:d}.\n').format(_node.identifier)
-                else:
-                    _msg = _msg + ('RTK ERROR: Attempt to save Node ID: '
-                                   '{0:d}.{1:d} failed.\n').format(
-                                       _node.data.hardware_id,
-                                       _node.data.hazard_id)
+        if _msg == '':
+            _msg = "RTK SUCCESS: Updating the RTK Program database."
 
         return _error_code, _msg
 
@@ -208,3 +195,55 @@ class HazardAnalysisDataModel(RTKDataModel):
         _hazard = self.select(node_id)
 
         return _hazard.calculate()
+
+    def calculate_all(self):
+        """
+        Calculate the HRIs and user-defined equations for all the hazards.
+
+        The hazards are grouped by the text of each user-defined equation and
+        each equation is evaluated once for all the hazards that use it.  The
+        results are the same as calling calculate() for each hazard.
+
+        :return: False if successful or True if an error is encountered.
+        :rtype: bool
+        """
+        _return = False
+
+        _hazards = [
+            _node.data for _node in self.tree.all_nodes()
+            if _node.data is not None
+        ]
+        for _hazard in _hazards:
+            _return = _hazard.calculate_hri() or _return
+
+        # All the variables are retrieved before any results are updated so
+        # each equation sees the existing results like calculate() does.
+        _calculations = dict(
+            (_name, [getattr(_hazard, _attribute) for _hazard in _hazards])
+            for _name, _attribute in EQUATION_VARIABLES)
+
+        for _index in range(1, 6):
+            _equations = {}
+            for _position, _equation in enumerate(
+                    _calculations['equation{0:d}'.format(_index)]):
+                _equations.setdefault(_equation, []).append(_position)
+
+            for _equation, _positions in _equations.items():
+                try:
+                    _results = do_evaluate_array(
+                        _equation,
+                        dict((_name, [_values[_idx] for _idx in _positions])
+                             for _name, _values in _calculations.items()),
+                        len(_positions))
+                except SyntaxError:
+                    _results = [
+                        _calculations['res{0:d}'.format(_index)][_idx]
+                        for _idx in _positions
+                    ]
+                    if _equation != '':
+                        _return = True
+                for _idx, _result in zip(_positions, _results):
+                    setattr(_hazards[_idx], 'result_{0:d}'.format(_index),
+                            _result)
+
+        return _return
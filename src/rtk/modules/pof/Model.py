@@ -146,21 +146,10 @@ class OpLoadDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all OpLoads in the FMEA.'
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.load_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.pof.Model.OpLoadDataModel.update_all().'
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.pof.Model.OpLoadDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all OpLoads in the FMEA.'
 
         return _error_code, _msg
 
@@ -303,21 +292,10 @@ class OpStressDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all OpStresss in the FMEA.'
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.stress_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.pof.Model.OpStressDataModel.update_all().'
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.pof.Model.OpStressDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all OpStresss in the FMEA.'
 
         return _error_code, _msg
 
@@ -460,21 +438,10 @@ class TestMethodDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all TestMethods in the FMEA.'
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.stress_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.pof.Model.TestMethodDataModel.update_all().'
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.pof.Model.TestMethodDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all TestMethods in the FMEA.'
 
         return _error_code, _msg
 
@@ -746,20 +713,9 @@ class PhysicsOfFailureDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Saving all Controls in the PhysicsOfFailure.'
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.identifier)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.fmea.Model.PhysicsOfFailureDataModel.update_all().'
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.fmea.Model.PhysicsOfFailureDataModel.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Saving all Controls in the PhysicsOfFailure.'
 
         return _error_code, _msg
@@ -46,12 +46,21 @@ class RequirementDataController(RTKDataController):
         # Initialize private list attributes.
 
         # Initialize private scalar attributes.
-        self._dmx_rqmt_hw_matrix = RTKDataMatrix(dao, RTKRequirement,
-                                                 RTKHardware)
-        self._dmx_rqmt_sw_matrix = RTKDataMatrix(dao, RTKRequirement,
-                                                 RTKSoftware)
-        self._dmx_rqmt_val_matrix = RTKDataMatrix(dao, RTKRequirement,
-                                                  RTKValidation)
+        self._dmx_rqmt_hw_matrix = RTKDataMatrix(
+            dao,
+            RTKRequirement,
+            RTKHardware,
+            sparse=configuration.RTK_SPARSE_MATRICES)
+        self._dmx_rqmt_sw_matrix = RTKDataMatrix(
+            dao,
+            RTKRequirement,
+            RTKSoftware,
+            sparse=configuration.RTK_SPARSE_MATRICES)
+        self._dmx_rqmt_val_matrix = RTKDataMatrix(
+            dao,
+            RTKRequirement,
+            RTKValidation,
+            sparse=configuration.RTK_SPARSE_MATRICES)
 
         # Initialize public dictionary attributes.
 
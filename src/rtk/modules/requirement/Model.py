@@ -151,20 +151,4 @@ class RequirementDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.requirement_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.requirement.Model.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.requirement.Model.update_all().'
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
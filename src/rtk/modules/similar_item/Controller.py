@@ -142,3 +142,19 @@ class SimilarItemDataController(RTKDataController):
         :rtype: bool
         """
         return self._dtm_data_model.calculate(node_id, hazard_rate)
+
+    def request_calculate_children(self, node_id, hazard_rates=None):
+        """
+        Request the similar_item calculations for each child hardware item.
+
+        :param int node_id: the Node (Hardware) ID of the hardware item whose
+                            children are to be calculated.
+        :param dict hazard_rates: the current hazard rate of each child
+                                  hardware item keyed by the Hardware ID.
+        :return: False if successful or True is an error is encountered.
+        :rtype: bool
+        """
+        if hazard_rates is None:
+            hazard_rates = {}
+
+        return self._dtm_data_model.calculate_children(node_id, hazard_rates)
@@ -6,11 +6,17 @@
 # Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
 """Similar Item Analysis Data Model."""
 
+import numpy as np
 from treelib.exceptions import NodeIDAbsentError
 
 # Import other RTK modules.
 from rtk.datamodels import RTKDataModel
 from rtk.dao import RTKSimilarItem
+from rtk.dao.programdb.RTKSimilarItem import do_calculate_topic_633
+
+# The RTKSimilarItem attributes calculated by the Topic 6.3.3 approach.
+_TOPIC_633_RESULTS = ('temperature_from', 'temperature_to', 'change_factor_1',
+                      'change_factor_2', 'change_factor_3', 'result_1')
 
 
 class SimilarItemDataModel(RTKDataModel):
@@ -166,26 +172,10 @@ class SimilarItemDataModel(RTKDataModel):
         """
         Update all RTKSimilarItem records.
 
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.hardware_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.analyses.similar_item.Model.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.analyses.ssimilar_item.Model.update_all().'
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
     def calculate(self, node_id, hazard_rate):
         """
@@ -210,3 +200,60 @@ class SimilarItemDataModel(RTKDataModel):
             _return = True
 
         return _return
+
+    def calculate_children(self, node_id, hazard_rates):
+        """
+        Calculate the similar item analysis for each child of a hardware item.
+
+        The children using the Topic 6.3.3 approach are calculated together
+        in one call.  The children using user-defined equations are
+        calculated one at a time.
+
+        :param int node_id: the Node (Hardware) ID of the hardware item whose
+                            children are to be calculated.
+        :param dict hazard_rates: the current hazard rate of each child
+                                  hardware item keyed by the Hardware ID.  The
+                                  hazard rate of a child missing from the
+                                  dict is 0.0.
+        :return: False if successful or True if an error is encountered.
+        :rtype: bool
+        """
+        _return = False
+
+        _topic_633 = []
+        for _node in self.select_children(node_id):
+            _sia = _node.data
+            if _sia.method_id == 1:
+                _topic_633.append(_sia)
+            elif _sia.method_id == 2:
+                _return = (_sia.user_defined(
+                    hazard_rates.get(_sia.hardware_id, 0.0)) or _return)
+            else:
+                _return = True
+
+        if _topic_633:
+            _values = np.array(
+                [(hazard_rates.get(_item.hardware_id, 0.0),
+                  _item.quality_from_id, _item.quality_to_id,
+                  _item.environment_from_id, _item.environment_to_id,
+                  _item.temperature_from, _item.temperature_to,
+                  _item.change_factor_1, _item.change_factor_2,
+                  _item.change_factor_3, _item.result_1)
+                 for _item in _topic_633],
+                dtype=float)
+            _factors, _results, _temperatures, _bad = do_calculate_topic_633(
+                *_values[:, :7].T)
+
+            # Only write back the values that changed; setting an attribute
+            # of an RTKSimilarItem costs far more than the calculation.
+            _new = np.column_stack((_temperatures.T, _factors.T, _results))
+            with np.errstate(invalid='ignore'):
+                _changed = np.nonzero(_new != _values[:, 5:])
+            _new = _new.tolist()
+            for _idx, _jdx in zip(*[_index.tolist() for _index in _changed]):
+                setattr(_topic_633[_idx], _TOPIC_633_RESULTS[_jdx],
+                        _new[_idx][_jdx])
+
+            _return = (_return or bool(_bad.any()))
+
+        return _return
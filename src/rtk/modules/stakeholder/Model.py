@@ -149,24 +149,13 @@ class StakeholderDataModel(RTKDataModel):
         """
         Update all RTKStakeholder records.
 
-        :return: False if successful or True if an error is encountered.
-        :rtype: bool
+        :return: (_error_code, _msg); the error code and associated message.
+        :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = 'RTK SUCCESS: Updating the RTK Program database.'
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.stakeholder_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.stakeholder.Model.update_all().'
+        _error_code, _msg = RTKDataModel.update_all(self)
 
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.stakeholder.Model.update_all().'
+        if _msg == '':
+            _msg = 'RTK SUCCESS: Updating the RTK Program database.'
 
         return _error_code, _msg
 
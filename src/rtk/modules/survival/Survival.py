@@ -38,49 +38,42 @@ Survival Package Data Module
 #    NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS
 #    SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
+import multiprocessing
+
 from collections import OrderedDict
 
 import numpy as np
 from scipy.stats import chi2  # pylint: disable=E0611
 
-try:
-    import Utilities
-    import analyses.statistics.NHPP as _nhpp
-    import analyses.survival.KaplanMeier as _km
-    import analyses.survival.MCF as _mcf
-    from survival.Record import Model as Record
-    from analyses.statistics.Bounds import calculate_fisher_bounds
-    from analyses.statistics.growth.CrowAMSAA import calculate_crow_amsaa_mean, \
-                                                     calculate_cramer_vonmises, \
-                                                     calculate_crow_amsaa_chi_square, \
-                                                     cramer_vonmises_critical_value
-    from analyses.statistics.Distributions import Exponential, Gaussian, \
-                                                  LogNormal, Weibull, \
-                                                  time_between_failures
-    from analyses.statistics.Duane import calculate_duane_mean
-    from analyses.statistics.Regression import regression
-except ImportError:
-    import rtk.Utilities as Utilities
-    import rtk.analyses.statistics.NHPP as _nhpp
-    import rtk.analyses.survival.KaplanMeier as _km
-    import rtk.analyses.survival.MCF as _mcf
-    from rtk.survival.Record import Model as Record
-    from rtk.analyses.statistics.Bounds import calculate_fisher_bounds
-    from rtk.analyses.statistics.growth.CrowAMSAA import calculate_crow_amsaa_mean, \
-                                                         calculate_cramer_vonmises, \
-                                                         calculate_crow_amsaa_chi_square, \
-                                                         cramer_vonmises_critical_value
-    from rtk.analyses.statistics.Distributions import Exponential, Gaussian, \
-                                                      LogNormal, Weibull, \
-                                                      time_between_failures
-    from rtk.analyses.statistics.Duane import calculate_duane_mean
-    from rtk.analyses.statistics.Regression import regression
+import rtk.statistics.distributions.KaplanMeier as _km
+import rtk.statistics.distributions.MCF as _mcf
+import rtk.statistics.distributions.NHPP as _nhpp
+from rtk.modules.survival.Record import Model as Record
+from rtk.statistics.Bounds import calculate_information_bounds
+from rtk.statistics.Regression import regression
+from rtk.statistics.distributions.Bootstrap import bootstrap
+from rtk.statistics.distributions.Distributions import Exponential, \
+    Gaussian, LogNormal, Weibull, time_between_failures
+from rtk.statistics.distributions.MLE import observed_information, \
+    partition_data
+from rtk.statistics.growth.CrowAMSAA import calculate_crow_amsaa_mean, \
+    calculate_cramer_vonmises, calculate_crow_amsaa_chi_square, \
+    cramer_vonmises_critical_value
+from rtk.statistics.growth.Duane import calculate_duane_mean
 
 __author__ = 'Andrew Rowland'
 __email__ = 'andrew.rowland@reliaqual.com'
 __organization__ = 'ReliaQual Associates, LLC'
 __copyright__ = 'Copyright 2007 - 2015 Andrew "Weibullguy" Rowland'
 
+# The noun names of the s-distributions keyed by distribution ID.
+_DISTRIBUTIONS = {
+    5: 'exponential',
+    6: 'lognormal',
+    7: 'gaussian',
+    8: 'weibull'
+}
+
 
 class Model(object):  # pylint: disable=R0902, R0904
     """
@@ -102,6 +95,10 @@ class Model(object):  # pylint: disable=R0902, R0904
                                reliability is calculated and the value is a
                                list of reliability values in the format of
                                [lower bound, point estimate, upper bound].
+    :ivar dict dicBootstrap: dictionary of the bootstrap estimates and
+                             intervals of the parameters, B10 life, and MTBF
+                             of the selected s-distribution.  See
+                             Bootstrap.bootstrap().
     :ivar list scale: list of [lower bound, point estimate, upper bound] values
                       of the estimated scale parameter.
     :ivar list shape: list of [lower bound, point estimate, upper bound] values
@@ -128,6 +125,11 @@ class Model(object):  # pylint: disable=R0902, R0904
     :ivar int fit_method: default value: 0
     :ivar float rel_time: default value: 100.0
     :ivar int n_rel_points: default value: 0
+    :ivar bool parallel_calcs: indicates whether to fit the bootstrap data
+                               sets in one worker process per CPU.  Default
+                               value: False
+    :ivar int seed: the seed of the bootstrap random number generator.
+                    Default value: 1
     :ivar int n_suspensions: default value: 0
     :ivar int n_failures: default value: 0
     :ivar float mhb: default value: 0.0
@@ -160,6 +162,7 @@ class Model(object):  # pylint: disable=R0902, R0904
         self.dicMTBF = {}
         self.dicHazard = {}
         self.dicReliability = {}
+        self.dicBootstrap = {}
 
         # Initialize public list attributes.
         self.scale = [0.0, 0.0, 0.0]
@@ -191,6 +194,8 @@ class Model(object):  # pylint: disable=R0902, R0904
         self.fit_method = 0  # 1=MLE, 2=Rank Regression
         self.rel_time = 100.0
         self.n_rel_points = 0
+        self.parallel_calcs = False
+        self.seed = 1
         self.n_suspensions = 0
         self.n_failures = 0
         self.mhb = 0.0  # MIL-HDBK trend statistic
@@ -261,6 +266,32 @@ class Model(object):  # pylint: disable=R0902, R0904
 
         return False
 
+    def _do_get_n_workers(self):
+        """
+        Method to get the number of worker processes for the bootstrap.
+
+        :return: the number of CPUs if parallel calculations are enabled,
+                 otherwise one.
+        :rtype: int
+        """
+        if self.parallel_calcs:
+            return multiprocessing.cpu_count()
+
+        return 1
+
+    def _do_set_bounds(self, bounds):
+        """
+        Method to set the bounds on the scale and shape parameters.
+
+        :param list bounds: the (lower, upper) bounds on the scale parameter
+                            followed by those on the shape parameter, if any.
+        :return: None
+        :rtype: None
+        """
+        (self.scale[0], self.scale[2]) = bounds[0]
+        if len(bounds) > 1:
+            (self.shape[0], self.shape[2]) = bounds[1]
+
     def calculate_parameter_bounds(self, data):
         """
         Method to calculate confidence bounds on estimated parameters.
@@ -279,14 +310,16 @@ class Model(object):  # pylint: disable=R0902, R0904
         """
         # TODO: Consider refactoring calculate_parameter_bounds; current McCabe Complexity metric=15.
         if self.confidence_method == 3:  # Fisher
-            (self.scale[0], self.scale[2]) = calculate_fisher_bounds(
-                self.scale[1], self.variance[0], self.confidence)
-
-            (self.shape[0], self.shape[2]) = calculate_fisher_bounds(
-                self.shape[1], self.variance[1], self.confidence)
-
-            (self.location[0], self.location[2]) = calculate_fisher_bounds(
-                self.location[1], self.variance[2], self.confidence)
+            _dist = _DISTRIBUTIONS[self.distribution_id]
+            _params = [self.scale[1], self.shape[1]]
+            if _dist == 'exponential':
+                _params = _params[:1]
+            _information = observed_information(
+                partition_data(data, self.start_time, self.rel_time),
+                _params, _dist)
+            self._do_set_bounds(
+                calculate_information_bounds(_params, _information,
+                                             self.confidence))
 
         elif self.confidence_method == 4:  # Likelihood ratio
             if self.distribution_id == 5:  # Exponential
@@ -294,36 +327,32 @@ class Model(object):  # pylint: disable=R0902, R0904
                  self.scale[2]) = Exponential().likelihood_bounds(
                      self.scale[1], self.location[1], self.confidence, data)
             elif self.distribution_id == 6:  # LogNormal
-                (_lower, _upper) = LogNormal().likelihood_bounds(
-                    [self.scale[1], self.shape[1]], self.confidence, data)
-                self.scale[0] = min(_lower.values())
-                self.scale[2] = max(_upper.values())
-                self.shape[0] = [
-                    _key for _key in _lower.keys()
-                    if _lower[_key] == min(_lower.values())
-                ][0]
-                self.shape[2] = [
-                    _key for _key in _upper.keys()
-                    if _upper[_key] == max(_upper.values())
-                ][0]
+                (self.scale[0], self.scale[2], self.shape[0],
+                 self.shape[2]) = LogNormal().likelihood_bounds(
+                     [self.scale[1], self.shape[1]], self.confidence, data)
             elif self.distribution_id == 7:  # Gaussian
-                (_lower, _upper) = LogNormal().likelihood_bounds(
-                    [self.scale[1], self.shape[1]], self.confidence, data)
-                self.scale[0] = min(_lower.values())
-                self.scale[2] = max(_upper.values())
-                self.shape[0] = [
-                    _key for _key in _lower.keys()
-                    if _lower[_key] == min(_lower.values())
-                ][0]
-                self.shape[2] = [
-                    _key for _key in _upper.keys()
-                    if _upper[_key] == max(_upper.values())
-                ][0]
+                (self.scale[0], self.scale[2], self.shape[0],
+                 self.shape[2]) = Gaussian().likelihood_bounds(
+                     [self.scale[1], self.shape[1]], self.confidence, data)
             elif self.distribution_id == 8:  # Weibull
                 (self.scale[0], self.scale[2], self.shape[0],
                  self.shape[2]) = Weibull().likelihood_bounds(
                      [self.scale[1], self.shape[1]], self.confidence, data)
 
+        elif self.confidence_method == 5:  # Bootstrap
+            self.dicBootstrap = bootstrap(
+                data,
+                _DISTRIBUTIONS[self.distribution_id],
+                confidence=self.confidence,
+                start=self.start_time,
+                end=self.rel_time,
+                seed=self.seed,
+                n_workers=self._do_get_n_workers())
+            self._do_set_bounds([
+                self.dicBootstrap['bca'][_name]
+                for _name in self.dicBootstrap['names'][:-2]
+            ])
+
         return False
 
     def theoretical_distribution(self, data):
@@ -834,20 +863,29 @@ class Survival(object):
     :ivar _dao: the :class:`rtk.dao.DAO` to use when communicating with the RTK
                 Project database.
     :ivar int _last_id: the last Survival ID used.
+    :ivar bool parallel_calcs: the RTK_PARALLEL_CALCS setting passed to each
+                               Survival data model.
     :ivar dict dicSurvivals: Dictionary of the Survival data models managed.
                              Key is the Survival ID; value is a pointer to the
                              Survival data model instance.
     """
 
-    def __init__(self):
+    def __init__(self, parallel_calcs=False):
         """
         Method to initialize a Survival data controller instance.
+
+        :keyword bool parallel_calcs: indicates whether the Survival data
+                                      models fit the bootstrap data sets in
+                                      one worker process per CPU.
         """
 
         # Initialize private scalar attributes.
         self._dao = None
         self._last_id = None
 
+        # Initialize public scalar attributes.
+        self.parallel_calcs = parallel_calcs
+
         # Initialize public dictionary attributes.
         self.dicSurvival = {}
 
@@ -885,6 +923,7 @@ class Survival(object):
 
         for i in range(_n_survivals):
             _survival = Model()
+            _survival.parallel_calcs = self.parallel_calcs
             _survival.set_attributes(_results[i])
             self.dicSurvival[_survival.survival_id] = _survival
 
@@ -919,6 +958,7 @@ class Survival(object):
             self._last_id = self._dao.get_last_id('rtk_survival')[0]
 
             _survival = Model()
+            _survival.parallel_calcs = self.parallel_calcs
             _survival.set_attributes(
                 (revision_id, self._last_id, 0, _description, 0, 0, 0.75, 0, 2,
                  0, 100.0, 0, 0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0,
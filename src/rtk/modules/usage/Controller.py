@@ -58,7 +58,7 @@ class UsageProfileDataController(RTKDataController):
 
         :param int entity_id: the RTK Program database Revision ID, Mission ID,
                               or Mission Phase ID to add the entity to.
-        :param int parent_id: the Node ID of the parent node in the treelib
+        :param str parent_id: the Node ID of the parent node in the treelib
                               Tree().
         :param str level: the level of entity to add to the Usage Profile.
                           Levels are:
@@ -98,8 +98,8 @@ class UsageProfileDataController(RTKDataController):
         """
         Request to delete a RTKMission, RTKMissionPhase, or RTKEnvironment.
 
-        :param int node_id: the Mission, Mission Phase, Environment ID to add
-                            the entity.
+        :param str node_id: the Node ID of the Mission, Mission Phase, or
+                            Environment to delete.
         :return: False if successful or True if an error is encountered.
         :rtype: bool
         """
@@ -112,7 +112,7 @@ class UsageProfileDataController(RTKDataController):
         """
         Request to update an RTKMission, RTKMissionPhase, or RTKEnvironment.
 
-        :param int node_id: the ID of the entity to save.
+        :param str node_id: the Node ID of the entity to save.
         :return: False if successful or True if an error is encountered.
         :rtype: bool
         """
@@ -133,6 +133,43 @@ class UsageProfileDataController(RTKDataController):
         return RTKDataController.do_handle_results(self, _error_code, _msg,
                                                    None)
 
+    def request_select_phase(self, environment_id):
+        """
+        Request the RTKMissionPhase an environment belongs to.
+
+        :param int environment_id: the Environment ID to retrieve the mission
+                                   phase for.
+        :return: the RTKMissionPhase the environment belongs to or None if the
+                 Environment ID is not in the Usage Profile.
+        :rtype: :class:`rtk.dao.RTKMissionPhase`
+        """
+        return self._dtm_data_model.select_phase(environment_id)
+
+    def request_select_environments(self, phase_id):
+        """
+        Request the RTKEnvironments of a mission phase.
+
+        :param int phase_id: the Mission Phase ID to retrieve the
+                             environments for.
+        :return: the list of RTKEnvironment in the mission phase.
+        :rtype: list
+        """
+        return self._dtm_data_model.select_environments(phase_id)
+
+    def request_get_mission_phases(self, mission_id, environments=None):
+        """
+        Request the conditions of each phase of a mission.
+
+        :param int mission_id: the Mission ID to retrieve the phases for.
+        :param dict environments: the {Phase ID:environment_active_id} of
+                                  the mission phases.
+        :return: the list of (duration, environment_active_id,
+                 temperature_active) for each phase of the mission.
+        :rtype: list
+        """
+        return self._dtm_data_model.get_mission_phases(mission_id,
+                                                       environments)
+
     def request_last_id(self, entity):
         """
         Request the last Mission, Mission Phase, or Environment ID used.
@@ -10,6 +10,10 @@
 from rtk.datamodels import RTKDataModel
 from rtk.dao import RTKEnvironment, RTKMission, RTKMissionPhase
 
+# The name of the environment condition whose mean value is the temperature
+# of a mission phase.
+TEMPERATURE_CONDITION = 'Temperature'
+
 
 class UsageProfileDataModel(RTKDataModel):
     """
@@ -20,17 +24,22 @@ class UsageProfileDataModel(RTKDataModel):
     relationship, such as:
 
         * Mission 1
-            - Mission Phase 11
-                + Environment 111
-                + Environment 112
-                + Environment 113
-            - Mission Phase 12
-                + Environment 121
-                + Environment 122
+            - Mission Phase 1.1
+                + Environment 1.1.1
+                + Environment 1.1.2
+                + Environment 1.1.3
+            - Mission Phase 1.2
+                + Environment 1.2.4
+                + Environment 1.2.5
         * Mission 2
-            - Mission Phase 21
-                + Environment 211
-                + Environment 212
+            - Mission Phase 2.3
+                + Environment 2.3.6
+                + Environment 2.3.7
+
+    The Node ID of each entity is the Node ID of its parent and its own ID
+    separated by a period.  The Usage Profile also indexes the Node ID of each
+    mission phase by Phase ID and the Phase ID and Node ID of each environment
+    by Environment ID.
     """
 
     _tag = 'Usage Profiles'
@@ -52,6 +61,8 @@ class UsageProfileDataModel(RTKDataModel):
         # Initialize private scalar attributes.
 
         # Initialize public dictionary attributes.
+        self.dic_phases = {}
+        self.dic_environments = {}
 
         # Initialize public list attributes.
 
@@ -64,72 +75,188 @@ class UsageProfileDataModel(RTKDataModel):
         """
         Retrieve and build the Usage Profile tree for Revision ID.
 
+        The missions, mission phases, and environments are each retrieved
+        with a single query and the tree is built from the rows grouped by
+        the ID of their parent.
+
         :param int revision_id: the Revision ID to retrieve the Usage Profile
                                 and build trees for.
         :return: tree; the Usage Profile treelib Tree().
         :rtype: :py:class:`treelib.Tree`
         """
-        RTKDataModel.select_all(self)
-
-        # Build the tree.  We concatenate the Mission ID and the Phase ID to
-        # create the Node() identifier for Mission Phases.  This prevents the
-        # likely case when the first Mission and Phase have the same ID (1) in
-        # the database from causing problems when building the tree.  Do the
-        # same for the environment by concatenating the Environment ID with the
-        # Mission ID and Phase ID.
-        _missions = self.dtm_mission.select_all(revision_id).nodes
-
-        # pylint: disable=too-many-nested-blocks
-        for _mkey in _missions:
-            _mission = _missions[_mkey].data
-            if _mission is not None:
-                self.tree.create_node(
-                    tag=_mission.description,
-                    identifier=_mission.mission_id,
-                    parent=0,
-                    data=_mission)
-
-                # Add the phases, if any, to the mission.
-                _phases = self.dtm_phase.select_all(_mission.mission_id).nodes
-                for _pkey in _phases:
-                    _phase = _phases[_pkey].data
-                    if _phase is not None:
-                        _phase_id = int(
-                            str(_mission.mission_id) + str(_phase.phase_id))
-                        self.tree.create_node(
-                            tag=_phase.description,
-                            identifier=_phase_id,
-                            parent=_mission.mission_id,
-                            data=_phase)
-
-                        # Add the environments, if any, to the phase.
-                        _environments = self.dtm_environment.select_all(
-                            _phase.phase_id).nodes
-                        for _ekey in _environments:
-                            _environment = _environments[_ekey].data
-                            if _environment is not None:
-                                _env_id = int(
-                                    str(_mission.mission_id) +
-                                    str(_phase.phase_id) +
-                                    str(_environment.environment_id))
-                                # The parent must be the concatenated phase ID
-                                # used in the tree above, not the Phase ID
-                                # attribute of the RTKPhase object.
-                                self.tree.create_node(
-                                    tag=_environment.name,
-                                    identifier=_env_id,
-                                    parent=_phase_id,
-                                    data=_environment)
+        _session = RTKDataModel.select_all(self)
+
+        self.dic_phases = {}
+        self.dic_environments = {}
+
+        _missions = _session.query(RTKMission).filter(
+            RTKMission.revision_id == revision_id)
+        _phases = _session.query(RTKMissionPhase).filter(
+            RTKMissionPhase.mission_id.in_(
+                _missions.with_entities(RTKMission.mission_id)))
+        _environments = self._do_group(
+            _session.query(RTKEnvironment).filter(
+                RTKEnvironment.phase_id.in_(
+                    _phases.with_entities(RTKMissionPhase.phase_id))).order_by(
+                        RTKEnvironment.environment_id).all(), 'phase_id')
+        _phases = self._do_group(
+            _phases.order_by(RTKMissionPhase.phase_id).all(), 'mission_id')
+        _missions = _missions.order_by(RTKMission.mission_id).all()
+
+        # pylint: disable=attribute-defined-outside-init
+        # It is defined in RTKDataModel.__init__
+        for _dtm, _entities, _key in [
+            (self.dtm_mission, [_missions], 'mission_id'),
+            (self.dtm_phase, _phases.values(), 'phase_id'),
+            (self.dtm_environment, _environments.values(), 'environment_id')
+        ]:
+            for _group in _entities:
+                _dtm.last_id = max([_dtm.last_id] +
+                                   [getattr(_entity, _key)
+                                    for _entity in _group])
+
+        for _mission in _missions:
+            _mission_node = self._do_add_node(_mission, 0, _mission.mission_id,
+                                              _mission.description)
+            for _phase in _phases.get(_mission.mission_id, []):
+                _phase_node = self._do_add_node(_phase, _mission_node,
+                                                _phase.phase_id,
+                                                _phase.description)
+                for _environment in _environments.get(_phase.phase_id, []):
+                    self._do_add_node(_environment, _phase_node,
+                                      _environment.environment_id,
+                                      _environment.name)
+
+        _session.close()
 
         return self.tree
 
+    @staticmethod
+    def _do_group(entities, key):
+        """
+        Group a list of Usage Profile entities by the ID of their parent.
+
+        :param list entities: the list of RTK<MODULE> entities to group.
+        :param str key: the name of the attribute with the parent ID.
+        :return: dictionary of entities; key is the parent ID and values are
+                 the list of entities with that parent ID.
+        :rtype: dict
+        """
+        _groups = {}
+        for _entity in entities:
+            _groups.setdefault(getattr(_entity, key), []).append(_entity)
+
+        return _groups
+
+    def _do_add_node(self, entity, parent_id, entity_id, tag):
+        """
+        Add a Usage Profile entity to the Usage Profile tree.
+
+        The Node ID of a mission is the Mission ID.  The Node ID of a mission
+        phase or environment is the Node ID of its parent and its own ID
+        separated by a period.  The phase and environment are also added to
+        the indices used by select_phase() and select_environments().
+
+        :param entity: the RTKMission, RTKMissionPhase, or RTKEnvironment to
+                       add to the Usage Profile tree.
+        :param parent_id: the Node ID to add the entity to.  The root of the
+                          tree is Node ID 0 and may be passed as 0 or '0'.
+        :param int entity_id: the ID of the entity used to build its Node ID.
+        :param str tag: the tag of the new node.
+        :return: the Node ID of the new node.
+        :rtype: str
+        """
+        if str(parent_id) == str(self.tree.root):
+            parent_id = self.tree.root
+            _node_id = str(entity_id)
+        else:
+            _node_id = str(parent_id) + '.' + str(entity_id)
+
+        self.tree.create_node(tag, _node_id, parent=parent_id, data=entity)
+
+        if entity.is_phase:
+            self.dic_phases[entity_id] = _node_id
+        elif entity.is_env:
+            self.dic_environments[entity_id] = (entity.phase_id, _node_id)
+
+        return _node_id
+
+    def select_phase(self, environment_id):
+        """
+        Retrieve the mission phase an environment belongs to.
+
+        :param int environment_id: the Environment ID to retrieve the mission
+                                   phase for.
+        :return: the RTKMissionPhase the environment belongs to or None if the
+                 Environment ID is not in the Usage Profile.
+        :rtype: :class:`rtk.dao.RTKMissionPhase`
+        """
+        try:
+            return self.tree.get_node(
+                self.dic_phases[self.dic_environments[environment_id][0]]).data
+        except KeyError:
+            return None
+
+    def select_environments(self, phase_id):
+        """
+        Retrieve the environments of a mission phase.
+
+        :param int phase_id: the Mission Phase ID to retrieve the
+                             environments for.
+        :return: the list of RTKEnvironment in the mission phase.
+        :rtype: list
+        """
+        try:
+            return [
+                _node.data
+                for _node in self.tree.children(self.dic_phases[phase_id])
+            ]
+        except KeyError:
+            return []
+
+    def get_mission_phases(self, mission_id, environments=None):
+        """
+        Retrieve the conditions of each phase of a mission.
+
+        The conditions are returned in the form used by the mission hazard
+        rate calculation.  The duration of a phase is its end time less its
+        start time.  The temperature of a phase is the mean value of its
+        Temperature environment condition.  The Usage Profile doesn't record
+        the MIL-HDBK-217F environment of a phase so it is passed in.  An
+        environment or temperature of None means each hardware item's own
+        value is used for the phase.
+
+        :param int mission_id: the Mission ID to retrieve the phases for.
+        :param dict environments: the {Phase ID:environment_active_id} of
+                                  the mission phases.
+        :return: _phases; the list of (duration, environment_active_id,
+                 temperature_active) for each phase of the mission.
+        :rtype: list
+        """
+        if environments is None:
+            environments = {}
+
+        _phases = []
+        if self.tree.contains(str(mission_id)):
+            for _node in self.tree.children(str(mission_id)):
+                _phase = _node.data
+                _temperature = None
+                for _environment in self.select_environments(_phase.phase_id):
+                    if _environment.name == TEMPERATURE_CONDITION:
+                        _temperature = _environment.mean
+                _phases.append((_phase.phase_end - _phase.phase_start,
+                                environments.get(_phase.phase_id, None),
+                                _temperature))
+
+        return _phases
+
     def insert(self, **kwargs):
         """
         Add an entity to the Usage Profile and RTK Program database..
 
         :param int entity_id: the RTK Program database Revision ID, Mission ID,
                               Mission Phase ID to add the entity to.
-        :param int parent_id: the Node ID of the parent node in the treelib
+        :param str parent_id: the Node ID of the parent node in the treelib
                               Tree().
         :param str level: the type of entity to add to the Usage Profile.
                           Levels are:
@@ -142,7 +269,7 @@ class UsageProfileDataModel(RTKDataModel):
         :rtype: (int, str)
         """
         _tag = 'Tag'
-        _node_id = -1
+        _id = -1
 
         _entity_id = kwargs['entity_id']
         _parent_id = kwargs['parent_id']
@@ -167,17 +294,16 @@ class UsageProfileDataModel(RTKDataModel):
 
         if _level == 'mission':
             _tag = _entity.description
-            _node_id = _entity.mission_id
+            _id = _entity.mission_id
         elif _level == 'phase':
             _tag = _entity.name
-            _node_id = int(str(_parent_id) + str(_entity.phase_id))
+            _id = _entity.phase_id
         elif _level == 'environment':
             _tag = _entity.name
-            _node_id = int(str(_parent_id) + str(_entity.environment_id))
+            _id = _entity.environment_id
 
         if _error_code == 0:
-            self.tree.create_node(
-                _tag, _node_id, parent=_parent_id, data=_entity)
+            self._do_add_node(_entity, _parent_id, _id, _tag)
         else:
             _error_code = 2105
             _msg = 'RTK ERROR: Attempted to add an item to the Usage ' \
@@ -191,7 +317,7 @@ class UsageProfileDataModel(RTKDataModel):
         """
         Remove an entity from the Usage Profile and RTK Program database.
 
-        :param int node_id: the Node ID of the entity to be removed.
+        :param str node_id: the Node ID of the entity to be removed.
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
@@ -203,9 +329,17 @@ class UsageProfileDataModel(RTKDataModel):
             _error_code = 2005
             _msg = _msg + '  RTK ERROR: Attempted to delete non-existent ' \
                           'Usage Profile entity with Node ID ' \
-                          '{0:d}.'.format(node_id)
+                          '{0:s}.'.format(str(node_id))
         else:
-            self.last_id = max(self.tree.nodes.keys())
+            # Removing a mission or mission phase also removes its children
+            # so drop every index entry whose node is no longer in the tree.
+            self.dic_phases = dict(
+                (_key, _node_id) for _key, _node_id in self.dic_phases.items()
+                if _node_id in self.tree.nodes)
+            self.dic_environments = dict(
+                (_key, _value)
+                for _key, _value in self.dic_environments.items()
+                if _value[1] in self.tree.nodes)
 
         return _error_code, _msg
 
@@ -213,7 +347,7 @@ class UsageProfileDataModel(RTKDataModel):
         """
         Update the entity associated with Node ID to the RTK Program database.
 
-        :param int node_id: the Node ID of the entity to save to the RTK
+        :param str node_id: the Node ID of the entity to save to the RTK
                             Program database.
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
@@ -223,7 +357,7 @@ class UsageProfileDataModel(RTKDataModel):
         if _error_code != 0:
             _error_code = 2006
             _msg = 'RTK ERROR: Attempted to save non-existent Usage Profile ' \
-                   'entity with Node ID {0:d}.'.format(node_id)
+                   'entity with Node ID {0:s}.'.format(str(node_id))
 
         return _error_code, _msg
 
@@ -234,18 +368,7 @@ class UsageProfileDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _key in self.tree.nodes:
-            if _key != 0:
-                _error_code, _msg = self.update(_key)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print _error_code
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
 
 class MissionDataModel(RTKDataModel):
@@ -387,23 +510,7 @@ class MissionDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.mission_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.Usage.Model.MissionDataModel.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.Usage.Model.MissionDataModel.update_all().'
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
 
 class MissionPhaseDataModel(RTKDataModel):
@@ -537,23 +644,7 @@ class MissionPhaseDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.phase_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.Usage.Model.MissionPhaseDataModel.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.Usage.Model.MissionPhaseDataModel.update_all().'
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
 
 
 class EnvironmentDataModel(RTKDataModel):
@@ -693,20 +784,4 @@ class EnvironmentDataModel(RTKDataModel):
         :return: (_error_code, _msg); the error code and associated message.
         :rtype: (int, str)
         """
-        _error_code = 0
-        _msg = ''
-
-        for _node in self.tree.all_nodes():
-            try:
-                _error_code, _msg = self.update(_node.data.environment_id)
-
-                # Break if something goes wrong and return.
-                if _error_code != 0:
-                    print 'FIXME: Handle non-zero error codes in ' \
-                          'rtk.Usage.Model.EnvironmentDataModel.update_all().'
-
-            except AttributeError:
-                print 'FIXME: Handle AttributeError in ' \
-                      'rtk.Usage.Model.EnvironmentDataModel.update_all().'
-
-        return _error_code, _msg
+        return RTKDataModel.update_all(self)
@@ -128,6 +128,34 @@ def calculate_fisher_bounds(metric, variance, alpha):
     return _fisher_l, _fisher_u
 
 
+def calculate_information_bounds(params, information, alpha):
+    """
+    Function to calculate the Fisher Information Matrix based confidence
+    bounds on each of the parameters of a distribution from the observed
+    information matrix, such as the one returned by
+    MLE.observed_information().
+
+    :param list params: the point estimates of the parameters.
+    :param ndarray information: the observed information matrix evaluated at
+                                the point estimates.
+    :param float alpha: the confidence level of the calculated bounds.
+    :return: _bounds; a list of the (lower, upper) Fisher bounds for each of
+             the parameters.  The bounds are NaN if the information matrix is
+             singular.
+    :rtype: list of tuples
+    """
+
+    try:
+        _variance = np.diag(inv(np.atleast_2d(information)))
+    except np.linalg.LinAlgError:
+        _variance = np.full(len(params), np.nan)
+
+    return [
+        calculate_fisher_bounds(_param, _var, alpha)
+        for _param, _var in zip(params, _variance)
+    ]
+
+
 def calculate_crow_bounds(n_failures,
                           t_star,
                           _lambda,
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+#
+#       rtk.statistics.distributions.Bootstrap.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Bootstrap Confidence Interval Module.
+
+Calculates bootstrap confidence intervals on the parameters, the B10 life,
+and the MTBF of the Exponential, Weibull, LogNormal, and Gaussian
+distributions.  Each bootstrap data set draws the same number of
+observations from the original data set with replacement.  An observation
+keeps its interval and status, so the bootstrap data sets have the censoring
+structure of the original.  Each bootstrap data set is refit with
+MLE.fit_partition().
+
+The bootstrap data sets are fit in chunks, each with its own seed drawn from
+the seed passed in.  The chunks are fit in a pool of worker processes when
+there is more than one worker and more than one chunk.  The results for a
+seed don't depend on the number of workers.
+"""
+
+from functools import partial
+
+import numpy as np
+from scipy.special import gamma  # pylint: disable=E0611
+from scipy.stats import norm  # pylint: disable=E0611
+
+import rtk.Utilities as Utilities
+from rtk.statistics.distributions.MLE import covariance_matrix, \
+    fit_partition, partition_data, scores, select_data
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+# The names of the metrics calculated for each distribution.  The parameters
+# are first, in the order MLE.fit_partition() returns them.
+METRICS = {
+    'exponential': ('theta', 'b10', 'mtbf'),
+    'gaussian': ('mu', 'sigma', 'b10', 'mtbf'),
+    'lognormal': ('mu', 'sigma', 'b10', 'mtbf'),
+    'weibull': ('eta', 'beta', 'b10', 'mtbf')
+}
+
+# The fraction failing at the B10 life.
+_B10_FRACTION = 0.1
+
+
+def calculate_metrics(params, dist='exponential'):
+    """
+    Calculate the parameters, B10 life, and MTBF of a distribution.
+
+    :param ndarray params: the parameters of the distribution.  A (k, m)
+                           array calculates the metrics of m sets of
+                           parameters at once.
+    :param str dist: the noun name of the distribution.
+    :return: _metrics; the parameters followed by the B10 life and the MTBF.
+    :rtype: ndarray
+    :raise: KeyError if dist is not one of METRICS.
+    """
+    _params = np.asarray(params, dtype=float)
+    _z_b10 = norm.ppf(_B10_FRACTION)
+
+    with np.errstate(all='ignore'):
+        if dist == 'exponential':
+            _b10 = -np.log1p(-_B10_FRACTION) / _params[0]
+            _mtbf = 1.0 / _params[0]
+        elif dist == 'gaussian':
+            _b10 = _params[0] + _z_b10 * _params[1]
+            _mtbf = _params[0]
+        elif dist == 'lognormal':
+            _b10 = np.exp(_params[0] + _z_b10 * _params[1])
+            _mtbf = np.exp(_params[0] + 0.5 * _params[1]**2.0)
+        elif dist == 'weibull':
+            _b10 = _params[0] * (-np.log1p(-_B10_FRACTION))**(
+                1.0 / _params[1])
+            _mtbf = _params[0] * gamma(1.0 + 1.0 / _params[1])
+        else:
+            raise KeyError(dist)
+
+    return np.concatenate((_params, [_b10, _mtbf]))
+
+
+def resample(data, random_state):
+    """
+    Draw a bootstrap data set.
+
+    The quantity of each record is replaced by the number of times it's
+    drawn when the observations are drawn with replacement.  Records that
+    aren't drawn are dropped.
+
+    :param ndarray data: the data set to resample.  See
+                         MLE.partition_data().  Quantities are rounded to the
+                         nearest whole observation.
+    :param random_state: the numpy.random.RandomState() to draw with.
+    :return: _data; the bootstrap data set.
+    :rtype: ndarray
+    """
+    _data = np.array(data, dtype=float).reshape(-1, 5)
+    _quantities = np.rint(_data[:, 2]).clip(0.0)
+    _total = int(np.sum(_quantities))
+
+    _data[:, 2] = random_state.multinomial(_total, _quantities / _total)
+
+    return _data[_data[:, 2] > 0]
+
+
+def do_bootstrap_chunk(chunk, data, dist, x0):
+    """
+    Fit a chunk of bootstrap data sets.
+
+    This is a module level function so it can be pickled and sent to a
+    worker process.
+
+    :param tuple chunk: the (seed, number of bootstrap data sets) to fit.
+    :param ndarray data: the data set to resample.
+    :param str dist: the noun name of the distribution to fit.
+    :param ndarray x0: the starting values of the parameters.
+    :return: _params; the (n, k) parameters of each bootstrap data set.  A
+             row is NaN if the fit failed or didn't converge.
+    :rtype: ndarray
+    """
+    _seed, _n_replicates = chunk
+    _random_state = np.random.RandomState(_seed)
+
+    _params = np.full((_n_replicates, len(x0)), np.nan)
+    for _idx in range(_n_replicates):
+        _partition = partition_data(resample(data, _random_state))
+        try:
+            _fit = fit_partition(_partition, dist, x0)
+        except ValueError:
+            continue
+        if _fit['converged']:
+            _params[_idx] = _fit['parameters']
+
+    return _params
+
+
+def _do_acceleration(partition, params, dist):
+    """
+    Calculate the BCa acceleration of each metric.
+
+    The acceleration is calculated from the empirical influence of each
+    observation, the infinitesimal jackknife, rather than by refitting the
+    data set once per observation.
+    """
+    _quantities, _scores = scores(partition, params, dist)
+    _covariance = covariance_matrix(partition, params, dist)
+
+    # The gradient of each metric with respect to the parameters by central
+    # differences.
+    _steps = 1.0E-6 * np.maximum(np.abs(params), 1.0E-3)
+    _gradient = np.array([
+        (calculate_metrics(params + _step, dist) -
+         calculate_metrics(params - _step, dist)) / (2.0 * _step[_idx])
+        for _idx, _step in enumerate(np.diag(_steps))
+    ]).T
+
+    _influence = np.dot(np.dot(_gradient, _covariance), _scores)
+    with np.errstate(all='ignore'):
+        _acceleration = (np.sum(_quantities * _influence**3.0, axis=1) / (
+            6.0 * np.sum(_quantities * _influence**2.0, axis=1)**1.5))
+
+    return np.nan_to_num(_acceleration)
+
+
+def _do_percentile(replicates, confidence):
+    """Calculate the percentile intervals of each metric."""
+    _alpha = 0.5 * (1.0 - confidence)
+
+    return np.percentile(
+        replicates, [100.0 * _alpha, 100.0 * (1.0 - _alpha)], axis=0).T
+
+
+def _do_bca(replicates, estimates, acceleration, confidence):
+    """Calculate the bias corrected and accelerated (BCa) intervals."""
+    _alpha = 0.5 * (1.0 - confidence)
+    _z_alpha = norm.ppf([_alpha, 1.0 - _alpha])
+
+    _intervals = np.full((len(estimates), 2), np.nan)
+    for _idx, _estimate in enumerate(estimates):
+        _replicates = replicates[:, _idx]
+        _below = (np.sum(_replicates < _estimate) +
+                  0.5 * np.sum(_replicates == _estimate))
+        _z_0 = norm.ppf(_below / len(_replicates))
+        if not np.isfinite(_z_0):
+            continue
+
+        _z = _z_0 + _z_alpha
+        _levels = norm.cdf(_z_0 + _z / (1.0 - acceleration[_idx] * _z))
+        _intervals[_idx] = np.percentile(_replicates, 100.0 * _levels)
+
+    return _intervals
+
+
+def bootstrap(data,
+              dist='exponential',
+              n_replicates=1000,
+              confidence=0.9,
+              start=0.0,
+              end=0.0,
+              seed=None,
+              n_workers=1,
+              chunk_size=50):
+    """
+    Calculate bootstrap confidence intervals.
+
+    :param ndarray data: the data set to fit.  This is a numpy array where
+                         each record contains the following, in order:
+                            * 0 = Interval start time
+                            * 1 = Interval end time
+                            * 2 = Quantity of observations
+                            * 3 = Status of observation
+                            * 4 = Time between failures or interarrival time
+    :param str dist: the noun name of the distribution to fit.
+    :param int n_replicates: the number of bootstrap data sets to fit.
+    :param float confidence: the confidence level of the two-sided
+                             intervals.
+    :param float start: the minimum time to include in the fit.
+    :param float end: the maximum time to include in the fit.  Zero includes
+                      all times.
+    :param int seed: the seed of the random number generator.
+    :param int n_workers: the number of worker processes.
+    :param int chunk_size: the number of bootstrap data sets fit at a time.
+    :return: _results; dictionary with the names of the metrics (see
+             METRICS), the estimates, the percentile and bca (bias corrected
+             and accelerated) intervals of each metric keyed by name, the
+             (n, m) replicates of the metrics of the n bootstrap data sets
+             that were fit, and n_failed, the number that couldn't be fit.
+    :rtype: dict
+    :raise: KeyError if dist is not one of METRICS.
+    :raise: ValueError if the data set doesn't contain any failures.
+    """
+    if confidence > 1.0:
+        confidence = confidence / 100.0
+
+    # Only the records inside the window are resampled so each bootstrap
+    # data set has as many observations as the one that was fit.
+    _names = METRICS[dist]
+    _data = select_data(data, start, end)
+    _partition = partition_data(_data)
+    _params = fit_partition(_partition, dist)['parameters']
+
+    _lst_results = Utilities.do_map_chunks(
+        partial(do_bootstrap_chunk, data=_data, dist=dist, x0=_params),
+        Utilities.do_make_seeded_chunks(n_replicates, chunk_size, seed),
+        n_workers)
+
+    _replicates = np.concatenate(_lst_results)
+    _replicates = _replicates[np.all(np.isfinite(_replicates), axis=1)]
+    _replicates = calculate_metrics(_replicates.T, dist).T
+    _estimates = calculate_metrics(_params, dist)
+
+    if len(_replicates) > 0:
+        _percentile = _do_percentile(_replicates, confidence)
+        _bca = _do_bca(_replicates, _estimates,
+                       _do_acceleration(_partition, _params, dist),
+                       confidence)
+    else:
+        _percentile = np.full((len(_names), 2), np.nan)
+        _bca = np.full((len(_names), 2), np.nan)
+
+    return {
+        'names': _names,
+        'estimates': dict(zip(_names, _estimates)),
+        'percentile': dict(zip(_names, [tuple(_i) for _i in _percentile])),
+        'bca': dict(zip(_names, [tuple(_i) for _i in _bca])),
+        'replicates': _replicates,
+        'n_failed': n_replicates - len(_replicates)
+    }
@@ -46,7 +46,10 @@ import numpy as np
 import scipy.misc as misc
 import scipy.optimize as optimize
 from scipy.special import gamma
-from scipy.stats import chi2, expon, exponweib, lognorm, norm  # pylint: disable=E0611
+from scipy.stats import chi2, norm  # pylint: disable=E0611
+
+from rtk.statistics.distributions.MLE import fit_partition, \
+    partition_data, profile_bounds
 
 __author__ = 'Andrew Rowland'
 __email__ = 'andrew.rowland@reliaqual.com'
@@ -59,7 +62,9 @@ def fisher_information(model, p0, X, noise=1.0):  # pylint: disable=C0103
     """
     Function to calculate the Fisher information matrix for model sampled on
     grid X with parameters p0. Assumes samples are not correlated and have
-    equal variance noise^2.
+    equal variance noise^2.  The model must accept an array for X.  The
+    censored survival distributions use the closed form observed information
+    in MLE.observed_information() instead.
 
     :param callable model: the model function, f(x, ...). It must take the
                            independent variable as the first argument and the
@@ -80,13 +85,14 @@ def fisher_information(model, p0, X, noise=1.0):  # pylint: disable=C0103
 
     _D = np.zeros((len(p0), X.size))
 
+    # The model is evaluated on the entire grid at once, so there is one
+    # central difference per parameter rather than one per parameter per
+    # point.
     for i, argname in enumerate(_labels):
-        _D[i, :] = [
-            misc.derivative(
-                lambda p: model(x, **dict(_p0dict, **{argname: p})),
-                _p0dict[argname],
-                dx=1.0e-6) for x in X
-        ]
+        _D[i, :] = misc.derivative(
+            lambda p: model(X, **dict(_p0dict, **{argname: p})),
+            _p0dict[argname],
+            dx=1.0e-6)
 
     _fisher = 1.0 / noise**2 * np.einsum('mk, nk', _D, _D)
 
@@ -129,6 +135,87 @@ def time_between_failures(previous, current):
     return _tbf
 
 
+# The integer code of each status of an observation.
+STATUS_CODES = {
+    'Event': 1,
+    'Right Censored': 2,
+    'Left Censored': 3,
+    'Interval Censored': 3,
+    '1': 1,
+    '2': 2,
+    '3': 3,
+    '4': 3
+}
+
+
+def _do_status_code(status):
+    """Return the integer code of a status; unknown statuses are events."""
+    try:
+        status = str(int(float(status)))
+    except (TypeError, ValueError):
+        pass
+
+    return STATUS_CODES.get(status, 1)
+
+
+def build_data_set(data, start=0.0, end=0.0):
+    """
+    Function to build the data set used by the maximum likelihood and
+    Kaplan-Meier functions from a list of survival records.
+
+    Each record becomes one row of the data set however many observations it
+    has; the quantity of observations is kept as the weight of the row.  The
+    status of each distinct status value is looked up once and the codes are
+    mapped onto the records as an array.
+
+    :param list data: the survival records.  This is a list of tuples where
+                      each tuple has the following:
+                            * 0 - Unit ID
+                            * 1 - left of interval
+                            * 2 - right of interval
+                            * 3 - time between failure
+                            * 4 - status of observation
+                            * 5 - quantity
+                      Any other items in the tuples are ignored.
+    :param float start: the minimum time to include in the fit.  Used to
+                        exclude outliers.
+    :param float end: the maximum time to include in the fit.  Used to
+                      exclude outliers.  Zero includes all times.
+    :return: _data; the data set sorted by the right of the interval.  Each
+             row contains the following, in order:
+                * 0 = Interval start time
+                * 1 = Interval end time
+                * 2 = Quantity of observations
+                * 3 = Status of observation (1 = event, 2 = right censored,
+                      3 = left or interval censored)
+                * 4 = Time between failures or interarrival time
+    :rtype: ndarray
+    """
+    if len(data) == 0:
+        return np.zeros((0, 5))
+
+    _records = np.empty((len(data), len(data[0])), dtype=object)
+    _records[:] = data
+
+    _left = _records[:, 1].astype(float)
+    _right = _records[:, 2].astype(float)
+    _keep = _left >= start
+    if end > 0.0:
+        _keep = np.logical_and(_keep, _right <= end)
+    _records = _records[_keep]
+
+    _statuses, _inverse = np.unique(
+        _records[:, 4].astype(np.unicode_), return_inverse=True)
+    _codes = np.array(
+        [_do_status_code(_status) for _status in _statuses], dtype=float)
+
+    _data = np.column_stack((_left[_keep], _right[_keep],
+                             _records[:, 5].astype(float), _codes[_inverse],
+                             _records[:, 3].astype(float)))
+
+    return _data[np.argsort(_data[:, 1], kind='mergesort')]
+
+
 def format_data_set(data, start, end):
     """
     Function to format the data set and turn it into a numpy array for use in
@@ -149,52 +236,56 @@ def format_data_set(data, start, end):
                         exclude outliers.
     :param float end: the maximum time to include in the fit.  Used to
                       exclude outliers.
-    :return: (_data, _n_records); tuple of the formatted data set and the total
-             number of records in the data set.
+    :return: (_data, _n_records, _n_suspensions, _n_failures); tuple of the
+             formatted data set (see build_data_set()) with the right of the
+             interval of right censored records set to infinity, the total
+             number of observations, the number of suspensions, and the
+             number of failures in the data set.
     :rtype: tuple
     """
-    # WARNING: Refactor format_data_set; current McCabe Complexity metric=12.
-    # Sort data by the right of the interval.  Remove records occurring before
-    # the start time and after the end time.
-    _data = sorted(data, key=lambda x: float(x[2]))
-    _data = [_rec for _rec in _data if float(_rec[1]) >= start]
-    if end > 0.0:
-        _data = [_rec for _rec in _data if float(_rec[2]) <= end]
-
-    # Expand the data set so there is one record for each failure.  Loop
-    # through the failure quantity passed for each record.
-    _data2 = []
-    for __, _record in enumerate(_data):
-        for __ in range(int(_record[5])):
-            _data2.append((_record[0], _record[1], _record[2], _record[3],
-                           _record[4], 1))
-    _data = np.array(_data2)
-
-    # Replace the string status with integer status.
-    _n_suspensions = 0
-    _n_failures = 0
-    for _record in _data:
-        if _record[4] == 'Right Censored' or str(_record[4]) == '2':
-            _record[2] = np.inf
-            _record[4] = 2
-            _n_suspensions += 1
-        elif (_record[4] == 'Left Censored'
-              or _record[4] == 'Interval Censored' or str(_record[4]) == '3'):
-            _record[4] = 3
-            _n_failures += 1
-        else:
-            _record[4] = 1
-            _n_failures += 1
+    _data = build_data_set(data, start, end)
 
-    # Coerce the data set into the form necessary for fitting to functions.
-    _data = np.vstack((_data[:, 1], _data[:, 2], _data[:, 5], _data[:, 4],
-                       _data[:, 3]))
-    _data = np.array(np.transpose(_data), dtype=float)
-    _n_records = len(_data)
+    _suspended = _data[:, 3] == 2
+    _data[_suspended, 1] = np.inf
+
+    _n_suspensions = int(np.sum(_data[_suspended, 2]))
+    _n_failures = int(np.sum(_data[~_suspended, 2]))
+    _n_records = _n_suspensions + _n_failures
 
     return (_data, _n_records, _n_suspensions, _n_failures)
 
 
+def _do_fit(data, start, end, dist):
+    """
+    Fit a data set with MLE.fit_partition() and return the results in the
+    layout of the maximum_likelihood_estimate() methods.
+
+    :param ndarray data: the data set to fit.  See
+                         MLE.partition_data().
+    :param float start: the minimum time to include in the fit.
+    :param float end: the maximum time to include in the fit.
+    :param str dist: the noun name of the distribution to fit.
+    :return: _fit; [[parameters], [scale variance, covariance, shape
+                    variance], [MLE, AIC, BIC], number of suspensions,
+                    number of failures]
+    :rtype: list
+    """
+    _fit = fit_partition(partition_data(data, start, end), dist)
+    _covariance = _fit['covariance']
+
+    _variance = [0.0, 0.0, 0.0]
+    _variance[0] = _covariance[0, 0]
+    if len(_fit['parameters']) > 1:
+        _variance[1] = _covariance[0, 1]
+        _variance[2] = _covariance[1, 1]
+
+    return [
+        list(_fit['parameters']), _variance,
+        [_fit['log_likelihood'], _fit['aic'], _fit['bic']],
+        _fit['n_suspensions'], _fit['n_failures']
+    ]
+
+
 class Exponential(object):
     """
     Class for the Exponential distribution.
@@ -427,43 +518,8 @@ class Exponential(object):
                         [MLE, AIC, BIC], correlation coeff.]
         :rtype: list
         """
-
-        # _error_function = lambda s, x, y: ((s[0] + s[1] * x) - y)
-
-        # Initialize lists to hold results.
-        _parameters = [0.0, 0.0]  # Scale and location parameters.
-        _variance = [0.0, 0.0, 0.0]  # Scale variance, covariance,
-        # location variance.
-        _gof = [0.0, 0.0, 0.0]  # MLE, AIC, BIC
-
-        # Sort data by the right of the interval.  Remove records occurring
-        # before the start time and after the end time.
-        _data = sorted(data, key=lambda x: float(x[1]))
-        _data = [_rec for _rec in _data if float(_rec[0]) >= start]
-        _data = [_rec for _rec in _data if float(_rec[1]) <= end]
-        _data = np.array(_data)
-
-        # Count the number of suspensions, failures, and records.
-        _n_suspensions = sum(x[2] for x in _data if x[3] == 2)
-        _n_failures = sum(
-            x[2] for x in _data if x[3] == 1 or x[3] == 3 or x[3] == 4)
-        _n_records = len(_data)
-
-        # Estimate the initial guess for the scale parameter using the fit
-        # function from scipy.stats.  Then minimize the partial derivitive of
-        # the likelihood function to find the final theta value.
-        _theta = 1.0 / expon.fit(_data[:, 1])[1]
-        _parameters[0] = optimize.fsolve(
-            self.partial_derivatives, _theta, args=(_data))[0]
-
-        _fI = fisher_information(self.log_pdf, _parameters, _data[:, 3])
-        _variance[0] = 1.0 / _fI[0, 0]
-
-        _gof[0] = self.log_likelihood(_parameters[0], _parameters[1], _data)
-        _gof[1] = -2.0 * _gof[0] + 2.0
-        _gof[2] = -2.0 * _gof[0] + (np.log(_n_records) - np.log(np.pi))
-
-        _fit = [_parameters, _variance, _gof, _n_suspensions, _n_failures]
+        _fit = _do_fit(data, start, end, 'exponential')
+        _fit[0].append(0.0)  # Location parameter.
 
         return _fit
 
@@ -690,20 +746,18 @@ class Gaussian(object):
         Method to calculate the likelihood ratio confidence bounds for the
         parameters.
 
-        Likelihood confidence bounds are calculated by finding values for mu,
-        while holding sigma constant, that satisfy:
-
-            L(mu, sigma) = L(mu_hat, sig_hat) * exp(-chi2(alpha, 1) / 2.0)
-
-        Taking logarithms (base e) of the equation above results in:
+        Likelihood confidence bounds are calculated by finding the values of
+        each parameter where the profile log-likelihood, the log-likelihood
+        maximized over the other parameter, satisfies:
 
-            log[L(mu, sigma)] = log[L(mu_hat, sig_hat)] - chi2(alpha, 1) / 2.0
+            log[L(mu)] = log[L(mu_hat, sigma_hat)] - chi2(alpha, 1) / 2.0
 
-        The same values of theta will minimize both, but logarithms are easier
-        to work with.
+        and likewise for sigma.  The crossings are bracketed on a grid and then
+        found with Brent's method.  See MLE.profile_bounds().
 
-        :param list of float pars: the parameter values at which to evaluate
-                                   the log-likelihood.
+        :param list of float pars: the parameter estimates; used as the
+                                   starting values for the maximum likelihood
+                                   fit the bounds are calculated around.
         :param float confidence: the confidence level at which to calculate the
                                  bounds.
         :param ndarray data: the data set to calculate the log-likelihood for.
@@ -716,100 +770,14 @@ class Gaussian(object):
                                 * 2 - right censored
                                 * 3 - left censored
                                 * 4 - interval censored
-        :return: (_lower, _upper)
+        :return: (_mu_l, _mu_u, _sigma_l, _sigma_u)
         :rtype: tuple
         """
 
-        # TODO: Consider re-writing Gaussian.likelihood_bounds; current McCabe Complexity metric=10.
-        def _shadow_func(pars, data, const):
-            """
-            Shadow function used to minimize the log-likelihood ratio.  It's a
-            hack to ensure the correct number of arguments are returned.
-            """
-
-            return [self.log_likelihood_ratio(pars, data, const), 0.0]
-
-        def _sigma_mu_func(x_var, m1, m2, intercept):
-            """
-            Function describing the relationship between mu and sigma.  This
-            relationship parabolic for both upper and lower limits.
-            """
-
-            return m1 * x_var**2.0 + m2 * x_var + intercept
-
-        def _sigma_limits(lower, upper):
-            """
-            Function to find the two sigma values at which mu is the same.
-            Used to find the limits on sigma over which the parabolic
-            relationship exists.
-            """
+        ((_mu_l, _mu_u), (_sigma_l, _sigma_u)) = profile_bounds(
+            partition_data(data), confidence, 'gaussian', x0=pars[:2])
 
-            for _keyl in lower.keys():
-                for _keyu in upper.keys():
-                    if (abs(upper[_keyu] - lower[_keyl]) < 1.0E-6
-                            and _keyl < _keyu):
-                        return (_keyl, _keyu)
-
-        _lower = OrderedDict()
-        _upper = OrderedDict()
-
-        _log_lik_ratio = self.log_likelihood_ratio(pars, data)
-        _const = _log_lik_ratio - (chi2.ppf(confidence, 1) / 2.0)
-
-        for _index in range(100):
-            # Set the sigma step value for this iteration.
-            _sigma = pars[1] * (0.5 + (0.5 * _index / 25))
-
-            # To find the lower bound, we provide root with a starting value
-            # for mu less than the point estimate; in this case 1/10 the value.
-            _lower[_sigma] = optimize.root(
-                _shadow_func, [pars[0] / 10.0, _sigma], args=(data,
-                                                              _const)).x[0]
-
-            # To find the upper bound, we provide root with a starting value
-            # for mu greater than the point estimate; in this case double.
-            _upper[_sigma] = optimize.root(
-                _shadow_func, [2.0 * pars[0], _sigma], args=(data,
-                                                             _const)).x[0]
-
-        # Find the values of sigma where the difference between the lower and
-        # upper limits is less than 1.0E-6.  There will be two points found and
-        # these are considered the mu values between which sigma is
-        # well-behaved.  Only the key-value pairs falling between these values
-        # will be kept and used to find the limits.
-        _sigma = _sigma_limits(_lower, _upper)
-        _upper.values = [
-            _upper[y] for y in _upper.keys()
-            if y >= _sigma[0] and y <= _sigma[1]
-        ]
-        _upper.keys = [
-            y for y in _upper.keys() if y >= _sigma[0] and y <= _sigma[1]
-        ]
-        _lower.values = [
-            _lower[y] for y in _lower.keys()
-            if y >= _sigma[0] and y <= _sigma[1]
-        ]
-        _lower.keys = [
-            y for y in _lower.keys() if y >= _sigma[0] and y <= _sigma[1]
-        ]
-
-        # Find the slope and intercept for the lower bounds assuming the
-        # sigma-mu relationship is parabolic.
-        _poptl, __ = optimize.curve_fit(_sigma_mu_func, _upper.keys,
-                                        _upper.values)
-        _mu_l = min(_lower.values)
-
-        # Find the slope and intercept for the upper bounds assuming the
-        # sigma-mu relationship is parabolic.
-        _poptu, __ = optimize.curve_fit(_sigma_mu_func, _lower.keys,
-                                        _lower.values)
-        _mu_u = max(_upper.values)
-
-        _sigma = np.roots([
-            _poptu[0] - _poptl[0], _poptu[1] - _poptl[1], _poptu[2] - _poptl[2]
-        ])
-
-        return (_mu_l, _mu_u, _sigma[1], _sigma[0])
+        return (_mu_l, _mu_u, _sigma_l, _sigma_u)
 
     def partial_derivatives(self, pars, data):  # pylint: disable=C0103, R0201, R0914
         """
@@ -885,7 +853,7 @@ class Gaussian(object):
 
         return _del_mu * _del_sigma
 
-    def maximum_likelihood_estimate(self, data, start, end):  # pylint: disable=R0914
+    def maximum_likelihood_estimate(self, data, start, end):
         """
         Method to fit data to a parametric distribution and find point
         estimates of the parameters.  It is up to the calling function to
@@ -908,69 +876,7 @@ class Gaussian(object):
                         [MLE, AIC, BIC], correlation coeff.]
         :rtype: list
         """
-
-        def _shadow_func(pars, data):
-            """
-            Shadow function used to ensure the correct number of values are
-            returned when finding roots.
-            """
-
-            return [self.partial_derivatives(pars, data), 0.0]
-
-        # Initialize lists to hold results.
-        _parameters = [0.0, 0.0]  # Scale and location parameters.
-        _variance = [0.0, 0.0, 0.0]  # Scale variance, covariance,
-        # location variance.
-        _gof = [0.0, 0.0, 0.0]  # MLE, AIC, BIC
-
-        # Sort data by the right of the interval.  Remove records occurring
-        # before the start time and after the end time.
-        _data = sorted(data, key=lambda x: float(x[1]))
-        _data = [_rec for _rec in _data if float(_rec[0]) >= start]
-        _data = [_rec for _rec in _data if float(_rec[1]) <= end]
-        _data = np.array(_data)
-
-        # Count the number of suspensions, failures, and records.
-        _n_suspensions = sum(x[2] for x in _data if x[3] == 2)
-        _n_failures = sum(
-            x[2] for x in _data if x[3] == 1 or x[3] == 3 or x[3] == 4)
-        _n_records = len(_data)
-
-        # Adjust the right-censored times to be the mid-point between the
-        # censored time and the maximum oberserved time in the data set.
-        _adj_right = (
-            max(_data[:, 1]) + _data[np.where(_data[:, 3] == 2), 1]) / 2.0
-        _data[np.where(_data[:, 3] == 2), 1] = _adj_right
-
-        # Adjust the interval-censored times so they can be passed to the
-        # fit method.
-        _interval_lt = _data[np.where(_data[:, 3] == 3)][:, 0]
-        _interval_rt = _data[np.where(_data[:, 3] == 3)][:, 1]
-        _interval_t = (_interval_lt + _interval_rt) / 2.0
-        _data[np.where(_data[:, 3] == 3), 1] = _interval_t
-
-        # Provide an estimate of mu and sigma assuming no suspensions and
-        # using the right of the interval.  Use these as the starting
-        # values to scipy.optimize.fsolve.
-        (_mu, _sigma) = norm.fit(np.array(_data[:, 1], dtype=float))
-        _params = optimize.fsolve(_shadow_func, [_mu, _sigma], args=(data))
-
-        _parameters[0] = _params[0]
-        _parameters[1] = _params[1]
-
-        _fI = fisher_information(self.log_pdf, _parameters, _data[:, 3])
-        _variance[0] = 1.0 / np.diag(_fI)[0]
-        _variance[1] = 1.0 / _fI[0][1]
-        _variance[2] = 1.0 / np.diag(_fI)[1]
-
-        # Calculate the MLE, AIC, and BIC
-        _gof[0] = self.log_likelihood([_parameters[0], _parameters[1]], _data)
-        _gof[1] = -2.0 * _gof[0] + 4.0
-        _gof[2] = -2.0 * _gof[0] + 4.0 * np.log(_n_records)
-
-        _fit = [_parameters, _variance, _gof, _n_suspensions, _n_failures]
-
-        return _fit
+        return _do_fit(data, start, end, 'gaussian')
 
     def theoretical_distribution(self, data, params):  # pylint: disable=R0201
         """
@@ -1217,20 +1123,18 @@ class LogNormal(object):
         Method to calculate the likelihood ratio confidence bounds for the
         parameters.
 
-        Likelihood confidence bounds are calculated by finding values for mu,
-        while holding sigma constant, that satisfy:
-
-            L(mu, sigma) = L(mu_hat, sig_hat) * exp(-chi2(alpha, 1) / 2.0)
+        Likelihood confidence bounds are calculated by finding the values of
+        each parameter where the profile log-likelihood, the log-likelihood
+        maximized over the other parameter, satisfies:
 
-        Taking logarithms (base e) of the equation above results in:
-
-            log[L(mu, sigma)] = log[L(mu_hat, sig_hat)] - chi2(alpha, 1) / 2.0
+            log[L(mu)] = log[L(mu_hat, sigma_hat)] - chi2(alpha, 1) / 2.0
 
-        The same values of theta will minimize both, but logarithms are easier
-        to work with.
+        and likewise for sigma.  The crossings are bracketed on a grid and then
+        found with Brent's method.  See MLE.profile_bounds().
 
-        :param list of float pars: the parameter values at which to evaluate
-                                   the log-likelihood.
+        :param list of float pars: the parameter estimates; used as the
+                                   starting values for the maximum likelihood
+                                   fit the bounds are calculated around.
         :param float confidence: the confidence level at which to calculate the
                                  bounds.
         :param ndarray data: the data set to calculate the log-likelihood for.
@@ -1243,42 +1147,14 @@ class LogNormal(object):
                                 * 2 - right censored
                                 * 3 - left censored
                                 * 4 - interval censored
-        :return: (_lower, _upper)
+        :return: (_mu_l, _mu_u, _sigma_l, _sigma_u)
         :rtype: tuple
         """
 
-        def _shadow_func(pars, data, const):
-            """
-            Shadow function used to minimize the log-likelihood ratio.  It's a
-            hack to ensure the correct number of arguments are returned.
-            """
-
-            return [self.log_likelihood_ratio(pars, data, const), 0.0]
-
-        _lower = OrderedDict()
-        _upper = OrderedDict()
-
-        _log_lik_ratio = self.log_likelihood_ratio(pars, data)
-        _const = _log_lik_ratio - (chi2.ppf(confidence, 1) / 2.0)
+        ((_mu_l, _mu_u), (_sigma_l, _sigma_u)) = profile_bounds(
+            partition_data(data), confidence, 'lognormal', x0=pars[:2])
 
-        _step = confidence / 50.0
-        for _index in range(100):
-            # Set the sigma step value for this iteration.
-            _sigma = pars[1] * (confidence + (_index * _step))
-
-            # To find the lower bound, we provide root with a starting value
-            # for mu less than the point estimate; in this case 1/10 the value.
-            _lower[_sigma] = optimize.root(
-                _shadow_func, [pars[0] / 10.0, _sigma], args=(data,
-                                                              _const)).x[0]
-
-            # To find the upper bound, we provide root with a starting value
-            # for mu greater than the point estimate; in this case double.
-            _upper[_sigma] = optimize.root(
-                _shadow_func, [2.0 * pars[0], _sigma], args=(data,
-                                                             _const)).x[0]
-
-        return (_lower, _upper)
+        return (_mu_l, _mu_u, _sigma_l, _sigma_u)
 
     def partial_derivatives(self, pars, data):  # pylint: disable=C0103, R0201, R0914
         """
@@ -1354,7 +1230,7 @@ class LogNormal(object):
 
         return _del_mu * _del_sigma
 
-    def maximum_likelihood_estimate(self, data, start, end):  # pylint: disable=R0914
+    def maximum_likelihood_estimate(self, data, start, end):
         """
         Method to fit data to a parametric distribution and find point
         estimates of the parameters.  It is up to the calling function to
@@ -1377,71 +1253,7 @@ class LogNormal(object):
                         [MLE, AIC, BIC], correlation coeff.]
         :rtype: list
         """
-
-        def _shadow_func(pars, data):
-            """
-            Shadow function used to ensure the correct number of values are
-            returned when finding roots.
-            """
-
-            return [self.partial_derivatives(pars, data), 0.0]
-
-        # Initialize lists to hold results.
-        _parameters = [0.0, 0.0]  # Scale and shape parameters.
-        _variance = [0.0, 0.0, 0.0]  # Scale variance, covariance,
-        # shape variance.
-        _gof = [0.0, 0.0, 0.0]  # MLE, AIC, BIC
-
-        # Sort data by the right of the interval.  Remove records occurring
-        # before the start time and after the end time.
-        _data = sorted(data, key=lambda x: float(x[1]))
-        _data = [_rec for _rec in _data if float(_rec[0]) >= start]
-        _data = [_rec for _rec in _data if float(_rec[1]) <= end]
-        _data = np.array(_data)
-
-        # Count the number of suspensions, failures, and records.
-        _n_suspensions = sum(x[2] for x in _data if x[3] == 2)
-        _n_failures = sum(
-            x[2] for x in _data if x[3] == 1 or x[3] == 3 or x[3] == 4)
-        _n_records = len(_data)
-
-        # Adjust the right-censored times to be the mid-point between the
-        # censored time and the maximum observed time in the data set.
-        _adj_right = (
-            max(_data[:, 1]) + _data[np.where(_data[:, 3] == 2), 1]) / 2.0
-        _data[np.where(_data[:, 3] == 2), 1] = _adj_right
-
-        # Adjust the interval-censored times so they can be passed to the
-        # fit method.
-        _interval_lt = _data[np.where(_data[:, 3] == 4)][:, 0]
-        _interval_rt = _data[np.where(_data[:, 3] == 4)][:, 1]
-        _interval_t = (_interval_lt + _interval_rt) / 2.0
-        _data[np.where(_data[:, 3] == 4), 1] = _interval_t
-
-        # Provide an estimate of mu and sigma assuming no suspensions and
-        # using the right of the interval.  Use these as the starting
-        # values to scipy.optimize.fsolve.
-        (_sigma, __, _mu) = lognorm.fit(
-            np.array(_data[:, 1], dtype=float), floc=0)
-        _params = optimize.fsolve(
-            _shadow_func, [np.log(_mu), _sigma], args=(_data))
-
-        _parameters[0] = _params[0]
-        _parameters[1] = _params[1]
-
-        _fI = fisher_information(self.log_pdf, _parameters, _data[:, 3])
-        _variance[0] = 1.0 / np.diag(_fI)[0]
-        _variance[1] = 1.0 / _fI[0][1]
-        _variance[2] = 1.0 / np.diag(_fI)[1]
-
-        # Calculate the MLE, AIC, and BIC.
-        _gof[0] = self.log_likelihood([_parameters[0], _parameters[1]], _data)
-        _gof[1] = -2.0 * _gof[0] + 4.0
-        _gof[2] = -2.0 * _gof[0] + 4.0 * np.log(_n_records)
-
-        _fit = [_parameters, _variance, _gof, _n_suspensions, _n_failures]
-
-        return _fit
+        return _do_fit(data, start, end, 'lognormal')
 
     def theoretical_distribution(self, data, params):  # pylint: disable=R0201
         """
@@ -1695,20 +1507,18 @@ class Weibull(object):
         Method to calculate the likelihood ratio confidence bounds for the
         parameters.
 
-        Likelihood confidence bounds are calculated by finding values for eta,
-        while holding beta constant, that satisfy:
-
-            L(eta, beta) = L(eta_hat, beta_hat) * exp(-chi2(alpha, 1) / 2.0)
+        Likelihood confidence bounds are calculated by finding the values of
+        each parameter where the profile log-likelihood, the log-likelihood
+        maximized over the other parameter, satisfies:
 
-        Taking logarithms (base e) of the equation above results in:
-
-            log[L(eta, beta)] = log[L(eta_hat, beta_hat)] - chi2(alpha, 1) / 2.0
+            log[L(eta)] = log[L(eta_hat, beta_hat)] - chi2(alpha, 1) / 2.0
 
-        The same values of theta will minimize both, but logarithms are easier
-        to work with.
+        and likewise for beta.  The crossings are bracketed on a grid and then
+        found with Brent's method.  See MLE.profile_bounds().
 
-        :param list of float pars: the parameter values at which to evaluate
-                                   the log-likelihood.
+        :param list of float pars: the parameter estimates; used as the
+                                   starting values for the maximum likelihood
+                                   fit the bounds are calculated around.
         :param float confidence: the confidence level at which to calculate the
                                  bounds.
         :param ndarray data: the data set to calculate the log-likelihood for.
@@ -1721,65 +1531,12 @@ class Weibull(object):
                                 * 2 - right censored
                                 * 3 - left censored
                                 * 4 - interval censored
-        :return: (_lower, _upper)
+        :return: (_eta_l, _eta_u, _beta_l, _beta_u)
         :rtype: tuple
         """
 
-        def _shadow_func(pars, data, const):
-            """
-            Shadow function used to minimize the log-likelihood ratio.  It's a
-            hack to ensure the correct number of arguments are returned.
-            """
-
-            return [self.log_likelihood_ratio(pars, data, const), 0.0]
-
-        def _beta_eta_func(x_var, m1, m2, intercept):
-            """
-            Function describing the relationship between mu and sigma.  This
-            relationship parabolic for both upper and lower limits.
-            """
-
-            return m1 * x_var**2.0 + m2 * x_var + intercept
-
-        def _beta_limits(lower, upper):
-            """
-            Function to find the two sigma values at which mu is the same.
-            Used to find the limits on sigma over which the parabolic
-            relationship exists.
-            """
-
-            for _keyl in lower.keys():
-                for _keyu in upper.keys():
-                    if (abs(upper[_keyu] - lower[_keyl]) < 1.0E-6
-                            and _keyl < _keyu):
-                        return (_keyl, _keyu)
-
-        _lower = OrderedDict()
-        _upper = OrderedDict()
-
-        _log_lik_ratio = self.log_likelihood_ratio(pars, data)
-        _const = _log_lik_ratio - (chi2.ppf(confidence, 1) / 2.0)
-
-        _betal = 0.5 * pars[1]
-        _betau = 2.0 * pars[1]
-        for _index in range(200):
-            # Find the lower bound.
-            _temp = optimize.root(
-                _shadow_func, [pars[0], _betal], args=(data, _const)).x
-            _lower[_betal] = _temp[0]
-            _betal = _temp[1]
-
-            # Find the upper bound.
-            _temp = optimize.root(
-                _shadow_func, [pars[0], _betau], args=(data, _const)).x
-            _upper[_betau] = _temp[0]
-            _betau = _temp[1]
-
-        _beta_l = max(_lower.keys())
-        _beta_u = min(_upper.keys())
-        _eta_l = optimize.fsolve(
-            _shadow_func, [pars[0] / 10.0, _beta_l], args=(data, 0.0))[0]
-        _eta_u = _upper[_beta_u]
+        ((_eta_l, _eta_u), (_beta_l, _beta_u)) = profile_bounds(
+            partition_data(data), confidence, 'weibull', x0=pars[:2])
 
         return (_eta_l, _eta_u, _beta_l, _beta_u)
 
@@ -1881,69 +1638,8 @@ class Weibull(object):
                         [MLE, AIC, BIC], correlation coeff.]
         :rtype: list
         """
-
-        def _shadow_func(pars, data):
-            """
-            Shadow function used to ensure the correct number of values are
-            returned when finding roots.
-            """
-
-            return [self.partial_derivatives(pars, data), 0.0]
-
-        # Initialize lists to hold results.
-        _parameters = [0.0, 0.0, 0.0]  # Scale, shape, and location
-        # parameters.
-        _variance = [0.0, 0.0, 0.0]  # Scale variance, covariance,
-        # location variance.
-        _gof = [0.0, 0.0, 0.0]  # MLE, AIC, BIC
-
-        # Sort data by the right of the interval.  Remove records occurring
-        # before the start time and after the end time.
-        _data = sorted(data, key=lambda x: float(x[1]))
-        _data = [_rec for _rec in _data if float(_rec[0]) >= start]
-        _data = [_rec for _rec in _data if float(_rec[1]) <= end]
-        _data = np.array(_data)
-
-        # Count the number of suspensions, failures, and records.
-        _n_suspensions = sum(x[2] for x in _data if x[3] == 2)
-        _n_failures = sum(
-            x[2] for x in _data if x[3] == 1 or x[3] == 3 or x[3] == 4)
-        _n_records = len(_data)
-
-        # Adjust the right-censored times to be the mid-point between the
-        # censored time and the maximum oberserved time in the data set.
-        _adj_right = (
-            max(_data[:, 1]) + _data[np.where(_data[:, 3] == 2), 1]) / 2.0
-        _data[np.where(_data[:, 3] == 2), 1] = _adj_right
-
-        # Adjust the interval-censored times so they can be passed to the
-        # fit method.
-        _interval_lt = _data[np.where(_data[:, 3] == 3)][:, 0]
-        _interval_rt = _data[np.where(_data[:, 3] == 3)][:, 1]
-        _interval_t = (_interval_lt + _interval_rt) / 2.0
-        _data[np.where(_data[:, 3] == 3), 1] = _interval_t
-
-        # Provide an estimate of eta and beta assuming no suspensions and
-        # using the right of the interval.  Use these as the starting
-        # values to scipy.optimize.fsolve.
-        (__, _beta, __, _eta) = exponweib.fit(
-            np.array(_data[:, 4], dtype=float), f0=1, floc=0)
-        _params = optimize.fsolve(_shadow_func, [_eta, _beta], args=(data))
-
-        _parameters[0] = _params[0]
-        _parameters[1] = _params[1]
-
-        _fI = fisher_information(self.log_pdf, _parameters, _data[:, 3])
-        _variance[0] = 1.0 / np.diag(_fI)[0]
-        _variance[1] = 1.0 / np.diag(_fI)[1]
-        _variance[2] = 1.0 / _fI[0, 1]
-
-        # Calculate the MLE, AIC, and BIC.
-        _gof[0] = self.log_likelihood([_parameters[0], _parameters[1]], _data)
-        _gof[1] = -2.0 * _gof[0] + 4.0
-        _gof[2] = -2.0 * _gof[0] + 4.0 * np.log(_n_records)
-
-        _fit = [_parameters, _variance, _gof, _n_suspensions, _n_failures]
+        _fit = _do_fit(data, start, end, 'weibull')
+        _fit[0].append(0.0)  # Location parameter.
 
         return _fit
 
@@ -38,10 +38,11 @@ Contains functions for performing Kaplan-Meier survival analysis.
 
 # Import mathematical functions.
 from math import sqrt
-import lifelines as nonpar
 import numpy as np
 from scipy.stats import norm  # pylint: disable=E0611
 
+from rtk.statistics.distributions.Distributions import build_data_set
+
 __author__ = 'Andrew Rowland'
 __email__ = 'andrew.rowland@reliaqual.com'
 __organization__ = 'ReliaQual Associates, LLC'
@@ -131,54 +132,52 @@ def kaplan_meier(data, start, end, conf=0.75, conftype=3):  # pylint: disable=W0
              _r; the array of observations during which an event occurred.
     :rtype: ndarray, ndarray
     """
-    # WARNING: Refactor kaplan_meier; current McCabe Complexity metric=12.
-    _kmf = nonpar.KaplanMeierFitter(alpha=conf)
-
-    # Sort data by the right of the interval.  Remove records occurring before
-    # the start time and after the end time.
-    _data = sorted(data, key=lambda x: (float(x[2]), float(x[1])))
-    _data = [_rec for _rec in _data if float(_rec[1]) >= start]
-    _data = [_rec for _rec in _data if float(_rec[2]) <= end]
-    _data = np.array(_data)
-
-    # Replace the string status with integer status.
-    for _record in _data:
-        if _record[4] == 'Right Censored' or _record[4] == '2':
-            _record[4] = 0
-        elif (_record[4] == 'Left Censored'
-              or _record[4] == 'Interval Censored' or _record[4] == '3'):
-            _record[4] = 3
-        else:
-            _record[4] = 1
-
-    # Coerce the data set into the form necessary for fitting functions.
-    _data = np.vstack((_data[:, 1], _data[:, 2], _data[:, 5], _data[:, 4]))
-    _data = np.array(np.transpose(_data), dtype=float)
-
-    # For those records with more than one observation, append the record
-    # n - 1 times to the data set to account for the multiple observations.
-    for _row in _data:
-        if _row[2] > 1:
-            for i in range(int(_row[2]) - 1):  # pylint: disable=W0612
-                _data = np.vstack((_data, _row))
-
-    # Adjust the interval-censored times so they can be passed to the
-    # fit method.
-    _interval_lt = _data[np.where(_data[:, 3] == 3)][:, 0]
-    _interval_rt = _data[np.where(_data[:, 3] == 3)][:, 1]
-    _interval_t = (_interval_lt + _interval_rt) / 2.0
-    _data[np.where(_data[:, 3] == 3), 1] = _interval_t
-    _data[np.where(_data[:, 3] == 3), 3] = 1
-
-    # Estimate the Kaplan-Meier survival function.
-    _fit = _kmf.fit(_data[:, 1], event_observed=_data[:, 3])
-    _kaplan_meier = np.vstack(
-        (np.unique(_fit.durations), _fit.confidence_interval_.values[1:, 1],
-         _fit.survival_function_.values[1:, 0],
-         _fit.confidence_interval_.values[1:, 0]))
-    _kaplan_meier = np.transpose(_kaplan_meier)
-
-    _r = np.where(_fit.event_observed == 1)[0] + 1
+    # Each record is one row weighted by its quantity of observations.
+    # Interval censored observations are treated as events at the middle of
+    # their interval.
+    _data = build_data_set(data, start, end)
+    _interval = _data[:, 3] == 3
+    _data[_interval, 1] = (_data[_interval, 0] + _data[_interval, 1]) / 2.0
+    _event = _data[:, 3] != 2
+
+    # Sort by time with the events ahead of the suspensions at the same time.
+    _order = np.lexsort((~_event, _data[:, 1]))
+    _times = _data[_order, 1]
+    _weights = _data[_order, 2]
+    _event = _event[_order]
+
+    # The number of events and the number removed from the risk set at each
+    # distinct time.
+    _unique, _index = np.unique(_times, return_inverse=True)
+    _removed = np.bincount(_index, weights=_weights)
+    _deaths = np.bincount(_index, weights=_weights * _event,
+                          minlength=len(_unique))
+    _at_risk = np.sum(_weights) - np.concatenate(([0.0],
+                                                  np.cumsum(_removed)[:-1]))
+
+    # The product-limit estimate, Greenwood's sum, and the log-log bounds.
+    _z_norm = norm.ppf(0.5 + conf / 2.0)
+    with np.errstate(all='ignore'):
+        _survival = np.cumprod(1.0 - _deaths / _at_risk)
+        _greenwood = np.cumsum(_deaths / (_at_risk * (_at_risk - _deaths)))
+        _log_s = np.log(_survival)
+        _spread = _z_norm * np.sqrt(_greenwood) / _log_s
+        _upper = np.exp(-np.exp(np.log(-_log_s) + _spread))
+        _lower = np.exp(-np.exp(np.log(-_log_s) - _spread))
+    _lower[_survival == 0.0] = 0.0
+    _upper[_survival == 0.0] = 0.0
+    _lower[_survival == 1.0] = 1.0
+    _upper[_survival == 1.0] = 1.0
+
+    _kaplan_meier = np.column_stack((_unique, _lower, _survival, _upper))
+
+    # The rank of each event among the observations in time order.
+    _counts = np.rint(_weights).astype(int)
+    _first = np.cumsum(_counts) - _counts + 1
+    _r = np.repeat(_first[_event], _counts[_event]) + (
+        np.arange(np.sum(_counts[_event])) -
+        np.repeat(np.cumsum(_counts[_event]) - _counts[_event],
+                  _counts[_event]))
 
     return _kaplan_meier, _r
 
@@ -0,0 +1,714 @@
+# -*- coding: utf-8 -*-
+#
+#       rtk.statistics.distributions.MLE.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Maximum Likelihood Estimation Module.
+
+Fits the Exponential, Weibull, LogNormal, and Gaussian distributions to data
+sets with event, right censored, and interval censored observations.  A data
+set is partitioned into the three kinds of observations once.  The negative
+log-likelihood is then minimized with a trust region Newton method using the
+closed form gradient and Hessian of the log-likelihood.  The positive
+parameters are fit on the log scale so every step stays inside the parameter
+space.  The covariance of the estimates is the inverse of the observed
+information at the estimates.
+
+The parameters of each distribution are, in order:
+
+    * exponential - theta (failure rate)
+    * weibull - eta (scale), beta (shape)
+    * lognormal - mu (scale), sigma (shape) of log(time)
+    * gaussian - mu (scale), sigma (shape)
+"""
+
+import numpy as np
+import scipy.optimize as optimize
+from scipy.stats import chi2, norm  # pylint: disable=E0611
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+_LOG_SQRT_2PI = 0.5 * np.log(2.0 * np.pi)
+_EULER_GAMMA = 0.5772156649015329
+
+# The tolerance on the gradient of the mean negative log-likelihood.
+GTOL = 1.0E-6
+
+# The distances, in multiples of the Wald half-width, from the estimate of a
+# parameter to the grid points used to bracket its likelihood ratio bounds.
+PROFILE_GRID = np.linspace(0.25, 3.0, 12)
+
+# The maximum number of Newton iterations for the nuisance parameter and the
+# tolerance on the Newton decrement relative to the log-likelihood.
+_MAX_NEWTON = 50
+_NEWTON_TOL = 1.0E-12
+
+
+def _do_outer(first, second):
+    """Return the (k, k, n) outer products of two (k, n) arrays."""
+    return first[:, None, :] * second[None, :, :]
+
+
+def _do_transform(values, log_scale, function):
+    """Apply function to the values that are fit on the log scale."""
+    _values = np.array(values, dtype=float)
+    _values[log_scale] = function(_values[log_scale])
+
+    return _values
+
+
+def _do_mask(mask, value, grad, hess, fill):
+    """Replace the value and derivatives where mask is False."""
+    value = np.where(mask, value, fill)
+    grad = np.where(mask, grad, 0.0)
+    hess = np.where(mask, hess, 0.0)
+
+    return value, grad, hess
+
+
+def _exponential(times, params, log_pdf=True):
+    """
+    Calculate the exponential log pdf or log survival and its derivatives.
+
+    :param ndarray times: the times at which to calculate.
+    :param ndarray params: the failure rate, [theta].
+    :param bool log_pdf: calculate the log pdf (True) or the log of the
+                         survival function (False).
+    :return: (_value, _grad, _hess); the (n, ) values, the (1, n) gradients
+             and the (1, 1, n) Hessians with respect to the parameters.
+    :rtype: tuple
+    """
+    _theta = params[0]
+    _finite = np.isfinite(times)
+    _times = np.where(_finite, times, 0.0)
+
+    if log_pdf:
+        _value = np.log(_theta) - _theta * _times
+        _grad = np.array([1.0 / _theta - _times])
+        _hess = np.array([[-np.ones_like(_value) / _theta**2.0]])
+    else:
+        _value = -_theta * _times
+        _grad = np.array([-_times * np.ones_like(_value)])
+        _hess = np.array([[np.zeros_like(_value)]])
+
+    return _do_mask(_finite, _value, _grad, _hess, -np.inf)
+
+
+def _weibull(times, params, log_pdf=True):
+    """
+    Calculate the Weibull log pdf or log survival and its derivatives.
+
+    :param ndarray times: the times at which to calculate.
+    :param ndarray params: the scale and shape parameters, [eta, beta].
+    :param bool log_pdf: calculate the log pdf (True) or the log of the
+                         survival function (False).
+    :return: (_value, _grad, _hess); the (n, ) values, the (2, n) gradients
+             and the (2, 2, n) Hessians with respect to the parameters.
+    :rtype: tuple
+    """
+    _eta, _beta = params
+
+    if log_pdf:
+        _w = np.log(times) - np.log(_eta)
+        _u = np.exp(_beta * _w)
+        _value = np.log(_beta / _eta) + (_beta - 1.0) * _w - _u
+        _grad = np.array(
+            [_beta * (_u - 1.0) / _eta, 1.0 / _beta + _w - _u * _w])
+        _h_eb = (_u * (1.0 + _beta * _w) - 1.0) / _eta
+        _hess = np.array(
+            [[_beta * (1.0 - (_beta + 1.0) * _u) / _eta**2.0, _h_eb],
+             [_h_eb, -1.0 / _beta**2.0 - _u * _w**2.0]])
+
+        return _value, _grad, _hess
+
+    _inside = np.logical_and(times > 0.0, np.isfinite(times))
+    _w = np.log(np.where(_inside, times, _eta)) - np.log(_eta)
+    _u = np.exp(_beta * _w)
+    _value = -_u
+    _grad = np.array([_beta * _u / _eta, -_u * _w])
+    _h_eb = _u * (1.0 + _beta * _w) / _eta
+    _hess = np.array([[-_beta * (_beta + 1.0) * _u / _eta**2.0, _h_eb],
+                      [_h_eb, -_u * _w**2.0]])
+
+    # The survival is one at time zero and zero at infinity.
+    return _do_mask(_inside, _value, _grad, _hess,
+                    np.where(times > 0.0, -np.inf, 0.0))
+
+
+def _location_scale(x_values, params, log_pdf=True):
+    """
+    Calculate the normal log pdf or log survival and its derivatives.
+
+    :param ndarray x_values: the values at which to calculate.
+    :param ndarray params: the location and scale parameters, [mu, sigma].
+    :param bool log_pdf: calculate the log pdf (True) or the log of the
+                         survival function (False).
+    :return: (_value, _grad, _hess); the (n, ) values, the (2, n) gradients
+             and the (2, 2, n) Hessians with respect to the parameters.
+    :rtype: tuple
+    """
+    _mu, _sigma = params
+
+    if log_pdf:
+        _z = (x_values - _mu) / _sigma
+        _value = -np.log(_sigma) - _LOG_SQRT_2PI - 0.5 * _z**2.0
+        _grad = np.array([_z / _sigma, (_z**2.0 - 1.0) / _sigma])
+        _h_ms = -2.0 * _z / _sigma**2.0
+        _hess = np.array([[-np.ones_like(_z) / _sigma**2.0, _h_ms],
+                          [_h_ms, (1.0 - 3.0 * _z**2.0) / _sigma**2.0]])
+
+        return _value, _grad, _hess
+
+    _finite = np.isfinite(x_values)
+    _z = (np.where(_finite, x_values, _mu) - _mu) / _sigma
+
+    # The derivatives of log(S(z)) follow from d/dz log(S(z)) = -h(z) and
+    # dh/dz = h(z) * (h(z) - z) where h is the inverse Mills ratio.
+    _value = norm.logsf(_z)
+    _h = np.exp(norm.logpdf(_z) - _value)
+    _dz = np.array([-np.ones_like(_z) / _sigma, -_z / _sigma])
+    _d2z = np.array([[np.zeros_like(_z),
+                      np.ones_like(_z) / _sigma**2.0],
+                     [np.ones_like(_z) / _sigma**2.0,
+                      2.0 * _z / _sigma**2.0]])
+    _grad = -_h * _dz
+    _hess = -_h * (_h - _z) * _do_outer(_dz, _dz) - _h * _d2z
+
+    return _do_mask(_finite, _value, _grad, _hess,
+                    np.where(x_values > 0.0, -np.inf, 0.0))
+
+
+def _gaussian(times, params, log_pdf=True):
+    """Calculate the Gaussian log pdf or log survival and its derivatives."""
+    return _location_scale(times, params, log_pdf)
+
+
+def _lognormal(times, params, log_pdf=True):
+    """Calculate the LogNormal log pdf or log survival and its derivatives."""
+    with np.errstate(divide='ignore'):
+        _log_t = np.log(times)
+    _value, _grad, _hess = _location_scale(_log_t, params, log_pdf)
+    if log_pdf:
+        _value = _value - _log_t
+
+    return _value, _grad, _hess
+
+
+# The kernel function and which parameters are fit on the log scale for each
+# distribution.
+DISTRIBUTIONS = {
+    'exponential': (_exponential, (True, )),
+    'gaussian': (_gaussian, (False, True)),
+    'lognormal': (_lognormal, (False, True)),
+    'weibull': (_weibull, (True, True))
+}
+
+
+def select_data(data, start=0.0, end=0.0):
+    """
+    Select the records of a data set inside the time window.
+
+    A record is inside the window when the left of its interval is at least
+    the start time and its time is no more than the end time.  The time of a
+    record is the right of the interval or, if the right of the interval is
+    infinite, the left of the interval.
+
+    :param ndarray data: the data set.  See partition_data().
+    :param float start: the minimum time to include.
+    :param float end: the maximum time to include.  Zero includes all times.
+    :return: _data; the records inside the window.
+    :rtype: ndarray
+    """
+    _data = np.asarray(data, dtype=float).reshape(-1, 5)
+    _times = np.where(np.isfinite(_data[:, 1]), _data[:, 1], _data[:, 0])
+
+    _keep = _data[:, 0] >= start
+    if end > 0.0:
+        _keep = np.logical_and(_keep, _times <= end)
+
+    return _data[_keep]
+
+
+def partition_data(data, start=0.0, end=0.0):
+    """
+    Partition a data set into event, right censored, and interval censored.
+
+    The time of an event is the right of the interval.  The time of a right
+    censored observation is the right of the interval or, if the right of the
+    interval is infinite, the left of the interval.  Left censored (status 3
+    with a zero left of the interval) and interval censored (status 3 or 4)
+    observations are both fit as interval censored.
+
+    :param ndarray data: the data set to partition.  This is a numpy array
+                         where each record contains the following, in order:
+                            * 0 = Interval start time
+                            * 1 = Interval end time
+                            * 2 = Quantity of observations
+                            * 3 = Status of observation
+                            * 4 = Time between failures or interarrival time
+    :param float start: the minimum time to include in the fit.  Used to
+                        exclude outliers.
+    :param float end: the maximum time to include in the fit.  Used to
+                      exclude outliers.  Zero includes all times.
+    :return: _partition; dictionary of the times and quantities of each kind
+             of observation.  Keys are event_t, event_n, right_t, right_n,
+             interval_lt, interval_rt, and interval_n.
+    :rtype: dict
+    """
+    _data = select_data(data, start, end)
+    _times = np.where(np.isfinite(_data[:, 1]), _data[:, 1], _data[:, 0])
+
+    _event = _data[:, 3] == 1
+    _right = _data[:, 3] == 2
+    _interval = np.logical_or(_data[:, 3] == 3, _data[:, 3] == 4)
+
+    return {
+        'event_t': _data[_event, 1],
+        'event_n': _data[_event, 2],
+        'right_t': _times[_right],
+        'right_n': _data[_right, 2],
+        'interval_lt': _data[_interval, 0],
+        'interval_rt': _data[_interval, 1],
+        'interval_n': _data[_interval, 2]
+    }
+
+
+def _do_terms(partition, params, dist):
+    """
+    Calculate the log-likelihood of each record and its derivatives.
+
+    :return: the (quantities, values, gradients, Hessians) of the event, the
+             right censored, and the interval censored records.
+    :rtype: list of tuples
+    """
+    _kernel = DISTRIBUTIONS[dist][0]
+    _params = np.asarray(params, dtype=float)
+
+    # Events contribute log(f(t)) and right censored observations contribute
+    # log(S(t)).
+    _terms = [(partition['event_n'], ) +
+              _kernel(partition['event_t'], _params, True),
+              (partition['right_n'], ) +
+              _kernel(partition['right_t'], _params, False)]
+
+    # Interval censored observations contribute log(S(l) - S(r)).  This is
+    # calculated as log(S(l)) + log(1 - q) where q = S(r) / S(l) so it
+    # doesn't underflow far into the tail.
+    _v_l, _g_l, _h_l = _kernel(partition['interval_lt'], _params, False)
+    _v_r, _g_r, _h_r = _kernel(partition['interval_rt'], _params, False)
+    _q = np.exp(_v_r - _v_l)
+    _a = (_g_l - _q * _g_r) / (1.0 - _q)
+    _b = ((_h_l + _do_outer(_g_l, _g_l)) - _q *
+          (_h_r + _do_outer(_g_r, _g_r))) / (1.0 - _q)
+    _terms.append((partition['interval_n'], _v_l + np.log1p(-_q), _a,
+                   _b - _do_outer(_a, _a)))
+
+    return _terms
+
+
+def log_likelihood(partition, params, dist='exponential'):
+    """
+    Calculate the log-likelihood and its gradient and Hessian.
+
+    The log-likelihood can be calculated for m sets of parameters at once by
+    passing params as a (k, m, 1) array.  The log-likelihood, gradient, and
+    Hessian are then (m, ), (k, m), and (k, k, m) arrays.
+
+    :param dict partition: the partitioned data set from partition_data().
+    :param list params: the parameters at which to calculate.
+    :param str dist: the noun name of the distribution.
+    :return: (_log_lik, _grad, _hess); the log-likelihood and its gradient
+             and Hessian with respect to the parameters.
+    :rtype: tuple
+    :raise: KeyError if dist is not one of DISTRIBUTIONS.
+    """
+    with np.errstate(all='ignore'):
+        _terms = _do_terms(partition, params, dist)
+        _log_lik = sum(
+            np.sum(_n * _value, axis=-1) for _n, _value, __, __ in _terms)
+        _d_log_lik = sum(
+            np.sum(_n * _grad, axis=-1) for _n, __, _grad, __ in _terms)
+        _d2_log_lik = sum(
+            np.sum(_n * _hess, axis=-1) for _n, __, __, _hess in _terms)
+
+    return _log_lik, _d_log_lik, _d2_log_lik
+
+
+def scores(partition, params, dist='exponential'):
+    """
+    Calculate the score of a single observation of each record.
+
+    The score is the gradient of the log-likelihood of the observation with
+    respect to the parameters.  The records are in the order events, right
+    censored, then interval censored.
+
+    :param dict partition: the partitioned data set from partition_data().
+    :param list params: the parameters at which to calculate.
+    :param str dist: the noun name of the distribution.
+    :return: (_quantities, _scores); the (r, ) quantities and the (k, r)
+             scores of the r records.
+    :rtype: tuple
+    :raise: KeyError if dist is not one of DISTRIBUTIONS.
+    """
+    with np.errstate(all='ignore'):
+        _terms = _do_terms(partition, params, dist)
+
+    return (np.concatenate([_n for _n, __, __, __ in _terms]),
+            np.concatenate([_grad for __, __, _grad, __ in _terms], axis=-1))
+
+
+def observed_information(partition, params, dist='exponential'):
+    """
+    Calculate the observed information matrix.
+
+    The observed information is the negative of the Hessian of the censored
+    log-likelihood.  Evaluated at the maximum likelihood estimates, its
+    inverse is the Fisher matrix estimate of the covariance of the
+    parameters.
+
+    :param dict partition: the partitioned data set from partition_data().
+    :param list params: the parameters at which to calculate.
+    :param str dist: the noun name of the distribution.
+    :return: _information; the observed information matrix.
+    :rtype: ndarray
+    :raise: KeyError if dist is not one of DISTRIBUTIONS.
+    """
+    return -log_likelihood(partition, params, dist)[2]
+
+
+def covariance_matrix(partition, params, dist='exponential'):
+    """
+    Calculate the covariance of the parameters from the observed information.
+
+    :param dict partition: the partitioned data set from partition_data().
+    :param list params: the maximum likelihood estimates of the parameters.
+    :param str dist: the noun name of the distribution.
+    :return: _covariance; the inverse of the observed information matrix or
+             a matrix of NaN if the observed information is singular.
+    :rtype: ndarray
+    :raise: KeyError if dist is not one of DISTRIBUTIONS.
+    """
+    _information = observed_information(partition, params, dist)
+    try:
+        _covariance = np.linalg.inv(_information)
+    except np.linalg.LinAlgError:
+        _covariance = np.full(_information.shape, np.nan)
+
+    return _covariance
+
+
+def _do_starting_values(partition, dist):
+    """Estimate starting values from the failure times, ignoring censoring."""
+    _lt = partition['interval_lt']
+    _rt = partition['interval_rt']
+    _times = np.concatenate(
+        (partition['event_t'], np.where(_lt > 0.0, 0.5 * (_lt + _rt), _rt)))
+    _weights = np.concatenate((partition['event_n'], partition['interval_n']))
+
+    if dist == 'exponential':
+        _exposure = (np.sum(_weights * _times) +
+                     np.sum(partition['right_n'] * partition['right_t']))
+        return np.array([np.sum(_weights) / _exposure])
+
+    if dist in ['weibull', 'lognormal']:
+        _positive = _times > 0.0
+        _times = np.log(_times[_positive])
+        _weights = _weights[_positive]
+        if not np.sum(_weights) > 0.0:
+            _times = np.zeros(1)
+            _weights = np.ones(1)
+
+    _mean = np.average(_times, weights=_weights)
+    _std = np.sqrt(np.average((_times - _mean)**2.0, weights=_weights))
+
+    if dist == 'weibull':
+        _beta = np.pi / (_std * np.sqrt(6.0)) if _std > 0.0 else 1.0
+        return np.array([np.exp(_mean + _EULER_GAMMA / _beta), _beta])
+
+    if not _std > 0.0:
+        _std = abs(_mean) if _mean != 0.0 else 1.0
+
+    return np.array([_mean, _std])
+
+
+def fit_partition(partition, dist='exponential', x0=None):
+    """
+    Find the maximum likelihood estimates of the parameters.
+
+    :param dict partition: the partitioned data set from partition_data().
+    :param str dist: the noun name of the distribution to fit.  Defaults to
+                     the exponential distribution.
+    :param list x0: the starting values of the parameters.  Defaults to
+                    estimates from the failure times, which are also used if
+                    x0 is outside the parameter space.
+    :return: _fit; dictionary with the parameters, covariance,
+             log_likelihood, aic, bic, n_failures, n_suspensions, converged,
+             and n_iterations.
+    :rtype: dict
+    :raise: KeyError if dist is not one of DISTRIBUTIONS.
+    :raise: ValueError if the data set doesn't contain any failures.
+    """
+    _log_scale = np.array(DISTRIBUTIONS[dist][1])
+
+    _n_failures = np.sum(partition['event_n']) + np.sum(
+        partition['interval_n'])
+    _n_suspensions = np.sum(partition['right_n'])
+    if not _n_failures > 0.0:
+        raise ValueError('The data set must contain at least one failure.')
+
+    with np.errstate(all='ignore'):
+        if x0 is None or not np.all(
+                np.isfinite(_do_transform(x0, _log_scale, np.log))):
+            x0 = _do_starting_values(partition, dist)
+    x0 = np.asarray(x0, dtype=float)
+
+    # The mean negative log-likelihood is minimized so the tolerances don't
+    # depend on the size of the data set.  The trust region method calls the
+    # objective, gradient, and Hessian separately at the same point so the
+    # last evaluation is kept.
+    _n_obs = _n_failures + _n_suspensions
+    _last = {}
+
+    def _evaluate(phi):
+        """Calculate the negative log-likelihood on the fitting scale."""
+        _key = phi.tostring()
+        if _key not in _last:
+            _params = _do_transform(phi, _log_scale, np.exp)
+            _log_lik, _grad, _hess = log_likelihood(partition, _params, dist)
+            _jac = np.where(_log_scale, _params, 1.0)
+            _value = (-_log_lik / _n_obs, -_grad * _jac / _n_obs,
+                      -(_hess * np.outer(_jac, _jac) + np.diag(
+                          np.where(_log_scale, _grad * _jac, 0.0))) / _n_obs)
+
+            # Reject steps outside the support of the data set.
+            if not (np.isfinite(_value[0]) and np.all(np.isfinite(_value[1]))
+                    and np.all(np.isfinite(_value[2]))):
+                _value = (np.inf, np.zeros(len(phi)), np.eye(len(phi)))
+
+            _last.clear()
+            _last[_key] = _value
+
+        return _last[_key]
+
+    _result = optimize.minimize(
+        lambda phi: _evaluate(phi)[0],
+        _do_transform(x0, _log_scale, np.log),
+        method='trust-exact',
+        jac=lambda phi: _evaluate(phi)[1],
+        hess=lambda phi: _evaluate(phi)[2],
+        options={'gtol': GTOL})
+
+    _params = _do_transform(_result.x, _log_scale, np.exp)
+    _log_lik = log_likelihood(partition, _params, dist)[0]
+    _covariance = covariance_matrix(partition, _params, dist)
+
+    _n_params = len(_params)
+
+    return {
+        'parameters': _params,
+        'covariance': _covariance,
+        'log_likelihood': _log_lik,
+        'aic': -2.0 * _log_lik + 2.0 * _n_params,
+        'bic': -2.0 * _log_lik + _n_params * np.log(_n_obs),
+        'n_failures': _n_failures,
+        'n_suspensions': _n_suspensions,
+        'converged': bool(_result.success
+                          or np.max(np.abs(_result.jac)) <= GTOL),
+        'n_iterations': _result.nit
+    }
+
+
+def maximum_likelihood(data, start=0.0, end=0.0, dist='exponential'):
+    """
+    Fit a data set to a parametric distribution by maximum likelihood.
+
+    :param ndarray data: the data set to fit.  This is a numpy array where
+                         each record contains the following, in order:
+                            * 0 = Interval start time
+                            * 1 = Interval end time
+                            * 2 = Quantity of observations
+                            * 3 = Status of observation
+                            * 4 = Time between failures or interarrival time
+    :param float start: the minimum time to include in the fit.  Used to
+                        exclude outliers.
+    :param float end: the maximum time to include in the fit.  Used to
+                      exclude outliers.  Zero includes all times.
+    :param str dist: the noun name of the distribution to fit.  Defaults to
+                     the exponential distribution.
+    :return: _fit; see fit_partition().
+    :rtype: dict
+    :raise: KeyError if dist is not one of DISTRIBUTIONS.
+    :raise: ValueError if the data set doesn't contain any failures.
+    """
+    return fit_partition(partition_data(data, start, end), dist)
+
+
+def profile_likelihood(partition, params, index, values, dist='exponential'):
+    """
+    Calculate the profile log-likelihood of one of the parameters.
+
+    The profile log-likelihood is the log-likelihood maximized over the other
+    (nuisance) parameter with the parameter of interest held at each of the
+    values.  The nuisance parameter is maximized at all of the values at once
+    with Newton's method on the scale it's fit on, starting from its value in
+    params.  Where the log-likelihood isn't concave in the nuisance
+    parameter the curvature at params is used instead and steps that
+    decrease the log-likelihood are halved.
+
+    :param dict partition: the partitioned data set from partition_data().
+    :param list params: the parameters to start from; usually the maximum
+                        likelihood estimates.
+    :param int index: the index of the parameter of interest.
+    :param ndarray values: the values of the parameter of interest.
+    :param str dist: the noun name of the distribution.
+    :return: (_profile, _params); the (m, ) profile log-likelihoods and the
+             (k, m) parameters that maximize the log-likelihood at each of
+             the m values.
+    :rtype: tuple
+    :raise: KeyError if dist is not one of DISTRIBUTIONS.
+    """
+    _log_scale = DISTRIBUTIONS[dist][1]
+    _values = np.atleast_1d(np.asarray(values, dtype=float))
+
+    _params = np.repeat(
+        np.asarray(params, dtype=float)[:, None], len(_values), axis=1)
+    _params[index] = _values
+    _log_lik, _grad, _hess = log_likelihood(partition, _params[:, :, None],
+                                            dist)
+
+    # There are at most two parameters so there is at most one nuisance.
+    for _nuisance in [_idx for _idx in range(len(params)) if _idx != index]:
+
+        def _do_derivatives(value, grad, hess, nuisance=_nuisance):
+            """Return the derivatives on the scale the nuisance is fit on."""
+            _g = grad[nuisance]
+            _h = hess[nuisance, nuisance]
+            if _log_scale[nuisance]:
+                _h = value**2.0 * _h + value * _g
+                _g = value * _g
+
+            return _g, _h
+
+        _h_start = _do_derivatives(
+            params[_nuisance], *log_likelihood(partition, params, dist)[1:])[1]
+        if not _h_start < 0.0:
+            _h_start = -1.0
+
+        for __ in range(_MAX_NEWTON):
+            _g, _h = _do_derivatives(_params[_nuisance], _grad, _hess)
+            _h = np.where(_h < 0.0, _h, _h_start)
+            _decrement = _g**2.0 / -_h
+            _active = np.isfinite(_log_lik) & (
+                _decrement > _NEWTON_TOL * (1.0 + np.abs(_log_lik)))
+            if not np.any(_active):
+                break
+            _step = np.where(_active, -_g / _h, 0.0)
+
+            # Take the step, halving it wherever the log-likelihood doesn't
+            # increase.
+            _start = _params[_nuisance].copy()
+            while np.any(_step != 0.0):
+                if _log_scale[_nuisance]:
+                    _params[_nuisance] = _start * np.exp(_step)
+                else:
+                    _params[_nuisance] = _start + _step
+                _new = log_likelihood(partition, _params[:, :, None], dist)
+                _better = _new[0] >= _log_lik
+                _accept = _better & (_step != 0.0)
+                _log_lik = np.where(_accept, _new[0], _log_lik)
+                _grad = np.where(_accept, _new[1], _grad)
+                _hess = np.where(_accept, _new[2], _hess)
+                _step = np.where(_better, 0.0, 0.5 * _step)
+                _step[np.abs(_step) < 1.0E-12] = 0.0
+                _params[_nuisance] = np.where(
+                    _better, _params[_nuisance], _start)
+
+    return _log_lik, _params
+
+
+def profile_bounds(partition, confidence, dist='exponential', x0=None):
+    """
+    Calculate the likelihood ratio confidence bounds on the parameters.
+
+    The bounds on each parameter are the values at which the profile
+    log-likelihood crosses:
+
+        log[L(theta_hat)] - chi2(alpha, 1) / 2.0
+
+    The profile log-likelihood is calculated on a grid of PROFILE_GRID
+    multiples of the Wald half-width either side of the estimate, all at
+    once, to bracket each crossing.  The crossing is then found with Brent's
+    method.  The grid is extended if it doesn't reach a crossing.
+
+    :param dict partition: the partitioned data set from partition_data().
+    :param float confidence: the confidence level of the bounds.
+    :param str dist: the noun name of the distribution.
+    :param list x0: the starting values of the parameters for the maximum
+                    likelihood fit.
+    :return: _bounds; a list of the (lower, upper) likelihood ratio bounds
+             for each of the parameters.  A bound is NaN if the profile
+             log-likelihood doesn't cross the critical value.
+    :rtype: list of tuples
+    :raise: KeyError if dist is not one of DISTRIBUTIONS.
+    :raise: ValueError if the data set doesn't contain any failures.
+    """
+    if confidence > 1.0:
+        confidence = confidence / 100.0
+
+    _log_scale = DISTRIBUTIONS[dist][1]
+    _fit = fit_partition(partition, dist, x0)
+    _params = _fit['parameters']
+    _critical = _fit['log_likelihood'] - chi2.ppf(confidence, 1) / 2.0
+
+    _bounds = []
+    for _index, _estimate in enumerate(_params):
+        # Work on the scale the parameter is fit on so the grid stays inside
+        # the parameter space.
+        if _log_scale[_index]:
+            _to_param = np.exp
+            _center = np.log(_estimate)
+            _width = np.sqrt(_fit['covariance'][_index, _index]) / _estimate
+        else:
+            _to_param = np.asarray
+            _center = _estimate
+            _width = np.sqrt(_fit['covariance'][_index, _index])
+        _width = _width * np.sqrt(chi2.ppf(confidence, 1))
+        if not (np.isfinite(_width) and _width > 0.0):
+            _width = 0.1 * max(abs(_center), 1.0)
+
+        def _do_excess(phi, start, index=_index, to_param=_to_param):
+            """Return the excess of the profile over the critical value."""
+            return profile_likelihood(partition, start, index,
+                                      [to_param(phi)], dist)[0][0] - _critical
+
+        _side_bounds = []
+        for _sign in [-1.0, 1.0]:
+            _bound = np.nan
+            _grid = PROFILE_GRID
+            _inside = (_center, _params)
+            for __ in range(4):
+                _phi = _center + _sign * _width * _grid
+                _profile, _maximizers = profile_likelihood(
+                    partition, _params, _index, _to_param(_phi), dist)
+                _below = np.flatnonzero(~(_profile >= _critical))
+                if len(_below) > 0:
+                    _outer = _below[0]
+                    if _outer > 0:
+                        _inside = (_phi[_outer - 1],
+                                   _maximizers[:, _outer - 1])
+                    _bound = _to_param(
+                        optimize.brentq(_do_excess, _inside[0], _phi[_outer],
+                                        args=(_inside[1], ), xtol=1.0E-10))
+                    break
+                _inside = (_phi[-1], _maximizers[:, -1])
+                _grid = _grid[-1] + 4.0 * PROFILE_GRID
+            _side_bounds.append(float(_bound))
+
+        _bounds.append(tuple(_side_bounds))
+
+    return _bounds
@@ -47,22 +47,11 @@ from scipy.optimize import fsolve
 from scipy.stats import t  # pylint: disable=E0611
 
 # Import other RTK modules.
-try:
-    from analyses.statistics.Bounds import calculate_crow_bounds, \
-                                           calculate_fisher_bounds, \
-                                           calculate_variance_covariance
-    from analyses.statistics.growth.CrowAMSAA import \
-        calculate_crow_amsaa_parameters
-    from analyses.statistics.Duane import calculate_duane_parameters, \
-                                          calculate_duane_standard_error
-except ImportError:
-    from rtk.analyses.statistics.Bounds import calculate_crow_bounds, \
-                                               calculate_fisher_bounds, \
-                                               calculate_variance_covariance
-    from rtk.analyses.statistics.growth.CrowAMSAA import \
-                calculate_crow_amsaa_parameters
-    from rtk.analyses.statistics.Duane import calculate_duane_parameters, \
-                                              calculate_duane_standard_error
+from rtk.statistics.Bounds import calculate_crow_bounds, \
+    calculate_fisher_bounds, calculate_variance_covariance
+from rtk.statistics.growth.CrowAMSAA import calculate_crow_amsaa_parameters
+from rtk.statistics.growth.Duane import calculate_duane_parameters, \
+    calculate_duane_standard_error
 
 __author__ = 'Andrew Rowland'
 __email__ = 'andrew.rowland@reliaqual.com'
@@ -167,3 +167,183 @@ def test_calculate_zero_quantity():
     assert isinstance(_attributes, dict)
     assert _msg == ("RTK WARNING: Quantity is less than 1 when calculating "
                     "hardware item, hardware ID: 6.\n")
+
+
+def _do_build_parts():
+    """Build a BoM of parts that covers the parts count models."""
+    _subcategories = {
+        1: range(1, 11),
+        2: range(1, 14),
+        3: range(1, 14),
+        4: range(1, 20),
+        5: [1, 2],
+        6: [1, 2],
+        7: range(1, 6),
+        8: range(1, 6),
+        9: [1, 2],
+        10: [1, 2, 3, 4]
+    }
+
+    _lst_parts = []
+    for _category_id, _lst_subcategories in _subcategories.items():
+        for _subcategory_id in _lst_subcategories:
+            for _environment_id in [1, 4, 13]:
+                for _quality_id in [1, 2]:
+                    _lst_parts.append(
+                        dict(
+                            HARDWARE_ATTRIBUTES,
+                            hardware_id=len(_lst_parts) + 1,
+                            hazard_rate_method_id=1,
+                            category_id=_category_id,
+                            subcategory_id=_subcategory_id,
+                            environment_active_id=_environment_id,
+                            environment_dormant_id=2,
+                            quality_id=_quality_id,
+                            specification_id=1 + len(_lst_parts) % 2,
+                            type_id=1,
+                            family_id=1,
+                            construction_id=1,
+                            technology_id=1,
+                            application_id=1,
+                            n_elements=100,
+                            quantity=1 + len(_lst_parts) % 4,
+                            add_adj_factor=0.0,
+                            mult_adj_factor=1.5,
+                            duty_cycle=75.0))
+
+    return _lst_parts
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_217f_part_count_batch():
+    """do_calculate_217f_part_count_batch() should return the same hazard rates as calculate() for each part."""
+    _lst_parts = _do_build_parts()
+
+    _parts = {}
+    for _key in [
+            'category_id', 'subcategory_id', 'environment_active_id',
+            'quality_id', 'specification_id', 'type_id', 'family_id',
+            'construction_id', 'technology_id', 'application_id',
+            'n_elements', 'quantity', 'add_adj_factor', 'mult_adj_factor',
+            'duty_cycle'
+    ]:
+        _parts[_key] = [_part[_key] for _part in _lst_parts]
+
+    _results = Component.do_calculate_217f_part_count_batch(_parts)
+
+    for _idx, _part in enumerate(_lst_parts):
+        _attributes, __ = Component.calculate(**_part)
+        assert _results['lambda_b'][_idx] == _attributes['lambda_b']
+        assert _results['hazard_rate_active'][_idx] == pytest.approx(
+            _attributes['hazard_rate_active'])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_217f_part_count_batch_defaults():
+    """do_calculate_217f_part_count_batch() should use the default adjustment factors and return 0.0 for parts with no parts count model."""
+    _parts = {
+        'category_id': [3, 3, 10],
+        'subcategory_id': [1, 1, 8],
+        'environment_active_id': [2, 2, 2],
+        'quality_id': [2, 2, 1],
+        'quantity': [1, 4, 1]
+    }
+
+    _results = Component.do_calculate_217f_part_count_batch(_parts)
+
+    assert _results['lambda_b'][0] == 0.0022
+    assert _results['piQ'][0] == 0.1
+    assert _results['hazard_rate_active'][1] == pytest.approx(
+        4.0 * 0.0022 * 0.1)
+    assert _results['hazard_rate_active'][2] == 0.0
+
+
+def _do_build_mission_parts():
+    """Build a part stress resistor and a parts count resistor."""
+    _stress = dict(
+        HARDWARE_ATTRIBUTES,
+        hardware_id=1,
+        hazard_rate_method_id=2,
+        category_id=3,
+        subcategory_id=1,
+        environment_active_id=3,
+        quality_id=2,
+        specification_id=1,
+        temperature_active=35.0,
+        power_operating=0.05,
+        power_rated=0.25,
+        resistance=10000.0)
+    _count = dict(_stress, hardware_id=2, hazard_rate_method_id=1)
+
+    return [_stress, _count]
+
+
+def _do_calculate_condition(part, environment_id, temperature):
+    """Return the active hazard rate of a part in a condition."""
+    return Component.calculate(**dict(
+        part,
+        environment_active_id=environment_id,
+        temperature_active=temperature))[0]['hazard_rate_active']
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_mission_hazard_rate():
+    """do_calculate_mission_hazard_rate() should return the phase duration weighted hazard rate of each part."""
+    _lst_parts = _do_build_mission_parts()
+    _phases = [(1.0, None, 25.0), (3.0, 2, 85.0), (1.0, None, 25.0)]
+
+    _hazard_rates = Component.do_calculate_mission_hazard_rate(
+        _lst_parts, _phases)
+
+    for _idx, _part in enumerate(_lst_parts):
+        assert _hazard_rates[_idx] == pytest.approx(
+            (2.0 * _do_calculate_condition(_part, 3, 25.0) +
+             3.0 * _do_calculate_condition(_part, 2, 85.0)) / 5.0)
+        assert _part['temperature_active'] == 35.0
+        assert _part['environment_active_id'] == 3
+    assert (_do_calculate_condition(_lst_parts[0], 3, 25.0) !=
+            _do_calculate_condition(_lst_parts[0], 3, 85.0))
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_mission_hazard_rate_distinct_conditions(monkeypatch):
+    """do_calculate_mission_hazard_rate() should call calculate() once per distinct condition and shared part."""
+    _stress, _count = _do_build_mission_parts()
+    _lst_parts = [
+        _stress,
+        dict(_stress, hardware_id=3, ref_des='R3', name='Resistor'), _count
+    ]
+    _phases = [(1.0, None, 25.0), (2.0, None, 85.0)] * 12
+
+    _calls = []
+    _calculate = Component.calculate
+
+    def _do_count(**attributes):
+        _calls.append(attributes['hardware_id'])
+        return _calculate(**attributes)
+
+    monkeypatch.setattr(Component, 'calculate', _do_count)
+    _cache = {}
+    _hazard_rates = Component.do_calculate_mission_hazard_rate(
+        _lst_parts, _phases, _cache)
+
+    # Two conditions for the part stress resistor, none for its copy, and
+    # one for the parts count resistor because it doesn't use temperature.
+    assert _calls == [1, 1, 2]
+    assert len(_cache) == 3
+    assert _hazard_rates[0] == _hazard_rates[1]
+    assert _hazard_rates[2] == pytest.approx(
+        _do_calculate_condition(_count, 3, 35.0))
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_mission_hazard_rate_no_duration():
+    """do_calculate_mission_hazard_rate() should raise a ValueError when the mission phases have no duration."""
+    with pytest.raises(ValueError):
+        Component.do_calculate_mission_hazard_rate(
+            _do_build_mission_parts(), [(0.0, None, 25.0)])
@@ -603,3 +603,56 @@ def test_temperature_overstress_harsh_environment(temperature_junction,
         assert _attributes['overstress']
         assert _attributes['reason'] == ('1. Junction temperature > '
                                          '125.000000C.\n')
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize("subcategory_id", [1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+def test_calculate_217f_part_stress_array(subcategory_id):
+    """calculate_217f_part_stress_array() should return the same hazard rates and factors as calculate_217f_part_stress()."""
+    _lst_parts = []
+    for _n_elements in [10, 250, 2000, 50000, 500000]:
+        for _environment_id in range(1, 15):
+            for _technology_id in [1, 2]:
+                _lst_parts.append(
+                    dict(
+                        ATTRIBUTES,
+                        subcategory_id=subcategory_id,
+                        technology_id=_technology_id,
+                        n_elements=_n_elements,
+                        environment_active_id=_environment_id,
+                        quality_id=1 + _environment_id % 3,
+                        package_id=1 + _environment_id % 10,
+                        application_id=_technology_id,
+                        type_id=1 + _technology_id % 2,
+                        family_id=_environment_id,
+                        construction_id=_technology_id,
+                        n_cycles=350000 * _technology_id,
+                        manufacturing_id=_technology_id,
+                        n_active_pins=16 * _technology_id,
+                        temperature_case=30.0 + _environment_id,
+                        power_operating=0.05 * _technology_id,
+                        theta_jc=12.0,
+                        years_in_production=0.5 * _technology_id,
+                        area=0.5,
+                        feature_size=1.25,
+                        voltage_esd=2000.0))
+
+    _parts = dict((_key, [_part[_key] for _part in _lst_parts])
+                  for _key in _lst_parts[0]
+                  if isinstance(_lst_parts[0][_key], (int, float)))
+
+    _results = IntegratedCircuit.calculate_217f_part_stress_array(_parts)
+
+    _lst_keys = ['C1', 'C2', 'piT', 'piL', 'piQ', 'piE', 'hazard_rate_active']
+    if subcategory_id == 6:
+        _lst_keys.append('lambda_cyc')
+    elif subcategory_id == 9:
+        _lst_keys.append('piA')
+    elif subcategory_id == 10:
+        _lst_keys.extend(['piCD', 'piPT', 'lambdaBP', 'lambdaEOS'])
+    for _idx, _part in enumerate(_lst_parts):
+        _attributes, _msg = IntegratedCircuit.calculate_217f_part_stress(
+            **_part)
+        for _key in _lst_keys:
+            assert _results[_key][_idx] == pytest.approx(_attributes[_key])
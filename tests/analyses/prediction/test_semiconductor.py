@@ -420,3 +420,52 @@ def test_voltage_overstress_mild_environment(power_rated,
         assert _attributes['overstress']
         assert _attributes['reason'] == ('1. Operating power > 90% rated '
                                          'power in mild environment.\n')
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize("subcategory_id",
+                         [1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13])
+def test_calculate_217f_part_stress_array(subcategory_id):
+    """calculate_217f_part_stress_array() should return the same hazard rates and factors as calculate_217f_part_stress()."""
+    _lst_parts = []
+    for _type_id in [1, 2]:
+        for _environment_id in range(1, 15):
+            for _voltage_ratio in [0.2, 0.6]:
+                _lst_parts.append(
+                    dict(
+                        ATTRIBUTES,
+                        subcategory_id=subcategory_id,
+                        type_id=_type_id,
+                        application_id=_type_id,
+                        environment_active_id=_environment_id,
+                        quality_id=1 + _environment_id % 3,
+                        package_id=_environment_id,
+                        temperature_case=(_voltage_ratio - 0.2) * 100.0,
+                        theta_jc=0.0,
+                        power_operating=0.05 * _environment_id,
+                        frequency_operating=_environment_id,
+                        n_elements=8,
+                        voltage_ratio=_voltage_ratio,
+                        duty_cycle=50.0,
+                        matching_id=_type_id,
+                        power_rated=0.5 * _type_id,
+                        current_rated=0.25,
+                        construction_id=_type_id,
+                        current_operating=0.1,
+                        power_ratio=0.4))
+
+    _parts = dict((_key, [_part[_key] for _part in _lst_parts])
+                  for _key in _lst_parts[0]
+                  if isinstance(_lst_parts[0][_key], (int, float)))
+
+    _results = Semiconductor.calculate_217f_part_stress_array(_parts)
+
+    _lst_keys = [
+        'lambda_b', 'piT', 'piQ', 'piE', 'temperature_junction',
+        'hazard_rate_active'
+    ]
+    for _idx, _part in enumerate(_lst_parts):
+        _attributes, _msg = Semiconductor.calculate_217f_part_stress(**_part)
+        for _key in _lst_keys:
+            assert _results[_key][_idx] == pytest.approx(_attributes[_key])
@@ -0,0 +1,104 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.analyses.test_equation.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Test class for the user-defined equation module."""
+
+import pytest
+
+from rtk.analyses import Equation
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+NAMESPACE = {'uf1': 4.4, 'uf2': 6.0, 'ui1': 2, 'ui2': 3}
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_do_compile_cached():
+    """do_compile() should compile an equation once and return it from the cache after that."""
+    _code, _names, _error = Equation.do_compile('(uf1 + ui1) / uf2')
+
+    assert _error is None
+    assert _names == frozenset(['uf1', 'ui1', 'uf2'])
+    assert Equation.do_compile('(uf1 + ui1) / uf2')[0] is _code
+    assert Equation.do_compile('(uf1 + ui1) / uf2 ')[0] is not _code
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_do_evaluate():
+    """do_evaluate() should return the value of the equation."""
+    assert Equation.do_evaluate('(uf1 + ui1) / uf2',
+                                NAMESPACE) == pytest.approx(1.06666667)
+    assert Equation.do_evaluate('ui2 / ui1', NAMESPACE) == 1
+    assert Equation.do_evaluate('uf1 if ui1 > ui2 else -uf2',
+                                NAMESPACE) == -6.0
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('equation', [
+    '', '(uf1 + ', 'uf1.real', '__import__("os")', 'uf9 * 2', '"uf1"',
+    '[uf1][0]', 'lambda: uf1', None
+])
+def test_do_evaluate_invalid(equation):
+    """do_evaluate() should raise a SyntaxError for empty, invalid, or unsafe equations and unknown variables."""
+    with pytest.raises(SyntaxError):
+        Equation.do_evaluate(equation, NAMESPACE)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_do_evaluate_runtime_error():
+    """do_evaluate() should raise errors encountered evaluating a valid equation."""
+    with pytest.raises(ZeroDivisionError):
+        Equation.do_evaluate('uf1 / (ui1 - 2)', NAMESPACE)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('equation', [
+    '(uf1 + ui1) / uf2', 'ui1 / ui2 + ui2 % 3', 'uf1 ** 2 - 3 * uf2',
+    'uf1 if ui1 > 0 else uf2', 'ui1 > 1 and uf1 or uf2', '-ui1 / 2'
+])
+def test_do_evaluate_array(equation):
+    """do_evaluate_array() should return the same results as do_evaluate() for each record."""
+    _namespace = {
+        'uf1': [4.4, 0.5, -1.25, 3.0],
+        'uf2': 6.0,
+        'ui1': [2, -3, 0, 7],
+        'ui2': [3, 2, 5, -4]
+    }
+    _records = [
+        dict((_key, _value[_idx] if isinstance(_value, list) else _value)
+             for _key, _value in _namespace.items()) for _idx in range(4)
+    ]
+
+    _results = Equation.do_evaluate_array(equation, _namespace, 4)
+
+    assert _results == [
+        Equation.do_evaluate(equation, _record) for _record in _records
+    ]
+    assert [type(_result) for _result in _results] == [
+        type(Equation.do_evaluate(equation, _record)) for _record in _records
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_do_evaluate_array_runtime_error():
+    """do_evaluate_array() should raise the same errors as do_evaluate()."""
+    with pytest.raises(ZeroDivisionError):
+        Equation.do_evaluate_array('uf1 / ui1', {
+            'uf1': [1.0, 2.0],
+            'ui1': [1, 0]
+        }, 2)
+    with pytest.raises(SyntaxError):
+        Equation.do_evaluate_array('', {'uf1': [1.0, 2.0]}, 2)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_allocation.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for allocating the reliability goals down an entire hardware tree.
+
+Invocation:
+
+    python tests/benchmarks/bench_allocation.py [N1 N2 ...]
+
+where N1, N2, ... are the number of children of each assembly in synthetic
+four level hardware trees.  The levels cycle through the equal, AGREE, ARINC,
+and feasibility of objectives methods.  For each size the wall time of walking
+the tree and calling AllocationDataModel.calculate() for each assembly (the
+way a whole tree was allocated before calculate_all()) and of
+AllocationDataModel.calculate_all() are reported.  The allocations of the two
+are checked for equality.
+"""
+
+import copy
+
+import numpy as np
+
+from rtk.dao import RTKAllocation
+from rtk.modules.allocation import dtmAllocation
+
+from benchmark import do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+CHILD_COUNTS = [5, 10, 20]
+LEVELS = 4
+
+
+def _do_build_tree(n_children):
+    """Build a synthetic allocation tree with n_children per assembly."""
+    _model = dtmAllocation(None)
+
+    _hazard_rates = {}
+    _level = [0]
+    _hardware_id = 1
+    for _depth in range(LEVELS):
+        _next = []
+        for _parent_id in _level:
+            for __ in range(1 if _parent_id == 0 else n_children):
+                _allocation = RTKAllocation(
+                    revision_id=1,
+                    hardware_id=_hardware_id,
+                    parent_id=_parent_id,
+                    method_id=1 + _depth % 4,
+                    goal_measure_id=2,
+                    hazard_rate_goal=0.0001,
+                    reliability_goal=1.0,
+                    mtbf_goal=0.0,
+                    included=1,
+                    mission_time=100.0,
+                    duty_cycle=90.0 + _hardware_id % 10,
+                    n_sub_elements=1 + _hardware_id % 3,
+                    weight_factor=0.5 + 0.1 * (_hardware_id % 5),
+                    int_factor=1 + _hardware_id % 10,
+                    soa_factor=1 + _hardware_id % 7,
+                    op_time_factor=1 + _hardware_id % 5,
+                    env_factor=1 + _hardware_id % 3,
+                    n_sub_systems=1,
+                    percent_weight_factor=0.0,
+                    reliability_alloc=0.0,
+                    hazard_rate_alloc=0.0,
+                    mtbf_alloc=0.0)
+                _model.tree.create_node(
+                    'Allocation ID: {0:d}'.format(_hardware_id),
+                    _hardware_id,
+                    parent=_parent_id,
+                    data=_allocation)
+                _hazard_rates[_hardware_id] = 1.0E-5 * (1 + _hardware_id % 13)
+                _next.append(_hardware_id)
+                _hardware_id += 1
+        _level = _next
+
+    return _model, _hazard_rates
+
+
+def _do_calculate_walk(model, hazard_rates):
+    """Allocate the tree one assembly at a time from the top down."""
+    _level = [1]
+    while _level:
+        _next = []
+        for _node_id in _level:
+            _children = model.select_children(_node_id)
+            if not _children:
+                continue
+            model.calculate(_node_id, [hazard_rates[_node_id]] + [
+                hazard_rates[_child.identifier] for _child in _children
+            ])
+            for _child in _children:
+                _child.data.hazard_rate_goal = _child.data.hazard_rate_alloc
+                _next.append(_child.identifier)
+        _level = _next
+
+
+def _do_get_results(model):
+    """Return the array of allocated values sorted by Hardware ID."""
+    return np.array(
+        sorted((_node.identifier, _node.data.reliability_alloc,
+                _node.data.hazard_rate_alloc, _node.data.mtbf_alloc)
+               for _node in model.tree.all_nodes() if _node.data is not None))
+
+
+def main(child_counts):
+    """Run the benchmark for each of the child counts."""
+    print('{0:>8s} {1:>8s} {2:>10s} {3:>18s} {4:>8s} {5:>6s}'.format(
+        'children', 'nodes', 'walk (s)', 'calculate_all (s)', 'speedup',
+        'equal'))
+
+    for _n_children in child_counts:
+        _walk, _hazard_rates = _do_build_tree(_n_children)
+        _all = copy.deepcopy(_walk)
+
+        _t_old, __ = do_time(_do_calculate_walk, _walk, _hazard_rates)
+        _t_new, __ = do_time(_all.calculate_all, _hazard_rates)
+        _equal = np.allclose(_do_get_results(_walk), _do_get_results(_all))
+
+        print('{0:>8d} {1:>8d} {2:>10.3f} {3:>18.3f} {4:>7.1f}x {5:>6s}'.
+              format(_n_children, len(_all.tree.nodes) - 1, _t_old, _t_new,
+                     _t_old / max(_t_new, 1E-9), str(_equal)))
+
+
+if __name__ == '__main__':
+    do_run(main, CHILD_COUNTS)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_allocation_feasibility.py is part of The RTK
+#       Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the Monte Carlo allocation feasibility analysis.
+
+Invocation:
+
+    python tests/benchmarks/bench_allocation_feasibility.py [N1 N2 ...]
+
+where N1, N2, ... are the number of children of the synthetic assemblies to
+analyze.  The assembly goal is allocated with the feasibility of objectives
+method.  The hazard rate and the four weighting factors of every child are
+sampled.  For each size the wall time of AllocationDataModel.calculate()
+for each trial (estimated from the first 100 trials), and of
+AllocationDataModel.calculate_feasibility() with one worker process and with
+one worker per CPU, for 10^5 and 10^6 trials are reported.  The
+probabilities for one worker and one worker per CPU are checked for equality.
+"""
+
+import multiprocessing
+
+import numpy as np
+
+from rtk.dao import RTKAllocation
+from rtk.modules.allocation import dtmAllocation
+
+from benchmark import do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+CHILD_COUNTS = [10, 100]
+TRIAL_COUNTS = [100000, 1000000]
+LOOP_TRIALS = 100
+SEED = 1
+
+
+def _do_build_assembly(n_children):
+    """Build a synthetic allocation with n_children children."""
+    _model = dtmAllocation(None)
+
+    _model.tree.create_node(
+        'Allocation ID: 1',
+        1,
+        parent=0,
+        data=RTKAllocation(
+            revision_id=1,
+            hardware_id=1,
+            parent_id=0,
+            method_id=4,
+            goal_measure_id=2,
+            hazard_rate_goal=0.0001 * n_children,
+            mission_time=100.0))
+
+    _hazard_rates = {1: 0.0001 * n_children}
+    _distributions = {}
+    for _hardware_id in range(2, n_children + 2):
+        _model.tree.create_node(
+            'Allocation ID: {0:d}'.format(_hardware_id),
+            _hardware_id,
+            parent=1,
+            data=RTKAllocation(
+                revision_id=1,
+                hardware_id=_hardware_id,
+                parent_id=1,
+                included=1,
+                mission_time=100.0,
+                duty_cycle=100.0,
+                n_sub_elements=1,
+                weight_factor=1,
+                int_factor=1 + _hardware_id % 5,
+                soa_factor=1 + _hardware_id % 3,
+                op_time_factor=1 + _hardware_id % 4,
+                env_factor=1 + _hardware_id % 2,
+                percent_weight_factor=0.0,
+                reliability_alloc=0.0,
+                hazard_rate_alloc=0.0,
+                mtbf_alloc=0.0))
+        _hazard_rate = 0.00005 * (1 + _hardware_id % 3)
+        _hazard_rates[_hardware_id] = _hazard_rate
+        _distributions[_hardware_id] = {
+            'hazard_rate': ('lognormal', (np.log(_hazard_rate), 0.5)),
+            'int_factor': ('triangular', (1.0, 1.0 + _hardware_id % 5, 6.0)),
+            'soa_factor': ('uniform', (1.0, 4.0)),
+            'op_time_factor': ('uniform', (1.0, 5.0)),
+            'env_factor': ('normal', (1.5, 0.25))
+        }
+
+    return _model, _hazard_rates, _distributions
+
+
+def _do_simulate_loop(model, distributions, n_trials):
+    """Simulate the trials one at a time with calculate()."""
+    _random_state = np.random.RandomState(SEED)
+    _children = [_node.data for _node in model.select_children(1)]
+    _n_met = np.zeros(len(_children))
+    for __ in range(n_trials):
+        _hazard_rates = []
+        for _child in _children:
+            _samples = {}
+            for _attribute in [
+                    'hazard_rate', 'int_factor', 'soa_factor',
+                    'op_time_factor', 'env_factor'
+            ]:
+                _distribution, _parameters = distributions[
+                    _child.hardware_id][_attribute]
+                _samples[_attribute] = max(
+                    0.0,
+                    getattr(_random_state, _distribution)(*_parameters))
+            _child.int_factor = _samples['int_factor']
+            _child.soa_factor = _samples['soa_factor']
+            _child.op_time_factor = _samples['op_time_factor']
+            _child.env_factor = _samples['env_factor']
+            _hazard_rates.append(_samples['hazard_rate'])
+        model.calculate(1)
+        _n_met += [
+            _hazard_rate <= _child.hazard_rate_alloc
+            for _hazard_rate, _child in zip(_hazard_rates, _children)
+        ]
+
+    return _n_met / n_trials
+
+
+def main(child_counts):
+    """Run the benchmark for each of the child counts."""
+    _n_cpus = multiprocessing.cpu_count()
+    print('{0:>8s} {1:>8s} {2:>14s} {3:>12s} {4:>16s} {5:>6s}'.format(
+        'children', 'trials', 'loop est (s)', '1 worker (s)',
+        '{0:d} workers (s)'.format(_n_cpus), 'equal'))
+
+    for _n_children in child_counts:
+        _model, _hazard_rates, _distributions = _do_build_assembly(_n_children)
+        _t_loop, __ = do_time(_do_simulate_loop, _model, _distributions,
+                              LOOP_TRIALS)
+        _t_loop = _t_loop / LOOP_TRIALS
+
+        for _n_trials in TRIAL_COUNTS:
+            _t_one, __ = do_time(
+                _model.calculate_feasibility,
+                1,
+                _hazard_rates,
+                _distributions,
+                n_trials=_n_trials,
+                seed=SEED)
+            _one = _model.goal_feasibility
+            _t_all, __ = do_time(
+                _model.calculate_feasibility,
+                1,
+                _hazard_rates,
+                _distributions,
+                n_trials=_n_trials,
+                seed=SEED,
+                n_workers=_n_cpus)
+            _equal = _one == _model.goal_feasibility
+
+            print('{0:>8d} {1:>8d} {2:>14.1f} {3:>12.3f} {4:>16.3f} {5:>6s}'.
+                  format(_n_children, _n_trials, _t_loop * _n_trials, _t_one,
+                         _t_all, str(_equal)))
+
+
+if __name__ == '__main__':
+    do_run(main, CHILD_COUNTS)
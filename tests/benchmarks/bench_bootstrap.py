@@ -0,0 +1,69 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_bootstrap.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the bootstrap confidence intervals of the survival
+distributions.
+
+Invocation:
+
+    python tests/benchmarks/bench_bootstrap.py [N1 N2 ...]
+
+where N1, N2, ... are the number of bootstrap data sets to fit.  Each data
+set has 50 records and is 30% right censored and 20% of the failures are
+interval censored.  For each count and distribution the wall time of
+Bootstrap.bootstrap() with one worker and with one worker per CPU is
+reported along with the BCa interval on the MTBF.  The replicates of the two
+are checked for equality.
+"""
+
+import multiprocessing
+
+import numpy as np
+
+from rtk.statistics.distributions.Bootstrap import bootstrap
+
+from benchmark import do_format, do_make_survival_data, do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+REPLICATE_COUNTS = [200, 1000]
+DISTRIBUTIONS = ['exponential', 'weibull', 'lognormal', 'gaussian']
+N_RECORDS = 50
+
+
+def main(replicate_counts):
+    """Run the benchmark for each of the replicate counts."""
+    _n_workers = multiprocessing.cpu_count()
+    print('{0:d} CPU(s)'.format(_n_workers))
+    print('{0:>10s} {1:>12s} {2:>10s} {3:>10s} {4:>22s} {5:>6s}'.format(
+        'replicates', 'distribution', '1 worker', 'n workers', 'MTBF BCa',
+        'equal'))
+
+    for _n_replicates in replicate_counts:
+        for _dist in DISTRIBUTIONS:
+            _data = do_make_survival_data(_dist, N_RECORDS)
+
+            _t_serial, _serial = do_time(bootstrap, _data, _dist,
+                                         _n_replicates, 0.9, 0.0, 0.0, 1, 1)
+            _t_pool, _pool = do_time(bootstrap, _data, _dist, _n_replicates,
+                                     0.9, 0.0, 0.0, 1, _n_workers)
+
+            print('{0:>10d} {1:>12s} {2:>10.3f} {3:>10.3f} {4:>22s} '
+                  '{5:>6s}'.format(
+                      _n_replicates, _dist, _t_serial, _t_pool,
+                      do_format(_serial['bca']['mtbf']),
+                      str(
+                          np.array_equal(_serial['replicates'],
+                                         _pool['replicates']))))
+
+
+if __name__ == '__main__':
+    do_run(main, REPLICATE_COUNTS)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_dao_add.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for adding records to the RTK Program database.
+
+Invocation:
+
+    python tests/benchmarks/bench_dao_add.py [N1 N2 ...]
+
+where N1, N2, ... are the number of hardware items to add.  Each hardware item
+is added as an RTKHardware record and its child RTKReliability record.  For
+each size the wall time of DAO.db_add() committing one item at a time and
+adding all the items in one transaction (bulk=True) is reported for records
+with their keys set and for records using autoincrement keys.
+"""
+
+from rtk.dao import DAO, RTKHardware, RTKReliability
+from rtk.dao.RTKProgramDB import create_program_db
+
+from benchmark import do_run, do_time, temporary_database
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+ITEM_COUNTS = [100, 1000, 5000]
+
+
+def _do_create_items(n_items, keyed):
+    """Create n_items RTKHardware records and their RTKReliability records."""
+    _items = []
+    for _idx in range(n_items):
+        if keyed:
+            _hardware_id = _idx + 2
+            _items.append(
+                RTKHardware(
+                    revision_id=1, hardware_id=_hardware_id, parent_id=1))
+            _items.append(RTKReliability(hardware_id=_hardware_id))
+        else:
+            _items.append(RTKHardware(revision_id=1, parent_id=1))
+
+    return _items
+
+
+def _do_add(n_items, keyed, bulk):
+    """Return the seconds to add n_items to a new RTK Program database."""
+    with temporary_database() as _path:
+        create_program_db(database='sqlite:///' + _path)
+        _dao = DAO()
+        _dao.db_connect('sqlite:///' + _path)
+        _session = _dao.RTK_SESSION(
+            bind=_dao.engine, autoflush=False, expire_on_commit=False)
+
+        _items = _do_create_items(n_items, keyed)
+        _elapsed, (_error_code, _msg) = do_time(_dao.db_add, _items,
+                                                _session, bulk=bulk)
+        assert _error_code == 0
+
+        _session.close()
+        _dao.db_close()
+
+    return _elapsed
+
+
+def main(item_counts):
+    """Run the benchmark for each of the item counts."""
+    print('{0:>8s} {1:>12s} {2:>14s} {3:>10s} {4:>8s}'.format(
+        'items', 'keys', 'per-item (s)', 'bulk (s)', 'speedup'))
+
+    for _n_items in item_counts:
+        for _keys, _keyed in [('set', True), ('autoinc', False)]:
+            _t_old = _do_add(_n_items, _keyed, False)
+            _t_new = _do_add(_n_items, _keyed, True)
+
+            print('{0:>8d} {1:>12s} {2:>14.3f} {3:>10.3f} {4:>7.1f}x'.format(
+                _n_items, _keys, _t_old, _t_new, _t_old / max(_t_new, 1E-9)))
+
+
+if __name__ == '__main__':
+    do_run(main, ITEM_COUNTS)
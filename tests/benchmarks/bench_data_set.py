@@ -0,0 +1,160 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_data_set.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for building the survival data sets.
+
+Invocation:
+
+    python tests/benchmarks/bench_data_set.py [N1 N2 ...]
+
+where N1, N2, ... are the number of survival records.  Each record has a
+quantity drawn from 1 to 19 observations, 30% of the records are right
+censored and 20% are interval censored.  For each size the wall time of the
+per-observation expansion format_data_set() and kaplan_meier() used before
+they were replaced is reported along with the wall time of
+format_data_set() and kaplan_meier() with the quantities kept as weights.
+The estimated total times on test and Kaplan-Meier curves are checked for
+equality.  A fleet of 1000 records of about 1000 observations each is timed
+with the new functions only.
+"""
+
+
+import numpy as np
+
+from rtk.statistics.distributions.Distributions import format_data_set
+from rtk.statistics.distributions.KaplanMeier import kaplan_meier
+
+from benchmark import do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+RECORD_COUNTS = [100, 1000]
+STATUSES = np.array([u'Event', u'Right Censored', u'Interval Censored'])
+
+
+def _do_make_records(n_records, max_quantity=20, seed=1):
+    """Create n_records synthetic survival records."""
+    _rng = np.random.RandomState(seed)
+    _right = np.round(1000.0 * _rng.weibull(1.7, n_records), 1)
+    _status = STATUSES[_rng.choice(3, n_records, p=[0.5, 0.3, 0.2])]
+    _left = np.where(_status == STATUSES[2], np.round(0.8 * _right, 1), _right)
+    _quantity = _rng.randint(1, max_quantity, n_records)
+
+    return [(_idx, _left[_idx], _right[_idx], 0.0, _status[_idx],
+             _quantity[_idx], 719163) for _idx in range(n_records)]
+
+
+def _do_format_old(data, start, end):
+    """Format the data set with one row per observation."""
+    _data = sorted(data, key=lambda x: float(x[2]))
+    _data = [_rec for _rec in _data if float(_rec[1]) >= start]
+    if end > 0.0:
+        _data = [_rec for _rec in _data if float(_rec[2]) <= end]
+
+    _data2 = []
+    for __, _record in enumerate(_data):
+        for __ in range(int(_record[5])):
+            _data2.append((_record[0], _record[1], _record[2], _record[3],
+                           _record[4], 1))
+    _data = np.array(_data2)
+
+    for _record in _data:
+        if _record[4] == 'Right Censored' or str(_record[4]) == '2':
+            _record[2] = np.inf
+            _record[4] = 2
+        elif (_record[4] == 'Left Censored'
+              or _record[4] == 'Interval Censored' or str(_record[4]) == '3'):
+            _record[4] = 3
+        else:
+            _record[4] = 1
+
+    _data = np.vstack((_data[:, 1], _data[:, 2], _data[:, 5], _data[:, 4],
+                       _data[:, 3]))
+
+    return np.array(np.transpose(_data), dtype=float)
+
+
+def _do_km_old(data, start, end):
+    """Expand the Kaplan-Meier data set by stacking a row per observation."""
+    _data = sorted(data, key=lambda x: (float(x[2]), float(x[1])))
+    _data = [_rec for _rec in _data if float(_rec[1]) >= start]
+    _data = [_rec for _rec in _data if float(_rec[2]) <= end]
+    _data = np.array(_data, dtype=object)
+
+    for _record in _data:
+        if _record[4] == 'Right Censored' or _record[4] == '2':
+            _record[4] = 0
+        elif (_record[4] == 'Left Censored'
+              or _record[4] == 'Interval Censored' or _record[4] == '3'):
+            _record[4] = 3
+        else:
+            _record[4] = 1
+
+    _data = np.vstack((_data[:, 1], _data[:, 2], _data[:, 5], _data[:, 4]))
+    _data = np.array(np.transpose(_data), dtype=float)
+
+    for _row in _data:
+        if _row[2] > 1:
+            for __ in range(int(_row[2]) - 1):
+                _data = np.vstack((_data, _row))
+
+    _interval = _data[:, 3] == 3
+    _data[_interval, 1] = (_data[_interval, 0] + _data[_interval, 1]) / 2.0
+    _data[_interval, 3] = 1
+
+    # The product-limit estimate of the expanded data set.
+    _times = np.unique(_data[:, 1])
+    _survival = np.cumprod([
+        1.0 - np.sum(_data[_data[:, 1] == _time, 3]) /
+        np.sum(_data[:, 1] >= _time) for _time in _times
+    ])
+
+    return np.column_stack((_times, _survival))
+
+
+def _do_ttt(data):
+    """Return the total time on test of a formatted data set."""
+    _times = np.where(np.isinf(data[:, 1]), data[:, 0], data[:, 1])
+
+    return np.sum(data[:, 2] * _times)
+
+
+def main(record_counts):
+    """Run the benchmark for each of the record counts."""
+    print('{0:>8s} {1:>12s} {2:>12s} {3:>12s} {4:>12s} {5:>12s} '
+          '{6:>6s}'.format('records', 'observations', 'old format',
+                           'new format', 'old KM', 'new KM', 'equal'))
+
+    for _n_records in record_counts:
+        _data = _do_make_records(_n_records)
+        _n_obs = sum(_record[5] for _record in _data)
+
+        _t_old, _old = do_time(_do_format_old, _data, 0.0, 0.0)
+        _t_new, _new = do_time(format_data_set, _data, 0.0, 0.0)
+        _t_km_old, _km_old = do_time(_do_km_old, _data, 0.0, 1.0E9)
+        _t_km_new, _km_new = do_time(kaplan_meier, _data, 0.0, 1.0E9)
+
+        _equal = (np.isclose(_do_ttt(_old), _do_ttt(_new[0]))
+                  and np.allclose(_km_old, _km_new[0][:, [0, 2]]))
+        print('{0:>8d} {1:>12d} {2:>12.4f} {3:>12.4f} {4:>12.4f} {5:>12.4f} '
+              '{6:>6s}'.format(_n_records, _n_obs, _t_old, _t_new, _t_km_old,
+                               _t_km_new, str(_equal)))
+
+    _data = _do_make_records(1000, 2000)
+    _n_obs = sum(_record[5] for _record in _data)
+    _t_new, __ = do_time(format_data_set, _data, 0.0, 0.0)
+    _t_km_new, __ = do_time(kaplan_meier, _data, 0.0, 1.0E9)
+    print('{0:>8d} {1:>12d} {2:>12s} {3:>12.4f} {4:>12s} {5:>12.4f}'.format(
+        1000, _n_obs, '', _t_new, '', _t_km_new))
+
+
+if __name__ == '__main__':
+    do_run(main, RECORD_COUNTS)
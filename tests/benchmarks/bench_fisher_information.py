@@ -0,0 +1,90 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_fisher_information.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the information matrix of the survival distributions.
+
+Invocation:
+
+    python tests/benchmarks/bench_fisher_information.py [N1 N2 ...]
+
+where N1, N2, ... are the number of records in the synthetic field data sets.
+Each data set is 30% right censored and 20% of the failures are interval
+censored.  For each size and distribution the wall time of the per-point
+numerical fisher_information() as it was written before it was vectorized,
+the vectorized fisher_information(), and the closed form
+MLE.observed_information() are reported.  The two numerical information
+matrices are checked for equality.
+"""
+
+import inspect
+
+import numpy as np
+import scipy.misc as misc
+
+from rtk.statistics.distributions import MLE
+from rtk.statistics.distributions.Distributions import Exponential, \
+    Gaussian, LogNormal, Weibull, fisher_information
+
+from benchmark import do_make_survival_data, do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+RECORD_COUNTS = [1000, 10000, 100000]
+DISTRIBUTIONS = [('exponential', Exponential, [0.002, 0.0]),
+                 ('weibull', Weibull, [1000.0, 1.7]),
+                 ('lognormal', LogNormal, [6.0, 0.8]),
+                 ('gaussian', Gaussian, [500.0, 80.0])]
+
+
+def _do_fisher_per_point(model, p0, X):
+    """Calculate the information with one derivative per point."""
+    _labels = inspect.getargspec(model)[0][2:]
+    _p0dict = dict(zip(_labels, p0))
+
+    _D = np.zeros((len(p0), X.size))
+
+    for i, argname in enumerate(_labels):
+        _D[i, :] = [
+            misc.derivative(
+                lambda p: model(x, **dict(_p0dict, **{argname: p})),
+                _p0dict[argname],
+                dx=1.0e-6) for x in X
+        ]
+
+    return np.einsum('mk, nk', _D, _D)
+
+
+def main(record_counts):
+    """Run the benchmark for each of the record counts."""
+    print('{0:>8s} {1:>12s} {2:>12s} {3:>12s} {4:>12s} {5:>6s}'.format(
+        'records', 'distribution', 'per-point', 'vectorized', 'closed form',
+        'equal'))
+
+    for _n_records in record_counts:
+        for _dist, _distribution, _params in DISTRIBUTIONS:
+            _data = do_make_survival_data(_dist, _n_records)
+            _model = _distribution().log_pdf
+
+            _t_old, _old = do_time(_do_fisher_per_point, _model, _params,
+                                   _data[:, 1])
+            _t_vec, _vec = do_time(fisher_information, _model, _params,
+                                   _data[:, 1])
+            _t_new, __ = do_time(
+                MLE.observed_information, MLE.partition_data(_data),
+                _params[:len(MLE.DISTRIBUTIONS[_dist][1])], _dist)
+
+            print('{0:>8d} {1:>12s} {2:>12.4f} {3:>12.4f} {4:>12.4f} '
+                  '{5:>6s}'.format(_n_records, _dist, _t_old, _t_vec, _t_new,
+                                   str(np.allclose(_old, _vec))))
+
+
+if __name__ == '__main__':
+    do_run(main, RECORD_COUNTS)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_fmea_calculate.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the FMEA RPN and criticality calculations.
+
+Invocation:
+
+    python tests/benchmarks/bench_fmea_calculate.py [N1 N2 ...]
+
+where N1, N2, ... are the number of failure modes in the synthetic hardware
+FMEAs to calculate.  Each mode has two mechanisms, each mechanism has two
+causes, and each cause has one control and one action.  For each size the wall
+time of the per-node calculations (one subtree() and one calculate_rpn() or
+calculate_criticality() call per entity) and the array calculations used by
+FMEADataModel.calculate_rpn() and calculate_criticality() are reported.  The
+results of the two are checked for equality.
+"""
+
+import copy
+
+from rtk.dao import RTKAction, RTKCause, RTKControl, RTKMechanism, RTKMode
+from rtk.modules.fmea import dtmFMEA
+
+from benchmark import do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+MODE_COUNTS = [1000, 10000]
+ITEM_HR = 0.00001
+
+
+def _do_build_fmea(n_modes):
+    """Build a synthetic hardware FMEA data model with n_modes modes."""
+    _model = dtmFMEA(None)
+
+    _mechanism_id = 1
+    _cause_id = 1
+    for _mode_id in range(1, n_modes + 1):
+        _mode = RTKMode(
+            mode_id=_mode_id,
+            rpn_severity=1 + _mode_id % 10,
+            rpn_severity_new=1 + _mode_id % 5,
+            mode_ratio=0.1 * (_mode_id % 10),
+            mode_op_time=10.0 * (1 + _mode_id % 3),
+            effect_probability=0.5,
+            severity_class='Class {0:d}'.format(1 + _mode_id % 4))
+        _mode_node = '0.' + str(_mode_id)
+        _model.tree.create_node('Mode', _mode_node, parent=0, data=_mode)
+        for _idx in range(2):
+            _mechanism = RTKMechanism(
+                mechanism_id=_mechanism_id,
+                rpn_occurrence=1 + _mechanism_id % 10,
+                rpn_detection=1 + _mechanism_id % 7,
+                rpn_occurrence_new=1 + _mechanism_id % 3,
+                rpn_detection_new=1 + _mechanism_id % 4)
+            _mechanism_node = _mode_node + '.' + str(_mechanism_id)
+            _model.tree.create_node(
+                'Mechanism', _mechanism_node, parent=_mode_node,
+                data=_mechanism)
+            for _jdx in range(2):
+                _cause = RTKCause(
+                    cause_id=_cause_id,
+                    rpn_occurrence=1 + _cause_id % 10,
+                    rpn_detection=1 + _cause_id % 9,
+                    rpn_occurrence_new=1 + _cause_id % 2,
+                    rpn_detection_new=1 + _cause_id % 6)
+                _cause_node = _mechanism_node + '.' + str(_cause_id)
+                _model.tree.create_node(
+                    'Cause', _cause_node, parent=_mechanism_node, data=_cause)
+                _model.tree.create_node(
+                    'Control',
+                    _cause_node + '.' + str(_cause_id) + 'c',
+                    parent=_cause_node,
+                    data=RTKControl(control_id=_cause_id))
+                _model.tree.create_node(
+                    'Action',
+                    _cause_node + '.' + str(_cause_id) + 'a',
+                    parent=_cause_node,
+                    data=RTKAction(action_id=_cause_id))
+                _cause_id += 1
+            _mechanism_id += 1
+
+    return _model
+
+
+def _do_calculate_per_node(model):
+    """Calculate the FMEA the way it was calculated before the arrays."""
+    for _node in model.tree.children(0):
+        for _child in model.tree.subtree(_node.identifier).all_nodes():
+            try:
+                _child.data.calculate_rpn(_node.data.rpn_severity,
+                                          _node.data.rpn_severity_new)
+            except AttributeError:
+                pass
+
+    model.item_criticality = {}
+    for _node in model.tree.children(0):
+        _node.data.calculate_criticality(ITEM_HR)
+        try:
+            model.item_criticality[
+                _node.data.severity_class] += _node.data.mode_criticality
+        except KeyError:
+            model.item_criticality[
+                _node.data.severity_class] = _node.data.mode_criticality
+
+
+def _do_calculate_arrays(model):
+    """Calculate the FMEA with the FMEADataModel array calculations."""
+    assert model.calculate_rpn()[0] == 0
+    assert model.calculate_criticality(ITEM_HR)[0] == 0
+
+
+def _do_get_results(model):
+    """Return the calculated results of each node in the FMEA."""
+    _results = []
+    for _node in model.tree.all_nodes():
+        _data = _node.data
+        if _data is None:
+            continue
+        if _data.is_mode:
+            _results.append((_node.identifier, _data.mode_hazard_rate,
+                             _data.mode_criticality))
+        elif _data.is_mechanism or _data.is_cause:
+            _results.append((_node.identifier, _data.rpn, _data.rpn_new))
+
+    return sorted(_results), model.item_criticality
+
+
+def main(mode_counts):
+    """Run the benchmark for each of the mode counts."""
+    print('{0:>8s} {1:>8s} {2:>14s} {3:>10s} {4:>8s} {5:>6s}'.format(
+        'modes', 'nodes', 'per-node (s)', 'array (s)', 'speedup', 'equal'))
+
+    for _n_modes in mode_counts:
+        _per_node = _do_build_fmea(_n_modes)
+        _arrays = copy.deepcopy(_per_node)
+
+        _t_old, __ = do_time(_do_calculate_per_node, _per_node)
+        _t_new, __ = do_time(_do_calculate_arrays, _arrays)
+        _equal = _do_get_results(_per_node) == _do_get_results(_arrays)
+
+        print('{0:>8d} {1:>8d} {2:>14.3f} {3:>10.3f} {4:>7.1f}x {5:>6s}'.
+              format(_n_modes, len(_arrays.tree.nodes), _t_old, _t_new,
+                     _t_old / max(_t_new, 1E-9), str(_equal)))
+
+
+if __name__ == '__main__':
+    do_run(main, MODE_COUNTS)
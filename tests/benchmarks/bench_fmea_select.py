@@ -0,0 +1,177 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_fmea_select.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for loading a hardware FMEA from the RTK Program database.
+
+Invocation:
+
+    python tests/benchmarks/bench_fmea_select.py [N1 N2 ...]
+
+where N1, N2, ... are the number of failure modes in the synthetic hardware
+FMEAs to load.  Each mode has two mechanisms, each mechanism has two causes,
+and each cause has one control and one action.  For each size the number of
+SQL statements issued and the wall time of the per-parent loader (one query
+per mode, mechanism, and cause) and FMEADataModel.do_select_all() are
+reported.  The two trees are checked for equality.
+"""
+
+from rtk.dao import (DAO, RTKAction, RTKCause, RTKControl, RTKMechanism,
+                     RTKMode)
+from rtk.dao.RTKProgramDB import create_program_db
+from rtk.modules.fmea import dtmFMEA
+
+from benchmark import (do_count_statements, do_get_structure, do_run,
+                       temporary_database)
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+MODE_COUNTS = [100, 500, 1000]
+HARDWARE_ID = 100
+
+
+def _do_create_fmea(uri, n_modes):
+    """Create an RTK Program database with a synthetic FMEA of n_modes."""
+    create_program_db(database=uri)
+
+    _dao = DAO()
+    _dao.db_connect(uri)
+    _session = _dao.RTK_SESSION(
+        bind=_dao.engine, autoflush=False, expire_on_commit=False)
+
+    _mechanism_id = 1
+    _cause_id = 1
+    for _mode_id in range(1, n_modes + 1):
+        _session.add(
+            RTKMode(
+                mode_id=_mode_id,
+                hardware_id=HARDWARE_ID,
+                function_id=-1,
+                description='Mode {0:d}'.format(_mode_id)))
+        for _idx in range(2):
+            _session.add(
+                RTKMechanism(
+                    mechanism_id=_mechanism_id,
+                    mode_id=_mode_id,
+                    description='Mechanism {0:d}'.format(_mechanism_id)))
+            for _jdx in range(2):
+                _session.add(
+                    RTKCause(
+                        cause_id=_cause_id,
+                        mode_id=-1,
+                        mechanism_id=_mechanism_id,
+                        description='Cause {0:d}'.format(_cause_id)))
+                _session.add(
+                    RTKControl(
+                        control_id=_cause_id,
+                        cause_id=_cause_id,
+                        description='Control {0:d}'.format(_cause_id)))
+                _session.add(
+                    RTKAction(
+                        action_id=_cause_id,
+                        cause_id=_cause_id,
+                        action_category='Action {0:d}'.format(_cause_id)))
+                _cause_id += 1
+            _mechanism_id += 1
+    _session.commit()
+    _session.close()
+
+    return _dao
+
+
+def _do_load_per_parent(dao):
+    """Load the FMEA the way it was loaded before the level-batched loader."""
+    _model = dtmFMEA(dao)
+    _model._functional = False
+
+    _modes = _model.dtm_mode.do_select_all(
+        parent_id=HARDWARE_ID, functional=False).nodes
+    for _key in _modes:
+        _mode = _modes[_key].data
+        if _mode is None:
+            continue
+        _mode_node = '0.' + str(_mode.mode_id)
+        _model.tree.create_node(
+            _mode.description, _mode_node, parent=0, data=_mode)
+        _mechanisms = _model.dtm_mechanism.do_select_all(
+            parent_id=_mode.mode_id).nodes
+        for _key in _mechanisms:
+            _mechanism = _mechanisms[_key].data
+            if _mechanism is None:
+                continue
+            _mechanism_node = _mode_node + '.' + str(_mechanism.mechanism_id)
+            _model.tree.create_node(
+                _mechanism.description,
+                _mechanism_node,
+                parent=_mode_node,
+                data=_mechanism)
+            _causes = _model.dtm_cause.do_select_all(
+                parent_id=_mechanism.mechanism_id, functional=False).nodes
+            for _key in _causes:
+                _cause = _causes[_key].data
+                if _cause is None:
+                    continue
+                _cause_node = _mechanism_node + '.' + str(_cause.cause_id)
+                _model.tree.create_node(
+                    _cause.description,
+                    _cause_node,
+                    parent=_mechanism_node,
+                    data=_cause)
+                _controls = _model.dtm_control.do_select_all(
+                    parent_id=_cause.cause_id).nodes
+                for _key in _controls:
+                    _control = _controls[_key].data
+                    if _control is not None:
+                        _model.tree.create_node(
+                            _control.description,
+                            _cause_node + '.' + str(_control.control_id) + 'c',
+                            parent=_cause_node,
+                            data=_control)
+                _actions = _model.dtm_action.do_select_all(
+                    parent_id=_cause.cause_id).nodes
+                for _key in _actions:
+                    _action = _actions[_key].data
+                    if _action is not None:
+                        _model.tree.create_node(
+                            _action.action_category,
+                            _cause_node + '.' + str(_action.action_id) + 'a',
+                            parent=_cause_node,
+                            data=_action)
+
+    return _model.tree
+
+
+def _do_load_batched(dao):
+    """Load the FMEA with FMEADataModel.do_select_all()."""
+    return dtmFMEA(dao).do_select_all(parent_id=HARDWARE_ID, functional=False)
+
+
+def main(mode_counts):
+    """Run the benchmark for each of the mode counts."""
+    print('{0:>8s} {1:>8s} {2:>12s} {3:>10s} {4:>12s} {5:>10s} {6:>6s}'.format(
+        'modes', 'nodes', 'per-parent', 'time (s)', 'batched', 'time (s)',
+        'equal'))
+
+    for _n_modes in mode_counts:
+        with temporary_database() as _path:
+            _dao = _do_create_fmea('sqlite:///' + _path, _n_modes)
+            _n_old, _t_old, _old = do_count_statements(_dao,
+                                                       _do_load_per_parent)
+            _n_new, _t_new, _new = do_count_statements(_dao, _do_load_batched)
+            _equal = do_get_structure(_old) == do_get_structure(_new)
+            _dao.db_close()
+
+        print('{0:>8d} {1:>8d} {2:>12d} {3:>10.3f} {4:>12d} {5:>10.3f} '
+              '{6:>6s}'.format(_n_modes, len(_new.nodes), _n_old, _t_old,
+                               _n_new, _t_new, str(_equal)))
+
+
+if __name__ == '__main__':
+    do_run(main, MODE_COUNTS)
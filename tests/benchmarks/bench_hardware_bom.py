@@ -0,0 +1,130 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_hardware_bom.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for loading the Hardware BoM from the RTK Program database.
+
+Invocation:
+
+    python tests/benchmarks/bench_hardware_bom.py [N1 N2 ...]
+
+where N1, N2, ... are the number of parts in the synthetic BoMs to load.  For
+each BoM size the number of SQL statements issued and the wall time of the
+per-item loader (one query per table per hardware item) and the bulk loader
+used by HardwareBoMDataModel.select_all() are reported.
+"""
+
+from rtk.dao import (DAO, RTKDesignElectric, RTKDesignMechanic, RTKHardware,
+                     RTKMilHdbkF, RTKNSWC, RTKReliability)
+from rtk.dao.RTKProgramDB import create_program_db
+from rtk.modules.hardware import dtmHardwareBoM
+
+from benchmark import do_count_statements, do_run, temporary_database
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+BOM_SIZES = [100, 1000, 5000]
+
+
+def _do_create_bom(uri, n_parts, n_assemblies=10):
+    """Create an RTK Program database with a synthetic BoM of n_parts."""
+    create_program_db(database=uri)
+
+    _dao = DAO()
+    _dao.db_connect(uri)
+    _session = _dao.RTK_SESSION(
+        bind=_dao.engine, autoflush=False, expire_on_commit=False)
+
+    _hardware_id = 2
+    _assemblies = []
+    for _idx in range(n_assemblies):
+        _assemblies.append(_hardware_id)
+        _session.add(
+            RTKHardware(
+                hardware_id=_hardware_id,
+                revision_id=1,
+                parent_id=1,
+                part=0,
+                ref_des='A{0:d}'.format(_idx)))
+        _hardware_id += 1
+    for _idx in range(n_parts):
+        _session.add(
+            RTKHardware(
+                hardware_id=_hardware_id,
+                revision_id=1,
+                parent_id=_assemblies[_idx % n_assemblies],
+                part=1,
+                ref_des='P{0:d}'.format(_idx)))
+        _hardware_id += 1
+    _session.flush()
+
+    for _id in range(2, _hardware_id):
+        for _table in [
+                RTKDesignElectric, RTKDesignMechanic, RTKMilHdbkF, RTKNSWC,
+                RTKReliability
+        ]:
+            _session.add(_table(hardware_id=_id))
+    _session.commit()
+    _session.close()
+
+    return _dao
+
+
+def _do_load_per_item(dao):
+    """Load the BoM the way it was loaded before the bulk loader."""
+    _model = dtmHardwareBoM(dao)
+    _tree = _model.dtm_hardware.select_all(1)
+    for _node in _tree.all_nodes()[1:]:
+        _hardware_id = _node.data.hardware_id
+        _data = _node.data.get_attributes()
+        for _dtm in [
+                _model.dtm_design_electric, _model.dtm_design_mechanic,
+                _model.dtm_mil_hdbk_f, _model.dtm_nswc,
+                _model.dtm_reliability
+        ]:
+            _data.update(
+                _dtm.select_all(_hardware_id).nodes[_hardware_id].data.
+                get_attributes())
+        _model.tree.create_node(
+            _node.data.comp_ref_des,
+            _hardware_id,
+            parent=_node.data.parent_id,
+            data=_data)
+
+    return _model.tree
+
+
+def _do_load_bulk(dao):
+    """Load the BoM with HardwareBoMDataModel.select_all()."""
+    return dtmHardwareBoM(dao).select_all(1)
+
+
+def main(bom_sizes):
+    """Run the benchmark for each of the BoM sizes."""
+    print('{0:>8s} {1:>12s} {2:>10s} {3:>12s} {4:>10s} {5:>8s}'.format(
+        'parts', 'per-item SQL', 'time (s)', 'bulk SQL', 'time (s)',
+        'speedup'))
+
+    for _n_parts in bom_sizes:
+        with temporary_database() as _path:
+            _dao = _do_create_bom('sqlite:///' + _path, _n_parts)
+            _n_old, _t_old, _old = do_count_statements(_dao,
+                                                       _do_load_per_item)
+            _n_new, _t_new, _new = do_count_statements(_dao, _do_load_bulk)
+            assert len(_old.nodes) == len(_new.nodes)
+            _dao.db_close()
+
+        print('{0:>8d} {1:>12d} {2:>10.3f} {3:>12d} {4:>10.3f} {5:>7.1f}x'.
+              format(_n_parts, _n_old, _t_old, _n_new, _t_new,
+                     _t_old / max(_t_new, 1E-9)))
+
+
+if __name__ == '__main__':
+    do_run(main, BOM_SIZES)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_hardware_rollup.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the Hardware BoM roll-up calculations.
+
+Invocation:
+
+    python tests/benchmarks/bench_hardware_rollup.py [N1 N2 ...]
+
+where N1, N2, ... are the number of nodes in the synthetic hardware trees.
+For each size a wide tree (ten child assemblies and ten parts per assembly)
+and a deep tree (one long chain of assemblies) are calculated with the
+recursive roll-up used before HardwareBoMDataModel.calculate_all() was made
+iterative and with the current calculate_all().  The results of the two are
+checked for exact equality.
+"""
+
+import copy
+
+from rtk.analyses.data import HARDWARE_ATTRIBUTES
+from rtk.modules.hardware import dtmHardwareBoM
+
+from benchmark import do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+TREE_SIZES = [10000, 100000]
+
+ASSEMBLY = dict(
+    HARDWARE_ATTRIBUTES,
+    category_id=0,
+    cost_type_id=0,
+    part=0,
+    subcategory_id=0)
+
+PART = dict(
+    HARDWARE_ATTRIBUTES,
+    category_id=3,
+    cost=0.27,
+    cost_type_id=1,
+    environment_active_id=3,
+    environment_dormant_id=2,
+    hazard_rate_method_id=1,
+    power_operating=0.05,
+    power_rated=0.25,
+    quality_id=2,
+    specification_id=1,
+    subcategory_id=2,
+    total_power_dissipation=0.05)
+
+
+def _do_calculate_recursive(model, hr_multiplier=1E6, node_id=0):
+    """Calculate the tree the way it was calculated before it was iterative."""
+    _cum_results = [0.0, 0.0, 0.0, 0.0, 0, 0.0]
+
+    if model.tree.get_node(node_id).fpointer:
+        _attributes = model.tree.get_node(node_id).data
+        for _node_id in model.tree.get_node(node_id).fpointer:
+            _results = _do_calculate_recursive(model, hr_multiplier, _node_id)
+            _cum_results[0] += _results[0]
+            _cum_results[1] += _results[1]
+            _cum_results[2] += _results[2]
+            _cum_results[3] += _results[3]
+            _cum_results[4] += int(_results[4])
+            _cum_results[5] += _results[5]
+        _attributes = model.calculate(node_id, hr_multiplier)
+        if _attributes is not None:
+            _cum_results[0] += _attributes['hazard_rate_active']
+            _cum_results[1] += _attributes['hazard_rate_dormant']
+            _cum_results[2] += _attributes['hazard_rate_software']
+            _cum_results[3] += _attributes['total_cost']
+            _cum_results[4] += int(_attributes['total_part_count'])
+            _cum_results[5] += _attributes['total_power_dissipation']
+    else:
+        if model.tree.get_node(node_id).data is not None:
+            _attributes = model.calculate(node_id, hr_multiplier)
+            _cum_results[0] += _attributes['hazard_rate_active']
+            _cum_results[1] += _attributes['hazard_rate_dormant']
+            _cum_results[2] += _attributes['hazard_rate_software']
+            _cum_results[3] += _attributes['total_cost']
+            _cum_results[4] += int(_attributes['total_part_count'])
+            _cum_results[5] += _attributes['total_power_dissipation']
+
+    if model.tree.get_node(
+            node_id).data is not None and _attributes['part'] == 0:
+        _attributes['hazard_rate_active'] = _cum_results[0]
+        _attributes['hazard_rate_dormant'] = _cum_results[1]
+        _attributes['hazard_rate_software'] = _cum_results[2]
+        _attributes['total_cost'] = _cum_results[3]
+        _attributes['total_part_count'] = int(_cum_results[4])
+        _attributes['total_power_dissipation'] = _cum_results[5]
+
+        _attributes = model._calculate_reliability_metrics(_attributes)
+        _attributes = model._calculate_cost_metrics(_attributes)
+        _attributes = model._calculate_metric_variances(_attributes)
+
+    return _cum_results
+
+
+def _do_build_tree(n_nodes, fanout, parts_per_assembly):
+    """
+    Build a synthetic Hardware BoM data model with n_nodes nodes.
+
+    Each assembly has up to fanout child assemblies and parts_per_assembly
+    parts.  A fanout of one and no parts builds a single chain of assemblies.
+    """
+    _model = dtmHardwareBoM(None)
+    _assemblies = []
+    _node_id = 1
+    while _node_id <= n_nodes:
+        _n_assemblies = len(_assemblies)
+        if _n_assemblies == 0:
+            _parent_id = 0
+        else:
+            _parent_id = _assemblies[(_n_assemblies - 1) // fanout]
+        _model.tree.create_node(
+            _node_id,
+            _node_id,
+            parent=_parent_id,
+            data=dict(ASSEMBLY, hardware_id=_node_id))
+        _assemblies.append(_node_id)
+        _parent_id = _node_id
+        _node_id += 1
+        for _idx in range(parts_per_assembly):
+            if _node_id > n_nodes:
+                break
+            _part = dict(PART, hardware_id=_node_id, quantity=1 + _idx % 3)
+            _model.tree.create_node(
+                _node_id, _node_id, parent=_parent_id, data=_part)
+            _node_id += 1
+
+    return _model
+
+
+def main(tree_sizes):
+    """Run the benchmark for each of the tree sizes."""
+    print('{0:>8s} {1:>6s} {2:>14s} {3:>14s} {4:>6s}'.format(
+        'nodes', 'shape', 'recursive (s)', 'iterative (s)', 'equal'))
+
+    for _n_nodes in tree_sizes:
+        for _shape, _fanout, _parts in [('wide', 10, 10), ('deep', 1, 0)]:
+            _recursive = _do_build_tree(_n_nodes, _fanout, _parts)
+            _iterative = copy.deepcopy(_recursive)
+
+            try:
+                _t_old, _old = do_time(_do_calculate_recursive, _recursive)
+            except RuntimeError:
+                _t_old = None
+            _t_new, _new = do_time(_iterative.calculate_all)
+
+            if _t_old is None:
+                _equal = 'n/a'
+                _t_old = 'recursion'
+            else:
+                _equal = str(_old == _new and all(
+                    _recursive.tree.get_node(_id).data == _iterative.tree.
+                    get_node(_id).data for _id in _recursive.tree.nodes))
+                _t_old = '{0:.3f}'.format(_t_old)
+
+            print('{0:>8d} {1:>6s} {2:>14s} {3:>14.3f} {4:>6s}'.format(
+                _n_nodes, _shape, _t_old, _t_new, _equal))
+
+
+if __name__ == '__main__':
+    do_run(main, TREE_SIZES)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_hazard_equations.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the hazard analysis user-defined equations.
+
+Invocation:
+
+    python tests/benchmarks/bench_hazard_equations.py [N1 N2 ...]
+
+where N1, N2, ... are the number of hazards in the synthetic hazard analyses
+to calculate.  Every hazard uses the same five user-defined equations.  For
+each size the wall time of calling eval() on the equation strings for every
+hazard (the way the hazards were calculated before the equations were
+compiled and cached), RTKHazardAnalysis.calculate() for every hazard, and
+HazardAnalysisDataModel.calculate_all() are reported.  The results of the
+three are checked for equality.
+"""
+
+import copy
+
+from rtk.dao import RTKHazardAnalysis
+from rtk.dao.programdb.RTKHazardAnalysis import EQUATION_VARIABLES
+from rtk.modules.hazops import dtmHazardAnalysis
+
+from benchmark import do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+HAZARD_COUNTS = [1000, 10000]
+
+EQUATIONS = [
+    '(uf1 + ui1) / uf2', 'uf1 * uf2 * uf3 + res1', 'ui1 * ui2 - ui3',
+    '(uf1 - uf2) ** 2 / (1.0 + uf3)', 'uf1 * 0.5 + uf2 * 0.25 + uf3 * 0.25'
+]
+
+
+def _do_build_hazards(n_hazards):
+    """Build a synthetic hazard analysis data model with n_hazards hazards."""
+    _model = dtmHazardAnalysis(None)
+    _model.tree.create_node('Hardware ID: 1', 1, 0, data=None)
+
+    for _hazard_id in range(1, n_hazards + 1):
+        _hazard = RTKHazardAnalysis(
+            hardware_id=1,
+            hazard_id=_hazard_id,
+            assembly_severity='Medium',
+            assembly_probability='Level A - Frequent',
+            assembly_severity_f='Slight',
+            assembly_probability_f='Level C - Occasional',
+            system_severity='Medium',
+            system_probability='Level B - Reasonably Probable',
+            system_severity_f='Low',
+            system_probability_f='Level D - Remote',
+            user_float_1=0.5 * (_hazard_id % 7),
+            user_float_2=1.0 + _hazard_id % 5,
+            user_float_3=0.25 * (_hazard_id % 3),
+            user_int_1=_hazard_id % 4,
+            user_int_2=_hazard_id % 6,
+            user_int_3=_hazard_id % 2,
+            result_1=0.0,
+            result_2=0.0,
+            result_3=0.0,
+            result_4=0.0,
+            result_5=0.0)
+        for _index, _equation in enumerate(EQUATIONS):
+            setattr(_hazard, 'function_{0:d}'.format(_index + 1), _equation)
+        _model.tree.create_node(
+            _hazard_id, '1.{0:d}'.format(_hazard_id), 1, data=_hazard)
+
+    return _model
+
+
+def _do_get_hazards(model):
+    """Return the list of hazards in the hazard analysis data model."""
+    return [
+        _node.data for _node in model.tree.all_nodes()
+        if _node.data is not None
+    ]
+
+
+def _do_calculate_eval(model):
+    """Calculate the hazards the way they were before the equation cache."""
+    for _hazard in _do_get_hazards(model):
+        _hazard.calculate_hri()
+        _calculations = dict((_name, getattr(_hazard, _attribute))
+                             for _name, _attribute in EQUATION_VARIABLES)
+        for _index in range(1, 6):
+            setattr(_hazard, 'result_{0:d}'.format(_index),
+                    eval(_calculations['equation{0:d}'.format(_index)],
+                         {"__builtins__": None}, _calculations))
+
+
+def _do_calculate_each(model):
+    """Calculate the hazards with RTKHazardAnalysis.calculate()."""
+    for _hazard in _do_get_hazards(model):
+        _hazard.calculate()
+
+
+def _do_get_results(model):
+    """Return the results of each hazard in the hazard analysis."""
+    return sorted((_hazard.hazard_id, _hazard.result_1, _hazard.result_2,
+                   _hazard.result_3, _hazard.result_4, _hazard.result_5)
+                  for _hazard in _do_get_hazards(model))
+
+
+def main(hazard_counts):
+    """Run the benchmark for each of the hazard counts."""
+    print('{0:>8s} {1:>10s} {2:>12s} {3:>16s} {4:>6s}'.format(
+        'hazards', 'eval (s)', 'cached (s)', 'calculate_all (s)', 'equal'))
+
+    for _n_hazards in hazard_counts:
+        _eval = _do_build_hazards(_n_hazards)
+        _each = copy.deepcopy(_eval)
+        _all = copy.deepcopy(_eval)
+
+        _t_eval, __ = do_time(_do_calculate_eval, _eval)
+        _t_each, __ = do_time(_do_calculate_each, _each)
+        _t_all, __ = do_time(_all.calculate_all)
+        _equal = (_do_get_results(_eval) == _do_get_results(_each) ==
+                  _do_get_results(_all))
+
+        print('{0:>8d} {1:>10.3f} {2:>12.3f} {3:>16.3f} {4:>6s}'.format(
+            _n_hazards, _t_eval, _t_each, _t_all, str(_equal)))
+
+
+if __name__ == '__main__':
+    do_run(main, HAZARD_COUNTS)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_load_globals.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for loading the global dictionaries from the RTK Common database.
+
+Invocation:
+
+    python tests/benchmarks/bench_load_globals.py [N1 N2 ...]
+
+where N1, N2, ... are the number of times to load the globals from a new RTK
+Common database populated with the test data.  For each count the number of
+SQL statements issued and the wall time of the eager loader (one query per
+hardware category and subcategory and one filtered query per dictionary, the
+way Model.load_globals() loaded them before RTKGlobals), RTKGlobals without a
+snapshot, and RTKGlobals with a warm snapshot are reported.  The dictionaries
+of the three are checked for equality.
+"""
+
+from rtk.dao.DAO import DAO
+from rtk.dao.RTKGlobals import GLOBALS, SIMPLE_GLOBALS, RTKGlobals
+from rtk.dao.commondb.RTKCategory import RTKCategory
+from rtk.dao.commondb.RTKFailureMode import RTKFailureMode
+from rtk.dao.commondb.RTKSubCategory import RTKSubCategory
+
+from benchmark import do_count_statements, do_run, temporary_database
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+LOAD_COUNTS = [1, 10]
+
+
+def _do_load_eager(dao):
+    """Load every global dictionary the way it was loaded before RTKGlobals."""
+    _session = dao.RTK_SESSION(
+        bind=dao.engine, autoflush=False, expire_on_commit=False)
+    _globals = dict((_name, {}) for _name in GLOBALS)
+
+    for _record in _session.query(RTKCategory).\
+            filter(RTKCategory.cat_type == 'hardware').all():
+        _subcats = {}
+        _globals['RTK_FAILURE_MODES'][_record.category_id] = {}
+        for _subcat in _session.query(RTKSubCategory).\
+                filter(RTKSubCategory.category_id == _record.category_id).\
+                all():
+            _subcats[_subcat.subcategory_id] = _subcat.description
+            _modes = {}
+            for _mode in _session.query(RTKFailureMode).\
+                    filter(RTKFailureMode.category_id == _record.category_id).\
+                    filter(RTKFailureMode.subcategory_id ==
+                           _subcat.subcategory_id).all():
+                _modes[_mode.mode_id] = [
+                    _mode.description, _mode.mode_ratio, _mode.source
+                ]
+            _globals['RTK_FAILURE_MODES'][_record.category_id][
+                _subcat.subcategory_id] = _modes
+        _globals['RTK_CATEGORIES'][_record.category_id] = _record.description
+        _globals['RTK_SUBCATEGORIES'][_record.category_id] = _subcats
+
+    for _name, (_table, _attribute, _value, _key,
+                _values) in SIMPLE_GLOBALS.items():
+        _query = _session.query(_table)
+        if _attribute is not None:
+            _query = _query.filter(getattr(_table, _attribute) == _value)
+        for _record in _query.all():
+            _attributes = _record.get_attributes()
+            if _values is None:
+                _globals[_name][getattr(_record, _key)] = _attributes
+            else:
+                _globals[_name][getattr(_record, _key)] = tuple(
+                    _attributes[_v] for _v in _values)
+
+    _session.close()
+
+    return _globals
+
+
+def _do_load_lazy(dao, snapshot=None):
+    """Load every global dictionary with RTKGlobals."""
+    _globals = RTKGlobals(dao, snapshot)
+    return dict((_name, _globals.do_get(_name)) for _name in GLOBALS)
+
+
+def _do_load_repeated(dao, n_loads, loader, *args):
+    """Load the global dictionaries n_loads times; return the last load."""
+    for __ in range(n_loads):
+        _globals = loader(dao, *args)
+
+    return _globals
+
+
+def main(load_counts):
+    """Run the benchmark for each of the load counts."""
+    with temporary_database() as _path:
+        _snapshot = _path + '.snapshot'
+        _dao = DAO()
+        _dao.db_connect('sqlite:///' + _path)
+        _dao.db_create_common('sqlite:///' + _path, test=True)
+
+        # Write the snapshot so every snapshot load is a warm start.
+        _do_load_lazy(_dao, _snapshot)
+
+        print('{0:>6s} {1:>6s} {2:>10s} {3:>6s} {4:>10s} {5:>9s} '
+              '{6:>10s} {7:>6s}'.format('loads', 'eager', 'time (s)', 'lazy',
+                                        'time (s)', 'snapshot', 'time (s)',
+                                        'equal'))
+
+        for _n_loads in load_counts:
+            _n_eager, _t_eager, _eager = do_count_statements(
+                _dao, _do_load_repeated, _n_loads, _do_load_eager)
+            _n_lazy, _t_lazy, _lazy = do_count_statements(
+                _dao, _do_load_repeated, _n_loads, _do_load_lazy)
+            _n_snap, _t_snap, _snap = do_count_statements(
+                _dao, _do_load_repeated, _n_loads, _do_load_lazy, _snapshot)
+            _equal = _eager == _lazy == _snap
+
+            print('{0:>6d} {1:>6d} {2:>10.3f} {3:>6d} {4:>10.3f} {5:>9d} '
+                  '{6:>10.3f} {7:>6s}'.format(
+                      _n_loads, _n_eager / _n_loads, _t_eager,
+                      _n_lazy / _n_loads, _t_lazy, _n_snap / _n_loads,
+                      _t_snap, str(_equal)))
+
+        _dao.db_close()
+
+
+if __name__ == '__main__':
+    do_run(main, LOAD_COUNTS)
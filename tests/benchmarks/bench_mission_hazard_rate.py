@@ -0,0 +1,107 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_mission_hazard_rate.py is part of The RTK
+#       Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the mission weighted hazard rate calculation.
+
+Invocation:
+
+    python tests/benchmarks/bench_mission_hazard_rate.py [N1 N2 ...]
+
+where N1, N2, ... are the number of parts to calculate.  Half the parts are
+part stress resistors and half are parts count resistors.  There are twenty
+distinct part designs repeated with different reference designators.  The
+mission has PHASE_COUNT phases that cycle through three (environment,
+temperature) conditions.  For each size the wall time of calling
+Component.calculate() for each part and phase and
+Component.do_calculate_mission_hazard_rate() are reported.  The results of
+the two are checked for equality.
+"""
+
+from rtk.analyses.data import HARDWARE_ATTRIBUTES
+from rtk.analyses.prediction import Component
+
+from benchmark import do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+PART_COUNTS = [100, 1000]
+PHASE_COUNT = 36
+CONDITIONS = [(1.0, 2, 25.0), (0.5, 3, 55.0), (2.0, 4, 85.0)]
+
+
+def _do_build_parts(n_parts):
+    """Build n_parts resistors from twenty distinct designs."""
+    _lst_parts = []
+    for _idx in range(n_parts):
+        _design = _idx % 20
+        _lst_parts.append(
+            dict(
+                HARDWARE_ATTRIBUTES,
+                hardware_id=_idx + 1,
+                ref_des='R{0:d}'.format(_idx + 1),
+                hazard_rate_method_id=1 + _design % 2,
+                category_id=3,
+                subcategory_id=1,
+                environment_active_id=3,
+                quality_id=1 + _design % 4,
+                specification_id=1,
+                temperature_active=35.0,
+                power_operating=0.01 * (1 + _design),
+                power_rated=0.25,
+                resistance=1000.0 * (1 + _design)))
+
+    return _lst_parts
+
+
+def _do_calculate_per_phase(parts, phases):
+    """Calculate every part in every phase and weight by duration."""
+    _total = sum(_phase[0] for _phase in phases)
+    _hazard_rates = []
+    for _part in parts:
+        _hazard_rate = 0.0
+        for _duration, _environment_id, _temperature in phases:
+            _hazard_rate += _duration * Component.calculate(**dict(
+                _part,
+                environment_active_id=_environment_id,
+                temperature_active=_temperature))[0]['hazard_rate_active']
+        _hazard_rates.append(_hazard_rate / _total)
+
+    return _hazard_rates
+
+
+def main(part_counts):
+    """Run the benchmark for each of the part counts."""
+    _phases = [
+        CONDITIONS[_idx % len(CONDITIONS)] for _idx in range(PHASE_COUNT)
+    ]
+
+    print('{0:>8s} {1:>8s} {2:>15s} {3:>13s} {4:>8s} {5:>6s}'.format(
+        'parts', 'phases', 'per-phase (s)', 'mission (s)', 'speedup',
+        'equal'))
+
+    for _n_parts in part_counts:
+        _lst_parts = _do_build_parts(_n_parts)
+
+        _t_old, _old = do_time(_do_calculate_per_phase, _lst_parts, _phases)
+        _t_new, _new = do_time(Component.do_calculate_mission_hazard_rate,
+                               _lst_parts, _phases)
+        _equal = all(
+            abs(_a - _b) <= 1E-9 * max(abs(_a), 1E-30)
+            for _a, _b in zip(_old, _new))
+
+        print('{0:>8d} {1:>8d} {2:>15.3f} {3:>13.3f} {4:>7.1f}x {5:>6s}'.
+              format(_n_parts, PHASE_COUNT, _t_old, _t_new,
+                     _t_old / max(_t_new, 1E-9), str(_equal)))
+
+
+if __name__ == '__main__':
+    do_run(main, PART_COUNTS)
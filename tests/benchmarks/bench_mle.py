@@ -0,0 +1,74 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_mle.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the maximum likelihood fits of the survival distributions.
+
+Invocation:
+
+    python tests/benchmarks/bench_mle.py [N1 N2 ...]
+
+where N1, N2, ... are the number of records in the synthetic field data sets
+to fit.  Each data set is 30% right censored and 20% of the failures are
+interval censored.  For each size and distribution the wall time and
+estimates of the maximum_likelihood_estimate() method of the distribution
+class in Distributions.py and of MLE.maximum_likelihood() are reported along
+with whether MLE.maximum_likelihood() converged.
+"""
+
+import warnings
+
+import numpy as np
+
+from rtk.statistics.distributions import MLE
+from rtk.statistics.distributions.Distributions import Exponential, \
+    Gaussian, LogNormal, Weibull
+
+from benchmark import do_format, do_make_survival_data, do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+RECORD_COUNTS = [1000, 10000, 100000]
+DISTRIBUTIONS = [('exponential', Exponential), ('weibull', Weibull),
+                 ('lognormal', LogNormal), ('gaussian', Gaussian)]
+
+
+def _do_fit_old(distribution, data):
+    """Fit the data with the distribution class; return its estimates."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with np.errstate(all='ignore'):
+            return distribution().maximum_likelihood_estimate(
+                data, 0.0, np.inf)[0][:2]
+
+
+def main(record_counts):
+    """Run the benchmark for each of the record counts."""
+    print('{0:>8s} {1:>12s} {2:>9s} {3:>22s} {4:>9s} {5:>22s} {6:>9s}'.format(
+        'records', 'distribution', 'old (s)', 'old estimates', 'MLE (s)',
+        'MLE estimates', 'converged'))
+
+    for _n_records in record_counts:
+        for _dist, _distribution in DISTRIBUTIONS:
+            _data = do_make_survival_data(_dist, _n_records)
+
+            _t_old, _old = do_time(_do_fit_old, _distribution, _data)
+            _t_new, _new = do_time(MLE.maximum_likelihood, _data, 0.0, 0.0,
+                                   _dist)
+
+            print('{0:>8d} {1:>12s} {2:>9.3f} {3:>22s} {4:>9.3f} {5:>22s} '
+                  '{6:>9s}'.format(_n_records, _dist, _t_old,
+                                   do_format(_old[:len(_new['parameters'])]),
+                                   _t_new, do_format(_new['parameters']),
+                                   str(_new['converged'])))
+
+
+if __name__ == '__main__':
+    do_run(main, RECORD_COUNTS)
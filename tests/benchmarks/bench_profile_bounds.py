@@ -0,0 +1,117 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_profile_bounds.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the likelihood ratio bounds of the survival distributions.
+
+Invocation:
+
+    python tests/benchmarks/bench_profile_bounds.py [N1 N2 ...]
+
+where N1, N2, ... are the number of records in the synthetic field data sets.
+Each data set is 30% right censored and 20% of the failures are interval
+censored.  For each size the wall time and bounds of the 200 iteration
+optimize.root() search Weibull.likelihood_bounds() used before it was
+replaced are reported for the Weibull distribution.  The wall time and
+bounds of likelihood_bounds(), which calls MLE.profile_bounds(), are
+reported for each distribution.
+"""
+
+import warnings
+from collections import OrderedDict
+
+import numpy as np
+import scipy.optimize as optimize
+from scipy.stats import chi2
+
+from rtk.statistics.distributions.Distributions import Gaussian, LogNormal, \
+    Weibull
+
+from benchmark import do_format, do_make_survival_data, do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+RECORD_COUNTS = [100, 1000, 10000]
+DISTRIBUTIONS = [('weibull', Weibull, [1000.0, 1.7]),
+                 ('lognormal', LogNormal, [6.0, 0.8]),
+                 ('gaussian', Gaussian, [500.0, 80.0])]
+CONFIDENCE = 0.9
+
+
+def _do_bounds_old(pars, confidence, data):
+    """Find the Weibull bounds the way Weibull.likelihood_bounds() did."""
+    _weibull = Weibull()
+
+    def _shadow_func(pars, data, const):
+        """Return the log-likelihood ratio and a zero."""
+        return [_weibull.log_likelihood_ratio(pars, data, const), 0.0]
+
+    _lower = OrderedDict()
+    _upper = OrderedDict()
+
+    _log_lik_ratio = _weibull.log_likelihood_ratio(pars, data)
+    _const = _log_lik_ratio - (chi2.ppf(confidence, 1) / 2.0)
+
+    _betal = 0.5 * pars[1]
+    _betau = 2.0 * pars[1]
+    for __ in range(200):
+        _temp = optimize.root(
+            _shadow_func, [pars[0], _betal], args=(data, _const)).x
+        _lower[_betal] = _temp[0]
+        _betal = _temp[1]
+
+        _temp = optimize.root(
+            _shadow_func, [pars[0], _betau], args=(data, _const)).x
+        _upper[_betau] = _temp[0]
+        _betau = _temp[1]
+
+    _beta_l = max(_lower.keys())
+    _beta_u = min(_upper.keys())
+    _eta_l = optimize.fsolve(
+        _shadow_func, [pars[0] / 10.0, _beta_l], args=(data, 0.0))[0]
+    _eta_u = _upper[_beta_u]
+
+    return (_eta_l, _eta_u, _beta_l, _beta_u)
+
+
+def _do_quiet(function, *args):
+    """Call function with args ignoring warnings."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        with np.errstate(all='ignore'):
+            return function(*args)
+
+
+def main(record_counts):
+    """Run the benchmark for each of the record counts."""
+    print('{0:>8s} {1:>12s} {2:>9s} {3:>44s} {4:>9s} {5:>44s}'.format(
+        'records', 'distribution', 'old (s)', 'old bounds', 'new (s)',
+        'new bounds'))
+
+    for _n_records in record_counts:
+        for _dist, _distribution, _params in DISTRIBUTIONS:
+            _data = do_make_survival_data(_dist, _n_records)
+
+            _old = ''
+            _t_old = np.nan
+            if _dist == 'weibull':
+                _t_old, _old = do_time(_do_quiet, _do_bounds_old, _params,
+                                       CONFIDENCE, _data)
+                _old = do_format(_old)
+            _t_new, _new = do_time(_distribution().likelihood_bounds,
+                                   _params, CONFIDENCE, _data)
+
+            print('{0:>8d} {1:>12s} {2:>9.3f} {3:>44s} {4:>9.3f} '
+                  '{5:>44s}'.format(_n_records, _dist, _t_old, _old, _t_new,
+                                    do_format(_new)))
+
+
+if __name__ == '__main__':
+    do_run(main, RECORD_COUNTS)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_similar_item.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for the Topic 6.3.3 similar item analysis.
+
+Invocation:
+
+    python tests/benchmarks/bench_similar_item.py [N1 N2 ...]
+
+where N1, N2, ... are the number of child hardware items in the synthetic
+assemblies to calculate.  Every child uses the Topic 6.3.3 approach.  For each
+size the wall time of calling SimilarItemDataModel.calculate() for each child
+and of SimilarItemDataModel.calculate_children() are reported.  The results of
+the two are checked for equality.  The wall time of recalculating the
+unchanged assembly with calculate_children(), as the nightly prediction
+refresh does, is also reported.
+"""
+
+import copy
+
+from rtk.dao import RTKSimilarItem
+from rtk.modules.similar_item import dtmSimilarItem
+
+from benchmark import do_run, do_time
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+CHILD_COUNTS = [1000, 10000, 100000]
+
+
+def _do_build_assembly(n_children):
+    """Build a synthetic similar item data model with n_children children."""
+    _model = dtmSimilarItem(None)
+    _model.tree.create_node('SimilarItem ID: 1', 1, 0, data=None)
+
+    _hazard_rates = {}
+    for _hardware_id in range(2, n_children + 2):
+        _similar_item = RTKSimilarItem(
+            revision_id=1,
+            hardware_id=_hardware_id,
+            parent_id=1,
+            method_id=1,
+            quality_from_id=1 + _hardware_id % 4,
+            quality_to_id=1 + _hardware_id % 3,
+            environment_from_id=1 + _hardware_id % 6,
+            environment_to_id=1 + _hardware_id % 5,
+            temperature_from=10.0 + 0.7 * (_hardware_id % 85),
+            temperature_to=10.0 + 0.3 * (_hardware_id % 199),
+            change_factor_1=1.0,
+            change_factor_2=1.0,
+            change_factor_3=1.0,
+            result_1=0.0)
+        _model.tree.create_node(
+            'SimilarItem ID: {0:d}'.format(_hardware_id),
+            _hardware_id,
+            parent=1,
+            data=_similar_item)
+        _hazard_rates[_hardware_id] = 1.0E-6 * (1 + _hardware_id % 17)
+
+    return _model, _hazard_rates
+
+
+def _do_calculate_each(model, hazard_rates):
+    """Calculate the similar item analysis one child at a time."""
+    for _node in model.select_children(1):
+        model.calculate(_node.identifier, hazard_rates[_node.identifier])
+
+
+def _do_get_results(model):
+    """Return the calculated results of each child in the assembly."""
+    return sorted(
+        (_node.identifier, _node.data.temperature_from,
+         _node.data.temperature_to, _node.data.change_factor_1,
+         _node.data.change_factor_2, _node.data.change_factor_3,
+         _node.data.result_1) for _node in model.select_children(1))
+
+
+def main(child_counts):
+    """Run the benchmark for each of the child counts."""
+    print('{0:>8s} {1:>14s} {2:>10s} {3:>8s} {4:>12s} {5:>6s}'.format(
+        'children', 'per-child (s)', 'batch (s)', 'speedup', 'refresh (s)',
+        'equal'))
+
+    for _n_children in child_counts:
+        _each, _hazard_rates = _do_build_assembly(_n_children)
+        _batch = copy.deepcopy(_each)
+
+        _t_old, __ = do_time(_do_calculate_each, _each, _hazard_rates)
+        _t_new, __ = do_time(_batch.calculate_children, 1, _hazard_rates)
+        _t_refresh, __ = do_time(_batch.calculate_children, 1, _hazard_rates)
+        _equal = _do_get_results(_each) == _do_get_results(_batch)
+
+        print('{0:>8d} {1:>14.3f} {2:>10.3f} {3:>7.1f}x {4:>12.3f} {5:>6s}'.
+              format(_n_children, _t_old, _t_new, _t_old / max(_t_new, 1E-9),
+                     _t_refresh, str(_equal)))
+
+
+if __name__ == '__main__':
+    do_run(main, CHILD_COUNTS)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.bench_usage_select.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Benchmark for loading a Usage Profile from the RTK Program database.
+
+Invocation:
+
+    python tests/benchmarks/bench_usage_select.py [N1 N2 ...]
+
+where N1, N2, ... are the number of missions in the synthetic Usage Profiles
+to load.  Each mission has five mission phases and each mission phase has four
+environments.  For each size the number of SQL statements issued and the wall
+time of the per-parent loader (one query per mission and mission phase) and
+UsageProfileDataModel.select_all() are reported.  The two trees are checked
+for equality.
+"""
+
+from rtk.dao import DAO, RTKEnvironment, RTKMission, RTKMissionPhase
+from rtk.dao.RTKProgramDB import create_program_db
+from rtk.modules.usage import dtmUsageProfile
+
+from benchmark import (do_count_statements, do_get_structure, do_run,
+                       temporary_database)
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+MISSION_COUNTS = [10, 100, 500]
+REVISION_ID = 1
+
+# A new RTK Program database already has a mission, mission phase, and
+# environment so the synthetic IDs start after them.
+FIRST_ID = 10
+
+
+def _do_create_profile(uri, n_missions):
+    """Create an RTK Program database with a synthetic Usage Profile."""
+    create_program_db(database=uri)
+
+    _dao = DAO()
+    _dao.db_connect(uri)
+    _session = _dao.RTK_SESSION(
+        bind=_dao.engine, autoflush=False, expire_on_commit=False)
+
+    _phase_id = FIRST_ID
+    _environment_id = FIRST_ID
+    for _mission_id in range(FIRST_ID, FIRST_ID + n_missions):
+        _session.add(
+            RTKMission(
+                mission_id=_mission_id,
+                revision_id=REVISION_ID,
+                description='Mission {0:d}'.format(_mission_id)))
+        for _idx in range(5):
+            _session.add(
+                RTKMissionPhase(
+                    phase_id=_phase_id,
+                    mission_id=_mission_id,
+                    description='Phase {0:d}'.format(_phase_id)))
+            for _jdx in range(4):
+                _session.add(
+                    RTKEnvironment(
+                        environment_id=_environment_id,
+                        phase_id=_phase_id,
+                        name='Environment {0:d}'.format(_environment_id)))
+                _environment_id += 1
+            _phase_id += 1
+    _session.commit()
+    _session.close()
+
+    return _dao
+
+
+def _do_load_per_parent(dao):
+    """
+    Load the Usage Profile the way it was loaded before the bulk loader.
+
+    The concatenated Node IDs the per-parent loader used collide in the
+    synthetic Usage Profiles (e.g., Mission 1 with Phase 1 and Mission 11) so
+    the Node IDs of the bulk loader are used instead.
+    """
+    _model = dtmUsageProfile(dao)
+
+    _missions = _model.dtm_mission.select_all(REVISION_ID).nodes
+    for _mkey in _missions:
+        _mission = _missions[_mkey].data
+        if _mission is None:
+            continue
+        _mission_node = str(_mission.mission_id)
+        _model.tree.create_node(
+            _mission.description, _mission_node, parent=0, data=_mission)
+        _phases = _model.dtm_phase.select_all(_mission.mission_id).nodes
+        for _pkey in _phases:
+            _phase = _phases[_pkey].data
+            if _phase is None:
+                continue
+            _phase_node = _mission_node + '.' + str(_phase.phase_id)
+            _model.tree.create_node(
+                _phase.description, _phase_node, parent=_mission_node,
+                data=_phase)
+            _environments = _model.dtm_environment.select_all(
+                _phase.phase_id).nodes
+            for _ekey in _environments:
+                _environment = _environments[_ekey].data
+                if _environment is not None:
+                    _model.tree.create_node(
+                        _environment.name,
+                        _phase_node + '.' + str(_environment.environment_id),
+                        parent=_phase_node,
+                        data=_environment)
+
+    return _model.tree
+
+
+def _do_load_bulk(dao):
+    """Load the Usage Profile with UsageProfileDataModel.select_all()."""
+    return dtmUsageProfile(dao).select_all(REVISION_ID)
+
+
+def main(mission_counts):
+    """Run the benchmark for each of the mission counts."""
+    print('{0:>8s} {1:>8s} {2:>12s} {3:>10s} {4:>8s} {5:>10s} {6:>6s}'.format(
+        'missions', 'nodes', 'per-parent', 'time (s)', 'bulk', 'time (s)',
+        'equal'))
+
+    for _n_missions in mission_counts:
+        with temporary_database() as _path:
+            _dao = _do_create_profile('sqlite:///' + _path, _n_missions)
+            _n_old, _t_old, _old = do_count_statements(_dao,
+                                                       _do_load_per_parent)
+            _n_new, _t_new, _new = do_count_statements(_dao, _do_load_bulk)
+            _equal = do_get_structure(_old) == do_get_structure(_new)
+            _dao.db_close()
+
+        print('{0:>8d} {1:>8d} {2:>12d} {3:>10.3f} {4:>8d} {5:>10.3f} '
+              '{6:>6s}'.format(_n_missions, len(_new.nodes), _n_old, _t_old,
+                               _n_new, _t_new, str(_equal)))
+
+
+if __name__ == '__main__':
+    do_run(main, MISSION_COUNTS)
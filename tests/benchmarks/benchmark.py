@@ -0,0 +1,129 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.benchmarks.benchmark.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""
+Helpers shared by the benchmark scripts.
+
+Each bench_*.py script builds its own synthetic data, then uses these
+helpers to time the calls, count the SQL statements, create a scratch
+database, and read the sizes to run from the command line.
+"""
+
+import glob
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+from sqlalchemy import event
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+
+def do_time(function, *args, **kwargs):
+    """Return the (seconds, result) of calling function with args."""
+    _start = time.time()
+    _result = function(*args, **kwargs)
+    return time.time() - _start, _result
+
+
+def do_count_statements(dao, function, *args):
+    """
+    Return the (statement count, seconds, result) of function(dao, *args).
+
+    The statements are the SQL statements executed by the engine of the
+    data access object while function is running.
+    """
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append(statement)
+
+    event.listen(dao.engine, 'before_cursor_execute', _count)
+    try:
+        _elapsed, _result = do_time(function, dao, *args)
+    finally:
+        event.remove(dao.engine, 'before_cursor_execute', _count)
+
+    return len(_statements), _elapsed, _result
+
+
+@contextmanager
+def temporary_database():
+    """
+    Yield the path to a scratch SQLite database file.
+
+    The database and any files saved next to it with the same prefix are
+    removed when the block exits.
+    """
+    _fd, _path = tempfile.mkstemp(suffix='.rtk')
+    os.close(_fd)
+    os.remove(_path)
+    try:
+        yield _path
+    finally:
+        for _file in glob.glob(_path + '*'):
+            os.remove(_file)
+
+
+def do_make_survival_data(dist, n_records, seed=1):
+    """
+    Make a survival data set with suspensions and interval censoring.
+
+    The data set is 30% right censored and 20% of the failures are interval
+    censored.  The columns are in the layout the survival distributions in
+    Distributions.py expect.
+    """
+    _rng = np.random.RandomState(seed)
+    if dist == 'exponential':
+        _times = _rng.exponential(500.0, n_records)
+    elif dist == 'gaussian':
+        _times = _rng.normal(500.0, 80.0, n_records)
+    elif dist == 'lognormal':
+        _times = _rng.lognormal(6.0, 0.8, n_records)
+    else:
+        _times = 1000.0 * _rng.weibull(1.7, n_records)
+
+    _censor = np.percentile(_times, 70)
+    _event = _times <= _censor
+    _interval = np.logical_and(_event, _rng.rand(n_records) < 0.2)
+
+    _data = np.zeros((n_records, 5))
+    _data[:, 1] = np.where(_event, _times, _censor)
+    _data[:, 2] = _rng.randint(1, 4, n_records)
+    _data[:, 3] = np.where(_event, 1, 2)
+    _data[:, 4] = _data[:, 1]
+    _data[_interval, 0] = np.floor(_times[_interval] / 50.0) * 50.0
+    _data[_interval, 1] = _data[_interval, 0] + 50.0
+    _data[_interval, 3] = 3
+
+    return _data
+
+
+def do_format(params):
+    """Format a list of estimates."""
+    return ', '.join('{0:.5g}'.format(_param) for _param in params)
+
+
+def do_get_structure(tree):
+    """
+    Return the (node ID, tag, parent ID, children) of each node.
+
+    The children are sorted because loaders may add them in any order.
+    """
+    return sorted((_node.identifier, _node.tag, _node.bpointer,
+                   sorted(_node.fpointer)) for _node in tree.all_nodes())
+
+
+def do_run(main, sizes):
+    """Call main with the sizes on the command line or the default sizes."""
+    main([int(_size) for _size in sys.argv[1:]] or sizes)
@@ -8,12 +8,15 @@
 
 import os
 
+from sqlalchemy import event
 from sqlalchemy.orm import sessionmaker
 
 import pytest
 
 from rtk.Configuration import Configuration
 from rtk.dao.DAO import DAO
+from rtk.dao.programdb.RTKHardware import RTKHardware
+from rtk.dao.programdb.RTKReliability import RTKReliability
 from rtk.dao.programdb.RTKRevision import RTKRevision
 from rtk.dao.programdb.RTKMission import RTKMission
 from rtk.dao.programdb.RTKMissionPhase import RTKMissionPhase
@@ -141,6 +144,96 @@ def test_dao_db_add_many(test_configuration):
                     "Program database.")
 
 
+@pytest.mark.integration
+def test_dao_db_add_bulk(test_configuration):
+    """ db_add() should return a zero error code on success when adding multiple records in one transaction. """
+    DUT = DAO()
+    _database = (test_configuration.RTK_BACKEND + ':///' +
+                '/tmp/_rtk_program_db.rtk')
+    DUT.db_connect(_database)
+
+    _revisions = [RTKRevision(), RTKRevision(), RTKRevision()]
+
+    _error_code, _msg = DUT.db_add(_revisions, DUT.session, bulk=True)
+
+    assert _error_code == 0
+    assert _msg == ("RTK SUCCESS: Adding one or more items to the RTK "
+                    "Program database.")
+    assert _revisions[1].revision_id == _revisions[0].revision_id + 1
+    assert _revisions[2].revision_id == _revisions[1].revision_id + 1
+
+
+@pytest.mark.integration
+def test_dao_db_add_bulk_keyed(test_configuration):
+    """ db_add() should insert parent records before child records and use one statement per table for records with their keys set. """
+    DUT = DAO()
+    _database = (test_configuration.RTK_BACKEND + ':///' +
+                '/tmp/_rtk_program_db.rtk')
+    DUT.db_connect(_database)
+
+    _session = DUT.RTK_SESSION(bind=DUT.engine, expire_on_commit=False)
+    _hardware_id = max(
+        [_hardware.hardware_id
+         for _hardware in _session.query(RTKHardware).all()] + [0]) + 1
+    _session.close()
+
+    _items = [
+        RTKReliability(hardware_id=_hardware_id),
+        RTKReliability(hardware_id=_hardware_id + 1),
+        RTKHardware(revision_id=1, hardware_id=_hardware_id),
+        RTKHardware(revision_id=1, hardware_id=_hardware_id + 1)
+    ]
+
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append(statement)
+
+    event.listen(DUT.engine, 'before_cursor_execute', _count)
+    _session = DUT.RTK_SESSION(bind=DUT.engine, expire_on_commit=False)
+    _error_code, _msg = DUT.db_add(_items, _session, bulk=True)
+    _session.close()
+    event.remove(DUT.engine, 'before_cursor_execute', _count)
+
+    assert _error_code == 0
+    assert [
+        _statement.split()[2] for _statement in _statements
+        if _statement.startswith('INSERT')
+    ] == ['rtk_hardware', 'rtk_reliability']
+
+    # The records should now be saved with UPDATE rather than INSERT.
+    _items[0].add_adj_factor = 0.5
+    _session = DUT.RTK_SESSION(bind=DUT.engine, expire_on_commit=False)
+    _session.add(_items[0])
+    _error_code, _msg = DUT.db_update(_session)
+    _session.close()
+
+    assert _error_code == 0
+    _session = DUT.RTK_SESSION(bind=DUT.engine)
+    assert _session.query(RTKReliability).get(
+        _hardware_id).add_adj_factor == 0.5
+    _session.close()
+
+
+@pytest.mark.integration
+def test_dao_db_add_bulk_failed_item(test_configuration):
+    """ db_add() should return a 1 error code and report the failed items when one or more items fail to add in one transaction. """
+    DUT = DAO()
+    _database = (test_configuration.RTK_BACKEND + ':///' +
+                '/tmp/_rtk_program_db.rtk')
+    DUT.db_connect(_database)
+
+    _revisions = [RTKRevision(), None, RTKRevision()]
+
+    _error_code, _msg = DUT.db_add(_revisions, DUT.session, bulk=True)
+
+    assert _error_code == 1
+    assert _msg == ("RTK ERROR: Adding one or more items to the RTK "
+                    "Program database.  Failed items: 1.")
+    assert _revisions[0].revision_id is not None
+    assert _revisions[2].revision_id is not None
+
+
 @pytest.mark.integration
 def test_dao_db_update(test_configuration):
     """ db_update() should return a zero error code on success. """
@@ -161,6 +254,51 @@ def test_dao_db_update(test_configuration):
     assert _msg == ("RTK SUCCESS: Updating the RTK Program database.")
 
 
+@pytest.mark.integration
+def test_dao_db_update_many(test_configuration):
+    """ db_update_many() should save all the modified items with one UPDATE statement. """
+    DUT = DAO()
+    _database = (test_configuration.RTK_BACKEND + ':///' +
+                '/tmp/_rtk_program_db.rtk')
+    DUT.db_connect(_database)
+
+    _revisions = [RTKRevision(), RTKRevision(), RTKRevision()]
+    DUT.db_add(_revisions, DUT.session)
+    DUT.session.close()
+
+    _revisions[0].availability_logistics = 0.9959
+    _revisions[1].availability_logistics = 0.9969
+
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append((statement, executemany))
+
+    event.listen(DUT.engine, 'before_cursor_execute', _count)
+    _session = DUT.RTK_SESSION(
+        bind=DUT.engine,
+        autoflush=True,
+        autocommit=False,
+        expire_on_commit=False)
+    _error_code, _msg = DUT.db_update_many(_revisions, _session)
+    _session.close()
+    event.remove(DUT.engine, 'before_cursor_execute', _count)
+
+    _updates = [_stmt for _stmt in _statements if _stmt[0].startswith('UPDATE')]
+
+    assert _error_code == 0
+    assert _msg == ("RTK SUCCESS: Updating the RTK Program database.")
+    assert len(_updates) == 1
+    assert _updates[0][1]
+
+    _session = DUT.RTK_SESSION(bind=DUT.engine)
+    assert _session.query(RTKRevision).get(
+        _revisions[0].revision_id).availability_logistics == 0.9959
+    assert _session.query(RTKRevision).get(
+        _revisions[1].revision_id).availability_logistics == 0.9969
+    _session.close()
+
+
 @pytest.mark.integration
 def test_dao_db_delete(test_configuration):
     """ db_delete() should return a zero error code on success. """
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+#
+#       tests.dao.test_rtkglobals.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Test class for testing the RTK Common database globals module."""
+
+import json
+import pickle
+from collections import MutableMapping
+
+from sqlalchemy import event
+
+import pytest
+
+from rtk.Configuration import Configuration
+from rtk.dao.RTKGlobals import GLOBALS, LazyDict, RTKGlobals
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+
+def _do_count(dao, function, *args):
+    """Return the (SELECT statements, result) of calling function."""
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append(statement)
+
+    event.listen(dao.engine, 'before_cursor_execute', _count)
+    _result = function(*args)
+    event.remove(dao.engine, 'before_cursor_execute', _count)
+
+    return [
+        _statement for _statement in _statements
+        if _statement.startswith('SELECT')
+    ], _result
+
+
+def _do_get_all(site_globals):
+    """Return every global dictionary."""
+    return dict((_name, site_globals.do_get(_name)) for _name in GLOBALS)
+
+
+@pytest.mark.unit
+def test_lazy_dict():
+    """ LazyDict should call the loader once, the first time it's used. """
+    _calls = []
+
+    def _loader():
+        _calls.append(1)
+        return {1: 'one', 2: 'two'}
+
+    DUT = LazyDict(_loader)
+
+    assert isinstance(DUT, MutableMapping)
+    assert not DUT.loaded
+    assert _calls == []
+
+    assert DUT[1] == 'one'
+    assert DUT.loaded
+    assert 2 in DUT
+    assert len(DUT) == 2
+    assert sorted(DUT.keys()) == [1, 2]
+    assert DUT == {1: 'one', 2: 'two'}
+    assert pickle.loads(pickle.dumps(DUT)) == {1: 'one', 2: 'two'}
+    assert _calls == [1]
+
+
+@pytest.mark.unit
+def test_lazy_dict_write_first():
+    """ LazyDict should load before the first change. """
+    DUT = LazyDict(lambda: {1: 'one'})
+
+    DUT[2] = 'two'
+
+    assert DUT == {1: 'one', 2: 'two'}
+
+
+@pytest.mark.unit
+def test_lazy_dict_copy_first():
+    """ LazyDict should load before it's first copied or serialized. """
+
+    def _do_unpack(**kwargs):
+        return kwargs
+
+    _contents = {'one': 1, 'two': 2}
+    _dict = {}
+    _dict.update(LazyDict(lambda: _contents))
+
+    assert dict(LazyDict(lambda: _contents)) == _contents
+    assert _dict == _contents
+    assert _do_unpack(**LazyDict(lambda: _contents)) == _contents
+    assert LazyDict(lambda: _contents).copy() == _contents
+    assert json.loads(json.dumps(dict(LazyDict(lambda: _contents)))) == \
+        _contents
+
+
+@pytest.mark.integration
+def test_do_attach(test_common_dao):
+    """ do_attach() should replace the globals without querying. """
+    _configuration = Configuration()
+    DUT = RTKGlobals(test_common_dao)
+
+    _statements, _result = _do_count(test_common_dao, DUT.do_attach,
+                                     _configuration)
+
+    assert _result is None
+    assert _statements == []
+    for _name in GLOBALS:
+        assert isinstance(getattr(_configuration, _name), LazyDict)
+        assert not getattr(_configuration, _name).loaded
+        assert getattr(Configuration, _name) == {}
+
+    assert _configuration.RTK_INCIDENT_CATEGORY == {
+        35: (u'HW', u'Hardware', u'incident', 1),
+        36: (u'SW', u'Software', u'incident', 1),
+        37: (u'PROC', u'Process', u'incident', 1)
+    }
+    assert _configuration.RTK_INCIDENT_CATEGORY.loaded
+    assert not _configuration.RTK_SEVERITY.loaded
+
+
+@pytest.mark.integration
+def test_do_get(test_common_dao):
+    """ do_get() should return the global dictionary. """
+    DUT = RTKGlobals(test_common_dao)
+
+    assert DUT.do_get('RTK_AFFINITY_GROUPS') == {
+        8: (u'Durability', u'affinity'),
+        9: (u'Cost', u'affinity'),
+        7: (u'Reliability', u'affinity')
+    }
+    assert DUT.do_get('RTK_STAKEHOLDERS') == {
+        1: (u'Customer', ),
+        2: (u'Service', ),
+        3: (u'Manufacturing', ),
+        4: (u'Management', )
+    }
+    assert DUT.do_get('RTK_RPN_SEVERITY')[1] == (1, u'None', u'No effect.',
+                                                 u'severity', 1)
+
+
+@pytest.mark.integration
+def test_do_get_unknown(test_common_dao):
+    """ do_get() should raise KeyError for an unknown global dictionary. """
+    DUT = RTKGlobals(test_common_dao)
+
+    with pytest.raises(KeyError):
+        DUT.do_get('RTK_NOT_A_GLOBAL')
+
+
+@pytest.mark.integration
+def test_do_get_hardware(test_common_dao):
+    """ do_get() should build the hardware category, subcategory, and failure mode tree. """
+    DUT = RTKGlobals(test_common_dao)
+
+    _categories = DUT.do_get('RTK_CATEGORIES')
+    _subcategories = DUT.do_get('RTK_SUBCATEGORIES')
+    _modes = DUT.do_get('RTK_FAILURE_MODES')
+
+    assert _categories[1] == u'Integrated Circuit'
+    assert sorted(_subcategories) == sorted(_categories)
+    assert sorted(_modes) == sorted(_categories)
+    for _category_id in _categories:
+        assert sorted(_modes[_category_id]) == sorted(
+            _subcategories[_category_id])
+    assert _modes[1][1] == {}
+    assert _modes[3][24][3] == [u'Parameter Change', 0.2, u'FMD-97']
+
+
+@pytest.mark.integration
+def test_do_get_one_query_per_table(test_common_dao):
+    """ do_get() should query each table once for all the globals. """
+    DUT = RTKGlobals(test_common_dao)
+
+    _statements, _globals = _do_count(test_common_dao, _do_get_all, DUT)
+
+    assert len(_statements) == 13
+    assert len(set(_statement.split('FROM')[1].split()[0]
+                   for _statement in _statements)) == 13
+
+    _statements, __ = _do_count(test_common_dao, _do_get_all, DUT)
+
+    assert _statements == []
+
+
+@pytest.mark.integration
+def test_snapshot(test_common_dao, tmpdir):
+    """ do_get() should save a snapshot and use it without querying. """
+    _snapshot = str(tmpdir.join('globals.snapshot'))
+
+    _statements, _cold = _do_count(test_common_dao, _do_get_all,
+                                   RTKGlobals(test_common_dao, _snapshot))
+
+    assert len(_statements) == 13
+    assert tmpdir.join('globals.snapshot').check()
+
+    _statements, _warm = _do_count(test_common_dao, _do_get_all,
+                                   RTKGlobals(test_common_dao, _snapshot))
+
+    assert _statements == []
+    assert _warm == _cold
+    assert _warm == _do_get_all(RTKGlobals(test_common_dao))
+
+
+@pytest.mark.integration
+def test_snapshot_stale(test_common_dao, tmpdir):
+    """ do_get() should not use a snapshot of a different database. """
+    _snapshot = str(tmpdir.join('globals.snapshot'))
+    with open(_snapshot, 'wb') as _file:
+        pickle.dump({
+            'stamp': (0.0, 0),
+            'globals': dict((_name, {}) for _name in GLOBALS)
+        }, _file)
+
+    DUT = RTKGlobals(test_common_dao, _snapshot)
+    _statements, _globals = _do_count(test_common_dao, _do_get_all, DUT)
+
+    assert len(_statements) == 13
+    assert _globals['RTK_CATEGORIES'][1] == u'Integrated Circuit'
+    with open(_snapshot, 'rb') as _file:
+        assert pickle.load(_file)['stamp'] == DUT.do_get_stamp()
+
+
+@pytest.mark.integration
+def test_snapshot_corrupt(test_common_dao, tmpdir):
+    """ do_get() should ignore a snapshot that can't be read. """
+    _snapshot = tmpdir.join('globals.snapshot')
+    _snapshot.write('not a snapshot')
+
+    DUT = RTKGlobals(test_common_dao, str(_snapshot))
+
+    assert DUT.do_get('RTK_CATEGORIES')[1] == u'Integrated Circuit'
@@ -7,6 +7,7 @@
 # Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
 """Test class for testing the FMEA class."""
 
+from sqlalchemy import event
 from treelib import Tree
 
 import pytest
@@ -17,7 +18,8 @@ from rtk.dao import RTKCause
 from rtk.dao import RTKControl
 from rtk.dao import RTKAction
 from rtk.modules.fmea import (dtcFMEA, dtmFMEA, dtmAction, dtmControl, dtmMode,
-                              dtmMechanism, dtmCause)
+                              dtmMechanism, dtmCause, dtmCriticalityMatrix)
+from rtk.modules.hardware import dtmHardwareBoM
 
 __author__ = 'Andrew Rowland'
 __email__ = 'andrew.rowland@reliaqual.com'
@@ -56,6 +58,35 @@ def test_do_select_all_hardware(test_dao):
     assert isinstance(_tree, Tree)
 
 
+@pytest.mark.integration
+@pytest.mark.parametrize("functional, n_queries", [(True, 4), (False, 5)])
+def test_do_select_all_one_query_per_level(test_dao, functional, n_queries):
+    """ do_select_all() should select each level of the FMEA with one query. """
+    DUT = dtmFMEA(test_dao)
+
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append(statement)
+
+    event.listen(test_dao.engine, 'before_cursor_execute', _count)
+    _tree = DUT.do_select_all(parent_id=1, functional=functional)
+    event.remove(test_dao.engine, 'before_cursor_execute', _count)
+
+    assert len(_statements) == n_queries
+    for _node in _tree.all_nodes()[1:]:
+        _parent = _tree.get_node(_node.bpointer)
+        assert _node.identifier.startswith(str(_parent.identifier) + '.')
+        if isinstance(_node.data, RTKMechanism):
+            assert _parent.data.mode_id == _node.data.mode_id
+        elif isinstance(_node.data, RTKCause) and functional:
+            assert _parent.data.mode_id == _node.data.mode_id
+        elif isinstance(_node.data, RTKCause):
+            assert _parent.data.mechanism_id == _node.data.mechanism_id
+        elif isinstance(_node.data, (RTKControl, RTKAction)):
+            assert _parent.data.cause_id == _node.data.cause_id
+
+
 @pytest.mark.integration
 def test_do_select_all_non_existent_hardware_id(test_dao):
     """ do_select_all() should return an empty Tree() when passed a Hardware ID that doesn't exist. """
@@ -482,10 +513,53 @@ def test_calculate_criticality(test_dao):
     _error_code, _msg = DUT.calculate_criticality(0.00001)
 
     assert _error_code == 0
-    assert _msg == ("RTK SUCCESS: Calculating failure mode 6 criticality.")
+    assert _msg == ("RTK SUCCESS: Calculating (D)FME(C)A criticality.")
     assert _mode.mode_criticality == pytest.approx(0.0004)
 
 
+@pytest.mark.integration
+def test_calculate_criticality_out_of_range(test_dao):
+    """ calculate_criticality() reports every out of range input at once. """
+    DUT = dtmFMEA(test_dao)
+    DUT.do_select_all(parent_id=1, functional=False)
+    _modes = [_node.data for _node in DUT.tree.children(0)]
+
+    for _mode in _modes:
+        _mode.mode_ratio = 0.5
+        _mode.mode_op_time = 10.0
+        _mode.effect_probability = 1.0
+        _mode.severity_class = 'II'
+        _mode.mode_criticality = 0.0
+    _modes[0].mode_ratio = 1.1
+    _modes[0].mode_op_time = -1.0
+    _modes[0].effect_probability = -0.1
+    _error_code, _msg = DUT.calculate_criticality(0.001)
+
+    assert _error_code == 2010
+    assert _msg == (
+        "RTK ERROR: Calculating (D)FME(C)A criticality.  The following 3 "
+        "value(s) are out of range:\n"
+        "Failure mode ratio is outside the range [0.0, 1.0] for Mode ID: "
+        "{0:d}.\n"
+        "Failure mode operating time has a negative value for Mode ID: "
+        "{0:d}.\n"
+        "Failure effect probability is outside the range [0.0, 1.0] for Mode "
+        "ID: {0:d}.").format(_modes[0].mode_id)
+    assert _modes[0].mode_criticality == 0.0
+    for _mode in _modes[1:]:
+        assert _mode.mode_hazard_rate == pytest.approx(0.0005)
+        assert _mode.mode_criticality == pytest.approx(0.005)
+    assert DUT.item_criticality == {
+        'II': pytest.approx(0.005 * (len(_modes) - 1))
+    }
+
+    _error_code, _msg = DUT.calculate_criticality(-0.001)
+
+    assert _error_code == 2010
+    assert _msg.split('\n')[1] == ("Item hazard rate has a negative value.")
+    assert DUT.item_criticality == {}
+
+
 @pytest.mark.integration
 def test_calculate_mechanism_rpn(test_dao):
     """ calculate_mechanism_rpn() returns a zero error code on success. """
@@ -546,6 +620,50 @@ def test_calculate_cause_rpn(test_dao):
     assert _node.rpn_new == 60
 
 
+@pytest.mark.integration
+def test_calculate_rpn_out_of_range(test_dao):
+    """ calculate_rpn() reports every out of range input at once. """
+    DUT = dtmFMEA(test_dao)
+    DUT.do_select_all(parent_id=1, functional=False)
+
+    for _node in DUT.tree.all_nodes():
+        if _node.data is None:
+            continue
+        if _node.data.is_mode:
+            _node.data.rpn_severity = 7
+            _node.data.rpn_severity_new = 4
+        if _node.data.is_mechanism or _node.data.is_cause:
+            _node.data.rpn_detection = 4
+            _node.data.rpn_occurrence = 7
+            _node.data.rpn_detection_new = 3
+            _node.data.rpn_occurrence_new = 5
+            _node.data.rpn = 0
+            _node.data.rpn_new = 0
+
+    _mechanism = DUT.tree.get_node('0.4.1').data
+    _cause = DUT.tree.get_node('0.4.1.4').data
+    _mechanism.rpn_occurrence = 0
+    _cause.rpn_detection = 11
+    _cause.rpn_detection_new = 12
+    _error_code, _msg = DUT.calculate_rpn()
+
+    assert _error_code == 2020
+    assert _msg == (
+        "RTK ERROR: Calculating (D)FME(C)A RPN.  The following 3 value(s) "
+        "are out of range:\n"
+        "RPN occurrence is outside the range [1, 10] for Mechanism ID: 1.\n"
+        "RPN detection is outside the range [1, 10] for Cause ID: 4.\n"
+        "RPN new detection is outside the range [1, 10] for Cause ID: 4.")
+    assert _mechanism.rpn == 0
+    assert _cause.rpn == 0
+    for _node in DUT.tree.all_nodes():
+        if _node.data is None or _node.data in [_mechanism, _cause]:
+            continue
+        if _node.data.is_mechanism or _node.data.is_cause:
+            assert _node.data.rpn == 196
+            assert _node.data.rpn_new == 60
+
+
 @pytest.mark.integration
 def test_create_data_controller(test_dao, test_configuration):
     """ __init__() should return instance of FMEA data controller. """
@@ -555,6 +673,35 @@ def test_create_data_controller(test_dao, test_configuration):
     assert isinstance(DUT._dtm_data_model, dtmFMEA)
 
 
+@pytest.mark.integration
+def test_request_calculate(test_dao, test_configuration):
+    """ request_calculate() returns False on success and True if any input is out of range. """
+    DUT = dtcFMEA(test_dao, test_configuration, test=True)
+    DUT.request_do_select_all(1, functional=False)
+
+    for _node in DUT._dtm_data_model.tree.all_nodes():
+        if _node.data is None:
+            continue
+        if _node.data.is_mode:
+            _node.data.rpn_severity = 7
+            _node.data.rpn_severity_new = 4
+            _node.data.mode_ratio = 0.5
+            _node.data.mode_op_time = 10.0
+            _node.data.effect_probability = 1.0
+        if _node.data.is_mechanism or _node.data.is_cause:
+            _node.data.rpn_detection = 4
+            _node.data.rpn_occurrence = 7
+            _node.data.rpn_detection_new = 3
+            _node.data.rpn_occurrence_new = 5
+
+    assert not DUT.request_calculate(0.001)
+
+    DUT.request_select('0.4').mode_ratio = 2.0
+
+    assert DUT.request_calculate(0.001)
+    assert not DUT.request_calculate(0.001, criticality=False)
+
+
 @pytest.mark.integration
 def test_request_do_select_all_hardware(test_dao, test_configuration):
     """ request_do_select_all() should return a treelib Tree() with the hardware FMEA. """
@@ -616,3 +763,124 @@ def test_request_update_all(test_dao, test_configuration):
     DUT.request_do_select_all(1, functional=True)
 
     assert not DUT.request_update_all()
+
+
+def _make_mode(mode_id, severity_class, mode_ratio):
+    """ Create a failure Mode for the criticality matrix tests. """
+    return RTKMode(
+        mode_id=mode_id,
+        severity_class=severity_class,
+        mode_ratio=mode_ratio,
+        mode_op_time=10.0,
+        effect_probability=1.0)
+
+
+@pytest.mark.integration
+def test_criticality_matrix_select_all(test_dao):
+    """ do_select_all() should load every hardware item in the Revision with a single query for the failure Modes. """
+    DUT = dtmCriticalityMatrix(test_dao)
+
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append(statement)
+
+    event.listen(test_dao.engine, 'before_cursor_execute', _count)
+    _tree = DUT.do_select_all(revision_id=1)
+    event.remove(test_dao.engine, 'before_cursor_execute', _count)
+
+    assert isinstance(_tree, Tree)
+    assert DUT.revision_id == 1
+    assert len([_sql for _sql in _statements if 'rtk_mode' in _sql]) == 1
+    assert sorted(DUT._lst_dirty) == list(range(1, 9))
+    assert _tree.get_node(1).data['mode_ids'][0] == 4
+    assert _tree.get_node(2).data['mode_ids'] == []
+
+
+@pytest.mark.integration
+def test_criticality_matrix_calculate_dirty(test_dao):
+    """ calculate_dirty() should only recalculate the hardware items whose hazard rate or failure Modes changed. """
+    DUT = dtmCriticalityMatrix(test_dao)
+    DUT.do_select_all(revision_id=1)
+    DUT.do_set_modes(2, [
+        _make_mode(101, 'I', 0.5),
+        _make_mode(102, 'II', 0.5), None
+    ])
+    DUT.do_set_modes(3, [_make_mode(103, 'II', 1.0)])
+    DUT.do_set_hazard_rate(2, 0.002)
+    DUT.do_set_hazard_rate(3, 0.001)
+
+    _error_code, _msg = DUT.calculate_dirty()
+    _matrix = DUT.get_matrix()
+
+    assert _error_code == 0
+    assert _msg == 'RTK SUCCESS: Calculating the criticality matrix.'
+    assert DUT._lst_dirty == []
+    assert _matrix.loc[2, 'I'] == pytest.approx(0.01)
+    assert _matrix.loc[2, 'II'] == pytest.approx(0.01)
+    assert _matrix.loc[3, 'I'] == 0.0
+    assert _matrix.loc[3, 'II'] == pytest.approx(0.01)
+
+    # Setting the same hazard rate is not a change.
+    DUT.do_set_hazard_rate(2, 0.002)
+    DUT.do_set_hazard_rate(3, 0.004)
+
+    assert DUT._lst_dirty == [3]
+
+    DUT.do_set_modes(2, [_make_mode(101, 'III', 1.5)])
+    _error_code, _msg = DUT.calculate_dirty()
+    _matrix = DUT.get_matrix()
+
+    assert _error_code == 2010
+    assert _msg == (
+        "RTK ERROR: Calculating the criticality matrix.  The following 1 "
+        "value(s) are out of range:\n"
+        "Failure mode ratio is outside the range [0.0, 1.0] for Mode ID: 101 "
+        "of Hardware ID: 2.")
+    assert 2 not in _matrix.index
+    assert 'III' not in _matrix.columns
+    assert _matrix.loc[3, 'II'] == pytest.approx(0.04)
+
+
+@pytest.mark.integration
+def test_criticality_matrix_hardware_hazard_rates(test_dao):
+    """ do_select_all() and do_set_hazard_rates() should use the hazard rates in the Hardware BoM data model. """
+    _hardware = dtmHardwareBoM(test_dao)
+    _hardware.select_all(1)
+    for _node in _hardware.tree.all_nodes()[1:]:
+        _node.data['hazard_rate_logistics'] = 0.001 * _node.identifier
+
+    DUT = dtmCriticalityMatrix(test_dao)
+    DUT.do_select_all(revision_id=1, hardware=_hardware)
+    DUT.calculate_dirty()
+
+    assert DUT.tree.get_node(5).data['hazard_rate_logistics'] == 0.005
+
+    _hardware.tree.get_node(5).data['hazard_rate_logistics'] = 0.5
+    DUT.do_set_hazard_rates(_hardware)
+
+    assert DUT._lst_dirty == [5]
+
+
+@pytest.mark.integration
+def test_request_select_criticality_matrix(test_dao, test_configuration):
+    """ request_select_criticality_matrix() should include the calculated hardware FMEA in the matrix. """
+    DUT = dtcFMEA(test_dao, test_configuration, test=True)
+    DUT.request_do_select_all(1, functional=False)
+    DUT.request_select_criticality_matrix(1)
+
+    for _node in DUT._dtm_data_model.tree.children(0):
+        _node.data.severity_class = 'IV'
+        _node.data.mode_ratio = 0.25
+        _node.data.mode_op_time = 4.0
+        _node.data.effect_probability = 1.0
+    DUT.request_calculate(0.01, rpn=False)
+
+    assert DUT._dtm_criticality._lst_dirty == [1]
+
+    _matrix = DUT.request_select_criticality_matrix(1)
+
+    assert list(_matrix.columns) == ['IV']
+    assert list(_matrix.index) == [1]
+    assert _matrix.loc[1, 'IV'] == pytest.approx(
+        0.01 * len(DUT._dtm_data_model.tree.children(0)))
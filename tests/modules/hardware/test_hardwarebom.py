@@ -8,11 +8,14 @@
 """Test class for testing Hardware BoM module algorithms and models. """
 
 from datetime import date
+from math import exp
 import pandas as pd
+from sqlalchemy import event
 from treelib import Tree
 
 import pytest
 
+from rtk.analyses.data import HARDWARE_ATTRIBUTES
 from rtk.modules.hardware import (
     dtmHardware, dtmDesignElectric, dtmDesignMechanic, dtmMilHdbkF, dtmNSWC,
     dtmReliability, dtmHardwareBoM, dtcHardwareBoM)
@@ -321,6 +324,40 @@ def test_select_all(test_dao):
     assert isinstance(_tree.get_node(1).data, dict)
 
 
+@pytest.mark.integration
+def test_select_all_single_query(test_dao):
+    """ select_all() should build the BoM and each table's Tree() with one query. """
+    DUT = dtmHardwareBoM(test_dao)
+
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append(statement)
+
+    event.listen(test_dao.engine, 'before_cursor_execute', _count)
+    try:
+        _tree = DUT.select_all(1)
+    finally:
+        event.remove(test_dao.engine, 'before_cursor_execute', _count)
+
+    assert len(_statements) == 1
+    assert sorted(DUT.dtm_hardware.tree.nodes.keys()) == sorted(
+        _tree.nodes.keys())
+    for _dtm in [
+            DUT.dtm_design_electric, DUT.dtm_design_mechanic,
+            DUT.dtm_mil_hdbk_f, DUT.dtm_nswc, DUT.dtm_reliability
+    ]:
+        assert 1 in _dtm.tree.nodes
+        assert set(_dtm.tree.nodes.keys()) <= set(_tree.nodes.keys())
+    assert _tree.get_node(2).bpointer == 1
+    assert _tree.get_node(1).data['hardware_id'] == 1
+    assert 'voltage_ac_operating' in _tree.get_node(1).data
+    assert 'pressure_upstream' in _tree.get_node(1).data
+    assert 'piP' in _tree.get_node(1).data
+    assert 'Clc' in _tree.get_node(1).data
+    assert 'hazard_rate_percent' in _tree.get_node(1).data
+
+
 @pytest.mark.integration
 def test_select(test_dao):
     """ select() should return an instance of the RTKHardware data model on success. """
@@ -453,6 +490,37 @@ def test_update_all(test_dao):
     assert _msg == ('RTK SUCCESS: Updating the RTK Program database.')
 
 
+@pytest.mark.integration
+def test_update_all_batched(test_dao):
+    """ update_all() should save the changes to each Hardware table with one UPDATE statement. """
+    DUT = dtmHardwareBoM(test_dao)
+    DUT.select_all(1)
+
+    DUT.dtm_hardware.select(1).page_number = '1-1'
+    DUT.dtm_hardware.select(2).page_number = '1-2'
+    DUT.dtm_reliability.select(1).add_adj_factor = 0.5
+    DUT.dtm_reliability.select(2).add_adj_factor = 0.5
+
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append(statement)
+
+    event.listen(test_dao.engine, 'before_cursor_execute', _count)
+    _error_code, _msg = DUT.update_all()
+    event.remove(test_dao.engine, 'before_cursor_execute', _count)
+
+    assert _error_code == 0
+    assert _msg == ('RTK SUCCESS: Updating the RTK Program database.')
+    assert [_stmt.split()[1] for _stmt in _statements
+            if _stmt.startswith('UPDATE')] == ['rtk_hardware',
+                                                'rtk_reliability']
+
+    DUT.select_all(1)
+    assert DUT.dtm_hardware.select(2).page_number == '1-2'
+    assert DUT.dtm_reliability.select(2).add_adj_factor == 0.5
+
+
 @pytest.mark.integration
 def test_data_controller_create(test_dao, test_configuration):
     """ __init__() should create an instance of a Hardware data controller. """
@@ -724,3 +792,243 @@ def test_request_make_composite_reference_designator(test_dao,
     assert _error_code == 0
     assert _msg == ''
     assert DUT.request_get_attributes(2)['comp_ref_des'] == 'S1:SS1'
+
+
+def _do_build_bom(n_assemblies, n_parts):
+    """Build a chain of n_assemblies with n_parts parts on the last one."""
+    DUT = dtmHardwareBoM(None)
+
+    for _node_id in range(1, n_assemblies + 1):
+        DUT.tree.create_node(
+            _node_id,
+            _node_id,
+            parent=_node_id - 1,
+            data=dict(
+                HARDWARE_ATTRIBUTES,
+                hardware_id=_node_id,
+                category_id=0,
+                cost_type_id=0,
+                part=0))
+    for _idx in range(n_parts):
+        _node_id = n_assemblies + _idx + 1
+        DUT.tree.create_node(
+            _node_id,
+            _node_id,
+            parent=n_assemblies,
+            data=dict(
+                HARDWARE_ATTRIBUTES,
+                hardware_id=_node_id,
+                category_id=3,
+                subcategory_id=2,
+                specification_id=1,
+                environment_active_id=3,
+                environment_dormant_id=2,
+                quality_id=2,
+                quantity=_idx + 1,
+                add_adj_factor=0.0,
+                mult_adj_factor=1.0,
+                duty_cycle=100.0,
+                cost=0.5,
+                cost_type_id=1,
+                total_power_dissipation=0.25))
+
+    return DUT
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_all():
+    """ calculate_all() should roll up the part results into each assembly. """
+    DUT = _do_build_bom(2, 3)
+
+    _results = DUT.calculate_all()
+
+    # Resistor, style RLR, ground fixed environment, quality level R.
+    _hr_part = 0.011 * 0.1 / 1E6
+    _system = DUT.tree.get_node(1).data
+    _assembly = DUT.tree.get_node(2).data
+    assert _results[0] == pytest.approx(6.0 * _hr_part)
+    # The dormant hazard rate does not include the quantity.
+    assert _results[1] == pytest.approx(0.2 * 3.0 * _hr_part)
+    assert _results[2:] == [0.0, 3.0, 6, 0.75]
+    assert _assembly['hazard_rate_active'] == _results[0]
+    assert _assembly['total_part_count'] == 6
+    assert _assembly['total_cost'] == 3.0
+    assert _assembly['total_power_dissipation'] == 0.75
+    assert _system['hazard_rate_active'] == _results[0]
+    assert _system['hazard_rate_logistics'] == (
+        _results[0] + _results[1] + _results[2])
+    assert _system['mtbf_logistics'] == 1.0 / _system['hazard_rate_logistics']
+    assert _system['total_part_count'] == 6
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_all_sub_tree():
+    """ calculate_all() should only calculate the sub-tree of the Node ID passed. """
+    DUT = _do_build_bom(3, 2)
+
+    _results = DUT.calculate_all(node_id=2)
+
+    assert _results[4] == 3
+    assert DUT.tree.get_node(2).data['total_part_count'] == 3
+    assert DUT.tree.get_node(1).data['total_part_count'] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_all_deep_tree():
+    """ calculate_all() should calculate hardware trees deeper than the recursion limit. """
+    DUT = _do_build_bom(5000, 1)
+
+    _results = DUT.calculate_all()
+
+    assert _results[4] == 1
+    assert DUT.tree.get_node(1).data['total_part_count'] == 1
+    assert DUT.tree.get_node(1).data['total_cost'] == 0.5
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_dirty():
+    """ calculate_dirty() should update the dirty parts' parents to the same results as calculate_all(). """
+    DUT = _do_build_bom(3, 4)
+    DUT.calculate_all()
+
+    DUT.tree.get_node(5).data['quantity'] = 10
+    DUT.tree.get_node(7).data['cost'] = 2.5
+    DUT.do_mark_dirty(5)
+    DUT.do_mark_dirty(7)
+
+    _lst_updated = DUT.calculate_dirty()
+
+    _expected = _do_build_bom(3, 4)
+    _expected.tree.get_node(5).data['quantity'] = 10
+    _expected.tree.get_node(7).data['cost'] = 2.5
+    _expected.calculate_all()
+
+    assert sorted(_lst_updated) == [0, 1, 2, 3, 5, 7]
+    for _node_id in [1, 2, 3]:
+        _attributes = DUT.tree.get_node(_node_id).data
+        _attributes_expected = _expected.tree.get_node(_node_id).data
+        for _key in [
+                'hazard_rate_active', 'hazard_rate_dormant', 'total_cost',
+                'total_power_dissipation', 'mtbf_logistics'
+        ]:
+            assert _attributes[_key] == pytest.approx(
+                _attributes_expected[_key])
+        assert _attributes['total_part_count'] == 18
+    assert DUT.calculate_dirty() == []
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_dirty_no_baseline():
+    """ calculate_dirty() should calculate the entire system when there are no previous results. """
+    DUT = _do_build_bom(2, 3)
+    DUT.do_mark_dirty(4)
+
+    _lst_updated = DUT.calculate_dirty()
+
+    assert sorted(_lst_updated) == [0, 1, 2, 3, 4, 5]
+    assert DUT.tree.get_node(1).data['total_part_count'] == 6
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_dirty_after_sub_tree():
+    """ calculate_dirty() should calculate the entire system after a sub-tree calculation. """
+    DUT = _do_build_bom(3, 2)
+    DUT.calculate_all()
+    DUT.calculate_all(node_id=2)
+    DUT.tree.get_node(4).data['quantity'] = 5
+    DUT.do_mark_dirty(4)
+
+    _lst_updated = DUT.calculate_dirty()
+
+    assert 1 in _lst_updated
+    assert DUT.tree.get_node(1).data['total_part_count'] == 7
+
+
+@pytest.mark.integration
+def test_request_set_attributes_marks_dirty(test_dao, test_configuration):
+    """ request_set_attributes() should mark the hardware item for recalculation. """
+    DUT = dtcHardwareBoM(test_dao, test_configuration, test=True)
+    DUT.request_select_all(1)
+
+    _attributes = DUT.request_get_attributes(2)
+    assert not DUT.request_set_attributes(2, _attributes)
+    assert not DUT.request_set_attributes(2, _attributes)
+
+    assert DUT._dtm_data_model._lst_dirty == [2]
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_calculate_parallel(n_workers):
+    """ calculate_parallel() should return the same results as calculate_all() and merge the part results into the BoM. """
+    DUT = _do_build_bom(3, 20)
+    _expected = _do_build_bom(3, 20).calculate_all()
+
+    _results = DUT.calculate_parallel(n_workers=n_workers, chunk_size=3)
+
+    assert _results == pytest.approx(_expected)
+    assert DUT.tree.get_node(1).data['total_part_count'] == 210
+    assert DUT.tree.get_node(4).data['hazard_rate_active'] == pytest.approx(
+        0.011 * 0.1 / 1E6)
+    assert DUT.tree.get_node(23).data['hazard_rate_active'] == pytest.approx(
+        20.0 * 0.011 * 0.1 / 1E6)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_parallel_sub_tree():
+    """ calculate_parallel() should only calculate the parts in the sub-tree of the Node ID passed. """
+    DUT = _do_build_bom(3, 4)
+    DUT.tree.create_node(
+        99,
+        99,
+        parent=1,
+        data=dict(DUT.tree.get_node(4).data, hardware_id=99, quantity=7))
+
+    _hazard_rate = DUT.tree.get_node(99).data['hazard_rate_active']
+
+    _results = DUT.calculate_parallel(node_id=2, n_workers=2, chunk_size=1)
+
+    assert _results[4] == 10
+    assert DUT.tree.get_node(99).data['hazard_rate_active'] == _hazard_rate
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_mission():
+    """ calculate_mission() should roll up the phase weighted part hazard rates and update the mission metrics. """
+    DUT = _do_build_bom(2, 3)
+    _ground_fixed = DUT.calculate(3)['hazard_rate_active']
+    DUT.calculate_mission([(1.0, 2, None)])
+    _ground_benign = DUT.tree.get_node(3).data['hazard_rate_mission']
+
+    _hazard_rate = DUT.calculate_mission([(3.0, None, None), (1.0, 2, 85.0)])
+
+    _part = DUT.tree.get_node(3).data
+    _system = DUT.tree.get_node(1).data
+    assert _part['hazard_rate_mission'] == pytest.approx(
+        0.75 * _ground_fixed + 0.25 * _ground_benign)
+    assert _ground_benign < _ground_fixed
+    assert _hazard_rate == _system['hazard_rate_mission']
+    assert _hazard_rate == pytest.approx(6.0 * _part['hazard_rate_mission'])
+    assert DUT.tree.get_node(2).data['hazard_rate_mission'] == _hazard_rate
+    assert _system['mtbf_mission'] == 1.0 / _hazard_rate
+    assert _system['reliability_mission'] == pytest.approx(
+        exp(-1.0 * _hazard_rate * _system['mission_time']))
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_mission_no_duration():
+    """ calculate_mission() should raise a ValueError when the mission phases have no duration. """
+    DUT = _do_build_bom(2, 3)
+
+    with pytest.raises(ValueError):
+        DUT.calculate_mission([(0.0, None, None)])
@@ -263,6 +263,255 @@ def test_foo_apportionment(test_dao):
     assert _children[3].data.reliability_alloc == pytest.approx(0.9998257)
 
 
+@pytest.mark.integration
+def test_calculate_all(test_dao):
+    """calculate_all() should return False on success and allocate the goals down the entire tree."""
+    DUT = dtmAllocation(test_dao)
+    DUT.select_all(1)
+
+    _parent = DUT.select(1)
+    _parent.method_id = 1
+    _parent.goal_measure_id = 1
+    _parent.reliability_goal = 0.99975
+    DUT.select(2).method_id = 1
+
+    assert not DUT.calculate_all()
+    assert _parent.n_sub_systems == 4
+    assert _parent.hazard_rate_goal == pytest.approx(2.5003126e-06)
+    for _child in DUT.select_children(1):
+        assert _child.data.reliability_alloc == pytest.approx(0.9999375)
+        assert _child.data.mtbf_alloc == pytest.approx(1599799.9916666)
+
+    _assembly = DUT.select(2)
+    assert _assembly.n_sub_systems == 3
+    assert _assembly.reliability_goal == pytest.approx(0.9999375)
+    assert _assembly.hazard_rate_goal == pytest.approx(6.2507815e-07)
+    assert _assembly.mtbf_goal == pytest.approx(1599799.9916666)
+    for _child in DUT.select_children(2):
+        assert _child.data.reliability_alloc == pytest.approx(0.9999792)
+        assert _child.data.hazard_rate_alloc == pytest.approx(2.0835938e-07)
+
+
+@pytest.mark.integration
+def test_calculate_all_same_as_calculate(test_dao):
+    """calculate_all() should allocate each level the same as calculate()."""
+    # The [parent, child 1, child 2, child 3, child 4] hazard rates.
+    _hazard_rates = [0.005862, 0.000392, 0.000168, 0.0000982, 0.000212]
+
+    for _method_ids in [(3, 4), (2, 1), (4, 3)]:
+        _models = []
+        for __ in range(2):
+            DUT = dtmAllocation(test_dao)
+            DUT.select_all(1)
+            _parent = DUT.select(1)
+            _parent.method_id = _method_ids[0]
+            _parent.goal_measure_id = 2
+            _parent.hazard_rate_goal = 2.5003126e-06
+            DUT.select(2).method_id = _method_ids[1]
+            DUT.select(2).goal_measure_id = 2
+            for _hardware_id in range(2, 9):
+                _child = DUT.select(_hardware_id)
+                _child.mission_time = 10.0 * _hardware_id
+                _child.duty_cycle = 100.0 - 5.0 * _hardware_id
+                _child.weight_factor = 0.1 * _hardware_id
+                _child.int_factor = _hardware_id
+                _child.soa_factor = 9 - _hardware_id
+                _child.op_time_factor = 1 + _hardware_id % 3
+                _child.env_factor = 2
+            _models.append(DUT)
+
+        assert not _models[0].calculate(1, _hazard_rates)
+        _assembly = _models[0].select(2)
+        _assembly.hazard_rate_goal = _assembly.hazard_rate_alloc
+        assert not _models[0].calculate(2, [0.000392, 0.0001, 0.0002, 0.00009])
+
+        assert not _models[1].calculate_all({
+            1: 0.005862,
+            2: 0.000392,
+            3: 0.000168,
+            4: 0.0000982,
+            5: 0.000212,
+            6: 0.0001,
+            7: 0.0002,
+            8: 0.00009
+        })
+
+        for _hardware_id in range(1, 9):
+            _expected = _models[0].select(_hardware_id)
+            _allocation = _models[1].select(_hardware_id)
+            assert _allocation.n_sub_systems == _expected.n_sub_systems
+            assert _allocation.weight_factor == pytest.approx(
+                _expected.weight_factor)
+            assert _allocation.percent_weight_factor == pytest.approx(
+                _expected.percent_weight_factor)
+            assert _allocation.reliability_alloc == pytest.approx(
+                _expected.reliability_alloc)
+            assert _allocation.hazard_rate_alloc == pytest.approx(
+                _expected.hazard_rate_alloc)
+            assert _allocation.mtbf_alloc == pytest.approx(
+                _expected.mtbf_alloc)
+
+
+@pytest.mark.integration
+def test_calculate_all_goal_error(test_dao):
+    """calculate_all() should return True and not allocate the children when the top-level goals can't be calculated."""
+    DUT = dtmAllocation(test_dao)
+    DUT.select_all(1)
+
+    _parent = DUT.select(1)
+    _parent.goal_measure_id = 1
+    _parent.reliability_goal = 0.0
+
+    assert DUT.calculate_all()
+    for _child in DUT.select_children(1):
+        assert _child.data.reliability_alloc == 0.0
+        assert _child.data.mtbf_alloc == 0.0
+
+
+@pytest.mark.integration
+def test_calculate_all_allocation_error(test_dao):
+    """calculate_all() should return True and not allocate the children of a hardware item whose allocation fails."""
+    DUT = dtmAllocation(test_dao)
+    DUT.select_all(1)
+
+    _parent = DUT.select(1)
+    _parent.method_id = 3
+    _parent.goal_measure_id = 1
+    _parent.reliability_goal = 0.99975
+
+    assert DUT.calculate_all({1: 0.005862, 3: 0.000168})
+    _assembly = DUT.select(2)
+    assert _assembly.weight_factor == 0.0
+    assert _assembly.hazard_rate_alloc == 0.0
+    assert _assembly.reliability_alloc == 0.0
+    assert _assembly.reliability_goal == 1.0
+    assert DUT.select(3).hazard_rate_alloc == pytest.approx(7.1656859e-08)
+    for _child in DUT.select_children(2):
+        assert _child.data.reliability_alloc == 0.0
+
+
+@pytest.mark.integration
+def test_calculate_feasibility_point_values(test_dao):
+    """calculate_feasibility() should return a zero error code on success and a probability of zero or one for attributes without a distribution."""
+    DUT = dtmAllocation(test_dao)
+    DUT.select_all(1)
+
+    _parent = DUT.select(1)
+    _parent.method_id = 1
+    _parent.goal_measure_id = 2
+    _parent.hazard_rate_goal = 0.0004
+
+    _error_code, _msg = DUT.calculate_feasibility(
+        1, {2: 0.00005, 3: 0.0002, 4: 0.0001, 5: 0.00009}, n_trials=1000)
+
+    assert _error_code == 0
+    assert _msg == 'RTK SUCCESS: Calculating allocation feasibility.'
+    assert DUT.goal_feasibility == {1: 0.0, 2: 1.0, 3: 0.0, 4: 1.0, 5: 1.0}
+
+
+@pytest.mark.integration
+def test_calculate_feasibility_distributions(test_dao):
+    """calculate_feasibility() should estimate the probability each goal is met from the sampled attributes."""
+    DUT = dtmAllocation(test_dao)
+    DUT.select_all(1)
+
+    _parent = DUT.select(1)
+    _parent.method_id = 4
+    _parent.goal_measure_id = 2
+    _parent.hazard_rate_goal = 0.0004
+
+    # The goal is allocated about equally when the weighting factors are
+    # about equal so a uniform hazard rate between zero and twice the
+    # allocation meets the allocation about half the time.
+    _distributions = {
+        2: {
+            'hazard_rate': ('uniform', (0.0, 0.0002))
+        },
+        3: {
+            'hazard_rate': ('normal', (0.00005, 0.00001))
+        },
+        4: {
+            'hazard_rate': ('uniform', (0.00005, 0.00015)),
+            'int_factor': ('uniform', (1.0, 1.0))
+        },
+        5: {
+            'env_factor': ('triangular', (0.5, 1.0, 1.5))
+        }
+    }
+    _hazard_rates = {2: 0.0001, 3: 0.0001, 4: 0.0001, 5: 0.0002}
+
+    _error_code, _msg = DUT.calculate_feasibility(
+        1, _hazard_rates, _distributions, n_trials=100000, seed=42)
+
+    assert _error_code == 0
+    assert DUT.goal_feasibility[2] == pytest.approx(0.5, abs=0.01)
+    assert DUT.goal_feasibility[3] == pytest.approx(1.0, abs=0.01)
+    assert DUT.goal_feasibility[4] == pytest.approx(0.5, abs=0.01)
+    assert DUT.goal_feasibility[5] == 0.0
+    assert 0.0 < DUT.goal_feasibility[1] < 0.5
+
+    _feasibility = DUT.goal_feasibility
+    DUT.calculate_feasibility(
+        1,
+        _hazard_rates,
+        _distributions,
+        n_trials=100000,
+        seed=42,
+        n_workers=2,
+        chunk_size=30000)
+    _parallel = DUT.goal_feasibility
+    DUT.calculate_feasibility(
+        1,
+        _hazard_rates,
+        _distributions,
+        n_trials=100000,
+        seed=42,
+        chunk_size=30000)
+
+    assert DUT.goal_feasibility == _parallel
+    assert DUT.goal_feasibility != _feasibility
+
+
+@pytest.mark.integration
+def test_calculate_feasibility_bad_distribution(test_dao):
+    """calculate_feasibility() should return a 2010 error code when passed a distribution that can't be sampled."""
+    DUT = dtmAllocation(test_dao)
+    DUT.select_all(1)
+    DUT.select(1).reliability_goal = 0.99975
+
+    _error_code, _msg = DUT.calculate_feasibility(
+        1, {}, {
+            2: {
+                'hazard_rate': ('gamma', (1.0, ))
+            },
+            3: {
+                'soa_factor': ('normal', (1.0, -1.0))
+            }
+        })
+
+    assert _error_code == 2010
+    assert _msg == ("RTK ERROR: Calculating allocation feasibility.  The "
+                    "following 2 distribution(s) are not valid:\n('gamma', "
+                    "(1.0,)) for the hazard_rate of Hardware ID 2.\n"
+                    "('normal', (1.0, -1.0)) for the soa_factor of Hardware "
+                    "ID 3.")
+    assert DUT.goal_feasibility == {}
+
+
+@pytest.mark.integration
+def test_calculate_feasibility_no_children(test_dao):
+    """calculate_feasibility() should return a 2010 error code when the hardware item has no children."""
+    DUT = dtmAllocation(test_dao)
+    DUT.select_all(1)
+
+    _error_code, _msg = DUT.calculate_feasibility(8, {})
+
+    assert _error_code == 2010
+    assert _msg == ('RTK ERROR: Calculating allocation feasibility.  '
+                    'Hardware ID 8 has no children or no allocation method '
+                    'or no trials were requested.')
+
+
 @pytest.mark.integration
 def test_create_allocation_data_controller(test_dao, test_configuration):
     """ __init__ should return instance of Allocation data controller. """
@@ -367,3 +616,36 @@ def test_request_calculate(test_dao, test_configuration):
     _hazard_rates = [0.005862, 0.000392, 0.000168, 0.0000982, 0.000212]
 
     assert not DUT.request_calculate(1)
+
+
+@pytest.mark.integration
+def test_request_calculate_all(test_dao, test_configuration):
+    """ request_calculate_all() should return False on success. """
+    DUT = dtcAllocation(test_dao, test_configuration, test='True')
+    DUT.request_select_all(1)
+
+    DUT.request_select(1).goal_measure_id = 1
+    DUT.request_select(1).reliability_goal = 0.99975
+
+    assert not DUT.request_calculate_all()
+    assert DUT.request_select(2).reliability_goal == pytest.approx(0.9999375)
+    assert DUT.request_select(6).reliability_alloc == pytest.approx(0.9999792)
+
+
+@pytest.mark.integration
+def test_request_calculate_feasibility(test_dao, test_configuration):
+    """ request_calculate_feasibility() should return False on success. """
+    DUT = dtcAllocation(test_dao, test_configuration, test='True')
+    DUT.request_select_all(1)
+
+    DUT.request_select(1).goal_measure_id = 1
+    DUT.request_select(1).reliability_goal = 0.99975
+
+    assert not DUT.request_calculate_feasibility(1, n_trials=1000)
+    assert DUT.request_goal_feasibility() == {
+        1: 1.0,
+        2: 1.0,
+        3: 1.0,
+        4: 1.0,
+        5: 1.0
+    }
@@ -183,6 +183,43 @@ def test_calculate_hri(test_dao):
     assert _hazard_analysis.system_hri_f == 6
 
 
+@pytest.mark.integration
+def test_calculate_all(test_dao):
+    """calculate_all() should return the same results as calculate() for each hazard."""
+    DUT = dtmHazardAnalysis(test_dao)
+    DUT.select_all(1)
+
+    _hazards = [
+        _node.data for _node in DUT.tree.all_nodes() if _node.data is not None
+    ]
+    for _idx, _hazard in enumerate(_hazards):
+        _hazard.assembly_severity = 'Medium'
+        _hazard.assembly_probability = 'Level A - Frequent'
+        _hazard.user_float_1 = 1.5 * _idx
+        _hazard.user_float_2 = 2.0 + _idx
+        _hazard.user_int_1 = _idx
+        _hazard.result_3 = 0.5
+        _hazard.function_1 = '(uf1 + ui1) / uf2'
+        _hazard.function_2 = 'uf1 if ui1 > 1 else res3'
+        _hazard.function_3 = ''
+    _hazards[0].function_4 = 'uf1.real'
+    _values = [(_hazard.function_4, _hazard.result_4) for _hazard in _hazards]
+
+    assert DUT.calculate_all()
+
+    for _idx, _hazard in enumerate(_hazards):
+        assert _hazard.assembly_hri == 20
+        assert _hazard.result_1 == pytest.approx(
+            (1.5 * _idx + _idx) / (2.0 + _idx))
+        assert _hazard.result_2 == (1.5 * _idx if _idx > 1 else 0.5)
+        assert _hazard.result_3 == 0.5
+        assert _hazard.result_4 == _values[_idx][1]
+
+    _hazards[0].function_4 = ''
+
+    assert not DUT.calculate_all()
+
+
 @pytest.mark.integration
 def test_create_hazard_analysis_data_controller(test_dao, test_configuration):
     """ __init__ should return instance of HazardAnalysis data controller. """
@@ -9,6 +9,7 @@
 
 from datetime import date
 
+from sqlalchemy import event
 from treelib import Tree
 import pandas as pd
 
@@ -17,7 +18,7 @@ import pytest
 from rtk.datamodels import RTKDataMatrix
 from rtk.modules.requirement import dtmRequirement, dtcRequirement
 from rtk.dao import DAO
-from rtk.dao import RTKRequirement
+from rtk.dao import RTKHardware, RTKMatrix, RTKRequirement
 
 __author__ = 'Andrew Rowland'
 __email__ = 'andrew.rowland@reliaqual.com'
@@ -404,6 +405,169 @@ def test_request_update_non_existent_matrix(test_dao, test_configuration):
     assert DUT.request_update_matrix(1, 'rqrmnt_rqrmnt')
 
 
+@pytest.mark.integration
+def test_update_matrix_changed_cells(test_dao, test_configuration):
+    """ update() should save only the changed cells of the matrix with one UPDATE statement. """
+    DUT = dtcRequirement(test_dao, test_configuration, test=True)
+    DUT.request_select_all_matrix(1, 'rqrmnt_hrdwr')
+
+    _matrix = DUT._dmx_rqmt_hw_matrix
+    _matrix.dtf_matrix[2][1] = 1
+    _matrix.dtf_matrix[3][1] = 2
+
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append((statement, parameters))
+
+    event.listen(test_dao.engine, 'before_cursor_execute', _count)
+    _error_code, _msg = _matrix.update(1, 'rqrmnt_hrdwr')
+    event.remove(test_dao.engine, 'before_cursor_execute', _count)
+
+    assert _error_code == 0
+    assert _msg == 'RTK SUCCESS: Updating Matrix rqrmnt_hrdwr.'
+    assert len(_statements) == 1
+    assert _statements[0][0].startswith('UPDATE rtk_matrix')
+    assert len(_statements[0][1]) == 2
+
+    # Nothing changed since the last save so nothing should be written.
+    event.listen(test_dao.engine, 'before_cursor_execute', _count)
+    _error_code, _msg = _matrix.update(1, 'rqrmnt_hrdwr')
+    event.remove(test_dao.engine, 'before_cursor_execute', _count)
+
+    assert _error_code == 0
+    assert len(_statements) == 1
+
+    DUT.request_select_all_matrix(1, 'rqrmnt_hrdwr')
+    assert _matrix.select(2, 1) == 1
+    assert _matrix.select(3, 1) == 2
+    assert _matrix.select(4, 1) == 0
+
+
+@pytest.mark.integration
+def test_update_matrix_new_row(test_dao, test_configuration):
+    """ update() should insert the cells of a row inserted into the matrix. """
+    DUT = dtcRequirement(test_dao, test_configuration, test=True)
+    DUT.request_select_all_matrix(1, 'rqrmnt_hrdwr')
+
+    _matrix = DUT._dmx_rqmt_hw_matrix
+    _matrix.insert(5, 'REL-0005')
+    _matrix.dtf_matrix[1][5] = 2
+
+    _error_code, _msg = _matrix.update(1, 'rqrmnt_hrdwr')
+
+    assert _error_code == 0
+
+    DUT.request_select_all_matrix(1, 'rqrmnt_hrdwr')
+    assert list(_matrix.dtf_matrix.index) == [1, 5]
+    assert _matrix.select(1, 5) == 2
+    assert _matrix.select(2, 5) == 0
+
+
+@pytest.mark.integration
+def test_sparse_matrix_select_all(test_dao):
+    """ select_all() should load only the non-zero cells of a sparse matrix and build the DataFrame on request. """
+    DUT = RTKDataMatrix(test_dao, RTKRequirement, RTKHardware, sparse=True)
+
+    assert not DUT.select_all(
+        1,
+        'rqrmnt_hrdwr',
+        rkey='requirement_id',
+        ckey='hardware_id',
+        rheader='requirement_code',
+        cheader='comp_ref_des')
+
+    assert DUT.lst_row_ids == sorted(DUT.dic_row_hdrs.keys())
+    assert DUT.lst_column_ids == sorted(DUT.dic_column_hdrs.keys())
+    assert 0 not in DUT.dic_cells.values()
+    assert DUT._dtf_matrix is None
+    assert DUT.select(8, 2) == 0
+    with pytest.raises(KeyError):
+        DUT.select(100, 1)
+
+    _matrix = DUT.dtf_matrix
+    assert isinstance(_matrix, pd.DataFrame)
+    assert _matrix.shape == (DUT.n_row, DUT.n_col)
+    assert _matrix.values.sum() == sum(DUT.dic_cells.values())
+
+
+@pytest.mark.integration
+def test_sparse_matrix_update(test_dao):
+    """ update() should store only the non-zero cells of a sparse matrix. """
+    DUT = RTKDataMatrix(test_dao, RTKRequirement, RTKHardware, sparse=True)
+    DUT.select_all(
+        1,
+        'rqrmnt_hrdwr',
+        rkey='requirement_id',
+        ckey='hardware_id',
+        rheader='requirement_code',
+        cheader='comp_ref_des')
+
+    # Change one cell through the DataFrame view and another through the
+    # cells.
+    DUT.dtf_matrix[7][2] = 2
+    DUT._do_fold_dense()
+    DUT.dic_cells[(8, 2)] = 1
+
+    _error_code, _msg = DUT.update(1, 'rqrmnt_hrdwr')
+
+    assert _error_code == 0
+    assert _msg == 'RTK SUCCESS: Updating Matrix rqrmnt_hrdwr.'
+
+    DUT.select_all(
+        1,
+        'rqrmnt_hrdwr',
+        rkey='requirement_id',
+        ckey='hardware_id',
+        rheader='requirement_code',
+        cheader='comp_ref_des')
+    assert DUT.select(7, 2) == 2
+    assert DUT.select(8, 2) == 1
+
+    DUT.dic_cells.pop((8, 2))
+    _error_code, _msg = DUT.update(1, 'rqrmnt_hrdwr')
+
+    assert _error_code == 0
+
+    _session = test_dao.RTK_SESSION(bind=test_dao.engine)
+    _cells = dict(((_matrix.column_item_id, _matrix.row_item_id),
+                   _matrix.value)
+                  for _matrix in _session.query(RTKMatrix).filter(
+                      RTKMatrix.matrix_type == 'rqrmnt_hrdwr').all())
+    _session.close()
+
+    assert 0 not in _cells.values()
+    assert (8, 2) not in _cells
+    assert _cells[(7, 2)] == 2
+
+
+@pytest.mark.integration
+def test_sparse_matrix_insert_delete(test_dao):
+    """ insert() and delete() should add and remove rows and columns of a sparse matrix. """
+    DUT = RTKDataMatrix(test_dao, RTKRequirement, RTKHardware, sparse=True)
+    DUT.select_all(
+        1,
+        'rqrmnt_hrdwr',
+        rkey='requirement_id',
+        ckey='hardware_id',
+        rheader='requirement_code',
+        cheader='comp_ref_des')
+
+    assert DUT.insert(100, 'REL-0100') == (
+        0, 'RTK SUCCESS: Inserting a row or column into the matrix.')
+    assert DUT.insert(100, 'REL-0100')[0] == 6
+    assert DUT.insert(100, 'S1:SS9', row=False)[0] == 0
+    assert DUT.select(100, 100) == 0
+
+    DUT.dic_cells[(100, 100)] = 1
+    assert DUT.delete(100, row=False) == (
+        0, 'RTK SUCCESS: Removing a row or column from the matrix.')
+    assert (100, 100) not in DUT.dic_cells
+    assert DUT.delete(100)[0] == 0
+    assert DUT.delete(100)[0] == 6
+    assert 100 not in DUT.lst_row_ids
+
+
 @pytest.mark.integration
 def test_request_update_all(test_dao, test_configuration):
     """ request_update_all() should return False on success. """
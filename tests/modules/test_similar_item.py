@@ -200,6 +200,81 @@ def test_user_defined(test_dao):
     assert _node.result_1 == pytest.approx(2.2446556e-06)
 
 
+@pytest.mark.integration
+def test_calculate_children(test_dao):
+    """calculate_children() should return False on success and calculate each child the same as calculate()."""
+    DUT = dtmSimilarItem(test_dao)
+    DUT.select_all(1)
+
+    for _hardware_id in [2, 3, 4]:
+        _node = DUT.select(_hardware_id)
+        _node.method_id = 1
+        _node.temperature_from = 27.5
+        _node.temperature_to = 25.0 + 10.0 * _hardware_id
+        _node.quality_from_id = 2
+        _node.quality_to_id = _hardware_id
+        _node.environment_from_id = 1
+        _node.environment_to_id = _hardware_id
+    _node = DUT.select(5)
+    _node.method_id = 2
+    _node.change_factor_1 = 0.75
+    _node.function_1 = 'hr * pi1'
+
+    _hazard_rates = {2: 2.5003126e-06, 3: 1.5e-06, 4: 3.2e-07, 5: 1.0e-06}
+
+    assert not DUT.calculate_children(1, _hazard_rates)
+
+    _node = DUT.select(2)
+    assert _node.temperature_from == 30.0
+    assert _node.temperature_to == 50.0
+    assert _node.change_factor_1 == 1.0
+    assert _node.change_factor_2 == 0.2
+    assert _node.change_factor_3 == 0.8
+    assert _node.result_1 == pytest.approx(1.5626954e-05)
+    assert DUT.select(5).result_1 == pytest.approx(7.5e-07)
+
+    _results = [(DUT.select(_hardware_id).change_factor_1,
+                 DUT.select(_hardware_id).change_factor_2,
+                 DUT.select(_hardware_id).change_factor_3,
+                 DUT.select(_hardware_id).result_1)
+                for _hardware_id in [2, 3, 4]]
+    for _hardware_id in [2, 3, 4]:
+        assert not DUT.calculate(_hardware_id, _hazard_rates[_hardware_id])
+    assert _results == [(DUT.select(_hardware_id).change_factor_1,
+                         DUT.select(_hardware_id).change_factor_2,
+                         DUT.select(_hardware_id).change_factor_3,
+                         DUT.select(_hardware_id).result_1)
+                        for _hardware_id in [2, 3, 4]]
+
+
+@pytest.mark.integration
+def test_calculate_children_key_error(test_dao):
+    """calculate_children() should return True when a child's conversion isn't in the Topic 633 tables."""
+    DUT = dtmSimilarItem(test_dao)
+    DUT.select_all(1)
+
+    for _hardware_id in [2, 3, 4, 5]:
+        _node = DUT.select(_hardware_id)
+        _node.method_id = 1
+        _node.temperature_from = 38.0
+        _node.temperature_to = 27.5
+        _node.quality_from_id = 2
+        _node.quality_to_id = 3
+        _node.environment_from_id = 4
+        _node.environment_to_id = 6
+    DUT.select(3).quality_to_id = 30
+    DUT.select(4).temperature_from = 380.0
+
+    assert DUT.calculate_children(1, {2: 0.000003335, 3: 0.000003335,
+                                      4: 0.000003335})
+    assert DUT.select(2).result_1 == pytest.approx(1.5312213e-06)
+    assert DUT.select(3).change_factor_1 == 1.0
+    assert DUT.select(3).result_1 == pytest.approx(9.1873278e-07)
+    assert DUT.select(4).change_factor_3 == 1.0
+    assert DUT.select(4).result_1 == pytest.approx(1.6843434e-06)
+    assert DUT.select(5).result_1 == 0.0
+
+
 @pytest.mark.integration
 def test_create_similar_item_data_controller(test_dao, test_configuration):
     """ __init__ should return instance of SimilarItem data controller. """
@@ -307,3 +382,25 @@ def test_request_calculate(test_dao, test_configuration):
 
     assert not DUT.request_calculate(1, 2.5003126e-06)
     assert DUT.request_select(1).result_1 == pytest.approx(2.2446556e-06)
+
+
+@pytest.mark.integration
+def test_request_calculate_children(test_dao, test_configuration):
+    """ request_calculate_children() should return False on success. """
+    DUT = dtcSimilarItem(test_dao, test_configuration, test='True')
+    DUT.request_select_all(1)
+
+    for _hardware_id in [6, 7, 8]:
+        DUT.request_select(_hardware_id).method_id = 1
+        DUT.request_select(_hardware_id).temperature_from = 27.5
+        DUT.request_select(_hardware_id).temperature_to = 35.0
+        DUT.request_select(_hardware_id).quality_from_id = 2
+        DUT.request_select(_hardware_id).quality_to_id = 3
+        DUT.request_select(_hardware_id).environment_from_id = 1
+        DUT.request_select(_hardware_id).environment_to_id = 3
+
+    assert not DUT.request_calculate_children(
+        2, {6: 2.5003126e-06, 7: 2.5003126e-06, 8: 2.5003126e-06})
+    for _hardware_id in [6, 7, 8]:
+        assert DUT.request_select(_hardware_id).result_1 == \
+            pytest.approx(1.5434028e-05)
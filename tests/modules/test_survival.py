@@ -0,0 +1,137 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       rtk.tests.modules.test_survival.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Test class for testing the Survival data model parameter bounds."""
+
+import numpy as np
+
+import pytest
+
+from rtk.modules.survival.Survival import Model
+from rtk.statistics.Bounds import calculate_fisher_bounds
+from rtk.statistics.distributions import MLE
+from rtk.statistics.distributions.Distributions import Exponential, Weibull
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "Weibullguy" Rowland'
+
+
+def _do_make_model(distribution_id, confidence_method):
+    """Create a Survival model fit to a right censored Weibull data set."""
+    _rng = np.random.RandomState(7)
+    _times = 500.0 * _rng.weibull(1.7, 60)
+    _data = np.zeros((60, 5))
+    _data[:, 1] = np.minimum(_times, 600.0)
+    _data[:, 2] = 1
+    _data[:, 3] = np.where(_times <= 600.0, 1, 2)
+    _data[:, 4] = _data[:, 1]
+
+    DUT = Model()
+    DUT.distribution_id = distribution_id
+    DUT.confidence_method = confidence_method
+    DUT.confidence = 0.9
+    DUT.rel_time = 600.0
+
+    if distribution_id == 5:
+        _fit = Exponential().maximum_likelihood_estimate(_data, 0.0, 600.0)
+    else:
+        _fit = Weibull().maximum_likelihood_estimate(_data, 0.0, 600.0)
+        DUT.shape[1] = _fit[0][1]
+    DUT.scale[1] = _fit[0][0]
+
+    return DUT, _data
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_parameter_bounds_likelihood_ratio():
+    """calculate_parameter_bounds() should set the profile likelihood bounds when the confidence method is likelihood ratio."""
+    DUT, _data = _do_make_model(8, 4)
+
+    assert not DUT.calculate_parameter_bounds(_data)
+
+    _bounds = MLE.profile_bounds(MLE.partition_data(_data), 0.9, 'weibull')
+    np.testing.assert_allclose([DUT.scale[0], DUT.scale[2]], _bounds[0])
+    np.testing.assert_allclose([DUT.shape[0], DUT.shape[2]], _bounds[1])
+    assert DUT.scale[0] < DUT.scale[1] < DUT.scale[2]
+    assert DUT.shape[0] < DUT.shape[1] < DUT.shape[2]
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_parameter_bounds_likelihood_ratio_exponential():
+    """calculate_parameter_bounds() should set the likelihood ratio bounds on the Exponential scale."""
+    DUT, _data = _do_make_model(5, 4)
+
+    assert not DUT.calculate_parameter_bounds(_data)
+
+    assert DUT.scale[0] < DUT.scale[1] < DUT.scale[2]
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_parameter_bounds_bootstrap():
+    """calculate_parameter_bounds() should set the BCa bounds when the confidence method is bootstrap."""
+    DUT, _data = _do_make_model(8, 5)
+
+    assert not DUT.calculate_parameter_bounds(_data)
+
+    assert DUT.dicBootstrap['names'] == ('eta', 'beta', 'b10', 'mtbf')
+    assert (DUT.scale[0], DUT.scale[2]) == DUT.dicBootstrap['bca']['eta']
+    assert (DUT.shape[0], DUT.shape[2]) == DUT.dicBootstrap['bca']['beta']
+    assert DUT.scale[0] < DUT.scale[1] < DUT.scale[2]
+    assert DUT.shape[0] < DUT.shape[1] < DUT.shape[2]
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_parameter_bounds_bootstrap_seed():
+    """calculate_parameter_bounds() should return the same bootstrap bounds for the same seed whether or not the calculations are parallel."""
+    DUT, _data = _do_make_model(8, 5)
+    DUT.seed = 3
+    assert DUT._do_get_n_workers() == 1
+    assert not DUT.calculate_parameter_bounds(_data)
+    _bounds = [DUT.scale[0], DUT.scale[2], DUT.shape[0], DUT.shape[2]]
+
+    DUT.parallel_calcs = True
+    assert not DUT.calculate_parameter_bounds(_data)
+
+    assert [DUT.scale[0], DUT.scale[2], DUT.shape[0],
+            DUT.shape[2]] == _bounds
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_parameter_bounds_fisher():
+    """calculate_parameter_bounds() should set the Fisher bounds from the observed information when the confidence method is Fisher."""
+    DUT, _data = _do_make_model(8, 3)
+
+    assert not DUT.calculate_parameter_bounds(_data)
+
+    _fit = Weibull().maximum_likelihood_estimate(_data, 0.0, 600.0)
+    np.testing.assert_allclose([DUT.scale[0], DUT.scale[2]],
+                               calculate_fisher_bounds(
+                                   DUT.scale[1], _fit[1][0], 0.9))
+    np.testing.assert_allclose([DUT.shape[0], DUT.shape[2]],
+                               calculate_fisher_bounds(
+                                   DUT.shape[1], _fit[1][2], 0.9))
+    assert DUT.scale[0] < DUT.scale[1] < DUT.scale[2]
+    assert DUT.shape[0] < DUT.shape[1] < DUT.shape[2]
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_parameter_bounds_fisher_exponential():
+    """calculate_parameter_bounds() should set the Fisher bounds on the Exponential scale."""
+    DUT, _data = _do_make_model(5, 3)
+
+    assert not DUT.calculate_parameter_bounds(_data)
+
+    assert DUT.scale[0] < DUT.scale[1] < DUT.scale[2]
+    assert DUT.shape == [0.0, 0.0, 0.0]
@@ -7,6 +7,7 @@
 # Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
 """Test class for Usage Profile algorithms and models."""
 
+from sqlalchemy import event
 from treelib import Tree
 
 import pytest
@@ -51,9 +52,9 @@ def test_select_all(test_dao):
 
     assert isinstance(_tree, Tree)
     assert _tree.get_node(0).tag == 'Usage Profiles'
-    assert isinstance(_tree.get_node(1).data, RTKMission)
-    assert isinstance(_tree.get_node(11).data, RTKMissionPhase)
-    assert isinstance(_tree.get_node(111).data, RTKEnvironment)
+    assert isinstance(_tree.get_node('1').data, RTKMission)
+    assert isinstance(_tree.get_node('1.1').data, RTKMissionPhase)
+    assert isinstance(_tree.get_node('1.1.1').data, RTKEnvironment)
 
 
 @pytest.mark.integration
@@ -64,7 +65,103 @@ def test_select_all_non_existent_id(test_dao):
 
     assert isinstance(_tree, Tree)
     assert _tree.get_node(0).tag == 'Usage Profiles'
-    assert _tree.get_node(1) is None
+    assert _tree.get_node('1') is None
+
+
+@pytest.mark.integration
+def test_select_all_three_queries(test_dao):
+    """ select_all() should retrieve the Usage Profile with one query each for the missions, mission phases, and environments. """
+    DUT = dtmUsageProfile(test_dao)
+
+    _statements = []
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        _statements.append(statement)
+
+    event.listen(test_dao.engine, 'before_cursor_execute', _count)
+    _tree = DUT.select_all(1)
+    event.remove(test_dao.engine, 'before_cursor_execute', _count)
+
+    assert len(_statements) == 3
+    assert _tree.parent('1.1').identifier == '1'
+    assert _tree.parent('1.1.1').identifier == '1.1'
+    assert DUT.dic_phases[1] == '1.1'
+    assert DUT.dic_environments[1] == (1, '1.1.1')
+
+
+@pytest.mark.unit
+def test_node_ids_do_not_collide():
+    """ _do_add_node() should create a unique Node ID for mission 1/phase 12 and mission 11/phase 2. """
+    DUT = dtmUsageProfile(None)
+
+    for _mission_id, _phase_id in [(1, 12), (11, 2)]:
+        _mission = RTKMission(mission_id=_mission_id)
+        _node_id = DUT._do_add_node(_mission, 0, _mission_id, 'Mission')
+        _phase = RTKMissionPhase(mission_id=_mission_id, phase_id=_phase_id)
+        DUT._do_add_node(_phase, _node_id, _phase_id, 'Phase')
+
+    assert DUT.tree.get_node('1.12').data.phase_id == 12
+    assert DUT.tree.get_node('11.2').data.phase_id == 2
+    assert DUT.dic_phases == {12: '1.12', 2: '11.2'}
+
+
+@pytest.mark.unit
+def test_add_node_string_root():
+    """ _do_add_node() should add a mission to the root when the root Node ID is passed as a string. """
+    DUT = dtmUsageProfile(None)
+
+    _node_id = DUT._do_add_node(RTKMission(mission_id=3), '0', 3, 'Mission')
+
+    assert _node_id == '3'
+    assert DUT.tree.parent('3').identifier == 0
+
+
+@pytest.mark.integration
+def test_select_phase(test_dao):
+    """ select_phase() should return the RTKMissionPhase an environment belongs to. """
+    DUT = dtmUsageProfile(test_dao)
+    DUT.select_all(1)
+
+    _phase = DUT.select_phase(1)
+
+    assert isinstance(_phase, RTKMissionPhase)
+    assert _phase.phase_id == 1
+    assert DUT.select_phase(100) is None
+
+
+@pytest.mark.integration
+def test_select_environments(test_dao):
+    """ select_environments() should return the list of RTKEnvironment in a mission phase. """
+    DUT = dtmUsageProfile(test_dao)
+    DUT.select_all(1)
+
+    _environments = DUT.select_environments(1)
+
+    assert _environments
+    assert all(
+        isinstance(_environment, RTKEnvironment) and _environment.phase_id == 1
+        for _environment in _environments)
+    assert DUT.select_environments(100) == []
+
+
+@pytest.mark.integration
+def test_get_mission_phases(test_dao):
+    """ get_mission_phases() should return the duration, environment, and temperature of each phase of a mission. """
+    DUT = dtmUsageProfile(test_dao)
+    DUT.select_all(1)
+
+    _phase = DUT.select('1.1')
+    _phase.phase_start = 2.0
+    _phase.phase_end = 10.0
+    _environment = DUT.select('1.1.1')
+    _environment.name = 'Temperature'
+    _environment.mean = 45.0
+
+    _phases = DUT.get_mission_phases(1, {1: 3})
+
+    assert _phases[0] == (8.0, 3, 45.0)
+    assert len(_phases) == len(DUT.tree.children('1'))
+    assert DUT.get_mission_phases(100) == []
 
 
 @pytest.mark.integration
@@ -73,7 +170,7 @@ def test_select(test_dao):
     DUT = dtmUsageProfile(test_dao)
     DUT.select_all(1)
 
-    _entity = DUT.select(1)
+    _entity = DUT.select('1')
 
     assert isinstance(_entity, RTKMission)
     assert _entity.description == 'Test Mission'
@@ -90,7 +187,7 @@ def test_insert_mission(test_dao):
     assert _error_code == 0
     assert _msg == ("RTK SUCCESS: Adding one or more items to the RTK Program "
                     "database.")
-    assert isinstance(DUT.select(2), RTKMission)
+    assert isinstance(DUT.select('2'), RTKMission)
 
 
 @pytest.mark.integration
@@ -99,12 +196,12 @@ def test_insert_phase(test_dao):
     DUT = dtmUsageProfile(test_dao)
     DUT.select_all(1)
 
-    _error_code, _msg = DUT.insert(entity_id=2, parent_id=1, level='phase')
+    _error_code, _msg = DUT.insert(entity_id=2, parent_id='1', level='phase')
 
     assert _error_code == 0
     assert _msg == ("RTK SUCCESS: Adding one or more items to the RTK Program "
                     "database.")
-    assert isinstance(DUT.select(12), RTKMissionPhase)
+    assert isinstance(DUT.select('1.2'), RTKMissionPhase)
 
 
 @pytest.mark.integration
@@ -114,12 +211,12 @@ def test_insert_environment(test_dao):
     DUT.select_all(1)
 
     _error_code, _msg = DUT.insert(
-        entity_id=2, parent_id=11, level='environment')
+        entity_id=2, parent_id='1.1', level='environment')
 
     assert _error_code == 0
     assert _msg == ("RTK SUCCESS: Adding one or more items to the RTK Program "
                     "database.")
-    assert isinstance(DUT.tree.get_node(112).data, RTKEnvironment)
+    assert isinstance(DUT.tree.get_node('1.1.2').data, RTKEnvironment)
 
 
 @pytest.mark.integration
@@ -144,11 +241,16 @@ def test_delete_environment(test_dao):
     DUT = dtmUsageProfile(test_dao)
     DUT.select_all(1)
 
-    _error_code, _msg = DUT.delete(223)
+    assert DUT.dic_environments[3] == (2, '2.2.3')
+
+    _error_code, _msg = DUT.delete('2.2.3')
 
     assert _error_code == 0
     assert _msg == ("RTK SUCCESS: Deleting an item from the RTK Program "
                     "database.")
+    assert 3 not in DUT.dic_environments
+    assert DUT.select_phase(3) is None
+    assert DUT.last_id is None
 
 
 @pytest.mark.integration
@@ -157,7 +259,7 @@ def test_delete_non_existent_node_id(test_dao):
     DUT = dtmUsageProfile(test_dao)
     DUT.select_all(1)
 
-    _error_code, _msg = DUT.delete(4)
+    _error_code, _msg = DUT.delete('4')
 
     assert _error_code == 2005
     assert _msg == ("  RTK ERROR: Attempted to delete non-existent Usage "
@@ -170,7 +272,7 @@ def test_update(test_dao):
     DUT = dtmUsageProfile(test_dao)
     DUT.select_all(1)
 
-    _error_code, _msg = DUT.update(1)
+    _error_code, _msg = DUT.update('1')
 
     assert _error_code == 0
     assert _msg == ("RTK SUCCESS: Updating the RTK Program database.")
@@ -182,7 +284,7 @@ def test_update_non_existent_node_id(test_dao):
     DUT = dtmUsageProfile(test_dao)
     DUT.select_all(1)
 
-    _error_code, _msg = DUT.update(100)
+    _error_code, _msg = DUT.update('100')
 
     assert _error_code == 2006
     assert _msg == ("RTK ERROR: Attempted to save non-existent Usage Profile "
@@ -218,6 +320,21 @@ def test_request_select_all(test_dao, test_configuration):
     assert isinstance(DUT.request_select_all(1), Tree)
 
 
+@pytest.mark.integration
+def test_request_select_phase(test_dao, test_configuration):
+    """ request_select_phase() and request_select_environments() should return the phase of an environment and the environments of a phase. """
+    DUT = dtcUsageProfile(test_dao, test_configuration, test=True)
+    DUT.request_select_all(1)
+
+    _phase = DUT.request_select_phase(1)
+
+    assert isinstance(_phase, RTKMissionPhase)
+    assert 1 in [
+        _environment.environment_id
+        for _environment in DUT.request_select_environments(_phase.phase_id)
+    ]
+
+
 @pytest.mark.integration
 def test_request_insert_mission(test_dao, test_configuration):
     """ request_insert() should return False on success. """
@@ -233,7 +350,7 @@ def test_request_delete(test_dao, test_configuration):
     DUT = dtcUsageProfile(test_dao, test_configuration, test=True)
     DUT.request_select_all(1)
 
-    assert not DUT.request_delete(3)
+    assert not DUT.request_delete('3')
 
 
 @pytest.mark.integration
@@ -242,7 +359,7 @@ def test_request_delete_non_existent_id(test_dao, test_configuration):
     DUT = dtcUsageProfile(test_dao, test_configuration, test=True)
     DUT.request_select_all(1)
 
-    assert DUT.request_delete(222)
+    assert DUT.request_delete('2.2.2')
 
 
 @pytest.mark.integration
@@ -251,7 +368,7 @@ def test_request_get_attributes(test_dao, test_configuration):
     DUT = dtcUsageProfile(test_dao, test_configuration, test=True)
     DUT.request_select_all(1)
 
-    _attributes = DUT.request_get_attributes(1)
+    _attributes = DUT.request_get_attributes('1')
 
     assert isinstance(_attributes, dict)
     assert _attributes['revision_id'] == 1
@@ -263,7 +380,7 @@ def test_request_set_attributes(test_dao, test_configuration):
     DUT = dtcUsageProfile(test_dao, test_configuration, test=True)
     DUT.request_select_all(1)
 
-    _error_code, _msg = DUT.request_set_attributes(1, ATTRIBUTES)
+    _error_code, _msg = DUT.request_set_attributes('1', ATTRIBUTES)
 
     assert _error_code == 0
     assert _msg == ('RTK SUCCESS: Updating RTKMission 1 attributes.')
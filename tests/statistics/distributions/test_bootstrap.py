@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+#
+#       tests.statistics.distributions.test_bootstrap.py is part of The RTK
+#       Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Test class for the bootstrap confidence interval module."""
+
+import numpy as np
+
+import pytest
+
+from rtk.statistics.distributions import MLE
+from rtk.statistics.distributions.Bootstrap import METRICS, \
+    _do_acceleration, bootstrap, calculate_metrics, resample
+
+from test_mle import _do_make_data
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_metrics():
+    """calculate_metrics() should return the parameters, B10 life, and MTBF."""
+    np.testing.assert_allclose(
+        calculate_metrics([0.002], 'exponential'),
+        [0.002, -np.log(0.9) / 0.002, 500.0])
+    np.testing.assert_allclose(
+        calculate_metrics([500.0, 1.0], 'weibull'),
+        [500.0, 1.0, -500.0 * np.log(0.9), 500.0])
+    np.testing.assert_allclose(
+        calculate_metrics([500.0, 80.0], 'gaussian'),
+        [500.0, 80.0, 500.0 - 1.2815516 * 80.0, 500.0])
+    np.testing.assert_allclose(
+        calculate_metrics([6.0, 0.8], 'lognormal'),
+        [6.0, 0.8, np.exp(6.0 - 1.2815516 * 0.8), np.exp(6.32)])
+
+    _metrics = calculate_metrics(
+        np.array([[500.0, 600.0], [1.0, 2.0]]), 'weibull')
+
+    assert _metrics.shape == (4, 2)
+    np.testing.assert_allclose(_metrics[:, 1],
+                               calculate_metrics([600.0, 2.0], 'weibull'))
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_resample():
+    """resample() should draw the same number of observations with their intervals and status."""
+    _data = _do_make_data('weibull', 50)
+
+    _resampled = resample(_data, np.random.RandomState(1))
+
+    assert np.sum(_resampled[:, 2]) == np.sum(_data[:, 2])
+    _original = set(tuple(_record) for _record in _data[:, [0, 1, 3]])
+    assert set(tuple(_record)
+               for _record in _resampled[:, [0, 1, 3]]) <= _original
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_acceleration():
+    """_do_acceleration() should match the acceleration from the jackknife."""
+    _data = _do_make_data('weibull', 40)
+    _partition = MLE.partition_data(_data)
+    _params = MLE.fit_partition(_partition, 'weibull')['parameters']
+
+    _metrics = []
+    for _idx in range(len(_data)):
+        _jackknife = _data.copy()
+        _jackknife[_idx, 2] -= 1
+        _metrics.append(
+            calculate_metrics(
+                MLE.fit_partition(
+                    MLE.partition_data(_jackknife[_jackknife[:, 2] > 0]),
+                    'weibull', _params)['parameters'], 'weibull'))
+    _metrics = np.array(_metrics)
+    _weights = _data[:, 2][:, None]
+    _influence = np.sum(_weights * _metrics, axis=0) / np.sum(
+        _weights) - _metrics
+
+    np.testing.assert_allclose(
+        _do_acceleration(_partition, _params, 'weibull'),
+        np.sum(_weights * _influence**3.0, axis=0) /
+        (6.0 * np.sum(_weights * _influence**2.0, axis=0)**1.5),
+        rtol=0.15)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('dist', sorted(METRICS))
+def test_bootstrap(dist):
+    """bootstrap() should return percentile and BCa intervals around the estimates."""
+    _data = _do_make_data(dist, 60)
+
+    _results = bootstrap(_data, dist, n_replicates=100, seed=1)
+
+    assert _results['names'] == METRICS[dist]
+    assert _results['replicates'].shape == (100 - _results['n_failed'],
+                                            len(METRICS[dist]))
+    assert _results['n_failed'] < 5
+    np.testing.assert_allclose(
+        [_results['estimates'][_name] for _name in METRICS[dist]],
+        calculate_metrics(
+            MLE.maximum_likelihood(_data, dist=dist)['parameters'], dist),
+        rtol=1.0E-6)
+    for _name in METRICS[dist]:
+        for _method in ['percentile', 'bca']:
+            _lower, _upper = _results[_method][_name]
+            assert _lower < _results['estimates'][_name] < _upper
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_bootstrap_reproducible():
+    """bootstrap() should return the same results for a seed with any number of workers."""
+    _data = _do_make_data('exponential', 40)
+
+    _serial = bootstrap(_data, n_replicates=40, seed=3, chunk_size=10)
+    _pooled = bootstrap(
+        _data, n_replicates=40, seed=3, chunk_size=10, n_workers=2)
+    _other = bootstrap(_data, n_replicates=40, seed=4, chunk_size=10)
+
+    np.testing.assert_array_equal(_serial['replicates'],
+                                  _pooled['replicates'])
+    assert _serial['bca'] == _pooled['bca']
+    assert not np.array_equal(_serial['replicates'], _other['replicates'])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_bootstrap_window():
+    """bootstrap() should resample only the records inside the time window."""
+    _data = _do_make_data('exponential', 60)
+
+    _results = bootstrap(_data, n_replicates=20, end=300.0, seed=1)
+
+    assert _results['estimates']['theta'] == pytest.approx(
+        MLE.maximum_likelihood(_data, end=300.0)['parameters'][0])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_bootstrap_unknown():
+    """bootstrap() should raise KeyError for an unknown distribution."""
+    with pytest.raises(KeyError):
+        bootstrap(_do_make_data('weibull', 10), 'gumbel')
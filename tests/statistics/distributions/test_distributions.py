@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+#       tests.statistics.distributions.test_distributions.py is part of The
+#       RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Test class for the survival distributions module."""
+
+import numpy as np
+import scipy.optimize as optimize
+
+import pytest
+
+from rtk.statistics.distributions import MLE
+from rtk.statistics.distributions.Distributions import Exponential, \
+    Gaussian, LogNormal, Weibull, build_data_set, fisher_information, format_data_set
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+_RECORDS = [(0, 0.0, 56.7, 0.0, u'Event', 1, 719163),
+            (1, 0.0, 286.1, 0.0, u'Right Censored', 4, 719163),
+            (2, 100.0, 152.1, 0.0, u'Interval Censored', 2, 719163),
+            (3, 0.0, 198.4, 56.7, 2, 3, 719163),
+            (4, 0.0, 233.3, 0.0, '4', 1, 719163),
+            (5, 0.0, 322.9, 0.0, u'Unknown', 1, 719163)]
+
+
+@pytest.mark.unit
+def test_build_data_set():
+    """build_data_set() should return one weighted row per record sorted by time."""
+    _data = build_data_set(_RECORDS)
+
+    np.testing.assert_array_equal(
+        _data, [[0.0, 56.7, 1.0, 1.0, 0.0], [100.0, 152.1, 2.0, 3.0, 0.0],
+                [0.0, 198.4, 3.0, 2.0, 56.7], [0.0, 233.3, 1.0, 3.0, 0.0],
+                [0.0, 286.1, 4.0, 2.0, 0.0], [0.0, 322.9, 1.0, 1.0, 0.0]])
+
+
+@pytest.mark.unit
+def test_build_data_set_window():
+    """build_data_set() should drop the records outside the start and end times."""
+    _data = build_data_set(_RECORDS, 50.0, 300.0)
+
+    np.testing.assert_array_equal(_data[:, 1], [152.1])
+    assert build_data_set([]).shape == (0, 5)
+
+
+@pytest.mark.unit
+def test_format_data_set():
+    """format_data_set() should count the observations rather than the records."""
+    _data, _n_records, _n_suspensions, _n_failures = format_data_set(
+        _RECORDS, 0.0, 0.0)
+
+    assert (_n_records, _n_suspensions, _n_failures) == (12, 7, 5)
+    np.testing.assert_array_equal(_data[:, 1],
+                                  [56.7, 152.1, np.inf, 233.3, np.inf, 322.9])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_fisher_information():
+    """fisher_information() should return the outer product of the scores over the grid."""
+    _times = np.array([10.0, 250.0, 400.0, 1200.0])
+    _scores = np.vstack((1.0 / 0.002 - _times, 0.002 * np.ones(4)))
+
+    _fisher = fisher_information(Exponential().log_pdf, [0.002, 0.0], _times)
+
+    np.testing.assert_allclose(_fisher, np.dot(_scores, _scores.T),
+                               rtol=1.0E-5)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_maximum_likelihood_estimate_variance():
+    """maximum_likelihood_estimate() should return the variances from the observed information."""
+    _rng = np.random.RandomState(1)
+    _times = 1000.0 * _rng.weibull(1.7, 200)
+    _data = np.zeros((200, 5))
+    _data[:, 1] = np.minimum(_times, 1200.0)
+    _data[:, 2] = 1
+    _data[:, 3] = np.where(_times <= 1200.0, 1, 2)
+    _data[:, 4] = _data[:, 1]
+    _partition = MLE.partition_data(_data)
+
+    _fit = Exponential().maximum_likelihood_estimate(_data, 0.0, 1200.0)
+
+    assert _fit[1][0] == pytest.approx(_fit[0][0]**2.0 / _fit[4])
+
+    _fit = Weibull().maximum_likelihood_estimate(_data, 0.0, 1200.0)
+    _covariance = np.linalg.inv(
+        MLE.observed_information(_partition, _fit[0][:2], 'weibull'))
+
+    np.testing.assert_allclose(
+        _fit[1], [_covariance[0, 0], _covariance[0, 1], _covariance[1, 1]])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('distribution, dist', [(Exponential, 'exponential'),
+                                                (Gaussian, 'gaussian'),
+                                                (LogNormal, 'lognormal'),
+                                                (Weibull, 'weibull')])
+def test_maximum_likelihood_estimate(distribution, dist):
+    """maximum_likelihood_estimate() should return the maximum likelihood estimates of a right censored data set."""
+    _rng = np.random.RandomState(3)
+    _times = 500.0 * _rng.weibull(1.7, 500)
+    _data = np.zeros((500, 5))
+    _data[:, 1] = np.minimum(_times, 600.0)
+    _data[:, 2] = 1
+    _data[:, 3] = np.where(_times <= 600.0, 1, 2)
+    _data[:, 4] = _data[:, 1]
+    _partition = MLE.partition_data(_data)
+
+    _fit = distribution().maximum_likelihood_estimate(_data, 0.0, 600.0)
+    _mle = MLE.maximum_likelihood(_data, 0.0, 600.0, dist)
+    _k = len(_mle['parameters'])
+
+    # An independent search of the log-likelihood.
+    _direct = optimize.minimize(
+        lambda x: -MLE.log_likelihood(_partition, x, dist)[0],
+        _mle['parameters'] * 1.1,
+        method='Nelder-Mead',
+        options={'xatol': 1.0E-8, 'fatol': 1.0E-10, 'maxiter': 5000}).x
+
+    np.testing.assert_allclose(_fit[0][:_k], _mle['parameters'])
+    np.testing.assert_allclose(_fit[0][:_k], _direct, rtol=1.0E-5)
+    assert _fit[2][0] == pytest.approx(_mle['log_likelihood'])
+    assert (_fit[3], _fit[4]) == (np.sum(_data[:, 3] == 2),
+                                  np.sum(_data[:, 3] == 1))
+
+    if _k == 2:
+        _bounds = MLE.profile_bounds(_partition, 0.9, dist)
+        assert _bounds[0][0] < _fit[0][0] < _bounds[0][1]
+        assert _bounds[1][0] < _fit[0][1] < _bounds[1][1]
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_likelihood_bounds():
+    """likelihood_bounds() should return the profile likelihood bounds on both parameters."""
+    _rng = np.random.RandomState(1)
+    _times = _rng.lognormal(6.0, 0.8, 200)
+    _data = np.zeros((200, 5))
+    _data[:, 1] = np.minimum(_times, 800.0)
+    _data[:, 2] = 1
+    _data[:, 3] = np.where(_times <= 800.0, 1, 2)
+    _data[:, 4] = _data[:, 1]
+    _partition = MLE.partition_data(_data)
+
+    _weibull = MLE.profile_bounds(_partition, 0.9, 'weibull')
+    _lognormal = MLE.profile_bounds(_partition, 0.9, 'lognormal')
+
+    np.testing.assert_allclose(
+        Weibull().likelihood_bounds([900.0, 1.5], 0.9, _data),
+        _weibull[0] + _weibull[1])
+    np.testing.assert_allclose(
+        LogNormal().likelihood_bounds([6.0, 0.8], 0.9, _data),
+        _lognormal[0] + _lognormal[1])
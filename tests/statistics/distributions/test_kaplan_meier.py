@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+#
+#       tests.statistics.distributions.test_kaplan_meier.py is part of The
+#       RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Test class for the Kaplan-Meier module."""
+
+import numpy as np
+
+import pytest
+
+from rtk.statistics.distributions.KaplanMeier import kaplan_meier
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+# Data is from Lee and Wang, page 69, example 4.2.
+_DATA = [('', 3.0, 3.0, 0.0, u'Event', 1),
+         ('', 4.0, 4.0, 0.0, u'Right Censored', 1),
+         ('', 5.7, 5.7, 0.0, u'Right Censored', 1),
+         ('', 6.5, 6.5, 0.0, u'Event', 1), ('', 6.5, 6.5, 0.0, u'Event', 1),
+         ('', 8.4, 8.4, 0.0, u'Right Censored', 1),
+         ('', 10.0, 10.0, 0.0, u'Event', 1),
+         ('', 10.0, 10.0, 0.0, u'Right Censored', 1),
+         ('', 12.0, 12.0, 0.0, u'Event', 1), ('', 15.0, 15.0, 0.0, u'Event', 1)]
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_kaplan_meier():
+    """kaplan_meier() should return the product-limit estimates and bounds."""
+    _km, _rank = kaplan_meier(_DATA, 0.0, 100000.0)
+
+    # The bounds were calculated with an approximate normal quantile so they
+    # only agree to about four places.
+    np.testing.assert_allclose(
+        _km, [[3.0, 0.71671928, 0.9, 0.96722054],
+              [4.0, 0.71671928, 0.9, 0.96722054],
+              [5.7, 0.71671928, 0.9, 0.96722054],
+              [6.5, 0.41797166, 0.64285714, 0.79948773],
+              [8.4, 0.41797166, 0.64285714, 0.79948773],
+              [10.0, 0.25976276, 0.48214286, 0.67381139],
+              [12.0, 0.06504527, 0.24107143, 0.47680147],
+              [15.0, 0.0, 0.0, 0.0]],
+        atol=1.0E-4)
+    np.testing.assert_array_equal(_rank, [1, 4, 5, 7, 9, 10])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_kaplan_meier_quantities():
+    """kaplan_meier() should weight each record by its quantity."""
+    _data = [('', 3.0, 3.0, 0.0, u'Event', 1),
+             ('', 4.0, 4.0, 0.0, u'Right Censored', 2),
+             ('', 10.0, 10.0, 0.0, u'Right Censored', 1),
+             ('', 6.5, 6.5, 0.0, u'Event', 2),
+             ('', 8.4, 8.4, 0.0, u'Right Censored', 1),
+             ('', 10.0, 10.0, 0.0, u'Event', 1),
+             ('', 12.0, 12.0, 0.0, u'Event', 1),
+             ('', 15.0, 15.0, 0.0, u'Event', 1)]
+    _expanded = [('', 3.0, 3.0, 0.0, u'Event', 1),
+                 ('', 4.0, 4.0, 0.0, u'Right Censored', 1),
+                 ('', 4.0, 4.0, 0.0, u'Right Censored', 1),
+                 ('', 6.5, 6.5, 0.0, u'Event', 1),
+                 ('', 6.5, 6.5, 0.0, u'Event', 1),
+                 ('', 8.4, 8.4, 0.0, u'Right Censored', 1),
+                 ('', 10.0, 10.0, 0.0, u'Event', 1),
+                 ('', 10.0, 10.0, 0.0, u'Right Censored', 1),
+                 ('', 12.0, 12.0, 0.0, u'Event', 1),
+                 ('', 15.0, 15.0, 0.0, u'Event', 1)]
+
+    _km, _rank = kaplan_meier(_data, 0.0, 100000.0)
+    _km_expanded, _rank_expanded = kaplan_meier(_expanded, 0.0, 100000.0)
+
+    np.testing.assert_allclose(_km, _km_expanded)
+    np.testing.assert_array_equal(_rank, _rank_expanded)
+    np.testing.assert_array_equal(_rank, [1, 4, 5, 7, 9, 10])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_kaplan_meier_interval_censored():
+    """kaplan_meier() should place interval censored events at the middle of the interval."""
+    _data = [('', 0.0, 4.0, 0.0, u'Interval Censored', 1),
+             ('', 5.0, 5.0, 0.0, u'Event', 1),
+             ('', 6.0, 6.0, 0.0, u'Right Censored', 2)]
+
+    _km, _rank = kaplan_meier(_data, 0.0, 100.0)
+
+    np.testing.assert_allclose(_km[:, 0], [2.0, 5.0, 6.0])
+    np.testing.assert_allclose(_km[:, 2], [0.75, 0.5, 0.5])
+    np.testing.assert_array_equal(_rank, [1, 2])
@@ -0,0 +1,328 @@
+#!/usr/bin/env python -O
+# -*- coding: utf-8 -*-
+#
+#       tests.statistics.distributions.test_mle.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Test class for the maximum likelihood estimation module."""
+
+import numpy as np
+from scipy.stats import chi2
+
+import pytest
+
+from rtk.statistics.distributions import MLE
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+PARAMETERS = {
+    'exponential': [0.002],
+    'gaussian': [480.0, 90.0],
+    'lognormal': [6.0, 0.7],
+    'weibull': [900.0, 1.5]
+}
+
+
+def _do_make_data(dist, n_records, seed=1):
+    """Make a data set with events, suspensions, and interval censoring."""
+    _rng = np.random.RandomState(seed)
+    if dist == 'exponential':
+        _times = _rng.exponential(500.0, n_records)
+    elif dist == 'gaussian':
+        _times = _rng.normal(500.0, 80.0, n_records)
+    elif dist == 'lognormal':
+        _times = _rng.lognormal(6.0, 0.8, n_records)
+    else:
+        _times = 1000.0 * _rng.weibull(1.7, n_records)
+
+    _censor = np.percentile(_times, 70)
+    _event = _times <= _censor
+    _interval = np.logical_and(_event, _rng.rand(n_records) < 0.2)
+
+    _data = np.zeros((n_records, 5))
+    _data[:, 1] = np.where(_event, _times, _censor)
+    _data[:, 2] = _rng.randint(1, 4, n_records)
+    _data[:, 3] = np.where(_event, 1, 2)
+    _data[_interval, 0] = np.floor(_times[_interval] / 50.0) * 50.0
+    _data[_interval, 1] = _data[_interval, 0] + 50.0
+    _data[_interval, 3] = 3
+
+    return _data
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_partition_data():
+    """partition_data() should split the records by status and drop records outside the window."""
+    _data = np.array([[0.0, 10.0, 2, 1, 10.0], [0.0, 20.0, 1, 2, 20.0],
+                      [30.0, np.inf, 3, 2, 30.0], [5.0, 15.0, 1, 3, 15.0],
+                      [0.0, 25.0, 4, 4, 25.0], [0.0, 90.0, 1, 1, 90.0]])
+
+    _partition = MLE.partition_data(_data, end=50.0)
+
+    np.testing.assert_array_equal(_partition['event_t'], [10.0])
+    np.testing.assert_array_equal(_partition['event_n'], [2])
+    np.testing.assert_array_equal(_partition['right_t'], [20.0, 30.0])
+    np.testing.assert_array_equal(_partition['right_n'], [1, 3])
+    np.testing.assert_array_equal(_partition['interval_lt'], [5.0, 0.0])
+    np.testing.assert_array_equal(_partition['interval_rt'], [15.0, 25.0])
+    np.testing.assert_array_equal(_partition['interval_n'], [1, 4])
+
+    _partition = MLE.partition_data(_data, start=1.0)
+
+    np.testing.assert_array_equal(_partition['right_t'], [30.0])
+    np.testing.assert_array_equal(_partition['interval_lt'], [5.0])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('dist', sorted(MLE.DISTRIBUTIONS))
+def test_log_likelihood_derivatives(dist):
+    """log_likelihood() should return the gradient and Hessian of the log-likelihood."""
+    _partition = MLE.partition_data(_do_make_data(dist, 300))
+    _params = np.array(PARAMETERS[dist])
+
+    _log_lik, _grad, _hess = MLE.log_likelihood(_partition, _params, dist)
+
+    for _idx in range(len(_params)):
+        _step = np.zeros(len(_params))
+        _step[_idx] = 1.0E-6 * abs(_params[_idx])
+        _upper = MLE.log_likelihood(_partition, _params + _step, dist)
+        _lower = MLE.log_likelihood(_partition, _params - _step, dist)
+
+        assert _grad[_idx] == pytest.approx(
+            (_upper[0] - _lower[0]) / (2.0 * _step[_idx]), rel=1.0E-5)
+        np.testing.assert_allclose(
+            _hess[:, _idx], (_upper[1] - _lower[1]) / (2.0 * _step[_idx]),
+            rtol=1.0E-5)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('dist', sorted(MLE.DISTRIBUTIONS))
+def test_log_likelihood_stacked(dist):
+    """log_likelihood() should calculate several sets of parameters at once."""
+    _partition = MLE.partition_data(_do_make_data(dist, 300))
+    _params = np.outer(PARAMETERS[dist], [0.9, 1.0, 1.1])
+
+    _log_lik, _grad, _hess = MLE.log_likelihood(_partition,
+                                                _params[:, :, None], dist)
+
+    assert _log_lik.shape == (3, )
+    for _idx in range(3):
+        _single = MLE.log_likelihood(_partition, _params[:, _idx], dist)
+        assert _log_lik[_idx] == pytest.approx(_single[0])
+        np.testing.assert_allclose(_grad[:, _idx], _single[1])
+        np.testing.assert_allclose(_hess[:, :, _idx], _single[2])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_observed_information_exponential():
+    """observed_information() should return the closed form exponential information."""
+    _data = _do_make_data('exponential', 500)
+    _data = _data[_data[:, 3] != 3]
+    _n_failures = np.sum(_data[_data[:, 3] == 1, 2])
+
+    _information = MLE.observed_information(
+        MLE.partition_data(_data), [0.002], 'exponential')
+
+    assert _information.shape == (1, 1)
+    assert _information[0, 0] == pytest.approx(_n_failures / 0.002**2.0)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('dist', sorted(MLE.DISTRIBUTIONS))
+def test_observed_information(dist):
+    """observed_information() should return the negative Hessian and covariance_matrix() its inverse."""
+    _partition = MLE.partition_data(_do_make_data(dist, 300))
+    _hess = MLE.log_likelihood(_partition, PARAMETERS[dist], dist)[2]
+
+    _information = MLE.observed_information(_partition, PARAMETERS[dist],
+                                            dist)
+
+    np.testing.assert_array_equal(_information, -_hess)
+    np.testing.assert_allclose(
+        MLE.covariance_matrix(_partition, PARAMETERS[dist], dist),
+        np.linalg.inv(_information))
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_covariance_matrix_singular():
+    """covariance_matrix() should return NaN when the observed information is singular."""
+    _partition = MLE.partition_data(
+        np.array([[0.0, 10.0, 1, 2, 10.0], [0.0, 20.0, 1, 2, 20.0]]))
+
+    _covariance = MLE.covariance_matrix(_partition, [0.002], 'exponential')
+
+    assert _covariance.shape == (1, 1)
+    assert np.isnan(_covariance[0, 0])
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_maximum_likelihood_exponential():
+    """maximum_likelihood() should return the closed form estimate for exponential data without interval censoring."""
+    _data = _do_make_data('exponential', 500)
+    _data = _data[_data[:, 3] != 3]
+    _n_failures = np.sum(_data[_data[:, 3] == 1, 2])
+    _theta = _n_failures / np.sum(_data[:, 1] * _data[:, 2])
+
+    _fit = MLE.maximum_likelihood(_data, dist='exponential')
+
+    assert _fit['converged']
+    assert _fit['parameters'][0] == pytest.approx(_theta, rel=1.0E-8)
+    assert _fit['covariance'][0, 0] == pytest.approx(
+        _theta**2.0 / _n_failures, rel=1.0E-6)
+    assert _fit['n_failures'] == _n_failures
+    assert _fit['aic'] == pytest.approx(-2.0 * _fit['log_likelihood'] + 2.0)
+    assert _fit['bic'] == pytest.approx(-2.0 * _fit['log_likelihood'] +
+                                        np.log(np.sum(_data[:, 2])))
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('dist', ['gaussian', 'lognormal'])
+def test_maximum_likelihood_complete(dist):
+    """maximum_likelihood() should return the sample moments for complete normal and lognormal data."""
+    _data = _do_make_data(dist, 500)
+    _data[:, 3] = 1
+    _times = _data[:, 1]
+    if dist == 'lognormal':
+        _times = np.log(_times)
+    _mu = np.average(_times, weights=_data[:, 2])
+    _sigma = np.sqrt(np.average((_times - _mu)**2.0, weights=_data[:, 2]))
+
+    _fit = MLE.maximum_likelihood(_data, dist=dist)
+
+    assert _fit['converged']
+    np.testing.assert_allclose(_fit['parameters'], [_mu, _sigma], rtol=1.0E-6)
+    assert _fit['n_suspensions'] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('dist', sorted(MLE.DISTRIBUTIONS))
+def test_maximum_likelihood_censored(dist):
+    """maximum_likelihood() should converge to the maximum of the censored log-likelihood."""
+    _partition = MLE.partition_data(_do_make_data(dist, 2000))
+
+    _fit = MLE.fit_partition(_partition, dist)
+    _log_lik, _grad, _hess = MLE.log_likelihood(_partition,
+                                                _fit['parameters'], dist)
+
+    assert _fit['converged']
+    assert _fit['log_likelihood'] == pytest.approx(_log_lik)
+    assert np.all(
+        np.abs(_grad * _fit['parameters']) <= MLE.GTOL *
+        (_fit['n_failures'] + _fit['n_suspensions']))
+    assert np.all(np.linalg.eigvalsh(_hess) < 0.0)
+    np.testing.assert_allclose(_fit['covariance'], np.linalg.inv(-_hess))
+
+    # Starting somewhere else should find the same estimates.
+    _other = MLE.fit_partition(
+        _partition, dist, x0=np.array(PARAMETERS[dist]) * 1.5)
+
+    np.testing.assert_allclose(
+        _other['parameters'], _fit['parameters'], rtol=1.0E-5)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_maximum_likelihood_weibull():
+    """maximum_likelihood() should recover the Weibull parameters of a large data set."""
+    _fit = MLE.maximum_likelihood(
+        _do_make_data('weibull', 20000), dist='weibull')
+
+    assert _fit['converged']
+    np.testing.assert_allclose(_fit['parameters'], [1000.0, 1.7], rtol=0.03)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('dist', ['gaussian', 'lognormal', 'weibull'])
+def test_profile_likelihood(dist):
+    """profile_likelihood() should maximize the log-likelihood over the nuisance parameter."""
+    _partition = MLE.partition_data(_do_make_data(dist, 500))
+    _fit = MLE.fit_partition(_partition, dist)
+    _values = _fit['parameters'][0] * np.array([0.98, 1.0, 1.03])
+
+    _profile, _params = MLE.profile_likelihood(_partition, _fit['parameters'],
+                                               0, _values, dist)
+
+    np.testing.assert_array_equal(_params[0], _values)
+    assert _profile[1] == pytest.approx(_fit['log_likelihood'])
+    assert np.all(_profile <= _fit['log_likelihood'] + 1.0E-8)
+    for _idx in range(3):
+        _log_lik, _grad, __ = MLE.log_likelihood(_partition, _params[:, _idx],
+                                                 dist)
+        assert _profile[_idx] == pytest.approx(_log_lik)
+        assert abs(_grad[1] * _params[1, _idx]) < 1.0E-4
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_profile_bounds_exponential():
+    """profile_bounds() should return the likelihood ratio bounds on the exponential failure rate."""
+    _partition = MLE.partition_data(_do_make_data('exponential', 500))
+    _fit = MLE.fit_partition(_partition, 'exponential')
+    _critical = _fit['log_likelihood'] - chi2.ppf(0.9, 1) / 2.0
+
+    _bounds = MLE.profile_bounds(_partition, 0.9, 'exponential')
+
+    assert len(_bounds) == 1
+    assert _bounds[0][0] < _fit['parameters'][0] < _bounds[0][1]
+    for _bound in _bounds[0]:
+        assert MLE.log_likelihood(_partition, [_bound],
+                                  'exponential')[0] == pytest.approx(
+                                      _critical, abs=1.0E-6)
+    np.testing.assert_allclose(
+        MLE.profile_bounds(_partition, 90.0, 'exponential'), _bounds)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+@pytest.mark.parametrize('dist', ['gaussian', 'lognormal', 'weibull'])
+def test_profile_bounds(dist):
+    """profile_bounds() should return where the profile log-likelihood crosses the critical value."""
+    _partition = MLE.partition_data(_do_make_data(dist, 500))
+    _fit = MLE.fit_partition(_partition, dist)
+    _critical = _fit['log_likelihood'] - chi2.ppf(0.95, 1) / 2.0
+
+    _bounds = MLE.profile_bounds(_partition, 0.95, dist)
+
+    assert len(_bounds) == 2
+    for _idx, (_lower, _upper) in enumerate(_bounds):
+        _estimate = _fit['parameters'][_idx]
+        _wald = 1.959964 * np.sqrt(_fit['covariance'][_idx, _idx])
+        assert _lower < _estimate < _upper
+        assert _upper - _lower == pytest.approx(2.0 * _wald, rel=0.05)
+        np.testing.assert_allclose(
+            MLE.profile_likelihood(_partition, _fit['parameters'], _idx,
+                                   [_lower, _upper], dist)[0],
+            _critical,
+            atol=1.0E-6)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_maximum_likelihood_no_failures():
+    """maximum_likelihood() should raise ValueError when there are no failures."""
+    _data = np.array([[0.0, 10.0, 1, 2, 10.0], [0.0, 20.0, 1, 2, 20.0]])
+
+    with pytest.raises(ValueError):
+        MLE.maximum_likelihood(_data, dist='weibull')
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_maximum_likelihood_unknown():
+    """maximum_likelihood() should raise KeyError for an unknown distribution."""
+    with pytest.raises(KeyError):
+        MLE.maximum_likelihood(_do_make_data('weibull', 10), dist='gumbel')
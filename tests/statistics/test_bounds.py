@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+#
+#       tests.statistics.test_bounds.py is part of The RTK Project
+#
+# All rights reserved.
+# Copyright 2007 - 2017 Andrew Rowland andrew.rowland <AT> reliaqual <DOT> com
+"""Test class for the confidence bounds module."""
+
+from math import exp
+
+import numpy as np
+
+import pytest
+
+from rtk.statistics.Bounds import calculate_fisher_bounds, \
+    calculate_information_bounds
+
+__author__ = 'Andrew Rowland'
+__email__ = 'andrew.rowland@reliaqual.com'
+__organization__ = 'ReliaQual Associates, LLC'
+__copyright__ = 'Copyright 2017 Andrew "weibullguy" Rowland'
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_fisher_bounds():
+    """calculate_fisher_bounds() should return the log-normal approximation bounds."""
+    _lower, _upper = calculate_fisher_bounds(100.0, 25.0, 95.0)
+
+    assert _lower == pytest.approx(100.0 * exp(-1.6448536 * 5.0 / 100.0))
+    assert _upper == pytest.approx(100.0 * exp(1.6448536 * 5.0 / 100.0))
+    assert calculate_fisher_bounds(0.0, 25.0, 0.95) == (0.0, 0.0)
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_information_bounds():
+    """calculate_information_bounds() should return the Fisher bounds using the inverse of the information matrix."""
+    _information = np.array([[0.05, 0.2], [0.2, 40.0]])
+    _covariance = np.linalg.inv(_information)
+
+    _bounds = calculate_information_bounds([100.0, 1.5], _information, 0.9)
+
+    assert len(_bounds) == 2
+    assert _bounds[0] == pytest.approx(
+        calculate_fisher_bounds(100.0, _covariance[0, 0], 0.9))
+    assert _bounds[1] == pytest.approx(
+        calculate_fisher_bounds(1.5, _covariance[1, 1], 0.9))
+
+
+@pytest.mark.unit
+@pytest.mark.calculation
+def test_calculate_information_bounds_singular():
+    """calculate_information_bounds() should return NaN bounds when the information matrix is singular."""
+    _bounds = calculate_information_bounds([100.0, 1.5], np.ones((2, 2)),
+                                           0.9)
+
+    assert np.all(np.isnan(_bounds))
@@ -107,7 +107,14 @@ def test_load_globals(test_common_dao, test_dao):
 
     assert isinstance(DUT.tree, Tree)
 
-    assert _configuration.RTK_ACTION_CATEGORY == {}
+    assert _configuration.RTK_ACTION_CATEGORY == {
+        37: (u'ENGD', u'Engineering, Design', u'action', 1),
+        38: (u'ENGR', u'Engineering, Reliability', u'action', 1),
+        39: (u'ENGS', u'Engineering, Systems', u'action', 1),
+        40: (u'MAN', u'Manufacturing', u'action', 1),
+        41: (u'TEST', u'Test', u'action', 1),
+        42: (u'VANDV', u'Verification & Validation', u'action', 1)
+    }
     assert _configuration.RTK_INCIDENT_CATEGORY == {
         35: (u'HW', u'Hardware', u'incident', 1),
         36: (u'SW', u'Software', u'incident', 1),
@@ -16,7 +16,8 @@ import pytest
 from rtk.Utilities import (create_logger, split_string, none_to_string,
                            string_to_boolean, date_to_ordinal, ordinal_to_date,
                            dir_exists, file_exists, none_to_default,
-                           error_handler)
+                           error_handler, do_make_seeded_chunks,
+                           do_map_chunks)
 
 __author__ = 'Andrew Rowland'
 __email__ = 'andrew.rowland@reliaqual.com'
@@ -185,3 +186,18 @@ def test_error_handler_default():
     """ error_handler() should return a 1000 error code when passed a error string it can't parse. """
     _error_code = error_handler(['Some kinda error message'])
     assert _error_code == 1000
+
+
+def test_do_make_seeded_chunks():
+    """ do_make_seeded_chunks() should split the items into seeded chunks. """
+    _chunks = do_make_seeded_chunks(25, 10, seed=1)
+
+    assert [_n_items for __, _n_items in _chunks] == [10, 10, 5]
+    assert _chunks == do_make_seeded_chunks(25, 10, seed=1)
+    assert len(set(_seed for _seed, __ in _chunks)) == 3
+
+
+@pytest.mark.parametrize("n_workers", [1, 2])
+def test_do_map_chunks(n_workers):
+    """ do_map_chunks() should return the results in the order of the chunks. """
+    assert do_map_chunks(abs, [-1, 2, -3], n_workers) == [1, 2, 3]